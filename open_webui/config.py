@@ -1913,6 +1913,14 @@ if VECTOR_DB == "chroma":
     CHROMA_HTTP_SSL = os.environ.get("CHROMA_HTTP_SSL", "false").lower() == "true"
 # this uses the model defined in the Dockerfile ENV variable. If you dont use docker or docker based deployments such as k8s, the default embedding model will be used (sentence-transformers/all-MiniLM-L6-v2)
 
+# Local (embedded)
+LOCAL_VECTOR_DATA_PATH = os.environ.get(
+    "LOCAL_VECTOR_DATA_PATH", f"{DATA_DIR}/vector_db_local"
+)
+# Collections with at least this many live rows get an IVF index on compaction
+LOCAL_VECTOR_IVF_MIN_ROWS = int(os.environ.get("LOCAL_VECTOR_IVF_MIN_ROWS", "20000"))
+LOCAL_VECTOR_IVF_NPROBE = int(os.environ.get("LOCAL_VECTOR_IVF_NPROBE", "16"))
+
 # Milvus
 
 MILVUS_URI = os.environ.get("MILVUS_URI", f"{DATA_DIR}/vector_db/milvus.db")
@@ -422,6 +422,13 @@ WEBUI_AUTH_SIGNOUT_REDIRECT_URL = os.environ.get(
     "WEBUI_AUTH_SIGNOUT_REDIRECT_URL", None
 )
 
+# Seconds a verified token -> user mapping is reused before the user is reloaded
+AUTH_PRINCIPAL_CACHE_TTL = os.environ.get("AUTH_PRINCIPAL_CACHE_TTL", "30")
+try:
+    AUTH_PRINCIPAL_CACHE_TTL = int(AUTH_PRINCIPAL_CACHE_TTL)
+except Exception:
+    AUTH_PRINCIPAL_CACHE_TTL = 30
+
 ####################################
 # WEBUI_SECRET_KEY
 ####################################
@@ -506,6 +513,15 @@ else:
     except Exception:
         MODELS_CACHE_TTL = 1
 
+# 未开启 ENABLE_BASE_MODELS_CACHE 时，模型目录重新拉取上游连接模型列表的间隔（秒）
+MODELS_CATALOG_REFRESH_INTERVAL = os.environ.get(
+    "MODELS_CATALOG_REFRESH_INTERVAL", "60"
+)
+try:
+    MODELS_CATALOG_REFRESH_INTERVAL = int(MODELS_CATALOG_REFRESH_INTERVAL)
+except Exception:
+    MODELS_CATALOG_REFRESH_INTERVAL = 60
+
 
 ####################################
 # CHAT
@@ -568,6 +584,238 @@ AIOHTTP_CLIENT_SESSION_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_SSL", "True").lower() == "true"
 )
 
+####################################
+# TOOL CALLS
+####################################
+
+# 单个工具调用的超时时间（秒），为空表示不限制
+TOOL_CALL_TIMEOUT = os.environ.get("TOOL_CALL_TIMEOUT", "300")
+
+if TOOL_CALL_TIMEOUT == "":
+    TOOL_CALL_TIMEOUT = None
+else:
+    try:
+        TOOL_CALL_TIMEOUT = int(TOOL_CALL_TIMEOUT)
+    except Exception:
+        TOOL_CALL_TIMEOUT = 300
+
+# 同一轮模型输出中并发执行的工具调用数量上限
+TOOL_CALL_MAX_CONCURRENCY = os.environ.get("TOOL_CALL_MAX_CONCURRENCY", "4")
+try:
+    TOOL_CALL_MAX_CONCURRENCY = max(1, int(TOOL_CALL_MAX_CONCURRENCY))
+except Exception:
+    TOOL_CALL_MAX_CONCURRENCY = 4
+
+####################################
+# CODE INTERPRETER
+####################################
+
+# 预先启动、保持空闲待用的 Jupyter kernel 数量，0 表示不使用 kernel 池
+JUPYTER_KERNEL_POOL_SIZE = os.environ.get("JUPYTER_KERNEL_POOL_SIZE", "2")
+try:
+    JUPYTER_KERNEL_POOL_SIZE = max(0, int(JUPYTER_KERNEL_POOL_SIZE))
+except Exception:
+    JUPYTER_KERNEL_POOL_SIZE = 2
+
+# kernel 池中 kernel 总数上限（空闲 + 已租用）
+JUPYTER_KERNEL_POOL_MAX_KERNELS = os.environ.get(
+    "JUPYTER_KERNEL_POOL_MAX_KERNELS", "10"
+)
+try:
+    JUPYTER_KERNEL_POOL_MAX_KERNELS = max(1, int(JUPYTER_KERNEL_POOL_MAX_KERNELS))
+except Exception:
+    JUPYTER_KERNEL_POOL_MAX_KERNELS = 10
+
+# 对话占用的 kernel 空闲超过该时间（秒）后重置并归还
+JUPYTER_KERNEL_IDLE_TIMEOUT = os.environ.get("JUPYTER_KERNEL_IDLE_TIMEOUT", "600")
+try:
+    JUPYTER_KERNEL_IDLE_TIMEOUT = int(JUPYTER_KERNEL_IDLE_TIMEOUT)
+except Exception:
+    JUPYTER_KERNEL_IDLE_TIMEOUT = 600
+
+# kernel 最长存活时间（秒），超过后关闭并启动新的 kernel
+JUPYTER_KERNEL_MAX_LIFETIME = os.environ.get("JUPYTER_KERNEL_MAX_LIFETIME", "3600")
+try:
+    JUPYTER_KERNEL_MAX_LIFETIME = int(JUPYTER_KERNEL_MAX_LIFETIME)
+except Exception:
+    JUPYTER_KERNEL_MAX_LIFETIME = 3600
+
+# 所有 kernel 都被占用时，等待空闲 kernel 的最长时间（秒）
+JUPYTER_KERNEL_LEASE_TIMEOUT = os.environ.get("JUPYTER_KERNEL_LEASE_TIMEOUT", "30")
+try:
+    JUPYTER_KERNEL_LEASE_TIMEOUT = float(JUPYTER_KERNEL_LEASE_TIMEOUT)
+except Exception:
+    JUPYTER_KERNEL_LEASE_TIMEOUT = 30.0
+
+####################################
+# WEBHOOK NOTIFICATIONS
+####################################
+
+# 同一 webhook 主机同时进行的投递数上限
+WEBHOOK_DELIVERY_CONCURRENCY_PER_HOST = os.environ.get(
+    "WEBHOOK_DELIVERY_CONCURRENCY_PER_HOST", "4"
+)
+try:
+    WEBHOOK_DELIVERY_CONCURRENCY_PER_HOST = max(
+        1, int(WEBHOOK_DELIVERY_CONCURRENCY_PER_HOST)
+    )
+except Exception:
+    WEBHOOK_DELIVERY_CONCURRENCY_PER_HOST = 4
+
+# 单次投递的最多尝试次数，之后标记为失败
+WEBHOOK_DELIVERY_MAX_ATTEMPTS = os.environ.get("WEBHOOK_DELIVERY_MAX_ATTEMPTS", "5")
+try:
+    WEBHOOK_DELIVERY_MAX_ATTEMPTS = max(1, int(WEBHOOK_DELIVERY_MAX_ATTEMPTS))
+except Exception:
+    WEBHOOK_DELIVERY_MAX_ATTEMPTS = 5
+
+# 单次 webhook 请求超时（秒）
+WEBHOOK_DELIVERY_TIMEOUT = os.environ.get("WEBHOOK_DELIVERY_TIMEOUT", "10")
+try:
+    WEBHOOK_DELIVERY_TIMEOUT = float(WEBHOOK_DELIVERY_TIMEOUT)
+except Exception:
+    WEBHOOK_DELIVERY_TIMEOUT = 10.0
+
+# 已完成的投递记录保留时间（秒），在此期间同一事件不会重复投递
+WEBHOOK_DELIVERY_RETENTION = os.environ.get("WEBHOOK_DELIVERY_RETENTION", "86400")
+try:
+    WEBHOOK_DELIVERY_RETENTION = int(WEBHOOK_DELIVERY_RETENTION)
+except Exception:
+    WEBHOOK_DELIVERY_RETENTION = 86400
+
+####################################
+# VECTOR DB
+####################################
+
+# 没有原生异步客户端的向量库，异步接口在该大小的线程池中执行同步调用
+VECTOR_DB_ASYNC_MAX_WORKERS = os.environ.get("VECTOR_DB_ASYNC_MAX_WORKERS", "8")
+try:
+    VECTOR_DB_ASYNC_MAX_WORKERS = int(VECTOR_DB_ASYNC_MAX_WORKERS)
+except Exception:
+    VECTOR_DB_ASYNC_MAX_WORKERS = 8
+
+# 分页遍历集合时每页的条数
+VECTOR_DB_ITER_BATCH_SIZE = os.environ.get("VECTOR_DB_ITER_BATCH_SIZE", "500")
+try:
+    VECTOR_DB_ITER_BATCH_SIZE = max(1, int(VECTOR_DB_ITER_BATCH_SIZE))
+except Exception:
+    VECTOR_DB_ITER_BATCH_SIZE = 500
+
+# 向量检索结果缓存的条目数，0 表示关闭
+VECTOR_QUERY_CACHE_MAX_ENTRIES = os.environ.get(
+    "VECTOR_QUERY_CACHE_MAX_ENTRIES", "2000"
+)
+try:
+    VECTOR_QUERY_CACHE_MAX_ENTRIES = int(VECTOR_QUERY_CACHE_MAX_ENTRIES)
+except Exception:
+    VECTOR_QUERY_CACHE_MAX_ENTRIES = 2000
+
+# 混合检索会读取整个集合，不超过该条数的集合内容也会被缓存
+VECTOR_QUERY_CACHE_MAX_COLLECTION_ITEMS = os.environ.get(
+    "VECTOR_QUERY_CACHE_MAX_COLLECTION_ITEMS", "20000"
+)
+try:
+    VECTOR_QUERY_CACHE_MAX_COLLECTION_ITEMS = int(
+        VECTOR_QUERY_CACHE_MAX_COLLECTION_ITEMS
+    )
+except Exception:
+    VECTOR_QUERY_CACHE_MAX_COLLECTION_ITEMS = 20000
+
+# 每个 worker 缓存的集合内容总大小上限（字节，按文档和元数据估算），0 表示不缓存集合
+VECTOR_QUERY_CACHE_MAX_COLLECTION_BYTES = os.environ.get(
+    "VECTOR_QUERY_CACHE_MAX_COLLECTION_BYTES", str(64 * 1024 * 1024)
+)
+try:
+    VECTOR_QUERY_CACHE_MAX_COLLECTION_BYTES = int(
+        VECTOR_QUERY_CACHE_MAX_COLLECTION_BYTES
+    )
+except Exception:
+    VECTOR_QUERY_CACHE_MAX_COLLECTION_BYTES = 64 * 1024 * 1024
+
+# 所有用户的记忆共用的向量集合，按 user_id 过滤
+MEMORY_VECTOR_COLLECTION = os.environ.get(
+    "MEMORY_VECTOR_COLLECTION", "user-memory-index"
+)
+
+# 重建或批量写入记忆时每次向量化的条数
+MEMORY_EMBEDDING_BATCH_SIZE = os.environ.get("MEMORY_EMBEDDING_BATCH_SIZE", "64")
+try:
+    MEMORY_EMBEDDING_BATCH_SIZE = int(MEMORY_EMBEDDING_BATCH_SIZE)
+except Exception:
+    MEMORY_EMBEDDING_BATCH_SIZE = 64
+
+####################################
+# WEB PAGE CACHE
+####################################
+
+# 网页缓存：按规范化 URL 保存 ETag/Last-Modified，按内容哈希缓存正文和向量
+ENABLE_WEB_PAGE_CACHE = (
+    os.environ.get("ENABLE_WEB_PAGE_CACHE", "True").lower() == "true"
+)
+WEB_PAGE_CACHE_MAX_ENTRIES = os.environ.get("WEB_PAGE_CACHE_MAX_ENTRIES", "10000")
+try:
+    WEB_PAGE_CACHE_MAX_ENTRIES = int(WEB_PAGE_CACHE_MAX_ENTRIES)
+except Exception:
+    WEB_PAGE_CACHE_MAX_ENTRIES = 10000
+
+####################################
+# WEB PAGE EXTRACTION
+####################################
+
+# 网页正文在进程池中解析；单页 CPU 时间和 HTML 大小受限
+WEB_EXTRACT_MAX_WORKERS = os.environ.get("WEB_EXTRACT_MAX_WORKERS", "")
+try:
+    WEB_EXTRACT_MAX_WORKERS = int(WEB_EXTRACT_MAX_WORKERS)
+except Exception:
+    WEB_EXTRACT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+WEB_EXTRACT_CPU_TIME_LIMIT = os.environ.get("WEB_EXTRACT_CPU_TIME_LIMIT", "10")
+try:
+    WEB_EXTRACT_CPU_TIME_LIMIT = float(WEB_EXTRACT_CPU_TIME_LIMIT)
+except Exception:
+    WEB_EXTRACT_CPU_TIME_LIMIT = 10.0
+
+WEB_EXTRACT_MAX_PAGE_BYTES = os.environ.get(
+    "WEB_EXTRACT_MAX_PAGE_BYTES", str(5 * 1024 * 1024)
+)
+try:
+    WEB_EXTRACT_MAX_PAGE_BYTES = int(WEB_EXTRACT_MAX_PAGE_BYTES)
+except Exception:
+    WEB_EXTRACT_MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+####################################
+# AUDIO TRANSCRIPTION
+####################################
+
+# 长音频在接近目标时长的静音处切分，各分段并行转写
+AUDIO_SEGMENT_TARGET_SECONDS = os.environ.get("AUDIO_SEGMENT_TARGET_SECONDS", "600")
+try:
+    AUDIO_SEGMENT_TARGET_SECONDS = float(AUDIO_SEGMENT_TARGET_SECONDS)
+except Exception:
+    AUDIO_SEGMENT_TARGET_SECONDS = 600.0
+
+# 在目标时长前后多少秒内寻找静音点
+AUDIO_SEGMENT_SEARCH_SECONDS = os.environ.get("AUDIO_SEGMENT_SEARCH_SECONDS", "30")
+try:
+    AUDIO_SEGMENT_SEARCH_SECONDS = float(AUDIO_SEGMENT_SEARCH_SECONDS)
+except Exception:
+    AUDIO_SEGMENT_SEARCH_SECONDS = 30.0
+
+AUDIO_TRANSCRIPTION_MAX_WORKERS = os.environ.get(
+    "AUDIO_TRANSCRIPTION_MAX_WORKERS", "4"
+)
+try:
+    AUDIO_TRANSCRIPTION_MAX_WORKERS = int(AUDIO_TRANSCRIPTION_MAX_WORKERS)
+except Exception:
+    AUDIO_TRANSCRIPTION_MAX_WORKERS = 4
+
+# 语音合成缓存的容量上限（MB），超出后按最近最少使用淘汰
+SPEECH_CACHE_MAX_SIZE_MB = os.environ.get("SPEECH_CACHE_MAX_SIZE_MB", "1024")
+try:
+    SPEECH_CACHE_MAX_SIZE_MB = int(SPEECH_CACHE_MAX_SIZE_MB)
+except Exception:
+    SPEECH_CACHE_MAX_SIZE_MB = 1024
+
 AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = os.environ.get(
     "AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST",
     os.environ.get("AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST", "10"),
@@ -662,10 +910,29 @@ if OFFLINE_MODE:
 ####################################
 # AUDIT LOGGING
 ####################################
-# Where to store log file
-AUDIT_LOGS_FILE_PATH = f"{DATA_DIR}/audit.log"
-# Maximum size of a file before rotating into a new log file
-AUDIT_LOG_FILE_ROTATION_SIZE = os.getenv("AUDIT_LOG_FILE_ROTATION_SIZE", "10MB")
+# Where to store the audit log segments and their index
+AUDIT_LOGS_DIR = os.getenv("AUDIT_LOGS_DIR", f"{DATA_DIR}/audit")
+
+# Seconds covered by one audit log segment (default one hour)
+AUDIT_LOG_SEGMENT_SECONDS = os.environ.get("AUDIT_LOG_SEGMENT_SECONDS", "3600")
+try:
+    AUDIT_LOG_SEGMENT_SECONDS = max(60, int(AUDIT_LOG_SEGMENT_SECONDS))
+except Exception:
+    AUDIT_LOG_SEGMENT_SECONDS = 3600
+
+# Entries waiting for the background writer; new entries are dropped when full
+AUDIT_LOG_QUEUE_SIZE = os.environ.get("AUDIT_LOG_QUEUE_SIZE", "10000")
+try:
+    AUDIT_LOG_QUEUE_SIZE = int(AUDIT_LOG_QUEUE_SIZE)
+except Exception:
+    AUDIT_LOG_QUEUE_SIZE = 10000
+
+# Maximum entries compressed and indexed together by the writer
+AUDIT_LOG_BATCH_SIZE = os.environ.get("AUDIT_LOG_BATCH_SIZE", "500")
+try:
+    AUDIT_LOG_BATCH_SIZE = int(AUDIT_LOG_BATCH_SIZE)
+except Exception:
+    AUDIT_LOG_BATCH_SIZE = 500
 
 # Comma separated list of logger names to use for audit logging
 # Default is "uvicorn.access" which is the access log for Uvicorn
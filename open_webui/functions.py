@@ -27,6 +27,7 @@ from open_webui.socket.main import (
 
 from open_webui.models.users import UserModel
 from open_webui.models.functions import Functions
+from open_webui.services.plugin_cache import plugin_cache
 from open_webui.models.models import Models
 
 from open_webui.utils.plugin import (
@@ -60,7 +61,9 @@ def get_function_module_by_id(request: Request, pipe_id: str):
     function_module, _, _ = get_function_module_from_cache(request, pipe_id)
 
     if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-        valves = Functions.get_function_valves_by_id(pipe_id)
+        valves = plugin_cache.get_valves(
+            "function", pipe_id, Functions.get_function_valves_by_id
+        )
         function_module.valves = function_module.Valves(**(valves if valves else {}))
     return function_module
 
@@ -63,6 +63,7 @@ from open_webui.socket.main import (
     get_active_user_ids,
 )
 from open_webui.routers import (
+    audit,
     auths,
     auth,
     channels,
@@ -122,6 +123,7 @@ from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 from open_webui.models.users import UserModel, Users
 from open_webui.models.chats import Chats
+from open_webui.models.groups import Groups
 
 from open_webui.config import (
     # Ollama
@@ -463,6 +465,7 @@ from open_webui.env import (
 from open_webui.utils.models import (
     get_all_models,
     get_all_base_models,
+    get_model_catalog,
     check_model_access,
 )
 from open_webui.utils.chat import (
@@ -471,6 +474,11 @@ from open_webui.utils.chat import (
     chat_action as chat_action_handler,
 )
 from open_webui.utils.embeddings import generate_embeddings
+from open_webui.utils.code_interpreter import close_kernel_pools
+from open_webui.services.audit_store import audit_store
+from open_webui.services.notification_dispatcher import notification_dispatcher
+from open_webui.services.trending_terms import trending_terms
+from open_webui.services.rating_engine import rating_engine
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
 from open_webui.utils.access_control import has_access
 
@@ -565,6 +573,13 @@ async def lifespan(app: FastAPI):
         async_mode=True,
     )
 
+    await notification_dispatcher.start()
+
+    # Backfill the leaderboard from existing feedback without delaying startup
+    app.state.rating_engine_task = asyncio.create_task(
+        asyncio.to_thread(rating_engine.ensure_built)
+    )
+
     if app.state.redis is not None:
         app.state.redis_task_command_listener = asyncio.create_task(
             redis_task_command_listener(app)
@@ -602,6 +617,11 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    await notification_dispatcher.close()
+    await close_kernel_pools()
+    await asyncio.to_thread(audit_store.close)
+    await asyncio.to_thread(trending_terms.close)
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -1297,6 +1317,7 @@ app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
 
 # New authentication and notification endpoints
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
+app.include_router(audit.router, prefix="/api/v1/audit", tags=["audit"])
 app.include_router(notifications.router, prefix="/api/v1", tags=["notifications"])
 
 # Development debug module
@@ -1339,64 +1360,13 @@ if audit_level != AuditLevel.NONE:
 async def get_models(
     request: Request, refresh: bool = False, user=Depends(get_verified_user)
 ):
-    def get_filtered_models(models, user):
-        filtered_models = []
-        for model in models:
-            if model.get("arena"):
-                if has_access(
-                    user.id,
-                    type="read",
-                    access_control=model.get("info", {})
-                    .get("meta", {})
-                    .get("access_control", {}),
-                ):
-                    filtered_models.append(model)
-                continue
-
-            model_info = Models.get_model_by_id(model["id"])
-            if model_info:
-                if user.id == model_info.user_id or has_access(
-                    user.id, type="read", access_control=model_info.access_control
-                ):
-                    filtered_models.append(model)
-
-        return filtered_models
-
-    all_models = await get_all_models(request, refresh=refresh, user=user)
-
-    models = []
-    for model in all_models:
-        # Filter out filter pipelines
-        if "pipeline" in model and model["pipeline"].get("type", None) == "filter":
-            continue
-
-        try:
-            model_tags = [
-                tag.get("name")
-                for tag in model.get("info", {}).get("meta", {}).get("tags", [])
-            ]
-            tags = [tag.get("name") for tag in model.get("tags", [])]
-
-            tags = list(set(model_tags + tags))
-            model["tags"] = [{"name": tag} for tag in tags]
-        except Exception as e:
-            log.debug(f"Error processing model tags: {e}")
-            model["tags"] = []
-            pass
-
-        models.append(model)
-
-    model_order_list = request.app.state.config.MODEL_ORDER_LIST
-    if model_order_list:
-        model_order_dict = {model_id: i for i, model_id in enumerate(model_order_list)}
-        # Sort models by order list priority, with fallback for those not in the list
-        models.sort(
-            key=lambda x: (model_order_dict.get(x["id"], float("inf")), x["name"])
-        )
+    snapshot = await get_model_catalog(request, refresh=refresh, user=user)
+    models = snapshot.listing if snapshot else []
 
     # Filter out models that the user does not have access to
-    if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL:
-        models = get_filtered_models(models, user)
+    if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL and snapshot:
+        group_ids = [group.id for group in Groups.get_groups_by_member_id(user.id)]
+        models = snapshot.filter_for_user(models, user.id, group_ids)
 
     log.debug(
         f"/api/models returned filtered models accessible to the user: {json.dumps([model.get('id') for model in models])}"
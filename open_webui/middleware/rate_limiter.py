@@ -1,54 +1,142 @@
 """
 API限流中间件
-使用滑动窗口算法实现请求频率限制
+使用 GCRA（通用信元速率算法）实现请求频率限制：
+一次请求涉及的所有限流 key 在一次 Lua 调用中原子地完成检查与更新，
+Redis 不可用时退回进程内令牌桶
 """
 
 import time
-import redis
-import json
-from typing import Optional, Dict, Tuple
-from datetime import datetime, timedelta
 import logging
-from fastapi import Request, HTTPException, status
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
+
+from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from redis import asyncio as aioredis
+from opentelemetry import metrics
 
 from open_webui.config import REDIS_URL
 
 log = logging.getLogger(__name__)
 
+meter = metrics.get_meter(__name__)
+decision_duration = meter.create_histogram(
+    name="rate_limiter.decision.duration",
+    description="Rate limit decision latency",
+    unit="ms",
+)
+rejection_counter = meter.create_counter(
+    name="rate_limiter.rejections",
+    description="Requests rejected by the rate limiter",
+    unit="1",
+)
+
+
+# KEYS: 限流 key 列表
+# ARGV: cost, 然后每个 key 依次为 emission_interval_ms, tolerance_ms
+# 先检查所有 key，全部通过后才更新，保证一次请求要么全部计数要么都不计数
+# 返回: {allowed, 拒绝 key 的下标(1 起), remaining, retry_after_ms, reset_after_ms}
+GCRA_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local cost = tonumber(ARGV[1])
+
+local new_tats = {}
+local min_remaining = -1
+local max_reset = 0
+
+for i, key in ipairs(KEYS) do
+    local interval = tonumber(ARGV[i * 2])
+    local tolerance = tonumber(ARGV[i * 2 + 1])
+    local tat = tonumber(redis.call('GET', key) or now)
+    if tat < now then
+        tat = now
+    end
+
+    local new_tat = tat + interval * cost
+    local allow_at = new_tat - tolerance
+    if now < allow_at then
+        local remaining = math.floor((tolerance - (tat - now)) / interval)
+        if remaining < 0 then
+            remaining = 0
+        end
+        return {0, i, remaining, allow_at - now, tat - now}
+    end
+
+    new_tats[i] = new_tat
+    local remaining = math.floor((now - allow_at) / interval)
+    if min_remaining < 0 or remaining < min_remaining then
+        min_remaining = remaining
+    end
+    if new_tat - now > max_reset then
+        max_reset = new_tat - now
+    end
+end
+
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, new_tats[i], 'PX', math.max(1, math.ceil(new_tats[i] - now)))
+end
+
+return {1, 0, min_remaining, 0, max_reset}
+"""
+
+
+class TokenBucket:
+    """进程内令牌桶，Redis 不可用时使用"""
+
+    def __init__(self, limit: int, window: int):
+        self.capacity = float(limit)
+        self.rate = limit / window
+        self.tokens = float(limit)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        if now <= self.updated_at:
+            return
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def can_consume(self, cost: int, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= cost
+
+    def consume(self, cost: int):
+        self.tokens -= cost
+
+    def retry_after(self, cost: int) -> float:
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+
 class RateLimiter:
     """基于Redis的限流器"""
-    
-    def __init__(self):
-        """初始化Redis连接"""
+
+    # Redis 调用失败后，在此时间内直接使用本地令牌桶，避免每个请求都等待超时
+    REDIS_RETRY_INTERVAL = 30
+    MAX_LOCAL_BUCKETS = 10000
+
+    def __init__(self, redis_url: Optional[str] = None):
+        """初始化Redis连接（异步客户端，首次使用时才真正建立连接）"""
         try:
-            if REDIS_URL:
-                self.redis_client = redis.from_url(
-                    REDIS_URL,
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_timeout=5
-                )
-            else:
-                self.redis_client = redis.Redis(
-                    host='localhost',
-                    port=6379,
-                    db=1,  # 使用不同的DB避免冲突
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_timeout=5
-                )
-            
-            self.redis_client.ping()
+            self.redis_client = aioredis.from_url(
+                redis_url or REDIS_URL or "redis://localhost:6379/1",  # 默认使用不同的DB避免冲突
+                decode_responses=True,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+            self._script = self.redis_client.register_script(GCRA_LUA)
             self.enabled = True
-            log.info("Rate limiter initialized successfully")
         except Exception as e:
-            log.warning(f"Failed to connect to Redis for rate limiting: {e}")
+            log.warning(f"Failed to create Redis client for rate limiting: {e}")
             self.redis_client = None
+            self._script = None
             self.enabled = False
-    
-    def check_rate_limit(
+
+        self._redis_down_until = 0.0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.stats = {"redis_decisions": 0, "local_decisions": 0, "rejections": 0}
+
+    async def check_rate_limit(
         self,
         key: str,
         limit: int,
@@ -57,100 +145,176 @@ class RateLimiter:
     ) -> Tuple[bool, Dict]:
         """
         检查是否超过速率限制
-        
+
         Args:
             key: 限流key（如用户ID或IP）
             limit: 时间窗口内的最大请求数
             window: 时间窗口大小（秒）
             cost: 本次请求的消耗（默认1）
-            
+
         Returns:
             (是否允许, 限流信息字典)
         """
-        if not self.enabled:
-            return True, {"enabled": False}
-        
+        return await self.check_rate_limits([(key, limit, window)], cost)
+
+    async def check_rate_limits(
+        self,
+        rules: List[Tuple[str, int, int]],
+        cost: int = 1,
+    ) -> Tuple[bool, Dict]:
+        """
+        原子地检查并更新一组限流规则
+
+        Args:
+            rules: [(限流key, 最大请求数, 时间窗口秒数)]
+            cost: 本次请求的消耗
+
+        Returns:
+            (是否允许, 限流信息字典)，拒绝时信息对应第一个超限的规则
+        """
+        if not rules:
+            return True, {}
+
+        start = time.perf_counter()
+        backend = "local"
         try:
-            now = time.time()
-            pipeline = self.redis_client.pipeline()
-            
-            # 移除过期的请求记录
-            pipeline.zremrangebyscore(key, 0, now - window)
-            
-            # 获取当前窗口内的请求数
-            pipeline.zcard(key)
-            
-            # 执行pipeline
-            results = pipeline.execute()
-            current_requests = results[1]
-            
-            # 检查是否超限
-            if current_requests + cost > limit:
-                # 计算重置时间
-                pipeline = self.redis_client.pipeline()
-                pipeline.zrange(key, 0, 0, withscores=True)
-                oldest = pipeline.execute()[0]
-                
-                if oldest:
-                    reset_time = oldest[0][1] + window
-                else:
-                    reset_time = now + window
-                
-                return False, {
-                    "limit": limit,
-                    "remaining": max(0, limit - current_requests),
-                    "reset": int(reset_time),
-                    "retry_after": int(reset_time - now)
-                }
-            
-            # 添加当前请求
-            for _ in range(cost):
-                self.redis_client.zadd(key, {f"{now}:{time.time_ns()}": now})
-            
-            # 设置过期时间
-            self.redis_client.expire(key, window)
-            
-            return True, {
-                "limit": limit,
-                "remaining": limit - current_requests - cost,
-                "reset": int(now + window)
-            }
-            
+            if self.enabled and time.monotonic() >= self._redis_down_until:
+                try:
+                    allowed, info = await self._check_redis(rules, cost)
+                    backend = "redis"
+                except Exception as e:
+                    log.warning(
+                        f"Rate limit check via Redis failed: {e}. "
+                        f"Falling back to local buckets for {self.REDIS_RETRY_INTERVAL}s"
+                    )
+                    self._redis_down_until = time.monotonic() + self.REDIS_RETRY_INTERVAL
+                    allowed, info = self._check_local(rules, cost)
+            else:
+                allowed, info = self._check_local(rules, cost)
         except Exception as e:
             log.error(f"Rate limit check failed: {e}")
             # 出错时默认允许请求
             return True, {"error": str(e)}
 
+        self.stats[f"{backend}_decisions"] += 1
+        decision_duration.record(
+            (time.perf_counter() - start) * 1000, {"backend": backend}
+        )
+        if not allowed:
+            self.stats["rejections"] += 1
+            rejection_counter.add(1, {"scope": info.get("scope", "unknown")})
+        return allowed, info
+
+    async def _check_redis(
+        self, rules: List[Tuple[str, int, int]], cost: int
+    ) -> Tuple[bool, Dict]:
+        keys = []
+        args = [cost]
+        for key, limit, window in rules:
+            window_ms = window * 1000
+            keys.append(key)
+            args.extend([window_ms / limit, window_ms])
+
+        allowed, index, remaining, retry_after_ms, reset_after_ms = await self._script(
+            keys=keys, args=args
+        )
+
+        now = time.time()
+        if not allowed:
+            key, limit, _ = rules[int(index) - 1]
+            retry_after = max(1, int(-(-int(retry_after_ms) // 1000)))
+            return False, {
+                "scope": key.split(":")[1] if ":" in key else key,
+                "limit": limit,
+                "remaining": int(remaining),
+                "reset": int(now + int(reset_after_ms) / 1000),
+                "retry_after": retry_after,
+            }
+
+        return True, {
+            "limit": min(limit for _, limit, _ in rules),
+            "remaining": int(remaining),
+            "reset": int(now + int(reset_after_ms) / 1000),
+        }
+
+    def _get_bucket(self, key: str, limit: int, window: int) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(limit, window)
+            if len(self._buckets) > self.MAX_LOCAL_BUCKETS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def _check_local(
+        self, rules: List[Tuple[str, int, int]], cost: int
+    ) -> Tuple[bool, Dict]:
+        now = time.monotonic()
+        buckets = [self._get_bucket(key, limit, window) for key, limit, window in rules]
+
+        for (key, limit, _), bucket in zip(rules, buckets):
+            if not bucket.can_consume(cost, now):
+                retry_after = bucket.retry_after(cost)
+                return False, {
+                    "scope": key.split(":")[1] if ":" in key else key,
+                    "limit": limit,
+                    "remaining": int(bucket.tokens),
+                    "reset": int(time.time() + retry_after),
+                    "retry_after": max(1, int(-(-retry_after // 1))),
+                }
+
+        for bucket in buckets:
+            bucket.consume(cost)
+
+        tightest = min(
+            zip(rules, buckets), key=lambda item: item[1].tokens / item[1].capacity
+        )
+        (_, limit, window), bucket = tightest
+        return True, {
+            "limit": limit,
+            "remaining": int(bucket.tokens),
+            "reset": int(time.time() + (bucket.capacity - bucket.tokens) / bucket.rate),
+        }
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "redis_enabled": self.enabled,
+            "redis_available": self.enabled and time.monotonic() >= self._redis_down_until,
+            "local_buckets": len(self._buckets),
+        }
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """API限流中间件"""
-    
+
     def __init__(self, app, config: Optional[Dict] = None):
         super().__init__(app)
         self.limiter = RateLimiter()
-        
+
         # 默认配置
         self.config = config or {}
-        
+
         # 全局限制
         self.global_limit = self.config.get("global_limit", 1000)
         self.global_window = self.config.get("global_window", 60)
-        
+
         # 用户限制
         self.user_limit = self.config.get("user_limit", 100)
         self.user_window = self.config.get("user_window", 60)
-        
+
         # IP限制
         self.ip_limit = self.config.get("ip_limit", 50)
         self.ip_window = self.config.get("ip_window", 60)
-        
-        # 特定路径限制
+
+        # 特定路径限制（可选 cost：该路径的请求按权重计入所有限流规则）
         self.path_limits = self.config.get("path_limits", {
             "/api/v1/analysis": {"limit": 10, "window": 60},  # AI分析限制
             "/api/v1/knowledge/documents/upload": {"limit": 20, "window": 60},  # 文件上传限制
             "/api/v1/cases/batch": {"limit": 5, "window": 60},  # 批量操作限制
         })
-        
+
         # 豁免路径
         self.exempt_paths = self.config.get("exempt_paths", [
             "/health",
@@ -158,18 +322,18 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             "/api/v1/auth/signin",
             "/api/v1/auth/signup"
         ])
-    
+
     async def dispatch(self, request: Request, call_next):
         """处理请求"""
-        
+
         # 检查是否为豁免路径
         path = request.url.path
         if any(path.startswith(exempt) for exempt in self.exempt_paths):
             return await call_next(request)
-        
+
         # 获取客户端IP
         client_ip = request.client.host if request.client else "unknown"
-        
+
         # 获取用户ID（如果已认证）
         user_id = None
         try:
@@ -177,80 +341,60 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 user_id = request.state.user.id
         except:
             pass
-        
-        # 检查特定路径限制
+
+        rules = []
+        cost = 1
+
+        # 特定路径限制
         for path_pattern, limits in self.path_limits.items():
             if path.startswith(path_pattern):
-                key = f"rate_limit:path:{path_pattern}:{user_id or client_ip}"
-                allowed, info = self.limiter.check_rate_limit(
-                    key,
+                rules.append((
+                    f"rate_limit:path:{path_pattern}:{user_id or client_ip}",
                     limits["limit"],
-                    limits["window"]
-                )
-                
-                if not allowed:
-                    return self._rate_limit_exceeded_response(info)
-        
-        # 检查用户限制（如果已认证）
+                    limits["window"],
+                ))
+                cost = max(cost, limits.get("cost", 1))
+
+        # 用户限制（如果已认证）
         if user_id:
-            key = f"rate_limit:user:{user_id}"
-            allowed, info = self.limiter.check_rate_limit(
-                key,
-                self.user_limit,
-                self.user_window
-            )
-            
-            if not allowed:
-                return self._rate_limit_exceeded_response(info)
-        
-        # 检查IP限制
+            rules.append((f"rate_limit:user:{user_id}", self.user_limit, self.user_window))
+
+        # IP限制
         if client_ip != "unknown":
-            key = f"rate_limit:ip:{client_ip}"
-            allowed, info = self.limiter.check_rate_limit(
-                key,
-                self.ip_limit,
-                self.ip_window
-            )
-            
-            if not allowed:
-                return self._rate_limit_exceeded_response(info)
-        
-        # 检查全局限制
-        key = "rate_limit:global"
-        allowed, info = self.limiter.check_rate_limit(
-            key,
-            self.global_limit,
-            self.global_window
-        )
-        
+            rules.append((f"rate_limit:ip:{client_ip}", self.ip_limit, self.ip_window))
+
+        # 全局限制
+        rules.append(("rate_limit:global", self.global_limit, self.global_window))
+
+        allowed, info = await self.limiter.check_rate_limits(rules, cost)
         if not allowed:
             return self._rate_limit_exceeded_response(info)
-        
+
         # 处理请求并添加限流头
         response = await call_next(request)
-        
+
         # 添加限流信息到响应头
         if info and "limit" in info:
             response.headers["X-RateLimit-Limit"] = str(info["limit"])
             response.headers["X-RateLimit-Remaining"] = str(info.get("remaining", 0))
             response.headers["X-RateLimit-Reset"] = str(info.get("reset", 0))
-        
+
         return response
-    
+
     def _rate_limit_exceeded_response(self, info: Dict) -> JSONResponse:
         """返回限流响应"""
         content = {
             "detail": "Rate limit exceeded",
             "retry_after": info.get("retry_after", 60)
         }
-        
+
         headers = {
             "Retry-After": str(info.get("retry_after", 60)),
             "X-RateLimit-Limit": str(info.get("limit", 0)),
             "X-RateLimit-Remaining": "0",
             "X-RateLimit-Reset": str(info.get("reset", 0))
         }
-        
+
         return JSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             content=content,
@@ -261,10 +405,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 def create_rate_limiter(config: Optional[Dict] = None) -> RateLimitMiddleware:
     """
     创建限流中间件实例
-    
+
     Args:
         config: 限流配置
-        
+
     Returns:
         RateLimitMiddleware实例
     """
@@ -0,0 +1,82 @@
+"""Add group_member table
+
+Revision ID: 7d3e1c9a5b42
+Revises: 468b42c4c1df
+Create Date: 2025-09-02 00:00:00.000000
+
+"""
+
+import json
+import time
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+revision = "7d3e1c9a5b42"
+down_revision = "468b42c4c1df"
+branch_labels = None
+depends_on = None
+
+
+group = table(
+    "group",
+    column("id", sa.Text()),
+    column("user_ids", sa.JSON()),
+)
+
+group_member = table(
+    "group_member",
+    column("group_id", sa.Text()),
+    column("user_id", sa.Text()),
+    column("created_at", sa.BigInteger()),
+)
+
+
+def _load_user_ids(value):
+    if isinstance(value, str):
+        value = json.loads(value)
+    return value or []
+
+
+def upgrade():
+    op.create_table(
+        "group_member",
+        sa.Column("group_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("group_id", "user_id"),
+    )
+    op.create_index("idx_group_member_user_id", "group_member", ["user_id"])
+
+    # Copy the members out of the group.user_ids JSON arrays
+    conn = op.get_bind()
+    now = int(time.time())
+    members = []
+    for row in conn.execute(sa.select(group.c.id, group.c.user_ids)):
+        for user_id in dict.fromkeys(_load_user_ids(row.user_ids)):
+            members.append({"group_id": row.id, "user_id": user_id, "created_at": now})
+
+    if members:
+        op.bulk_insert(group_member, members)
+
+
+def downgrade():
+    conn = op.get_bind()
+    user_ids = {}
+    for row in conn.execute(
+        sa.select(group_member.c.group_id, group_member.c.user_id).order_by(
+            group_member.c.created_at
+        )
+    ):
+        user_ids.setdefault(row.group_id, []).append(row.user_id)
+
+    for row in conn.execute(sa.select(group.c.id)).all():
+        conn.execute(
+            group.update()
+            .where(group.c.id == row.id)
+            .values(user_ids=user_ids.get(row.id, []))
+        )
+
+    op.drop_index("idx_group_member_user_id", table_name="group_member")
+    op.drop_table("group_member")
@@ -0,0 +1,44 @@
+"""Add webhook_delivery table
+
+Revision ID: 9c4e2a7b1d30
+Revises: 7d3e1c9a5b42
+Create Date: 2025-09-09 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "9c4e2a7b1d30"
+down_revision = "7d3e1c9a5b42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "webhook_delivery",
+        sa.Column("id", sa.Text(), nullable=False),
+        sa.Column("dedupe_key", sa.Text(), nullable=False),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("claimed_by", sa.Text(), nullable=True),
+        sa.Column("next_attempt_at", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("dedupe_key"),
+    )
+    op.create_index(
+        "idx_webhook_delivery_status_next",
+        "webhook_delivery",
+        ["status", "next_attempt_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("idx_webhook_delivery_status_next", table_name="webhook_delivery")
+    op.drop_table("webhook_delivery")
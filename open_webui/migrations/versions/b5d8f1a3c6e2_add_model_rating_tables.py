@@ -0,0 +1,52 @@
+"""Add model_rating_pair and model_rating tables
+
+Revision ID: b5d8f1a3c6e2
+Revises: 9c4e2a7b1d30
+Create Date: 2025-09-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "b5d8f1a3c6e2"
+down_revision = "9c4e2a7b1d30"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled from the feedback table by the rating engine on first start
+    op.create_table(
+        "model_rating_pair",
+        sa.Column("tag", sa.Text(), nullable=False),
+        sa.Column("model_a", sa.Text(), nullable=False),
+        sa.Column("model_b", sa.Text(), nullable=False),
+        sa.Column("wins_a", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("wins_b", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ties", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("tag", "model_a", "model_b"),
+    )
+
+    op.create_table(
+        "model_rating",
+        sa.Column("tag", sa.Text(), nullable=False),
+        sa.Column("model_id", sa.Text(), nullable=False),
+        sa.Column("rating", sa.Float(), nullable=False),
+        sa.Column("ci_low", sa.Float(), nullable=False),
+        sa.Column("ci_high", sa.Float(), nullable=False),
+        sa.Column("won", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("lost", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ties", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("tag", "model_id"),
+    )
+    op.create_index("idx_model_rating_model_id", "model_rating", ["model_id"])
+    op.create_index("idx_model_rating_tag_rating", "model_rating", ["tag", "rating"])
+
+
+def downgrade():
+    op.drop_index("idx_model_rating_tag_rating", table_name="model_rating")
+    op.drop_index("idx_model_rating_model_id", table_name="model_rating")
+    op.drop_table("model_rating")
+    op.drop_table("model_rating_pair")
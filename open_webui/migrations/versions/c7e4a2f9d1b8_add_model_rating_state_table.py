@@ -0,0 +1,31 @@
+"""Add model_rating_state table
+
+Revision ID: c7e4a2f9d1b8
+Revises: b5d8f1a3c6e2
+Create Date: 2025-09-18 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c7e4a2f9d1b8"
+down_revision = "b5d8f1a3c6e2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Locked by every rating write; built_at is set by the first backfill
+    state = op.create_table(
+        "model_rating_state",
+        sa.Column("id", sa.Text(), nullable=False),
+        sa.Column("built_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.bulk_insert(state, [{"id": "leaderboard", "built_at": None, "updated_at": 0}])
+
+
+def downgrade():
+    op.drop_table("model_rating_state")
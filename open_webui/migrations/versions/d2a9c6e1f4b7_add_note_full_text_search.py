@@ -0,0 +1,71 @@
+"""Add full-text search over note titles and content
+
+Revision ID: d2a9c6e1f4b7
+Revises: c7e4a2f9d1b8
+Create Date: 2025-09-19 00:00:00.000000
+
+"""
+
+from alembic import op
+
+revision = "d2a9c6e1f4b7"
+down_revision = "c7e4a2f9d1b8"
+branch_labels = None
+depends_on = None
+
+
+SQLITE_ROW = "json_extract({row}.data, '$.content.md')"
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == "sqlite":
+        # Trigram tokens match substrings, including text without spaces
+        # between words; rows are keyed by the note rowid and kept in sync
+        # by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE note_fts USING fts5("
+            "title, content, tokenize='trigram')"
+        )
+        insert = (
+            "INSERT INTO note_fts(rowid, title, content) "
+            f"VALUES (new.rowid, new.title, {SQLITE_ROW.format(row='new')});"
+        )
+        delete = "DELETE FROM note_fts WHERE rowid = old.rowid;"
+        op.execute(
+            f"CREATE TRIGGER note_fts_insert AFTER INSERT ON note BEGIN {insert} END"
+        )
+        op.execute(
+            "CREATE TRIGGER note_fts_update AFTER UPDATE ON note "
+            f"BEGIN {delete} {insert} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER note_fts_delete AFTER DELETE ON note BEGIN {delete} END"
+        )
+        op.execute(
+            "INSERT INTO note_fts(rowid, title, content) "
+            f"SELECT rowid, title, {SQLITE_ROW.format(row='note')} FROM note"
+        )
+    elif dialect_name == "postgresql":
+        op.execute(
+            "ALTER TABLE note ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', "
+            "coalesce(title, '') || ' ' || coalesce(data->'content'->>'md', ''))) "
+            "STORED"
+        )
+        op.execute(
+            "CREATE INDEX idx_note_search_vector ON note USING GIN (search_vector)"
+        )
+
+
+def downgrade():
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == "sqlite":
+        for trigger in ("note_fts_insert", "note_fts_update", "note_fts_delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS note_fts")
+    elif dialect_name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS idx_note_search_vector")
+        op.execute("ALTER TABLE note DROP COLUMN IF EXISTS search_vector")
@@ -1006,6 +1006,20 @@ class ChatTable:
         except Exception:
             return False
 
+    def delete_chats_by_user_id_and_folder_ids(
+        self, user_id: str, folder_ids: list[str]
+    ) -> bool:
+        try:
+            with get_db() as db:
+                db.query(Chat).filter(
+                    Chat.user_id == user_id, Chat.folder_id.in_(folder_ids)
+                ).delete(synchronize_session=False)
+                db.commit()
+
+                return True
+        except Exception:
+            return False
+
     def delete_shared_chats_by_user_id(self, user_id: str) -> bool:
         try:
             with get_db() as db:
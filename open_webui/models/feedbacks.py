@@ -8,7 +8,7 @@ from open_webui.models.chats import Chats
 
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
+from sqlalchemy import BigInteger, Column, Text, JSON, Boolean, and_, or_
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -32,6 +32,19 @@ class Feedback(Base):
     updated_at = Column(BigInteger)
 
 
+# Everything but the chat snapshot, for listings and the rating engine
+FEEDBACK_COLUMNS_WITHOUT_SNAPSHOT = (
+    Feedback.id,
+    Feedback.user_id,
+    Feedback.version,
+    Feedback.type,
+    Feedback.data,
+    Feedback.meta,
+    Feedback.created_at,
+    Feedback.updated_at,
+)
+
+
 class FeedbackModel(BaseModel):
     id: str
     user_id: str
@@ -143,8 +156,15 @@ class FeedbackTable:
         except Exception:
             return None
 
-    def get_all_feedbacks(self) -> list[FeedbackModel]:
+    def get_all_feedbacks(self, include_snapshot: bool = True) -> list[FeedbackModel]:
         with get_db() as db:
+            if not include_snapshot:
+                return [
+                    FeedbackModel(**row._mapping)
+                    for row in db.query(*FEEDBACK_COLUMNS_WITHOUT_SNAPSHOT)
+                    .order_by(Feedback.updated_at.desc())
+                    .all()
+                ]
             return [
                 FeedbackModel.model_validate(feedback)
                 for feedback in db.query(Feedback)
@@ -152,6 +172,50 @@ class FeedbackTable:
                 .all()
             ]
 
+    def get_feedbacks_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        type: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> tuple[list[FeedbackModel], Optional[str]]:
+        """
+        One page of feedback without snapshots, newest first. The cursor is
+        "updated_at:id" of the last row of the previous page.
+        """
+        with get_db() as db:
+            query = db.query(*FEEDBACK_COLUMNS_WITHOUT_SNAPSHOT)
+            if type is not None:
+                query = query.filter(Feedback.type == type)
+            if user_id is not None:
+                query = query.filter(Feedback.user_id == user_id)
+
+            if cursor:
+                try:
+                    updated_at, id = cursor.split(":", 1)
+                    updated_at = int(updated_at)
+                except ValueError:
+                    raise ValueError(f"Invalid cursor: {cursor}")
+                query = query.filter(
+                    or_(
+                        Feedback.updated_at < updated_at,
+                        and_(Feedback.updated_at == updated_at, Feedback.id < id),
+                    )
+                )
+
+            rows = (
+                query.order_by(Feedback.updated_at.desc(), Feedback.id.desc())
+                .limit(limit + 1)
+                .all()
+            )
+
+        feedbacks = [FeedbackModel(**row._mapping) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = feedbacks[-1]
+            next_cursor = f"{last.updated_at}:{last.id}"
+        return feedbacks, next_cursor
+
     def get_feedbacks_by_type(self, type: str) -> list[FeedbackModel]:
         with get_db() as db:
             return [
@@ -6,7 +6,7 @@ import re
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean, func
+from sqlalchemy import BigInteger, Column, Text, JSON, Boolean, func, select
 
 from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
@@ -104,27 +104,48 @@ class FolderTable:
         except Exception:
             return None
 
+    def _subtree_cte(self, ids: list[str], user_id: str):
+        """
+        Recursive CTE of the ids of the given folders and all their descendants.
+        UNION (not UNION ALL) also stops the recursion if parent links form a cycle.
+        """
+        tree = (
+            select(Folder.id)
+            .where(Folder.id.in_(ids), Folder.user_id == user_id)
+            .cte("folder_tree", recursive=True)
+        )
+        return tree.union(
+            select(Folder.id).where(
+                Folder.parent_id == tree.c.id, Folder.user_id == user_id
+            )
+        )
+
+    def get_subtree_folder_ids_by_id_and_user_id(
+        self, id: str, user_id: str
+    ) -> list[str]:
+        """Ids of the folder and all its descendants, loaded in one query"""
+        with get_db() as db:
+            tree = self._subtree_cte([id], user_id)
+            return [row[0] for row in db.execute(select(tree.c.id)).all()]
+
     def get_children_folders_by_id_and_user_id(
         self, id: str, user_id: str
     ) -> Optional[list[FolderModel]]:
         try:
             with get_db() as db:
-                folders = []
-
-                def get_children(folder):
-                    children = self.get_folders_by_parent_id_and_user_id(
-                        folder.id, user_id
-                    )
-                    for child in children:
-                        get_children(child)
-                        folders.append(child)
+                tree = self._subtree_cte([id], user_id)
+                folders = (
+                    db.query(Folder).filter(Folder.id.in_(select(tree.c.id))).all()
+                )
 
-                folder = db.query(Folder).filter_by(id=id, user_id=user_id).first()
-                if not folder:
+                if not any(folder.id == id for folder in folders):
                     return None
 
-                get_children(folder)
-                return folders
+                return [
+                    FolderModel.model_validate(folder)
+                    for folder in folders
+                    if folder.id != id
+                ]
         except Exception:
             return None
 
@@ -253,32 +274,20 @@ class FolderTable:
 
     def delete_folder_by_id_and_user_id(self, id: str, user_id: str) -> list[str]:
         try:
-            folder_ids = []
             with get_db() as db:
-                folder = db.query(Folder).filter_by(id=id, user_id=user_id).first()
-                if not folder:
-                    return folder_ids
-
-                folder_ids.append(folder.id)
-
-                # Delete all children folders
-                def delete_children(folder):
-                    folder_children = self.get_folders_by_parent_id_and_user_id(
-                        folder.id, user_id
-                    )
-                    for folder_child in folder_children:
-
-                        delete_children(folder_child)
-                        folder_ids.append(folder_child.id)
-
-                        folder = db.query(Folder).filter_by(id=folder_child.id).first()
-                        db.delete(folder)
-                        db.commit()
-
-                delete_children(folder)
-                db.delete(folder)
+                tree = self._subtree_cte([id], user_id)
+                folder_ids = [row[0] for row in db.execute(select(tree.c.id)).all()]
+                if id not in folder_ids:
+                    return []
+
+                # Delete the folder and all children folders at once
+                db.query(Folder).filter(
+                    Folder.id.in_(folder_ids), Folder.user_id == user_id
+                ).delete(synchronize_session=False)
                 db.commit()
-                return folder_ids
+
+                folder_ids.remove(id)
+                return [id, *folder_ids]
         except Exception as e:
             log.error(f"delete_folder: {e}")
             return []
@@ -298,26 +307,26 @@ class FolderTable:
         if not normalized_queries:
             return []
 
-        results = {}
         with get_db() as db:
-            folders = db.query(Folder).filter_by(user_id=user_id).all()
-            for folder in folders:
-                if self.normalize_folder_name(folder.name) in normalized_queries:
-                    results[folder.id] = FolderModel.model_validate(folder)
-
-                    # get children folders
-                    children = self.get_children_folders_by_id_and_user_id(
-                        folder.id, user_id
-                    )
-                    for child in children:
-                        results[child.id] = child
+            # Only ids and names are needed to match the normalized names
+            matched_ids = [
+                folder_id
+                for folder_id, name in db.query(Folder.id, Folder.name)
+                .filter_by(user_id=user_id)
+                .all()
+                if self.normalize_folder_name(name) in normalized_queries
+            ]
+            if not matched_ids:
+                return []
 
-        # Return the results as a list
-        if not results:
-            return []
-        else:
-            results = list(results.values())
-            return results
+            # Matched folders and all their children folders in one query
+            tree = self._subtree_cte(matched_ids, user_id)
+            return [
+                FolderModel.model_validate(folder)
+                for folder in db.query(Folder)
+                .filter(Folder.id.in_(select(tree.c.id)))
+                .all()
+            ]
 
     def search_folders_by_name_contains(
         self, user_id: str, query: str
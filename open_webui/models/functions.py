@@ -5,6 +5,8 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.services.model_catalog import model_catalog
+from open_webui.services.plugin_cache import plugin_cache
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text
 
@@ -99,6 +101,8 @@ class FunctionsTable:
                 result = Function(**function.model_dump())
                 db.add(result)
                 db.commit()
+                plugin_cache.invalidate("function", result.id)
+                model_catalog.bump("function")
                 db.refresh(result)
                 if result:
                     return FunctionModel.model_validate(result)
@@ -147,6 +151,8 @@ class FunctionsTable:
                         db.delete(func)
 
                 db.commit()
+                plugin_cache.invalidate("function")
+                model_catalog.bump("function")
 
                 return [
                     FunctionModel.model_validate(func)
@@ -230,6 +236,7 @@ class FunctionsTable:
                 function.valves = valves
                 function.updated_at = int(time.time())
                 db.commit()
+                plugin_cache.invalidate("function", id)
                 db.refresh(function)
                 return self.get_function_by_id(id)
             except Exception:
@@ -290,6 +297,8 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                plugin_cache.invalidate("function", id)
+                model_catalog.bump("function")
                 return self.get_function_by_id(id)
             except Exception:
                 return None
@@ -304,6 +313,8 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                plugin_cache.invalidate("function")
+                model_catalog.bump("function")
                 return True
             except Exception:
                 return None
@@ -313,6 +324,8 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                plugin_cache.invalidate("function", id)
+                model_catalog.bump("function")
 
                 return True
             except Exception:
@@ -11,7 +11,7 @@ from open_webui.models.files import FileMetadataResponse
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON, func
+from sqlalchemy import BigInteger, Column, Index, Text, JSON
 
 
 log = logging.getLogger(__name__)
@@ -35,12 +35,23 @@ class Group(Base):
     meta = Column(JSON, nullable=True)
 
     permissions = Column(JSON, nullable=True)
+    # Legacy member list, superseded by the group_member table
     user_ids = Column(JSON, nullable=True)
 
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
 
+class GroupMember(Base):
+    __tablename__ = "group_member"
+
+    group_id = Column(Text, primary_key=True)
+    user_id = Column(Text, primary_key=True)
+    created_at = Column(BigInteger)
+
+    __table_args__ = (Index("idx_group_member_user_id", "user_id"),)
+
+
 class GroupModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: str
@@ -92,6 +103,77 @@ class GroupUpdateForm(GroupForm, UserIdsForm):
 
 
 class GroupTable:
+    ####################
+    # Membership helpers
+    ####################
+
+    def _get_members(self, db, group_ids: list[str]) -> dict[str, list[str]]:
+        members = {group_id: [] for group_id in group_ids}
+        if group_ids:
+            rows = (
+                db.query(GroupMember.group_id, GroupMember.user_id)
+                .filter(GroupMember.group_id.in_(group_ids))
+                .order_by(GroupMember.created_at, GroupMember.user_id)
+                .all()
+            )
+            for group_id, user_id in rows:
+                members[group_id].append(user_id)
+        return members
+
+    def _to_models(self, db, groups: list[Group]) -> list[GroupModel]:
+        # Members of all groups are loaded in one query
+        members = self._get_members(db, [group.id for group in groups])
+        return [
+            GroupModel.model_validate(
+                {
+                    **{
+                        column.name: getattr(group, column.name)
+                        for column in Group.__table__.columns
+                    },
+                    "user_ids": members[group.id],
+                }
+            )
+            for group in groups
+        ]
+
+    def _insert_members(self, db, members: list[tuple[str, str]]) -> None:
+        """Insert (group_id, user_id) pairs in one executemany"""
+        if members:
+            now = int(time.time())
+            db.execute(
+                GroupMember.__table__.insert(),
+                [
+                    {"group_id": group_id, "user_id": user_id, "created_at": now}
+                    for group_id, user_id in members
+                ],
+            )
+
+    def _touch(self, db, group_ids) -> None:
+        if group_ids:
+            db.query(Group).filter(Group.id.in_(list(group_ids))).update(
+                {"updated_at": int(time.time())}, synchronize_session=False
+            )
+
+    def _set_members(self, db, id: str, user_ids: list[str]) -> None:
+        """Replace the members of a group with one delete and one insert"""
+        user_ids = list(dict.fromkeys(user_ids))
+        current = {
+            row[0]
+            for row in db.query(GroupMember.user_id).filter(GroupMember.group_id == id)
+        }
+        removed = current - set(user_ids)
+        if removed:
+            db.query(GroupMember).filter(
+                GroupMember.group_id == id, GroupMember.user_id.in_(removed)
+            ).delete(synchronize_session=False)
+        self._insert_members(
+            db, [(id, user_id) for user_id in user_ids if user_id not in current]
+        )
+
+    ####################
+    # Groups
+    ####################
+
     def insert_new_group(
         self, user_id: str, form_data: GroupForm
     ) -> Optional[GroupModel]:
@@ -107,12 +189,12 @@ class GroupTable:
             )
 
             try:
-                result = Group(**group.model_dump())
+                result = Group(**group.model_dump(exclude={"user_ids"}))
                 db.add(result)
                 db.commit()
                 db.refresh(result)
                 if result:
-                    return GroupModel.model_validate(result)
+                    return self._to_models(db, [result])[0]
                 else:
                     return None
 
@@ -120,41 +202,93 @@ class GroupTable:
                 return None
 
     def get_groups(self) -> list[GroupModel]:
+        with get_db() as db:
+            return self._to_models(
+                db, db.query(Group).order_by(Group.updated_at.desc()).all()
+            )
+
+    def get_groups_page(
+        self, skip: int = 0, limit: int = 20, name: Optional[str] = None
+    ) -> tuple[list[GroupModel], int]:
+        """One page of groups, optionally filtered by exact name, and the total"""
+        with get_db() as db:
+            query = db.query(Group)
+            if name is not None:
+                query = query.filter(Group.name == name)
+
+            total = query.count()
+            groups = (
+                query.order_by(Group.updated_at.desc(), Group.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+            return self._to_models(db, groups), total
+
+    def get_existing_group_names(self, names: list[str]) -> set[str]:
+        with get_db() as db:
+            return {
+                row[0]
+                for row in db.query(Group.name).filter(Group.name.in_(names)).all()
+            }
+
+    def get_group_ids_by_member_id(self, user_id: str) -> list[str]:
         with get_db() as db:
             return [
-                GroupModel.model_validate(group)
-                for group in db.query(Group).order_by(Group.updated_at.desc()).all()
+                row[0]
+                for row in db.query(GroupMember.group_id).filter(
+                    GroupMember.user_id == user_id
+                )
             ]
 
     def get_groups_by_member_id(self, user_id: str) -> list[GroupModel]:
         with get_db() as db:
-            return [
-                GroupModel.model_validate(group)
-                for group in db.query(Group)
-                .filter(
-                    func.json_array_length(Group.user_ids) > 0
-                )  # Ensure array exists
-                .filter(
-                    Group.user_ids.cast(String).like(f'%"{user_id}"%')
-                )  # String-based check
+            return self._to_models(
+                db,
+                db.query(Group)
+                .join(GroupMember, GroupMember.group_id == Group.id)
+                .filter(GroupMember.user_id == user_id)
+                .order_by(Group.updated_at.desc())
+                .all(),
+            )
+
+    def get_groups_by_member_ids(
+        self, user_ids: list[str]
+    ) -> dict[str, list[GroupModel]]:
+        """Groups of each of the given users, loaded in a constant number of queries"""
+        groups_by_user = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return groups_by_user
+
+        with get_db() as db:
+            rows = (
+                db.query(GroupMember.user_id, Group)
+                .join(Group, Group.id == GroupMember.group_id)
+                .filter(GroupMember.user_id.in_(user_ids))
                 .order_by(Group.updated_at.desc())
                 .all()
-            ]
+            )
+            groups = {group.id: group for _, group in rows}
+            models = {
+                group.id: group for group in self._to_models(db, list(groups.values()))
+            }
+            for user_id, group in rows:
+                groups_by_user[user_id].append(models[group.id])
+        return groups_by_user
 
     def get_group_by_id(self, id: str) -> Optional[GroupModel]:
         try:
             with get_db() as db:
                 group = db.query(Group).filter_by(id=id).first()
-                return GroupModel.model_validate(group) if group else None
+                return self._to_models(db, [group])[0] if group else None
         except Exception:
             return None
 
-    def get_group_user_ids_by_id(self, id: str) -> Optional[str]:
-        group = self.get_group_by_id(id)
-        if group:
-            return group.user_ids
-        else:
-            return None
+    def get_group_user_ids_by_id(self, id: str) -> Optional[list[str]]:
+        with get_db() as db:
+            if not db.query(Group.id).filter_by(id=id).first():
+                return None
+            return self._get_members(db, [id])[id]
 
     def update_group_by_id(
         self, id: str, form_data: GroupUpdateForm, overwrite: bool = False
@@ -163,10 +297,12 @@ class GroupTable:
             with get_db() as db:
                 db.query(Group).filter_by(id=id).update(
                     {
-                        **form_data.model_dump(exclude_none=True),
+                        **form_data.model_dump(exclude_none=True, exclude={"user_ids"}),
                         "updated_at": int(time.time()),
                     }
                 )
+                if form_data.user_ids is not None:
+                    self._set_members(db, id, form_data.user_ids)
                 db.commit()
                 return self.get_group_by_id(id=id)
         except Exception as e:
@@ -176,6 +312,7 @@ class GroupTable:
     def delete_group_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(GroupMember).filter_by(group_id=id).delete()
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
                 return True
@@ -185,6 +322,7 @@ class GroupTable:
     def delete_all_groups(self) -> bool:
         with get_db() as db:
             try:
+                db.query(GroupMember).delete()
                 db.query(Group).delete()
                 db.commit()
 
@@ -195,17 +333,15 @@ class GroupTable:
     def remove_user_from_all_groups(self, user_id: str) -> bool:
         with get_db() as db:
             try:
-                groups = self.get_groups_by_member_id(user_id)
-
-                for group in groups:
-                    group.user_ids.remove(user_id)
-                    db.query(Group).filter_by(id=group.id).update(
-                        {
-                            "user_ids": group.user_ids,
-                            "updated_at": int(time.time()),
-                        }
+                group_ids = [
+                    row[0]
+                    for row in db.query(GroupMember.group_id).filter(
+                        GroupMember.user_id == user_id
                     )
-                    db.commit()
+                ]
+                db.query(GroupMember).filter(GroupMember.user_id == user_id).delete()
+                self._touch(db, group_ids)
+                db.commit()
 
                 return True
             except Exception:
@@ -216,13 +352,12 @@ class GroupTable:
     ) -> list[GroupModel]:
 
         # check for existing groups
-        existing_groups = self.get_groups()
-        existing_group_names = {group.name for group in existing_groups}
+        existing_group_names = self.get_existing_group_names(group_names)
 
         new_groups = []
 
         with get_db() as db:
-            for group_name in group_names:
+            for group_name in dict.fromkeys(group_names):
                 if group_name not in existing_group_names:
                     new_group = GroupModel(
                         id=str(uuid.uuid4()),
@@ -233,44 +368,71 @@ class GroupTable:
                         updated_at=int(time.time()),
                     )
                     try:
-                        result = Group(**new_group.model_dump())
+                        result = Group(**new_group.model_dump(exclude={"user_ids"}))
                         db.add(result)
                         db.commit()
-                        db.refresh(result)
-                        new_groups.append(GroupModel.model_validate(result))
+                        new_groups.append(new_group)
                     except Exception as e:
                         log.exception(e)
+                        db.rollback()
                         continue
             return new_groups
 
-    def sync_groups_by_group_names(self, user_id: str, group_names: list[str]) -> bool:
+    def sync_groups_by_group_names(
+        self,
+        user_id: str,
+        group_names: list[str],
+        excluded_group_names: Optional[list[str]] = None,
+        default_permissions: Optional[dict] = None,
+    ) -> bool:
+        """
+        Make the user a member of exactly the named groups, as one diff.
+        Groups named in excluded_group_names are neither joined nor left.
+        Changed groups without permissions get default_permissions, if given.
+        """
+        excluded_group_names = list(excluded_group_names or [])
         with get_db() as db:
             try:
-                groups = db.query(Group).filter(Group.name.in_(group_names)).all()
-                group_ids = [group.id for group in groups]
+                target = dict(
+                    db.query(Group.id, Group.permissions)
+                    .filter(
+                        Group.name.in_(group_names),
+                        Group.name.not_in(excluded_group_names),
+                    )
+                    .all()
+                )
+                current = dict(
+                    db.query(GroupMember.group_id, Group.permissions)
+                    .join(Group, Group.id == GroupMember.group_id)
+                    .filter(
+                        GroupMember.user_id == user_id,
+                        Group.name.not_in(excluded_group_names),
+                    )
+                    .all()
+                )
 
                 # Remove user from groups not in the new list
-                existing_groups = self.get_groups_by_member_id(user_id)
-
-                for group in existing_groups:
-                    if group.id not in group_ids:
-                        group.user_ids.remove(user_id)
-                        db.query(Group).filter_by(id=group.id).update(
-                            {
-                                "user_ids": group.user_ids,
-                                "updated_at": int(time.time()),
-                            }
-                        )
+                removed = current.keys() - target.keys()
+                if removed:
+                    db.query(GroupMember).filter(
+                        GroupMember.user_id == user_id,
+                        GroupMember.group_id.in_(removed),
+                    ).delete(synchronize_session=False)
 
                 # Add user to new groups
-                for group in groups:
-                    if user_id not in group.user_ids:
-                        group.user_ids.append(user_id)
-                        db.query(Group).filter_by(id=group.id).update(
-                            {
-                                "user_ids": group.user_ids,
-                                "updated_at": int(time.time()),
-                            }
+                added = target.keys() - current.keys()
+                self._insert_members(db, [(group_id, user_id) for group_id in added])
+
+                self._touch(db, removed | added)
+
+                # In case a group is created, but perms are never assigned to it
+                if default_permissions is not None:
+                    permissions = {**current, **target}
+                    unset = [id for id in removed | added if not permissions[id]]
+                    if unset:
+                        db.query(Group).filter(Group.id.in_(unset)).update(
+                            {"permissions": default_permissions},
+                            synchronize_session=False,
                         )
 
                 db.commit()
@@ -284,21 +446,25 @@ class GroupTable:
     ) -> Optional[GroupModel]:
         try:
             with get_db() as db:
-                group = db.query(Group).filter_by(id=id).first()
-                if not group:
+                if not db.query(Group.id).filter_by(id=id).first():
                     return None
 
-                if not group.user_ids:
-                    group.user_ids = []
-
-                for user_id in user_ids:
-                    if user_id not in group.user_ids:
-                        group.user_ids.append(user_id)
+                user_ids = list(dict.fromkeys(user_ids or []))
+                existing = {
+                    row[0]
+                    for row in db.query(GroupMember.user_id).filter(
+                        GroupMember.group_id == id,
+                        GroupMember.user_id.in_(user_ids),
+                    )
+                }
+                self._insert_members(
+                    db,
+                    [(id, user_id) for user_id in user_ids if user_id not in existing],
+                )
 
-                group.updated_at = int(time.time())
+                self._touch(db, [id])
                 db.commit()
-                db.refresh(group)
-                return GroupModel.model_validate(group)
+            return self.get_group_by_id(id)
         except Exception as e:
             log.exception(e)
             return None
@@ -308,21 +474,18 @@ class GroupTable:
     ) -> Optional[GroupModel]:
         try:
             with get_db() as db:
-                group = db.query(Group).filter_by(id=id).first()
-                if not group:
+                if not db.query(Group.id).filter_by(id=id).first():
                     return None
 
-                if not group.user_ids:
-                    return GroupModel.model_validate(group)
-
-                for user_id in user_ids:
-                    if user_id in group.user_ids:
-                        group.user_ids.remove(user_id)
+                if user_ids:
+                    db.query(GroupMember).filter(
+                        GroupMember.group_id == id,
+                        GroupMember.user_id.in_(user_ids),
+                    ).delete(synchronize_session=False)
 
-                group.updated_at = int(time.time())
+                self._touch(db, [id])
                 db.commit()
-                db.refresh(group)
-                return GroupModel.model_validate(group)
+            return self.get_group_by_id(id)
         except Exception as e:
             log.exception(e)
             return None
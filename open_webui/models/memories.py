@@ -99,6 +99,15 @@ class MemoriesTable:
             except Exception:
                 return None
 
+    def has_memories_by_user_id(self, user_id: str) -> bool:
+        with get_db() as db:
+            try:
+                return (
+                    db.query(Memory.id).filter_by(user_id=user_id).first() is not None
+                )
+            except Exception:
+                return False
+
     def get_memory_by_id(self, id: str) -> Optional[MemoryModel]:
         with get_db() as db:
             try:
@@ -0,0 +1,296 @@
+import logging
+import time
+from typing import Callable, Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Float, Index, Integer, Text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+# Tag under which comparisons across all tags are counted
+OVERALL = ""
+
+# Row of model_rating_state that rating writers lock and mark as built
+STATE_ID = "leaderboard"
+
+COUNTERS = ("wins_a", "wins_b", "ties")
+
+PairDeltas = dict[tuple[str, str, str], tuple[int, int, int]]
+FitRatings = Callable[[list["ModelRatingPairModel"]], list[dict]]
+
+####################
+# ModelRating DB Schema
+####################
+
+
+class ModelRatingPair(Base):
+    """Head-to-head results between two models, model_a < model_b."""
+
+    __tablename__ = "model_rating_pair"
+
+    tag = Column(Text, primary_key=True)
+    model_a = Column(Text, primary_key=True)
+    model_b = Column(Text, primary_key=True)
+
+    wins_a = Column(Integer, nullable=False, default=0)
+    wins_b = Column(Integer, nullable=False, default=0)
+    ties = Column(Integer, nullable=False, default=0)
+
+
+class ModelRating(Base):
+    """Fitted rating of a model for a tag, rebuilt whenever the tag changes."""
+
+    __tablename__ = "model_rating"
+
+    tag = Column(Text, primary_key=True)
+    model_id = Column(Text, primary_key=True)
+
+    rating = Column(Float, nullable=False)
+    ci_low = Column(Float, nullable=False)
+    ci_high = Column(Float, nullable=False)
+
+    won = Column(Integer, nullable=False, default=0)
+    lost = Column(Integer, nullable=False, default=0)
+    ties = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        Index("idx_model_rating_model_id", "model_id"),
+        Index("idx_model_rating_tag_rating", "tag", "rating"),
+    )
+
+
+class ModelRatingState(Base):
+    """
+    Single row locked by every rating write; built_at is set once the
+    counters have been backfilled from the feedback table.
+    """
+
+    __tablename__ = "model_rating_state"
+
+    id = Column(Text, primary_key=True)
+    built_at = Column(BigInteger, nullable=True)
+    updated_at = Column(BigInteger)
+
+
+class ModelRatingPairModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    tag: str
+    model_a: str
+    model_b: str
+
+    wins_a: int = 0
+    wins_b: int = 0
+    ties: int = 0
+
+
+class ModelRatingModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+
+    tag: str
+    model_id: str
+
+    rating: float
+    ci_low: float
+    ci_high: float
+
+    won: int = 0
+    lost: int = 0
+    ties: int = 0
+
+    updated_at: int  # timestamp in epoch
+
+
+####################
+# Table
+####################
+
+
+class ModelRatingTable:
+    def _lock(self, db: Session) -> ModelRatingState:
+        """
+        Lock the state row until the transaction ends, so counters are
+        updated by one process at a time. Updating a row takes a row lock on
+        PostgreSQL and MySQL and the database write lock on SQLite.
+        """
+        now = int(time.time())
+        updated = (
+            db.query(ModelRatingState)
+            .filter_by(id=STATE_ID)
+            .update({"updated_at": now}, synchronize_session=False)
+        )
+        if not updated:
+            db.add(ModelRatingState(id=STATE_ID, built_at=None, updated_at=now))
+            db.flush()
+        return db.get(ModelRatingState, STATE_ID)
+
+    def _add_pair_deltas(self, db: Session, deltas: PairDeltas) -> None:
+        rows = [
+            {
+                "tag": tag,
+                "model_a": model_a,
+                "model_b": model_b,
+                "wins_a": wins_a,
+                "wins_b": wins_b,
+                "ties": ties,
+            }
+            for (tag, model_a, model_b), (wins_a, wins_b, ties) in deltas.items()
+            if wins_a or wins_b or ties
+        ]
+        if not rows:
+            return
+
+        dialect_name = db.bind.dialect.name
+        if dialect_name in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+            stmt = insert(ModelRatingPair).values(rows)
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["tag", "model_a", "model_b"],
+                    set_={
+                        column: getattr(ModelRatingPair, column)
+                        + getattr(stmt.excluded, column)
+                        for column in COUNTERS
+                    },
+                )
+            )
+        else:
+            # Other dialects: read and write each counter while holding the lock
+            for row in rows:
+                pair = db.get(
+                    ModelRatingPair, (row["tag"], row["model_a"], row["model_b"])
+                )
+                if pair is None:
+                    pair = ModelRatingPair(
+                        **{**row, **{column: 0 for column in COUNTERS}}
+                    )
+                    db.add(pair)
+                for column in COUNTERS:
+                    setattr(pair, column, getattr(pair, column) + row[column])
+            db.flush()
+
+        # A delta for feedback counted differently (for example before the
+        # backfill) must not leave a negative counter behind
+        tags = {row["tag"] for row in rows}
+        for column in COUNTERS:
+            counter = getattr(ModelRatingPair, column)
+            db.query(ModelRatingPair).filter(
+                ModelRatingPair.tag.in_(tags), counter < 0
+            ).update({column: 0}, synchronize_session=False)
+        db.query(ModelRatingPair).filter(
+            ModelRatingPair.tag.in_(tags),
+            ModelRatingPair.wins_a == 0,
+            ModelRatingPair.wins_b == 0,
+            ModelRatingPair.ties == 0,
+        ).delete(synchronize_session=False)
+
+    def _refit(self, db: Session, tags: set[str], fit: FitRatings) -> None:
+        now = int(time.time())
+        for tag in tags:
+            pairs = [
+                ModelRatingPairModel.model_validate(pair)
+                for pair in db.query(ModelRatingPair).filter_by(tag=tag).all()
+            ]
+            db.query(ModelRating).filter_by(tag=tag).delete()
+            ratings = fit(pairs)
+            if ratings:
+                db.bulk_insert_mappings(
+                    ModelRating,
+                    [{**rating, "tag": tag, "updated_at": now} for rating in ratings],
+                )
+
+    def add_pair_deltas(self, deltas: PairDeltas, fit: FitRatings) -> bool:
+        """
+        Add (wins_a, wins_b, ties) to the (tag, model_a, model_b) counters,
+        remove counters that drop to zero and refit the affected tags, all in
+        one locked transaction. Returns False without writing anything while
+        the counters have not been built yet; the backfill will count the
+        feedback instead.
+        """
+        with get_db() as db:
+            if self._lock(db).built_at is None:
+                db.rollback()
+                return False
+            self._add_pair_deltas(db, deltas)
+            self._refit(db, {tag for tag, _, _ in deltas}, fit)
+            db.commit()
+            return True
+
+    def rebuild(
+        self,
+        load_deltas: Callable[[], PairDeltas],
+        fit: FitRatings,
+        only_if_unbuilt: bool = False,
+    ) -> Optional[PairDeltas]:
+        """
+        Replace all counters and ratings with load_deltas() and mark them as
+        built, in one locked transaction. With only_if_unbuilt, nothing
+        happens (and None is returned) once a rebuild has completed.
+        """
+        with get_db() as db:
+            state = self._lock(db)
+            if only_if_unbuilt and state.built_at is not None:
+                db.rollback()
+                return None
+
+            # Loaded under the lock, so concurrent updates wait for the rebuild
+            deltas = load_deltas()
+            db.query(ModelRatingPair).delete()
+            db.query(ModelRating).delete()
+            self._add_pair_deltas(db, deltas)
+            self._refit(db, {tag for tag, _, _ in deltas}, fit)
+            state.built_at = int(time.time())
+            db.commit()
+            return deltas
+
+    def get_ratings_by_tag(self, tag: str = OVERALL) -> list[ModelRatingModel]:
+        with get_db() as db:
+            return [
+                ModelRatingModel.model_validate(rating)
+                for rating in db.query(ModelRating)
+                .filter_by(tag=tag)
+                .order_by(ModelRating.rating.desc(), ModelRating.model_id)
+                .all()
+            ]
+
+    def get_ratings_by_model_id(self, model_id: str) -> list[ModelRatingModel]:
+        with get_db() as db:
+            return [
+                ModelRatingModel.model_validate(rating)
+                for rating in db.query(ModelRating)
+                .filter_by(model_id=model_id)
+                .order_by(ModelRating.tag)
+                .all()
+            ]
+
+    def get_tags(self) -> list[str]:
+        with get_db() as db:
+            return [
+                tag
+                for (tag,) in db.query(ModelRatingPair.tag)
+                .filter(ModelRatingPair.tag != OVERALL)
+                .distinct()
+                .order_by(ModelRatingPair.tag)
+            ]
+
+    def delete_all(self) -> None:
+        """Clear counters and ratings after all feedback has been deleted."""
+        with get_db() as db:
+            state = self._lock(db)
+            db.query(ModelRatingPair).delete()
+            db.query(ModelRating).delete()
+            # No feedback left, so the empty counters are complete
+            state.built_at = int(time.time())
+            db.commit()
+
+
+ModelRatings = ModelRatingTable()
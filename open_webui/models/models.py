@@ -6,6 +6,7 @@ from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
 from open_webui.models.users import Users, UserResponse
+from open_webui.services.model_catalog import model_catalog
 
 
 from pydantic import BaseModel, ConfigDict
@@ -159,6 +160,7 @@ class ModelsTable:
                 result = Model(**model.model_dump())
                 db.add(result)
                 db.commit()
+                model_catalog.bump("model")
                 db.refresh(result)
 
                 if result:
@@ -226,6 +228,7 @@ class ModelsTable:
                     }
                 )
                 db.commit()
+                model_catalog.bump("model")
 
                 return self.get_model_by_id(id)
             except Exception:
@@ -241,6 +244,7 @@ class ModelsTable:
                     .update(model.model_dump(exclude={"id"}))
                 )
                 db.commit()
+                model_catalog.bump("model")
 
                 model = db.get(Model, id)
                 db.refresh(model)
@@ -254,6 +258,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).filter_by(id=id).delete()
                 db.commit()
+                model_catalog.bump("model")
 
                 return True
         except Exception:
@@ -264,6 +269,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).delete()
                 db.commit()
+                model_catalog.bump("model")
 
                 return True
         except Exception:
@@ -305,6 +311,7 @@ class ModelsTable:
                         db.delete(model)
 
                 db.commit()
+                model_catalog.bump("model")
 
                 return [
                     ModelModel.model_validate(model) for model in db.query(Model).all()
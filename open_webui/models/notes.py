@@ -4,8 +4,8 @@ import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
-from open_webui.utils.access_control import has_access
 from open_webui.models.users import Users, UserResponse
+from open_webui.utils.access_control import has_access
 
 
 from pydantic import BaseModel, ConfigDict
@@ -101,16 +101,159 @@ class NoteTable:
             notes = db.query(Note).order_by(Note.updated_at.desc()).all()
             return [NoteModel.model_validate(note) for note in notes]
 
+    def _access_filter(self, db, user_id: str, permission: str):
+        """
+        Owner or access_control filter evaluated in SQL, equivalent to calling
+        has_access on every note, including the group membership lookup.
+        Returns None on dialects without the JSON functions used here; callers
+        then filter with has_access in Python.
+        """
+        if permission not in ("read", "write"):
+            raise ValueError(f"Invalid permission: {permission}")
+
+        dialect_name = db.bind.dialect.name
+        if dialect_name == "sqlite":
+            elements = (
+                "SELECT value FROM json_each(note.access_control, "
+                f"'$.{permission}.{{key}}')"
+            )
+            is_public = (
+                "(json_type(note.access_control) IS NULL "
+                "OR json_type(note.access_control) = 'null')"
+            )
+        elif dialect_name == "postgresql":
+            elements = (
+                "SELECT value FROM json_array_elements_text("
+                f"note.access_control->'{permission}'->'{{key}}') AS value"
+            )
+            is_public = (
+                "(note.access_control IS NULL "
+                "OR json_typeof(note.access_control) = 'null')"
+            )
+        else:
+            return None
+
+        conditions = [
+            Note.user_id == user_id,
+            text(
+                f":acl_user_id IN ({elements.format(key='user_ids')})"
+            ).bindparams(acl_user_id=user_id),
+            text(
+                f"EXISTS (SELECT 1 FROM ({elements.format(key='group_ids')}) "
+                "AS permitted WHERE permitted.value IN (SELECT group_id "
+                "FROM group_member WHERE user_id = :acl_member))"
+            ).bindparams(acl_member=user_id),
+        ]
+
+        # Notes without access control are readable by everyone
+        if permission == "read":
+            conditions.append(text(is_public))
+
+        return or_(*conditions)
+
+    def _search_filter(self, db, query: str):
+        """
+        Every term has to appear in the title or the markdown content. Uses
+        the note_fts FTS5 table on SQLite and the search_vector tsvector on
+        PostgreSQL; other dialects fall back to substring matching.
+        """
+        terms = query.split()
+        dialect_name = db.bind.dialect.name
+
+        if dialect_name == "postgresql":
+            # Prefix match on every term, quoted so the input is never parsed
+            # as tsquery syntax
+            return and_(
+                *[
+                    text(
+                        "note.search_vector @@ to_tsquery('simple', "
+                        f"quote_literal(:fts_term_{i}) || ':*')"
+                    ).bindparams(**{f"fts_term_{i}": term})
+                    for i, term in enumerate(terms)
+                ]
+            )
+
+        conditions = []
+        if dialect_name == "sqlite":
+            # The trigram tokenizer matches substrings of at least 3 characters
+            indexed = [term for term in terms if len(term) >= 3]
+            terms = [term for term in terms if len(term) < 3]
+            if indexed:
+                phrases = " ".join(
+                    '"' + term.replace('"', '""') + '"' for term in indexed
+                )
+                conditions.append(
+                    text(
+                        "note.rowid IN (SELECT rowid FROM note_fts "
+                        "WHERE note_fts MATCH :fts_query)"
+                    ).bindparams(fts_query=phrases)
+                )
+
+        content = Note.data["content"]["md"].as_string()
+        conditions.extend(
+            or_(
+                Note.title.icontains(term, autoescape=True),
+                content.icontains(term, autoescape=True),
+            )
+            for term in terms
+        )
+        return and_(*conditions)
+
+    def search_notes_by_user_id(
+        self,
+        user_id: str,
+        permission: str = "write",
+        query: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[list[NoteModel], Optional[str]]:
+        """
+        Notes the user owns or has access to, newest first, with keyset pagination.
+        The cursor is the "<updated_at>:<id>" of the last note of the previous page;
+        returns the page and the cursor of the next page, if any.
+        """
+        with get_db() as db:
+            access_filter = self._access_filter(db, user_id, permission)
+            notes = db.query(Note)
+            if access_filter is not None:
+                notes = notes.filter(access_filter)
+
+            if query and query.strip():
+                notes = notes.filter(self._search_filter(db, query))
+
+            if cursor:
+                updated_at, id = cursor.split(":", 1)
+                notes = notes.filter(
+                    or_(
+                        Note.updated_at < int(updated_at),
+                        and_(Note.updated_at == int(updated_at), Note.id < id),
+                    )
+                )
+
+            notes = notes.order_by(Note.updated_at.desc(), Note.id.desc())
+            if limit is not None and access_filter is not None:
+                notes = notes.limit(limit + 1)
+
+            notes = [NoteModel.model_validate(note) for note in notes.all()]
+
+        if access_filter is None:
+            notes = [
+                note
+                for note in notes
+                if note.user_id == user_id
+                or has_access(user_id, permission, note.access_control)
+            ]
+
+        if limit is not None and len(notes) > limit:
+            notes = notes[:limit]
+            return notes, f"{notes[-1].updated_at}:{notes[-1].id}"
+        return notes, None
+
     def get_notes_by_user_id(
         self, user_id: str, permission: str = "write"
     ) -> list[NoteModel]:
-        notes = self.get_notes()
-        return [
-            note
-            for note in notes
-            if note.user_id == user_id
-            or has_access(user_id, permission, note.access_control)
-        ]
+        notes, _ = self.search_notes_by_user_id(user_id, permission)
+        return notes
 
     def get_note_by_id(self, id: str) -> Optional[NoteModel]:
         with get_db() as db:
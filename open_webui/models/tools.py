@@ -5,6 +5,7 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users, UserResponse
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.services.plugin_cache import plugin_cache
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
@@ -125,6 +126,7 @@ class ToolsTable:
                 result = Tool(**tool.model_dump())
                 db.add(result)
                 db.commit()
+                plugin_cache.invalidate("tool", result.id)
                 db.refresh(result)
                 if result:
                     return ToolModel.model_validate(result)
@@ -185,6 +187,7 @@ class ToolsTable:
                     {"valves": valves, "updated_at": int(time.time())}
                 )
                 db.commit()
+                plugin_cache.invalidate("tool", id)
                 return self.get_tool_by_id(id)
         except Exception:
             return None
@@ -241,6 +244,7 @@ class ToolsTable:
                     {**updated, "updated_at": int(time.time())}
                 )
                 db.commit()
+                plugin_cache.invalidate("tool", id)
 
                 tool = db.query(Tool).get(id)
                 db.refresh(tool)
@@ -253,6 +257,7 @@ class ToolsTable:
             with get_db() as db:
                 db.query(Tool).filter_by(id=id).delete()
                 db.commit()
+                plugin_cache.invalidate("tool", id)
 
                 return True
         except Exception:
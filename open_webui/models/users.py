@@ -5,12 +5,13 @@ from open_webui.internal.db import Base, JSONField, get_db
 
 
 from open_webui.models.chats import Chats
-from open_webui.models.groups import Groups
+from open_webui.models.groups import GroupMember, Groups
+from open_webui.services.principal_cache import principal_cache
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text
-from sqlalchemy import or_
+from sqlalchemy import JSON, BigInteger, Column, String, Text
+from sqlalchemy import cast, or_, select, type_coerce
 
 
 ####################
@@ -286,11 +287,55 @@ class UsersTable:
         except Exception:
             return None
 
+    def get_webhook_urls_by_access(
+        self,
+        access_control: Optional[dict],
+        type: str = "read",
+        exclude_user_ids: Optional[list[str]] = None,
+    ) -> list[tuple[str, str]]:
+        """
+        Return (user_id, webhook_url) for every user with `type` access who has
+        a notification webhook configured, resolved in a single query.
+        """
+        with get_db() as db:
+            # settings is stored as text; postgres needs an explicit cast to json
+            # while sqlite's json functions read the text directly
+            if db.bind.dialect.name == "postgresql":
+                settings = cast(User.settings, JSON)
+            else:
+                settings = type_coerce(User.settings, JSON)
+            webhook_url = settings[("ui", "notifications", "webhook_url")].as_string()
+
+            query = db.query(User.id, webhook_url).filter(
+                webhook_url.isnot(None), webhook_url != ""
+            )
+
+            if access_control is not None:
+                permission_access = access_control.get(type, {})
+                query = query.filter(
+                    or_(
+                        User.id.in_(permission_access.get("user_ids", [])),
+                        User.id.in_(
+                            select(GroupMember.user_id).where(
+                                GroupMember.group_id.in_(
+                                    permission_access.get("group_ids", [])
+                                )
+                            )
+                        ),
+                    )
+                )
+
+            if exclude_user_ids:
+                query = query.filter(User.id.notin_(exclude_user_ids))
+
+            return [(user_id, url) for user_id, url in query.all()]
+
     def update_user_role_by_id(self, id: str, role: str) -> Optional[UserModel]:
         try:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                principal_cache.invalidate_user(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -305,6 +350,7 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                principal_cache.invalidate_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -331,6 +377,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"oauth_sub": oauth_sub})
                 db.commit()
+                principal_cache.invalidate_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -342,6 +389,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                principal_cache.invalidate_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -361,6 +409,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                principal_cache.invalidate_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -379,6 +428,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    principal_cache.invalidate_user(id)
 
                 return True
             else:
@@ -391,6 +441,7 @@ class UsersTable:
             with get_db() as db:
                 result = db.query(User).filter_by(id=id).update({"api_key": api_key})
                 db.commit()
+                principal_cache.invalidate_user(id)
                 return True if result == 1 else False
         except Exception:
             return False
@@ -0,0 +1,237 @@
+import logging
+import time
+from typing import Optional
+import uuid
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import JSON, BigInteger, Column, Index, Integer, Text, and_, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+####################
+# WebhookDelivery DB Schema
+####################
+
+PENDING = "pending"
+SENDING = "sending"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+
+class WebhookDelivery(Base):
+    __tablename__ = "webhook_delivery"
+
+    id = Column(Text, primary_key=True)
+    # One delivery per event and endpoint, e.g. "channel-message:<id>:<url>"
+    dedupe_key = Column(Text, nullable=False, unique=True)
+
+    url = Column(Text, nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    status = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    claimed_by = Column(Text, nullable=True)
+
+    next_attempt_at = Column(BigInteger)  # time_ns
+    created_at = Column(BigInteger)  # time_ns
+    updated_at = Column(BigInteger)  # time_ns
+
+    __table_args__ = (
+        Index("idx_webhook_delivery_status_next", "status", "next_attempt_at"),
+    )
+
+
+class WebhookDeliveryModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    dedupe_key: str
+
+    url: str
+    payload: dict
+
+    status: str
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+    next_attempt_at: int  # timestamp in epoch (time_ns)
+    created_at: int  # timestamp in epoch (time_ns)
+    updated_at: int  # timestamp in epoch (time_ns)
+
+
+####################
+# Table
+####################
+
+
+class WebhookDeliveryTable:
+    def insert_new_deliveries(self, deliveries: list[tuple[str, str, dict]]) -> int:
+        """
+        Queue (dedupe_key, url, payload) deliveries, skipping keys that were
+        already queued. Returns the number of new deliveries.
+        """
+        now = time.time_ns()
+        rows = {
+            dedupe_key: {
+                "id": str(uuid.uuid4()),
+                "dedupe_key": dedupe_key,
+                "url": url,
+                "payload": payload,
+                "status": PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for dedupe_key, url, payload in deliveries
+        }
+        if not rows:
+            return 0
+
+        with get_db() as db:
+            dialect_name = db.bind.dialect.name
+            if dialect_name in ("sqlite", "postgresql"):
+                insert = (
+                    sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+                )
+                result = db.execute(
+                    insert(WebhookDelivery)
+                    .values(list(rows.values()))
+                    .on_conflict_do_nothing(index_elements=["dedupe_key"])
+                )
+                db.commit()
+                return result.rowcount
+
+            # Other dialects: skip known keys, then insert one row at a time so
+            # a key enqueued concurrently by another worker only skips that row
+            existing = {
+                dedupe_key
+                for (dedupe_key,) in db.query(WebhookDelivery.dedupe_key).filter(
+                    WebhookDelivery.dedupe_key.in_(list(rows))
+                )
+            }
+            inserted = 0
+            for dedupe_key, row in rows.items():
+                if dedupe_key in existing:
+                    continue
+                try:
+                    db.add(WebhookDelivery(**row))
+                    db.commit()
+                    inserted += 1
+                except IntegrityError:
+                    db.rollback()
+            return inserted
+
+    def claim_due_deliveries(
+        self, limit: int, lease_ns: int
+    ) -> list[WebhookDeliveryModel]:
+        """
+        Claim up to `limit` due deliveries for this worker. Deliveries left in
+        the sending state for longer than `lease_ns` (e.g. after a crash) are
+        claimed again.
+        """
+        now = time.time_ns()
+        claim = str(uuid.uuid4())
+        due = or_(
+            and_(
+                WebhookDelivery.status == PENDING,
+                WebhookDelivery.next_attempt_at <= now,
+            ),
+            and_(
+                WebhookDelivery.status == SENDING,
+                WebhookDelivery.updated_at <= now - lease_ns,
+            ),
+        )
+
+        with get_db() as db:
+            ids = [
+                id
+                for (id,) in db.query(WebhookDelivery.id)
+                .filter(due)
+                .order_by(WebhookDelivery.next_attempt_at)
+                .limit(limit)
+            ]
+            if not ids:
+                return []
+
+            # Re-check the condition so concurrent workers never share a row
+            db.query(WebhookDelivery).filter(
+                WebhookDelivery.id.in_(ids), due
+            ).update(
+                {"status": SENDING, "claimed_by": claim, "updated_at": now},
+                synchronize_session=False,
+            )
+            db.commit()
+
+            deliveries = (
+                db.query(WebhookDelivery)
+                .filter_by(claimed_by=claim, status=SENDING)
+                .order_by(WebhookDelivery.next_attempt_at)
+                .all()
+            )
+            return [WebhookDeliveryModel.model_validate(d) for d in deliveries]
+
+    def mark_delivered(self, id: str) -> None:
+        with get_db() as db:
+            db.query(WebhookDelivery).filter_by(id=id).update(
+                {
+                    "status": DELIVERED,
+                    "attempts": WebhookDelivery.attempts + 1,
+                    "last_error": None,
+                    "claimed_by": None,
+                    "updated_at": time.time_ns(),
+                }
+            )
+            db.commit()
+
+    def mark_attempt_failed(
+        self, id: str, error: str, retry_at: Optional[int] = None
+    ) -> None:
+        """Record a failed attempt; retry at `retry_at` or give up if None."""
+        now = time.time_ns()
+        with get_db() as db:
+            db.query(WebhookDelivery).filter_by(id=id).update(
+                {
+                    "status": PENDING if retry_at is not None else FAILED,
+                    "attempts": WebhookDelivery.attempts + 1,
+                    "last_error": error[:1000],
+                    "claimed_by": None,
+                    "next_attempt_at": retry_at if retry_at is not None else now,
+                    "updated_at": now,
+                }
+            )
+            db.commit()
+
+    def get_delivery_by_dedupe_key(
+        self, dedupe_key: str
+    ) -> Optional[WebhookDeliveryModel]:
+        with get_db() as db:
+            delivery = (
+                db.query(WebhookDelivery).filter_by(dedupe_key=dedupe_key).first()
+            )
+            return WebhookDeliveryModel.model_validate(delivery) if delivery else None
+
+    def delete_finished_deliveries_before(self, before: int) -> int:
+        """Drop delivered and failed rows older than `before` (time_ns)."""
+        with get_db() as db:
+            count = (
+                db.query(WebhookDelivery)
+                .filter(
+                    WebhookDelivery.status.in_([DELIVERED, FAILED]),
+                    WebhookDelivery.updated_at < before,
+                )
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return count
+
+
+WebhookDeliveries = WebhookDeliveryTable()
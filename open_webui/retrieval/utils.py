@@ -21,7 +21,8 @@ from open_webui.models.files import Files
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.notes import Notes
 
-from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.vector.main import GetResult, collect_get_pages
+from open_webui.services.vector_query_cache import vector_query_cache
 from open_webui.utils.access_control import has_access
 
 
@@ -57,10 +58,16 @@ class VectorSearchRetriever(BaseRetriever):
         *,
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
-        result = VECTOR_DB_CLIENT.search(
-            collection_name=self.collection_name,
-            vectors=[self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)],
-            limit=self.top_k,
+        query_embedding = self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+        result = vector_query_cache.search(
+            self.collection_name,
+            query_embedding,
+            self.top_k,
+            lambda: VECTOR_DB_CLIENT.search(
+                collection_name=self.collection_name,
+                vectors=[query_embedding],
+                limit=self.top_k,
+            ),
         )
 
         ids = result.ids[0]
@@ -83,10 +90,15 @@ def query_doc(
 ):
     try:
         log.debug(f"query_doc:doc {collection_name}")
-        result = VECTOR_DB_CLIENT.search(
-            collection_name=collection_name,
-            vectors=[query_embedding],
-            limit=k,
+        result = vector_query_cache.search(
+            collection_name,
+            query_embedding,
+            k,
+            lambda: VECTOR_DB_CLIENT.search(
+                collection_name=collection_name,
+                vectors=[query_embedding],
+                limit=k,
+            ),
         )
 
         if result:
@@ -101,7 +113,10 @@ def query_doc(
 def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f"get_doc:doc {collection_name}")
-        result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        result = vector_query_cache.get_collection(
+            collection_name,
+            lambda: collect_get_pages(VECTOR_DB_CLIENT.iter_get(collection_name)),
+        )
 
         if result:
             log.info(f"query_doc:result {result.ids} {result.metadatas}")
@@ -342,8 +357,9 @@ def query_collection_with_hybrid_search(
             log.debug(
                 f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
             )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
+            collection_results[collection_name] = vector_query_cache.get_collection(
+                collection_name,
+                lambda: collect_get_pages(VECTOR_DB_CLIENT.iter_get(collection_name)),
             )
         except Exception as e:
             log.exception(f"Failed to fetch collection {collection_name}: {e}")
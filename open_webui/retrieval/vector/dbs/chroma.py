@@ -3,7 +3,7 @@ import logging
 from chromadb import Settings
 from chromadb.utils.batch_utils import create_batches
 
-from typing import Optional
+from typing import Iterator, Optional
 
 from open_webui.retrieval.vector.main import (
     VectorDBBase,
@@ -24,7 +24,7 @@ from open_webui.config import (
     CHROMA_CLIENT_AUTH_PROVIDER,
     CHROMA_CLIENT_AUTH_CREDENTIALS,
 )
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import SRC_LOG_LEVELS, VECTOR_DB_ITER_BATCH_SIZE
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
@@ -71,7 +71,11 @@ class ChromaClient(VectorDBBase):
         return self.client.delete_collection(name=collection_name)
 
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         try:
@@ -80,6 +84,7 @@ class ChromaClient(VectorDBBase):
                 result = collection.query(
                     query_embeddings=vectors,
                     n_results=limit,
+                    **({"where": filter} if filter else {}),
                 )
 
                 # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
@@ -137,6 +142,37 @@ class ChromaClient(VectorDBBase):
             )
         return None
 
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        # Page through the collection with limit/offset.
+        collection = self.client.get_collection(name=collection_name)
+        include = ["documents", "metadatas"]
+        if include_vectors:
+            include.append("embeddings")
+
+        offset = 0
+        while True:
+            result = collection.get(limit=batch_size, offset=offset, include=include)
+            if not result["ids"]:
+                return
+            yield GetResult(
+                ids=[result["ids"]],
+                documents=[result["documents"]],
+                metadatas=[result["metadatas"]],
+                vectors=(
+                    [[list(map(float, v)) for v in result["embeddings"]]]
+                    if include_vectors
+                    else None
+                ),
+            )
+            if len(result["ids"]) < batch_size:
+                return
+            offset += batch_size
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(
@@ -1,7 +1,7 @@
-from elasticsearch import Elasticsearch, BadRequestError
-from typing import Optional
+from elasticsearch import AsyncElasticsearch, Elasticsearch, BadRequestError
+from typing import Iterator, Optional
 import ssl
-from elasticsearch.helpers import bulk, scan
+from elasticsearch.helpers import async_scan, bulk, scan
 
 from open_webui.retrieval.vector.utils import stringify_metadata
 from open_webui.retrieval.vector.main import (
@@ -20,6 +20,7 @@ from open_webui.config import (
     ELASTICSEARCH_INDEX_PREFIX,
     SSL_ASSERT_FINGERPRINT,
 )
+from open_webui.env import VECTOR_DB_ITER_BATCH_SIZE
 
 
 class ElasticsearchClient(VectorDBBase):
@@ -32,7 +33,11 @@ class ElasticsearchClient(VectorDBBase):
 
     def __init__(self):
         self.index_prefix = ELASTICSEARCH_INDEX_PREFIX
-        self.client = Elasticsearch(
+        self.client = Elasticsearch(**self._client_kwargs())
+        self._async_client = None
+
+    def _client_kwargs(self) -> dict:
+        return dict(
             hosts=[ELASTICSEARCH_URL],
             ca_certs=ELASTICSEARCH_CA_CERTS,
             api_key=ELASTICSEARCH_API_KEY,
@@ -45,6 +50,13 @@ class ElasticsearchClient(VectorDBBase):
             ssl_assert_fingerprint=SSL_ASSERT_FINGERPRINT,
         )
 
+    @property
+    def async_client(self) -> AsyncElasticsearch:
+        # Created lazily so it binds to the running event loop
+        if self._async_client is None:
+            self._async_client = AsyncElasticsearch(**self._client_kwargs())
+        return self._async_client
+
     # Status: works
     def _get_index_name(self, dimension: int) -> str:
         return f"{self.index_prefix}_d{str(dimension)}"
@@ -151,18 +163,23 @@ class ElasticsearchClient(VectorDBBase):
         query = {"query": {"term": {"collection": collection_name}}}
         self.client.delete_by_query(index=f"{self.index_prefix}*", body=query)
 
-    # Status: works
-    def search(
-        self, collection_name: str, vectors: list[list[float]], limit: int
-    ) -> Optional[SearchResult]:
-        query = {
+    def _search_body(
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        limit: int,
+        filter: Optional[dict] = None,
+    ) -> dict:
+        conditions = [{"term": {"collection": collection_name}}]
+        for field, value in (filter or {}).items():
+            conditions.append({"term": {f"metadata.{field}": value}})
+
+        return {
             "size": limit,
             "_source": ["text", "metadata"],
             "query": {
                 "script_score": {
-                    "query": {
-                        "bool": {"filter": [{"term": {"collection": collection_name}}]}
-                    },
+                    "query": {"bool": {"filter": conditions}},
                     "script": {
                         "source": "cosineSimilarity(params.vector, 'vector') + 1.0",
                         "params": {
@@ -173,8 +190,30 @@ class ElasticsearchClient(VectorDBBase):
             },
         }
 
+    def _query_body(self, collection_name: str, filter: dict) -> dict:
+        query_body = {
+            "query": {"bool": {"filter": []}},
+            "_source": ["text", "metadata"],
+        }
+
+        for field, value in filter.items():
+            query_body["query"]["bool"]["filter"].append({"term": {field: value}})
+        query_body["query"]["bool"]["filter"].append(
+            {"term": {"collection": collection_name}}
+        )
+        return query_body
+
+    # Status: works
+    def search(
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        limit: int,
+        filter: Optional[dict] = None,
+    ) -> Optional[SearchResult]:
         result = self.client.search(
-            index=self._get_index_name(len(vectors[0])), body=query
+            index=self._get_index_name(len(vectors[0])),
+            body=self._search_body(collection_name, vectors, limit, filter),
         )
 
         return self._result_to_search_result(result)
@@ -186,22 +225,12 @@ class ElasticsearchClient(VectorDBBase):
         if not self.has_collection(collection_name):
             return None
 
-        query_body = {
-            "query": {"bool": {"filter": []}},
-            "_source": ["text", "metadata"],
-        }
-
-        for field, value in filter.items():
-            query_body["query"]["bool"]["filter"].append({"term": {field: value}})
-        query_body["query"]["bool"]["filter"].append(
-            {"term": {"collection": collection_name}}
-        )
         size = limit if limit else 10
 
         try:
             result = self.client.search(
                 index=f"{self.index_prefix}*",
-                body=query_body,
+                body=self._query_body(collection_name, filter),
                 size=size,
             )
 
@@ -231,6 +260,36 @@ class ElasticsearchClient(VectorDBBase):
 
         return self._scan_result_to_get_result(results)
 
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        # Scroll through the collection and hand out one page at a time.
+        source = ["text", "metadata"] + (["vector"] if include_vectors else [])
+        query = {
+            "query": {"bool": {"filter": [{"term": {"collection": collection_name}}]}},
+            "_source": source,
+        }
+        hits = scan(
+            self.client, index=f"{self.index_prefix}*", query=query, size=batch_size
+        )
+        page = []
+        for hit in hits:
+            page.append(hit)
+            if len(page) == batch_size:
+                yield self._hits_to_page(page, include_vectors)
+                page = []
+        if page:
+            yield self._hits_to_page(page, include_vectors)
+
+    def _hits_to_page(self, hits: list, include_vectors: bool) -> GetResult:
+        result = self._scan_result_to_get_result(hits)
+        if include_vectors:
+            result.vectors = [[hit["_source"].get("vector") for hit in hits]]
+        return result
+
     # Status: works
     def insert(self, collection_name: str, items: list[VectorItem]):
         if not self._has_index(dimension=len(items[0]["vector"])):
@@ -300,3 +359,65 @@ class ElasticsearchClient(VectorDBBase):
         indices = self.client.indices.get(index=f"{self.index_prefix}*")
         for index in indices:
             self.client.indices.delete(index=index)
+
+    # Native async interface
+
+    async def ahas_collection(self, collection_name) -> bool:
+        query_body = {
+            "query": {"bool": {"filter": [{"term": {"collection": collection_name}}]}}
+        }
+        try:
+            result = await self.async_client.count(
+                index=f"{self.index_prefix}*", body=query_body
+            )
+            return result.body["count"] > 0
+        except Exception as e:
+            return None
+
+    async def adelete_collection(self, collection_name: str):
+        query = {"query": {"term": {"collection": collection_name}}}
+        await self.async_client.delete_by_query(
+            index=f"{self.index_prefix}*", body=query
+        )
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        limit: int,
+        filter: Optional[dict] = None,
+    ) -> Optional[SearchResult]:
+        result = await self.async_client.search(
+            index=self._get_index_name(len(vectors[0])),
+            body=self._search_body(collection_name, vectors, limit, filter),
+        )
+        return self._result_to_search_result(result)
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not await self.ahas_collection(collection_name):
+            return None
+
+        try:
+            result = await self.async_client.search(
+                index=f"{self.index_prefix}*",
+                body=self._query_body(collection_name, filter),
+                size=limit if limit else 10,
+            )
+            return self._result_to_get_result(result)
+        except Exception as e:
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        query = {
+            "query": {"bool": {"filter": [{"term": {"collection": collection_name}}]}},
+            "_source": ["text", "metadata"],
+        }
+        results = [
+            hit
+            async for hit in async_scan(
+                self.async_client, index=f"{self.index_prefix}*", query=query
+            )
+        ]
+        return self._scan_result_to_get_result(results)
@@ -0,0 +1,739 @@
+"""
+Embedded vector store that runs inside the Open WebUI process.
+
+Each collection is a directory holding:
+- a memory-mapped float32 file of L2-normalized vectors, one row per chunk
+- an SQLite sidecar (WAL journal) with ids, texts, metadata, an index of
+  top-level metadata values used for filters, and the collection state
+- an IVF index (spherical k-means centroids plus per-list row ranges)
+
+Writes append rows to the vector file and only become visible once the
+sidecar transaction that references them commits, so the sidecar journal is
+the write-ahead log: rows left behind by an interrupted write are truncated
+on open. Upserts and deletes mark rows dead.
+
+A background compaction rewrites the vector file without dead rows, sorted
+by IVF list so every list is a contiguous range, and retrains the index.
+Rows appended after the last compaction are scanned exhaustively until the
+next one.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from hashlib import sha256
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from open_webui.retrieval.vector.main import (
+    VectorDBBase,
+    VectorItem,
+    SearchResult,
+    GetResult,
+)
+from open_webui.config import (
+    LOCAL_VECTOR_DATA_PATH,
+    LOCAL_VECTOR_IVF_MIN_ROWS,
+    LOCAL_VECTOR_IVF_NPROBE,
+)
+from open_webui.env import SRC_LOG_LEVELS, VECTOR_DB_ITER_BATCH_SIZE
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+MAX_OPEN_COLLECTIONS = 128
+COPY_CHUNK_ROWS = 65536
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 32
+
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _filter_value(value: Any) -> Optional[str]:
+    # Only top-level scalars are indexed for filtering
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return json.dumps(value)
+    return None
+
+
+def train_ivf(
+    vectors: np.ndarray, rows: np.ndarray, nlist: int, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Spherical k-means over a sample of the given rows.
+    Returns (centroids, list assignment of every row in `rows`).
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(rows), nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(rows, sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        empty = np.bincount(assignment, minlength=nlist) == 0
+        # Re-seed empty lists from random sample points
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        centroids = _normalize(sums)
+
+    assignment = np.empty(len(rows), dtype=np.int32)
+    for start in range(0, len(rows), COPY_CHUNK_ROWS):
+        chunk = np.asarray(vectors[rows[start : start + COPY_CHUNK_ROWS]])
+        assignment[start : start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return centroids, assignment
+
+
+class LocalCollection:
+    """One collection directory; all methods are thread-safe."""
+
+    def __init__(self, path: str, ivf_min_rows: int, nprobe: int):
+        self.path = path
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self.lock = threading.RLock()
+        self.compacting = False
+        self.compaction_lock = threading.Lock()
+        # Number of client calls currently using this collection
+        self.users = 0
+
+        os.makedirs(path, exist_ok=True)
+        self.conn = sqlite3.connect(
+            os.path.join(path, "items.db"), check_same_thread=False, timeout=30
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                id TEXT PRIMARY KEY,
+                row INTEGER NOT NULL,
+                text TEXT,
+                metadata TEXT
+            );
+            CREATE INDEX IF NOT EXISTS items_row ON items (row);
+            CREATE TABLE IF NOT EXISTS metadata_index (
+                row INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS metadata_key_value
+                ON metadata_index (key, value);
+            CREATE INDEX IF NOT EXISTS metadata_row ON metadata_index (row);
+            CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        self.conn.commit()
+        self._load()
+        self._remove_stale_files()
+
+    ####################
+    # State
+    ####################
+
+    def _state(self, key: str, default: Any = None) -> Any:
+        row = self.conn.execute(
+            "SELECT value FROM state WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_state(self, **values: Any) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO state VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in values.items()],
+        )
+
+    def _vectors_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"vectors-{generation}.f32")
+
+    def _ivf_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"ivf-{generation}.npz")
+
+    def _load(self) -> None:
+        self.dimension = self._state("dimension")
+        self.rows = self._state("rows", 0)
+        self.generation = self._state("generation", 0)
+
+        # Drop rows appended by a write whose sidecar commit never happened
+        vectors_path = self._vectors_path(self.generation)
+        if self.dimension and os.path.exists(vectors_path):
+            size = self.rows * self.dimension * 4
+            if os.path.getsize(vectors_path) > size:
+                os.truncate(vectors_path, size)
+
+        self.alive = np.zeros(self.rows, dtype=bool)
+        self.alive[self._rows_for("SELECT row FROM items", [])] = True
+
+        self.centroids = self.offsets = None
+        if os.path.exists(self._ivf_path(self.generation)):
+            with np.load(self._ivf_path(self.generation)) as ivf:
+                self.centroids = ivf["centroids"]
+                self.offsets = ivf["offsets"]
+        self._map_vectors()
+
+    def _remove_stale_files(self) -> None:
+        # Files of other generations are left by an interrupted compaction
+        current = (
+            os.path.basename(self._vectors_path(self.generation)),
+            os.path.basename(self._ivf_path(self.generation)),
+        )
+        for name in os.listdir(self.path):
+            if name.startswith(("vectors-", "ivf-")) and name not in current:
+                os.remove(os.path.join(self.path, name))
+
+    def _map_vectors(self) -> None:
+        if not self.rows:
+            self.vectors = np.empty((0, self.dimension or 0), dtype=np.float32)
+            return
+        self.vectors = np.memmap(
+            self._vectors_path(self.generation),
+            dtype=np.float32,
+            mode="r",
+            shape=(self.rows, self.dimension),
+        )
+
+    ####################
+    # Writes
+    ####################
+
+    def _rows_for(self, sql: str, params: List[Any]) -> List[int]:
+        return [row for (row,) in self.conn.execute(sql, params)]
+
+    def _ids_to_rows(self, ids: List[str]) -> List[int]:
+        rows = []
+        for start in range(0, len(ids), 500):
+            batch = ids[start : start + 500]
+            rows += self._rows_for(
+                f"SELECT row FROM items WHERE id IN ({','.join('?' * len(batch))})",
+                batch,
+            )
+        return rows
+
+    def _remove_rows(self, rows: List[int]) -> None:
+        for start in range(0, len(rows), 500):
+            batch = rows[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            self.conn.execute(f"DELETE FROM items WHERE row IN ({placeholders})", batch)
+            self.conn.execute(
+                f"DELETE FROM metadata_index WHERE row IN ({placeholders})", batch
+            )
+        self.alive[rows] = False
+
+    def upsert(self, items: List[VectorItem]) -> None:
+        vectors = _normalize(
+            np.asarray([item["vector"] for item in items], dtype=np.float32)
+        )
+        with self.lock:
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Vector dimension {vectors.shape[1]} does not match "
+                    f"collection dimension {self.dimension}"
+                )
+
+            try:
+                self._remove_rows(self._ids_to_rows([item["id"] for item in items]))
+
+                with open(self._vectors_path(self.generation), "ab") as f:
+                    f.truncate(self.rows * self.dimension * 4)
+                    f.write(vectors.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                first_row = self.rows
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            item["id"],
+                            first_row + i,
+                            item["text"],
+                            json.dumps(item["metadata"], default=str),
+                        )
+                        for i, item in enumerate(items)
+                    ],
+                )
+                self.conn.executemany(
+                    "INSERT INTO metadata_index VALUES (?, ?, ?)",
+                    [
+                        (first_row + i, key, value)
+                        for i, item in enumerate(items)
+                        for key, raw in (item["metadata"] or {}).items()
+                        if (value := _filter_value(raw)) is not None
+                    ],
+                )
+                self._set_state(dimension=self.dimension, rows=first_row + len(items))
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                self._load()
+                raise
+
+            self.rows = first_row + len(items)
+            self.alive = np.concatenate([self.alive, np.ones(len(items), dtype=bool)])
+            self._map_vectors()
+
+    def delete(self, ids: Optional[List[str]], filter: Optional[Dict]) -> None:
+        with self.lock:
+            if ids:
+                rows = self._ids_to_rows(ids)
+            elif filter:
+                rows = self._filter_rows(filter)
+            else:
+                return
+            try:
+                self._remove_rows(rows)
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                self._load()
+                raise
+
+    ####################
+    # Reads
+    ####################
+
+    def _filter_rows(self, filter: Dict, limit: Optional[int] = None) -> List[int]:
+        clauses, params = [], []
+        for key, raw in filter.items():
+            value = _filter_value(raw)
+            if value is None:
+                raise ValueError(f"Unsupported filter value for '{key}'")
+            clauses.append("SELECT row FROM metadata_index WHERE key = ? AND value = ?")
+            params += [key, value]
+        sql = " INTERSECT ".join(clauses) + " ORDER BY row LIMIT ?"
+        return self._rows_for(sql, params + [limit if limit is not None else -1])
+
+    def _fetch(self, rows: List[int]) -> Dict[int, Tuple[str, str, Any]]:
+        found = {}
+        for start in range(0, len(rows), 500):
+            batch = [int(row) for row in rows[start : start + 500]]
+            for row, id, text, metadata in self.conn.execute(
+                f"SELECT row, id, text, metadata FROM items WHERE row IN ({','.join('?' * len(batch))})",
+                batch,
+            ):
+                found[row] = (id, text, json.loads(metadata))
+        return found
+
+    def _candidates(self, query: np.ndarray, vectors, alive, centroids, offsets, rows):
+        """Score the probed IVF lists plus the unindexed tail."""
+        if centroids is None:
+            blocks = [(0, rows)]
+        else:
+            nprobe = min(self.nprobe, len(centroids))
+            probes = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+            blocks = [(int(offsets[c]), int(offsets[c + 1])) for c in probes]
+            blocks.append((int(offsets[-1]), rows))
+
+        row_ids, scores = [], []
+        for start, end in blocks:
+            if end <= start:
+                continue
+            block_scores = vectors[start:end] @ query
+            mask = alive[start:end]
+            row_ids.append(np.arange(start, end)[mask])
+            scores.append(block_scores[mask])
+        if not row_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return np.concatenate(row_ids), np.concatenate(scores)
+
+    def search(
+        self, vectors: List[List[float]], limit: int, filter: Optional[Dict] = None
+    ) -> Optional[SearchResult]:
+        queries = _normalize(np.asarray(vectors, dtype=np.float32))
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+
+        for query in queries:
+            # Score without holding the lock; retry if a compaction swapped
+            # the files before the rows were resolved.
+            while True:
+                with self.lock:
+                    if self.dimension is not None and len(query) != self.dimension:
+                        raise ValueError(
+                            f"Query dimension {len(query)} does not match "
+                            f"collection dimension {self.dimension}"
+                        )
+                    snapshot = (
+                        self.vectors,
+                        self.alive,
+                        self.centroids,
+                        self.offsets,
+                        self.rows,
+                    )
+                    generation = self.generation
+                    # A filter selects few rows (e.g. one tenant): score
+                    # exactly those instead of probing the IVF lists.
+                    allowed = (
+                        np.asarray(self._filter_rows(filter), dtype=np.int64)
+                        if filter
+                        else None
+                    )
+
+                if allowed is None:
+                    rows, scores = self._candidates(query, *snapshot)
+                else:
+                    vectors, alive = snapshot[0], snapshot[1]
+                    rows = allowed[alive[allowed]] if len(allowed) else allowed
+                    scores = (
+                        vectors[rows] @ query
+                        if len(rows)
+                        else np.empty(0, dtype=np.float32)
+                    )
+                k = min(limit or len(rows), len(rows))
+                top = np.argpartition(-scores, k - 1)[:k] if k else rows[:0]
+                top = top[np.argsort(-scores[top])]
+
+                with self.lock:
+                    if generation != self.generation:
+                        continue
+                    found = self._fetch(rows[top].tolist())
+                break
+
+            # Items deleted after scoring are dropped
+            hits = [
+                (found[row], score)
+                for row, score in zip(rows[top].tolist(), scores[top].tolist())
+                if row in found
+            ]
+            result["ids"].append([item[0] for item, _ in hits])
+            result["documents"].append([item[1] for item, _ in hits])
+            result["metadatas"].append([item[2] for item, _ in hits])
+            # cosine similarity [-1, 1] normalized to [0, 1]
+            result["distances"].append([(s + 1.0) / 2.0 for _, s in hits])
+
+        return SearchResult(**result)
+
+    def query(self, filter: Dict, limit: Optional[int]) -> GetResult:
+        with self.lock:
+            rows = self._filter_rows(filter, limit) if filter else self._rows_for(
+                "SELECT row FROM items ORDER BY row LIMIT ?",
+                [limit if limit is not None else -1],
+            )
+            found = self._fetch(rows)
+        items = [found[row] for row in rows if row in found]
+        return GetResult(
+            ids=[[item[0] for item in items]],
+            documents=[[item[1] for item in items]],
+            metadatas=[[item[2] for item in items]],
+        )
+
+    def iter_pages(self, batch_size: int, include_vectors: bool) -> Iterator[GetResult]:
+        # Keyset on id, which unlike row numbers survives compaction
+        last_id = ""
+        while True:
+            with self.lock:
+                page = self.conn.execute(
+                    "SELECT row, id, text, metadata FROM items WHERE id > ? "
+                    "ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+                vectors = None
+                if include_vectors and page:
+                    rows = [row for row, *_ in page]
+                    vectors = np.asarray(self.vectors[rows]).tolist()
+            if not page:
+                return
+            yield GetResult(
+                ids=[[id for _, id, _, _ in page]],
+                documents=[[text for _, _, text, _ in page]],
+                metadatas=[[json.loads(metadata) for *_, metadata in page]],
+                vectors=[vectors] if include_vectors else None,
+            )
+            if len(page) < batch_size:
+                return
+            last_id = page[-1][1]
+
+    ####################
+    # Compaction
+    ####################
+
+    def needs_compaction(self) -> bool:
+        live = int(self.alive.sum())
+        dead = self.rows - live
+        tail = self.rows - (int(self.offsets[-1]) if self.offsets is not None else 0)
+        if dead > 1000 and dead > self.rows // 4:
+            return True
+        if live < self.ivf_min_rows:
+            return False
+        return self.centroids is None or tail > max(1000, self.rows // 5)
+
+    def compact(self) -> None:
+        with self.compaction_lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        with self.lock:
+            snapshot_rows = self.rows
+            live_rows = np.flatnonzero(self.alive[:snapshot_rows])
+            vectors = self.vectors
+            generation = self.generation
+
+        centroids = offsets = None
+        order = live_rows
+        if len(live_rows) >= self.ivf_min_rows:
+            nlist = int(np.clip(np.sqrt(len(live_rows)), 16, 4096))
+            centroids, assignment = train_ivf(vectors, live_rows, nlist)
+            order = live_rows[np.argsort(assignment, kind="stable")]
+            counts = np.bincount(assignment, minlength=nlist)
+            offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        new_generation = generation + 1
+        new_path = self._vectors_path(new_generation)
+        try:
+            with open(new_path, "wb") as f:
+                for start in range(0, len(order), COPY_CHUNK_ROWS):
+                    chunk = order[start : start + COPY_CHUNK_ROWS]
+                    f.write(np.asarray(vectors[chunk]).tobytes())
+
+                with self.lock:
+                    if self.generation != generation:
+                        raise RuntimeError("collection changed during compaction")
+
+                    # Rows written while the new file was being built are
+                    # appended as they are and stay outside the IVF lists.
+                    end = self.rows
+                    for start in range(snapshot_rows, end, COPY_CHUNK_ROWS):
+                        stop = min(end, start + COPY_CHUNK_ROWS)
+                        f.write(np.asarray(self.vectors[start:stop]).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                    remap = np.full(end, -1, dtype=np.int64)
+                    remap[order] = np.arange(len(order))
+                    remap[snapshot_rows:end] = len(order) + np.arange(
+                        end - snapshot_rows
+                    )
+                    self._swap(remap, new_generation, centroids, offsets)
+        except BaseException:
+            if os.path.exists(new_path):
+                os.remove(new_path)
+            raise
+
+        log.info(
+            f"Compacted {self.path}: {snapshot_rows} -> {len(order)} rows, "
+            f"{0 if centroids is None else len(centroids)} IVF lists"
+        )
+
+    def _swap(self, remap, new_generation, centroids, offsets) -> None:
+        """Renumber the sidecar and switch to the new files in one commit."""
+        old_generation = self.generation
+        new_rows = int(remap.max()) + 1 if len(remap) else 0
+        try:
+            if centroids is not None:
+                np.savez(
+                    self._ivf_path(new_generation),
+                    centroids=centroids,
+                    offsets=offsets,
+                )
+            self.conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS remap "
+                "(old INTEGER PRIMARY KEY, new INTEGER)"
+            )
+            self.conn.execute("DELETE FROM remap")
+            mapped = np.flatnonzero(remap >= 0)
+            self.conn.executemany(
+                "INSERT INTO remap VALUES (?, ?)",
+                zip(mapped.tolist(), remap[mapped].tolist()),
+            )
+            for table in ("items", "metadata_index"):
+                self.conn.execute(
+                    f"UPDATE {table} SET row = "
+                    f"(SELECT new FROM remap WHERE old = {table}.row)"
+                )
+            self._set_state(
+                rows=new_rows,
+                generation=new_generation,
+            )
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            if os.path.exists(self._ivf_path(new_generation)):
+                os.remove(self._ivf_path(new_generation))
+            raise
+
+        alive = np.zeros(new_rows, dtype=bool)
+        alive[remap[mapped]] = self.alive[mapped]
+        self.alive = alive
+        self.rows = new_rows
+        self.generation = new_generation
+        self.centroids, self.offsets = centroids, offsets
+        self._map_vectors()
+
+        for path in (
+            self._vectors_path(old_generation),
+            self._ivf_path(old_generation),
+        ):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+            self.vectors = None
+
+
+class LocalVectorClient(VectorDBBase):
+    def __init__(
+        self,
+        data_path: str = LOCAL_VECTOR_DATA_PATH,
+        ivf_min_rows: int = LOCAL_VECTOR_IVF_MIN_ROWS,
+        nprobe: int = LOCAL_VECTOR_IVF_NPROBE,
+    ):
+        self.data_path = data_path
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+        self._collections: "OrderedDict[str, LocalCollection]" = OrderedDict()
+        # A single thread so compactions never compete for memory bandwidth
+        self._compactor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="vector-compaction"
+        )
+        os.makedirs(self.data_path, exist_ok=True)
+
+    def _collection_path(self, collection_name: str) -> str:
+        if not _SAFE_NAME.match(collection_name) or collection_name in (".", ".."):
+            collection_name = sha256(collection_name.encode()).hexdigest()
+        return os.path.join(self.data_path, collection_name)
+
+    @contextmanager
+    def _open(self, collection_name: str, create: bool = False):
+        """
+        Yield the open collection (or None), keeping it out of LRU eviction
+        while it is in use.
+        """
+        with self._lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                path = self._collection_path(collection_name)
+                if not create and not os.path.exists(os.path.join(path, "items.db")):
+                    collection = None
+                else:
+                    collection = LocalCollection(path, self.ivf_min_rows, self.nprobe)
+                    self._collections[collection_name] = collection
+            if collection is not None:
+                self._collections.move_to_end(collection_name)
+                collection.users += 1
+                self._evict()
+        try:
+            yield collection
+        finally:
+            if collection is not None:
+                with self._lock:
+                    collection.users -= 1
+
+    def _evict(self) -> None:
+        # Close the least recently used collections that nobody is using
+        excess = len(self._collections) - MAX_OPEN_COLLECTIONS
+        for name, collection in list(self._collections.items()):
+            if excess <= 0:
+                break
+            if collection.users == 0 and not collection.compacting:
+                del self._collections[name]
+                collection.close()
+                excess -= 1
+
+    def _maybe_compact(self, collection: LocalCollection) -> None:
+        with collection.lock:
+            if collection.compacting or not collection.needs_compaction():
+                return
+            collection.compacting = True
+
+        def run():
+            try:
+                collection.compact()
+            except Exception as e:
+                log.warning(f"Compaction of {collection.path} failed: {e}")
+            finally:
+                collection.compacting = False
+
+        self._compactor.submit(run)
+
+    def has_collection(self, collection_name: str) -> bool:
+        with self._open(collection_name) as collection:
+            return collection is not None
+
+    def delete_collection(self, collection_name: str) -> None:
+        with self._lock:
+            collection = self._collections.pop(collection_name, None)
+        if collection is not None:
+            collection.close()
+        shutil.rmtree(self._collection_path(collection_name), ignore_errors=True)
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self.upsert(collection_name, items)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        if not items:
+            return
+        with self._open(collection_name, create=True) as collection:
+            collection.upsert(items)
+            self._maybe_compact(collection)
+
+    def search(
+        self,
+        collection_name: str,
+        vectors: List[List[float | int]],
+        limit: int,
+        filter: Optional[Dict] = None,
+    ) -> Optional[SearchResult]:
+        with self._open(collection_name) as collection:
+            if collection is None or not vectors:
+                return None
+            return collection.search(vectors, limit, filter)
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        with self._open(collection_name) as collection:
+            if collection is None:
+                return None
+            return collection.query(filter, limit)
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        return self.query(collection_name, {})
+
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        with self._open(collection_name) as collection:
+            if collection is not None:
+                yield from collection.iter_pages(batch_size, include_vectors)
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        with self._open(collection_name) as collection:
+            if collection is None:
+                return
+            collection.delete(ids, filter)
+            self._maybe_compact(collection)
+
+    def reset(self) -> None:
+        with self._lock:
+            collections = list(self._collections.values())
+            self._collections.clear()
+        for collection in collections:
+            collection.close()
+        shutil.rmtree(self.data_path, ignore_errors=True)
+        os.makedirs(self.data_path, exist_ok=True)
@@ -2,7 +2,7 @@ from pymilvus import MilvusClient as Client
 from pymilvus import FieldSchema, DataType
 import json
 import logging
-from typing import Optional
+from typing import Iterator, Optional
 
 from open_webui.retrieval.vector.utils import stringify_metadata
 from open_webui.retrieval.vector.main import (
@@ -21,7 +21,7 @@ from open_webui.config import (
     MILVUS_HNSW_EFCONSTRUCTION,
     MILVUS_IVF_FLAT_NLIST,
 )
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import SRC_LOG_LEVELS, VECTOR_DB_ITER_BATCH_SIZE
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
@@ -171,7 +171,11 @@ class MilvusClient(VectorDBBase):
         )
 
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         collection_name = collection_name.replace("-", "_")
@@ -183,6 +187,10 @@ class MilvusClient(VectorDBBase):
             data=vectors,
             limit=limit,
             output_fields=["data", "metadata"],
+            filter=" && ".join(
+                f'metadata["{key}"] == {json.dumps(value)}'
+                for key, value in (filter or {}).items()
+            ),
             # search_params=search_params # Potentially add later if needed
         )
         return self._result_to_search_result(result)
@@ -283,6 +291,36 @@ class MilvusClient(VectorDBBase):
         # This will use the paginated query logic.
         return self.query(collection_name=collection_name, filter={}, limit=None)
 
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        # Milvus query iterators page by primary key, unlike offset queries
+        # which are capped at 16384 rows.
+        collection_name = collection_name.replace("-", "_")
+        if not self.has_collection(collection_name):
+            return
+        output_fields = ["id", "data", "metadata"]
+        if include_vectors:
+            output_fields.append("vector")
+
+        iterator = self.client.query_iterator(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            batch_size=batch_size,
+            filter="",
+            output_fields=output_fields,
+        )
+        try:
+            while items := iterator.next():
+                result = self._result_to_get_result([items])
+                if include_vectors:
+                    result.vectors = [[list(item["vector"]) for item in items]]
+                yield result
+        finally:
+            iterator.close()
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection_name = collection_name.replace("-", "_")
@@ -1,6 +1,6 @@
-from opensearchpy import OpenSearch
-from opensearchpy.helpers import bulk
-from typing import Optional
+from opensearchpy import AsyncOpenSearch, OpenSearch
+from opensearchpy.helpers import bulk, scan
+from typing import Iterator, Optional
 
 from open_webui.retrieval.vector.utils import stringify_metadata
 from open_webui.retrieval.vector.main import (
@@ -16,18 +16,30 @@ from open_webui.config import (
     OPENSEARCH_USERNAME,
     OPENSEARCH_PASSWORD,
 )
+from open_webui.env import VECTOR_DB_ITER_BATCH_SIZE
 
 
 class OpenSearchClient(VectorDBBase):
     def __init__(self):
         self.index_prefix = "open_webui"
-        self.client = OpenSearch(
+        self.client = OpenSearch(**self._client_kwargs())
+        self._async_client = None
+
+    def _client_kwargs(self) -> dict:
+        return dict(
             hosts=[OPENSEARCH_URI],
             use_ssl=OPENSEARCH_SSL,
             verify_certs=OPENSEARCH_CERT_VERIFY,
             http_auth=(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
         )
 
+    @property
+    def async_client(self) -> AsyncOpenSearch:
+        # Created lazily so it binds to the running event loop
+        if self._async_client is None:
+            self._async_client = AsyncOpenSearch(**self._client_kwargs())
+        return self._async_client
+
     def _get_index_name(self, collection_name: str) -> str:
         return f"{self.index_prefix}_{collection_name}"
 
@@ -112,32 +124,59 @@ class OpenSearchClient(VectorDBBase):
         # We are simply adapting to the norms of the other DBs.
         self.client.indices.delete(index=self._get_index_name(collection_name))
 
+    def _search_body(
+        self,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
+    ) -> dict:
+        return {
+            "size": limit,
+            "_source": ["text", "metadata"],
+            "query": {
+                "script_score": {
+                    "query": (
+                        self._query_body(filter)["query"]
+                        if filter
+                        else {"match_all": {}}
+                    ),
+                    "script": {
+                        "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
+                        "params": {
+                            "field": "vector",
+                            "query_value": vectors[0],
+                        },  # Assuming single query vector
+                    },
+                }
+            },
+        }
+
+    def _query_body(self, filter: dict) -> dict:
+        query_body = {
+            "query": {"bool": {"filter": []}},
+            "_source": ["text", "metadata"],
+        }
+
+        for field, value in filter.items():
+            query_body["query"]["bool"]["filter"].append(
+                {"term": {"metadata." + str(field) + ".keyword": value}}
+            )
+        return query_body
+
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         try:
             if not self.has_collection(collection_name):
                 return None
 
-            query = {
-                "size": limit,
-                "_source": ["text", "metadata"],
-                "query": {
-                    "script_score": {
-                        "query": {"match_all": {}},
-                        "script": {
-                            "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
-                            "params": {
-                                "field": "vector",
-                                "query_value": vectors[0],
-                            },  # Assuming single query vector
-                        },
-                    }
-                },
-            }
-
             result = self.client.search(
-                index=self._get_index_name(collection_name), body=query
+                index=self._get_index_name(collection_name),
+                body=self._search_body(vectors, limit, filter),
             )
 
             return self._result_to_search_result(result)
@@ -151,22 +190,12 @@ class OpenSearchClient(VectorDBBase):
         if not self.has_collection(collection_name):
             return None
 
-        query_body = {
-            "query": {"bool": {"filter": []}},
-            "_source": ["text", "metadata"],
-        }
-
-        for field, value in filter.items():
-            query_body["query"]["bool"]["filter"].append(
-                {"term": {"metadata." + str(field) + ".keyword": value}}
-            )
-
         size = limit if limit else 10000
 
         try:
             result = self.client.search(
                 index=self._get_index_name(collection_name),
-                body=query_body,
+                body=self._query_body(filter),
                 size=size,
             )
 
@@ -187,6 +216,35 @@ class OpenSearchClient(VectorDBBase):
         )
         return self._result_to_get_result(result)
 
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        # The scroll API keeps one page of hits in flight at a time.
+        source = ["text", "metadata"] + (["vector"] if include_vectors else [])
+        hits = scan(
+            self.client,
+            index=self._get_index_name(collection_name),
+            query={"query": {"match_all": {}}, "_source": source},
+            size=batch_size,
+        )
+        page = []
+        for hit in hits:
+            page.append(hit)
+            if len(page) == batch_size:
+                yield self._hits_to_page(page, include_vectors)
+                page = []
+        if page:
+            yield self._hits_to_page(page, include_vectors)
+
+    def _hits_to_page(self, hits: list, include_vectors: bool) -> GetResult:
+        result = self._result_to_get_result({"hits": {"hits": hits}})
+        if include_vectors:
+            result.vectors = [[hit["_source"].get("vector") for hit in hits]]
+        return result
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         self._create_index_if_not_exists(
             collection_name=collection_name, dimension=len(items[0]["vector"])
@@ -265,3 +323,58 @@ class OpenSearchClient(VectorDBBase):
         indices = self.client.indices.get(index=f"{self.index_prefix}_*")
         for index in indices:
             self.client.indices.delete(index=index)
+
+    # Native async interface
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await self.async_client.indices.exists(
+            index=self._get_index_name(collection_name)
+        )
+
+    async def adelete_collection(self, collection_name: str):
+        await self.async_client.indices.delete(
+            index=self._get_index_name(collection_name)
+        )
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
+    ) -> Optional[SearchResult]:
+        try:
+            if not await self.ahas_collection(collection_name):
+                return None
+
+            result = await self.async_client.search(
+                index=self._get_index_name(collection_name),
+                body=self._search_body(vectors, limit, filter),
+            )
+            return self._result_to_search_result(result)
+        except Exception as e:
+            return None
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not await self.ahas_collection(collection_name):
+            return None
+
+        try:
+            result = await self.async_client.search(
+                index=self._get_index_name(collection_name),
+                body=self._query_body(filter),
+                size=limit if limit else 10000,
+            )
+            return self._result_to_get_result(result)
+        except Exception as e:
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        query = {"query": {"match_all": {}}, "_source": ["text", "metadata"]}
+
+        result = await self.async_client.search(
+            index=self._get_index_name(collection_name), body=query
+        )
+        return self._result_to_get_result(result)
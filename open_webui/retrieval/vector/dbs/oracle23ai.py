@@ -26,7 +26,7 @@ ORACLE_DB_POOL_MAX = 10
 ORACLE_DB_POOL_INCREMENT = 1
 """
 
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Iterator, Union
 from decimal import Decimal
 import logging
 import os
@@ -55,7 +55,7 @@ from open_webui.config import (
     ORACLE_DB_POOL_MAX,
     ORACLE_DB_POOL_INCREMENT,
 )
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import SRC_LOG_LEVELS, VECTOR_DB_ITER_BATCH_SIZE
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
@@ -523,7 +523,11 @@ class Oracle23aiClient(VectorDBBase):
                 raise
 
     def search(
-        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
     ) -> Optional[SearchResult]:
         """
         Search for similar vectors in the database.
@@ -534,6 +538,7 @@ class Oracle23aiClient(VectorDBBase):
             collection_name (str): Name of the collection to search
             vectors (List[List[Union[float, int]]]): Query vectors to find similar items for
             limit (int): Maximum number of results to return per query
+            filter (Optional[Dict]): Metadata filters every result must match
 
         Returns:
             Optional[SearchResult]: Search results containing ids, distances, documents, and metadata
@@ -563,18 +568,25 @@ class Oracle23aiClient(VectorDBBase):
             documents = [[] for _ in range(num_queries)]
             metadatas = [[] for _ in range(num_queries)]
 
+            filter_clause = ""
+            filter_params = {}
+            for i, (key, value) in enumerate((filter or {}).items()):
+                param_name = f"value_{i}"
+                filter_clause += f" AND JSON_VALUE(dc.vmetadata, '$.{key}' RETURNING VARCHAR2(4096)) = :{param_name}"
+                filter_params[param_name] = str(value)
+
             with self.get_connection() as connection:
                 with connection.cursor() as cursor:
                     for qid, vector in enumerate(vectors):
                         vector_blob = self._vector_to_blob(vector)
 
                         cursor.execute(
-                            """
+                            f"""
                             SELECT dc.id, dc.text, 
                                 JSON_SERIALIZE(dc.vmetadata RETURNING VARCHAR2(4096)) as vmetadata,
                                 VECTOR_DISTANCE(dc.vector, :query_vector, COSINE) as distance
                             FROM document_chunk dc
-                            WHERE dc.collection_name = :collection_name
+                            WHERE dc.collection_name = :collection_name{filter_clause}
                             ORDER BY VECTOR_DISTANCE(dc.vector, :query_vector, COSINE)
                             FETCH APPROX FIRST :limit ROWS ONLY
                         """,
@@ -582,6 +594,7 @@ class Oracle23aiClient(VectorDBBase):
                                 "query_vector": vector_blob,
                                 "collection_name": collection_name,
                                 "limit": limit,
+                                **filter_params,
                             },
                         )
 
@@ -760,6 +773,78 @@ class Oracle23aiClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        """
+        Iterate over all items in a collection page by page.
+
+        Uses keyset pagination on the primary key, so every page is an
+        index range scan regardless of how deep into the collection it is.
+
+        Args:
+            collection_name (str): Name of the collection to iterate
+            batch_size (int): Maximum number of items per page
+            include_vectors (bool): Whether to return the stored vectors
+
+        Yields:
+            GetResult: One page of ids, documents and metadata
+        """
+        columns = "id, text, JSON_SERIALIZE(vmetadata RETURNING VARCHAR2(4096))"
+        if include_vectors:
+            columns += ", vector"
+
+        last_id = None
+        while True:
+            with self.get_connection() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"""
+                        SELECT {columns}
+                        FROM document_chunk
+                        WHERE collection_name = :collection_name
+                        AND (:last_id IS NULL OR id > :last_id)
+                        ORDER BY id
+                        FETCH FIRST :limit ROWS ONLY
+                    """,
+                        {
+                            "collection_name": collection_name,
+                            "last_id": last_id,
+                            "limit": batch_size,
+                        },
+                    )
+                    results = cursor.fetchall()
+
+            if not results:
+                return
+
+            yield GetResult(
+                ids=[[row[0] for row in results]],
+                documents=[
+                    [
+                        row[1].read() if isinstance(row[1], oracledb.LOB) else str(row[1])
+                        for row in results
+                    ]
+                ],
+                metadatas=[
+                    [
+                        self._json_to_metadata(
+                            row[2].read() if isinstance(row[2], oracledb.LOB) else row[2]
+                        )
+                        for row in results
+                    ]
+                ],
+                vectors=(
+                    [[list(row[3]) for row in results]] if include_vectors else None
+                ),
+            )
+            if len(results) < batch_size:
+                return
+            last_id = results[-1][0]
+
     def delete(
         self,
         collection_name: str,
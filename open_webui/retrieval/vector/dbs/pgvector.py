@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 import logging
 import json
 from sqlalchemy import (
@@ -45,7 +45,7 @@ from open_webui.config import (
     PGVECTOR_POOL_RECYCLE,
 )
 
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import SRC_LOG_LEVELS, VECTOR_DB_ITER_BATCH_SIZE
 
 VECTOR_LENGTH = PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH
 Base = declarative_base()
@@ -77,8 +77,20 @@ class DocumentChunk(Base):
         vmetadata = Column(MutableDict.as_mutable(JSONB), nullable=True)
 
 
+def to_async_database_url(url: Optional[str]) -> Optional[str]:
+    """Return the asyncpg form of a PostgreSQL URL, or None for other databases."""
+    if not url:
+        return None
+    scheme, sep, rest = url.partition("://")
+    if not sep or scheme.split("+")[0] not in ("postgres", "postgresql"):
+        return None
+    return f"postgresql+asyncpg://{rest}"
+
+
 class PgvectorClient(VectorDBBase):
     def __init__(self) -> None:
+        self._async_engine = None
+        self._async_engine_failed = False
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
@@ -319,11 +331,111 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during upsert: {e}")
             raise
 
+    def _search_statement(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        limit: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ):
+        def vector_expr(vector):
+            return cast(array(vector), Vector(VECTOR_LENGTH))
+
+        # Create the values for query vectors
+        qid_col = column("qid", Integer)
+        q_vector_col = column("q_vector", Vector(VECTOR_LENGTH))
+        query_vectors = (
+            values(qid_col, q_vector_col)
+            .data(
+                [(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)]
+            )
+            .alias("query_vectors")
+        )
+
+        result_fields = [
+            DocumentChunk.id,
+        ]
+        if PGVECTOR_PGCRYPTO:
+            result_fields.append(
+                pgcrypto_decrypt(
+                    DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+                ).label("text")
+            )
+            result_fields.append(
+                pgcrypto_decrypt(
+                    DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                ).label("vmetadata")
+            )
+        else:
+            result_fields.append(DocumentChunk.text)
+            result_fields.append(DocumentChunk.vmetadata)
+        result_fields.append(
+            (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
+                "distance"
+            )
+        )
+
+        where_clauses = [DocumentChunk.collection_name == collection_name]
+        for key, value in (filter or {}).items():
+            metadata = (
+                pgcrypto_decrypt(DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB)
+                if PGVECTOR_PGCRYPTO
+                else DocumentChunk.vmetadata
+            )
+            where_clauses.append(metadata[key].astext == str(value))
+
+        # Build the lateral subquery for each query vector
+        subq = (
+            select(*result_fields)
+            .where(*where_clauses)
+            .order_by(
+                (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
+            )
+        )
+        if limit is not None:
+            subq = subq.limit(limit)
+        subq = subq.lateral("result")
+
+        # Build the main query by joining query_vectors and the lateral subquery
+        stmt = (
+            select(
+                query_vectors.c.qid,
+                subq.c.id,
+                subq.c.text,
+                subq.c.vmetadata,
+                subq.c.distance,
+            )
+            .select_from(query_vectors)
+            .join(subq, true())
+            .order_by(query_vectors.c.qid, subq.c.distance)
+        )
+        return stmt
+
+    def _search_result(self, results, num_queries: int) -> SearchResult:
+        ids = [[] for _ in range(num_queries)]
+        distances = [[] for _ in range(num_queries)]
+        documents = [[] for _ in range(num_queries)]
+        metadatas = [[] for _ in range(num_queries)]
+
+        for row in results:
+            qid = int(row.qid)
+            ids[qid].append(row.id)
+            # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
+            # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
+            distances[qid].append((2.0 - row.distance) / 2.0)
+            documents[qid].append(row.text)
+            metadatas[qid].append(row.vmetadata)
+
+        return SearchResult(
+            ids=ids, distances=distances, documents=documents, metadatas=metadatas
+        )
+
     def search(
         self,
         collection_name: str,
         vectors: List[List[float]],
         limit: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
     ) -> Optional[SearchResult]:
         try:
             if not vectors:
@@ -332,99 +444,13 @@ class PgvectorClient(VectorDBBase):
             # Adjust query vectors to VECTOR_LENGTH
             vectors = [self.adjust_vector_length(vector) for vector in vectors]
             num_queries = len(vectors)
-
-            def vector_expr(vector):
-                return cast(array(vector), Vector(VECTOR_LENGTH))
-
-            # Create the values for query vectors
-            qid_col = column("qid", Integer)
-            q_vector_col = column("q_vector", Vector(VECTOR_LENGTH))
-            query_vectors = (
-                values(qid_col, q_vector_col)
-                .data(
-                    [(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)]
-                )
-                .alias("query_vectors")
-            )
-
-            result_fields = [
-                DocumentChunk.id,
-            ]
-            if PGVECTOR_PGCRYPTO:
-                result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text")
-                )
-                result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata")
-                )
-            else:
-                result_fields.append(DocumentChunk.text)
-                result_fields.append(DocumentChunk.vmetadata)
-            result_fields.append(
-                (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
-                    "distance"
-                )
-            )
-
-            # Build the lateral subquery for each query vector
-            subq = (
-                select(*result_fields)
-                .where(DocumentChunk.collection_name == collection_name)
-                .order_by(
-                    (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
-                )
-            )
-            if limit is not None:
-                subq = subq.limit(limit)
-            subq = subq.lateral("result")
-
-            # Build the main query by joining query_vectors and the lateral subquery
-            stmt = (
-                select(
-                    query_vectors.c.qid,
-                    subq.c.id,
-                    subq.c.text,
-                    subq.c.vmetadata,
-                    subq.c.distance,
-                )
-                .select_from(query_vectors)
-                .join(subq, true())
-                .order_by(query_vectors.c.qid, subq.c.distance)
-            )
+            stmt = self._search_statement(collection_name, vectors, limit, filter)
 
             result_proxy = self.session.execute(stmt)
             results = result_proxy.all()
 
-            ids = [[] for _ in range(num_queries)]
-            distances = [[] for _ in range(num_queries)]
-            documents = [[] for _ in range(num_queries)]
-            metadatas = [[] for _ in range(num_queries)]
-
-            if not results:
-                return SearchResult(
-                    ids=ids,
-                    distances=distances,
-                    documents=documents,
-                    metadatas=metadatas,
-                )
-
-            for row in results:
-                qid = int(row.qid)
-                ids[qid].append(row.id)
-                # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
-                # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
-                distances[qid].append((2.0 - row.distance) / 2.0)
-                documents[qid].append(row.text)
-                metadatas[qid].append(row.vmetadata)
-
             self.session.rollback()  # read-only transaction
-            return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
-            )
+            return self._search_result(results, num_queries)
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during search: {e}")
@@ -534,6 +560,57 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        # Keyset pagination on the primary key; each page is its own
+        # short read-only transaction.
+        if PGVECTOR_PGCRYPTO:
+            text_column = pgcrypto_decrypt(
+                DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+            ).label("text")
+            metadata_column = pgcrypto_decrypt(
+                DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+            ).label("vmetadata")
+        else:
+            text_column = DocumentChunk.text
+            metadata_column = DocumentChunk.vmetadata
+        columns = [DocumentChunk.id, text_column, metadata_column]
+        if include_vectors:
+            columns.append(DocumentChunk.vector)
+
+        last_id = None
+        while True:
+            stmt = select(*columns).where(
+                DocumentChunk.collection_name == collection_name
+            )
+            if last_id is not None:
+                stmt = stmt.where(DocumentChunk.id > last_id)
+            stmt = stmt.order_by(DocumentChunk.id).limit(batch_size)
+            try:
+                results = self.session.execute(stmt).all()
+            finally:
+                self.session.rollback()  # read-only transaction
+            if not results:
+                return
+
+            yield GetResult(
+                ids=[[row.id for row in results]],
+                documents=[[row.text for row in results]],
+                metadatas=[[row.vmetadata for row in results]],
+                vectors=(
+                    [[list(map(float, row.vector)) for row in results]]
+                    if include_vectors
+                    else None
+                ),
+            )
+            if len(results) < batch_size:
+                return
+            last_id = results[-1].id
+
     def delete(
         self,
         collection_name: str,
@@ -590,6 +667,50 @@ class PgvectorClient(VectorDBBase):
     def close(self) -> None:
         pass
 
+    def _get_async_engine(self):
+        """Lazily create an asyncpg engine; None when asyncpg is not usable."""
+        if self._async_engine is None and not self._async_engine_failed:
+            from open_webui.env import DATABASE_URL
+
+            async_url = to_async_database_url(PGVECTOR_DB_URL or DATABASE_URL)
+            try:
+                if async_url is None:
+                    raise ValueError("not a PostgreSQL database URL")
+
+                from sqlalchemy.ext.asyncio import create_async_engine
+
+                self._async_engine = create_async_engine(
+                    async_url, pool_pre_ping=True
+                )
+            except Exception as e:
+                log.info(f"Async pgvector search disabled, using executor: {e}")
+                self._async_engine_failed = True
+        return self._async_engine
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        limit: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> Optional[SearchResult]:
+        engine = self._get_async_engine()
+        if engine is None:
+            return await super().asearch(collection_name, vectors, limit, filter)
+
+        try:
+            if not vectors:
+                return None
+
+            vectors = [self.adjust_vector_length(vector) for vector in vectors]
+            stmt = self._search_statement(collection_name, vectors, limit, filter)
+            async with engine.connect() as connection:
+                results = (await connection.execute(stmt)).all()
+            return self._search_result(results, len(vectors))
+        except Exception as e:
+            log.exception(f"Error during search: {e}")
+            return None
+
     def has_collection(self, collection_name: str) -> bool:
         try:
             exists = (
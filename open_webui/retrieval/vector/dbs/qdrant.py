@@ -1,8 +1,8 @@
-from typing import Optional
+from typing import Iterator, Optional
 import logging
 from urllib.parse import urlparse
 
-from qdrant_client import QdrantClient as Qclient
+from qdrant_client import AsyncQdrantClient, QdrantClient as Qclient
 from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
 
@@ -22,7 +22,7 @@ from open_webui.config import (
     QDRANT_TIMEOUT,
     QDRANT_HNSW_M,
 )
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import SRC_LOG_LEVELS, VECTOR_DB_ITER_BATCH_SIZE
 
 NO_LIMIT = 999999999
 
@@ -41,30 +41,73 @@ class QdrantClient(VectorDBBase):
         self.QDRANT_TIMEOUT = QDRANT_TIMEOUT
         self.QDRANT_HNSW_M = QDRANT_HNSW_M
 
+        self._async_client = None
+
         if not self.QDRANT_URI:
             self.client = None
             return
 
-        # Unified handling for either scheme
-        parsed = urlparse(self.QDRANT_URI)
-        host = parsed.hostname or self.QDRANT_URI
-        http_port = parsed.port or 6333  # default REST port
+        self.client = Qclient(**self._client_kwargs())
 
+    def _client_kwargs(self) -> dict:
+        # Unified handling for either scheme
         if self.PREFER_GRPC:
-            self.client = Qclient(
-                host=host,
-                port=http_port,
+            parsed = urlparse(self.QDRANT_URI)
+            return dict(
+                host=parsed.hostname or self.QDRANT_URI,
+                port=parsed.port or 6333,  # default REST port
                 grpc_port=self.GRPC_PORT,
                 prefer_grpc=self.PREFER_GRPC,
                 api_key=self.QDRANT_API_KEY,
                 timeout=self.QDRANT_TIMEOUT,
             )
-        else:
-            self.client = Qclient(
-                url=self.QDRANT_URI,
-                api_key=self.QDRANT_API_KEY,
-                timeout=QDRANT_TIMEOUT,
+        return dict(
+            url=self.QDRANT_URI,
+            api_key=self.QDRANT_API_KEY,
+            timeout=self.QDRANT_TIMEOUT,
+        )
+
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        # Created lazily so it binds to the running event loop
+        if self._async_client is None:
+            self._async_client = AsyncQdrantClient(**self._client_kwargs())
+        return self._async_client
+
+    def _search_result(self, query_response) -> SearchResult:
+        get_result = self._result_to_get_result(query_response.points)
+        return SearchResult(
+            ids=get_result.ids,
+            documents=get_result.documents,
+            metadatas=get_result.metadatas,
+            # qdrant distance is [-1, 1], normalize to [0, 1]
+            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
+        )
+
+    def _field_conditions(self, filter: dict) -> list:
+        return [
+            models.FieldCondition(
+                key=f"metadata.{key}", match=models.MatchValue(value=value)
             )
+            for key, value in filter.items()
+        ]
+
+    def _delete_selector(
+        self, ids: Optional[list[str]] = None, filter: Optional[dict] = None
+    ) -> models.FilterSelector:
+        if ids:
+            field_conditions = [
+                models.FieldCondition(
+                    key="metadata.id",
+                    match=models.MatchValue(value=id_value),
+                )
+                for id_value in ids
+            ]
+        elif filter:
+            field_conditions = self._field_conditions(filter)
+        else:
+            field_conditions = []
+        return models.FilterSelector(filter=models.Filter(must=field_conditions))
 
     def _result_to_get_result(self, points) -> GetResult:
         ids = []
@@ -146,8 +189,16 @@ class QdrantClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}"
         )
 
+    def _search_filter(self, filter: Optional[dict]) -> Optional[models.Filter]:
+        # Every condition must match, unlike query() which ORs them
+        return models.Filter(must=self._field_conditions(filter)) if filter else None
+
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         if limit is None:
@@ -157,15 +208,9 @@ class QdrantClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}",
             query=vectors[0],
             limit=limit,
+            query_filter=self._search_filter(filter),
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
-        )
+        return self._search_result(query_response)
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
         # Construct the filter string for querying
@@ -175,17 +220,9 @@ class QdrantClient(VectorDBBase):
             if limit is None:
                 limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-            field_conditions = []
-            for key, value in filter.items():
-                field_conditions.append(
-                    models.FieldCondition(
-                        key=f"metadata.{key}", match=models.MatchValue(value=value)
-                    )
-                )
-
             points = self.client.scroll(
                 collection_name=f"{self.collection_prefix}_{collection_name}",
-                scroll_filter=models.Filter(should=field_conditions),
+                scroll_filter=models.Filter(should=self._field_conditions(filter)),
                 limit=limit,
             )
             return self._result_to_get_result(points[0])
@@ -201,6 +238,29 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        # Follow the scroll cursor returned with each page.
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                limit=batch_size,
+                offset=offset,
+                with_vectors=include_vectors,
+            )
+            if points:
+                result = self._result_to_get_result(points)
+                if include_vectors:
+                    result.vectors = [[point.vector for point in points]]
+                yield result
+            if offset is None:
+                return
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]["vector"]))
@@ -220,30 +280,9 @@ class QdrantClient(VectorDBBase):
         filter: Optional[dict] = None,
     ):
         # Delete the items from the collection based on the ids.
-        field_conditions = []
-
-        if ids:
-            for id_value in ids:
-                field_conditions.append(
-                    models.FieldCondition(
-                        key="metadata.id",
-                        match=models.MatchValue(value=id_value),
-                    ),
-                ),
-        elif filter:
-            for key, value in filter.items():
-                field_conditions.append(
-                    models.FieldCondition(
-                        key=f"metadata.{key}",
-                        match=models.MatchValue(value=value),
-                    ),
-                ),
-
         return self.client.delete(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            points_selector=models.FilterSelector(
-                filter=models.Filter(must=field_conditions)
-            ),
+            points_selector=self._delete_selector(ids, filter),
         )
 
     def reset(self):
@@ -252,3 +291,67 @@ class QdrantClient(VectorDBBase):
         for collection_name in collection_names:
             if collection_name.name.startswith(self.collection_prefix):
                 self.client.delete_collection(collection_name=collection_name.name)
+
+    # Native async interface
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await self.async_client.collection_exists(
+            f"{self.collection_prefix}_{collection_name}"
+        )
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
+    ) -> Optional[SearchResult]:
+        if limit is None:
+            limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+        query_response = await self.async_client.query_points(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            query=vectors[0],
+            limit=limit,
+            query_filter=self._search_filter(filter),
+        )
+        return self._search_result(query_response)
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not await self.ahas_collection(collection_name):
+            return None
+        try:
+            points = await self.async_client.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                scroll_filter=models.Filter(should=self._field_conditions(filter)),
+                limit=limit if limit is not None else NO_LIMIT,
+            )
+            return self._result_to_get_result(points[0])
+        except Exception as e:
+            log.exception(f"Error querying a collection '{collection_name}': {e}")
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        points = await self.async_client.scroll(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            limit=NO_LIMIT,
+        )
+        return self._result_to_get_result(points[0])
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        return await self.async_client.delete(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            points_selector=self._delete_selector(ids, filter),
+        )
+
+    async def adelete_collection(self, collection_name: str):
+        return await self.async_client.delete_collection(
+            collection_name=f"{self.collection_prefix}_{collection_name}"
+        )
@@ -6,8 +6,8 @@ from open_webui.retrieval.vector.main import (
     SearchResult,
 )
 from open_webui.config import S3_VECTOR_BUCKET_NAME, S3_VECTOR_REGION
-from open_webui.env import SRC_LOG_LEVELS
-from typing import List, Optional, Dict, Any, Union
+from open_webui.env import SRC_LOG_LEVELS, VECTOR_DB_ITER_BATCH_SIZE
+from typing import List, Optional, Dict, Any, Iterator, Union
 import logging
 import boto3
 
@@ -273,7 +273,11 @@ class S3VectorClient(VectorDBBase):
             raise
 
     def search(
-        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
     ) -> Optional[SearchResult]:
         """
         Search for similar vectors in a collection using multiple query vectors.
@@ -313,6 +317,11 @@ class S3VectorClient(VectorDBBase):
                     queryVector=query_vector_dict,
                     returnMetadata=True,
                     returnDistance=True,
+                    **(
+                        {"filter": {k: {"$eq": v} for k, v in filter.items()}}
+                        if filter
+                        else {}
+                    ),
                 )
 
                 # Process results for this query
@@ -466,6 +475,75 @@ class S3VectorClient(VectorDBBase):
                     return GetResult(ids=[[]], documents=[[]], metadatas=[[]])
             raise
 
+    @staticmethod
+    def _document_text(vector_id: str, vector_metadata: Any) -> str:
+        """
+        For documents, we try to extract text from metadata or use the vector ID.
+        """
+        if not isinstance(vector_metadata, dict):
+            return vector_id
+        # Get the text field first (highest priority), then other possible text fields
+        document_text = (
+            vector_metadata.get("text")
+            or vector_metadata.get("content")
+            or vector_metadata.get("document")
+            or vector_id
+        )
+        log.debug(
+            f"Document text preview (first 200 chars): {str(document_text)[:200]}"
+        )
+        return document_text
+
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        """
+        Iterate over a collection one list_vectors page at a time.
+        """
+        if not self.has_collection(collection_name):
+            return
+
+        next_token = None
+        while True:
+            request_params = {
+                "vectorBucketName": self.bucket_name,
+                "indexName": collection_name,
+                "returnData": include_vectors,
+                "returnMetadata": True,
+                # list_vectors returns at most 1000 vectors per page
+                "maxResults": min(batch_size, 1000),
+            }
+            if next_token:
+                request_params["nextToken"] = next_token
+
+            response = self.client.list_vectors(**request_params)
+            vectors = response.get("vectors", [])
+            if vectors:
+                ids, documents, metadatas = [], [], []
+                for vector in vectors:
+                    vector_id = vector.get("key")
+                    vector_metadata = vector.get("metadata", {})
+                    ids.append(vector_id)
+                    documents.append(self._document_text(vector_id, vector_metadata))
+                    metadatas.append(vector_metadata)
+                yield GetResult(
+                    ids=[ids],
+                    documents=[documents],
+                    metadatas=[metadatas],
+                    vectors=(
+                        [[v.get("data", {}).get("float32", []) for v in vectors]]
+                        if include_vectors
+                        else None
+                    ),
+                )
+
+            next_token = response.get("nextToken")
+            if not next_token:
+                return
+
     def get(self, collection_name: str) -> Optional[GetResult]:
         """
         Retrieve all vectors from a collection.
@@ -507,31 +585,8 @@ class S3VectorClient(VectorDBBase):
 
                 for vector in vectors:
                     vector_id = vector.get("key")
-                    vector_data = vector.get("data", {})
                     vector_metadata = vector.get("metadata", {})
-
-                    # Extract the actual vector array
-                    vector_array = vector_data.get("float32", [])
-
-                    # For documents, we try to extract text from metadata or use the vector ID
-                    document_text = ""
-                    if isinstance(vector_metadata, dict):
-                        # Get the text field first (highest priority)
-                        document_text = vector_metadata.get("text")
-                        if not document_text:
-                            # Fallback to other possible text fields
-                            document_text = (
-                                vector_metadata.get("content")
-                                or vector_metadata.get("document")
-                                or vector_id
-                            )
-
-                        # Log the actual content for debugging
-                        log.debug(
-                            f"Document text preview (first 200 chars): {str(document_text)[:200]}"
-                        )
-                    else:
-                        document_text = vector_id
+                    document_text = self._document_text(vector_id, vector_metadata)
 
                     all_ids.append(vector_id)
                     all_documents.append(document_text)
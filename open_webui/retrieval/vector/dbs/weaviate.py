@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, List, Union, Any, Dict
+from typing import Optional, List, Union, Any, Dict, Iterator
 
 from open_webui.retrieval.vector.main import (
     VectorDBBase,
@@ -7,7 +7,7 @@ from open_webui.retrieval.vector.main import (
     SearchResult,
     GetResult,
 )
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import SRC_LOG_LEVELS, VECTOR_DB_ITER_BATCH_SIZE
 from open_webui.config import WEAVIATE_URL, WEAVIATE_COLLECTION_PREFIX
 
 log = logging.getLogger(__name__)
@@ -30,6 +30,8 @@ class WeaviateClient(VectorDBBase):
         self.url = WEAVIATE_URL
         self.collection_prefix = WEAVIATE_COLLECTION_PREFIX
         self._client = None
+        self._async_client = None
+        self._async_client_failed = False
 
         if not self.url:
             log.warning("WEAVIATE_URL is not configured; WeaviateClient disabled")
@@ -113,6 +115,58 @@ class WeaviateClient(VectorDBBase):
                     }
                 )
 
+    @staticmethod
+    def _near_vector_result(res) -> SearchResult:
+        ids = []
+        texts = []
+        metas = []
+        dists = []
+        for obj in getattr(res, "objects", []) or []:
+            ids.append(getattr(obj, "uuid", None))
+            properties = getattr(obj, "properties", {}) or {}
+            texts.append(properties.get("text"))
+            metas.append(properties.get("metadata"))
+            meta = getattr(obj, "metadata", None)
+            dists.append(getattr(meta, "distance", 0.0) if meta else 0.0)
+
+        return SearchResult(
+            ids=[ids],
+            documents=[texts],
+            metadatas=[metas],
+            distances=[dists],
+        )
+
+    async def _get_async_client(self):
+        """
+        Lazily connect the v4 async client. Returns None when the installed
+        client has no async API, so callers fall back to the executor.
+        """
+        if self._async_client is None and not self._async_client_failed:
+            try:
+                import weaviate
+                from urllib.parse import urlparse
+
+                if not self.url or not hasattr(weaviate, "use_async_with_custom"):
+                    raise RuntimeError("async client unavailable")
+
+                parsed = urlparse(self.url)
+                host = parsed.hostname or "localhost"
+                secure = parsed.scheme == "https"
+                client = weaviate.use_async_with_custom(
+                    http_host=host,
+                    http_port=parsed.port or 8080,
+                    http_secure=secure,
+                    grpc_host=host,
+                    grpc_port=50051,
+                    grpc_secure=secure,
+                )
+                await client.connect()
+                self._async_client = client
+            except Exception as e:
+                log.info(f"Weaviate async client disabled, using executor: {e}")
+                self._async_client_failed = True
+        return self._async_client
+
     def _require_client(self):
         if self._client is None:
             raise RuntimeError(
@@ -179,34 +233,41 @@ class WeaviateClient(VectorDBBase):
                     )
 
     def search(
-        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
     ) -> Optional[SearchResult]:
         client = self._require_client()
         if not vectors:
             return None
         name = self._collection_name(collection_name)
 
+        # metadata is a nested object, which Weaviate cannot filter on; resolve
+        # the matching ids first and restrict the vector search to them
+        ids = None
+        if filter:
+            matched = self.query(collection_name, filter)
+            ids = [i for i in (matched.ids[0] if matched and matched.ids else []) if i]
+            if not ids:
+                return SearchResult(
+                    ids=[[]], documents=[[]], metadatas=[[]], distances=[[]]
+                )
+
         if hasattr(client, "collections"):
             coll = client.collections.get(name)
-            res = coll.query.near_vector(near_vector=vectors[0], limit=limit)
-            ids = []
-            texts = []
-            metas = []
-            dists = []
-            for obj in getattr(res, "objects", []) or []:
-                ids.append(getattr(obj, "uuid", None))
-                properties = getattr(obj, "properties", {}) or {}
-                texts.append(properties.get("text"))
-                metas.append(properties.get("metadata"))
-                meta = getattr(obj, "metadata", None)
-                dists.append(getattr(meta, "distance", 0.0) if meta else 0.0)
-
-            return SearchResult(
-                ids=[ids],
-                documents=[texts],
-                metadatas=[metas],
-                distances=[dists],
-            )
+            if ids is not None:
+                from weaviate.classes.query import Filter
+
+                res = coll.query.near_vector(
+                    near_vector=vectors[0],
+                    limit=limit,
+                    filters=Filter.by_id().contains_any(ids),
+                )
+            else:
+                res = coll.query.near_vector(near_vector=vectors[0], limit=limit)
+            return self._near_vector_result(res)
         else:
             # v3 GraphQL
             query = (
@@ -214,6 +275,10 @@ class WeaviateClient(VectorDBBase):
                     {"vector": vectors[0]}
                 ).with_limit(limit)
             )
+            if ids is not None:
+                query = query.with_where(
+                    {"path": ["id"], "operator": "ContainsAny", "valueTextArray": ids}
+                )
             result = query.do()
             data = (((result or {}).get("data") or {}).get("Get") or {}).get(name) or []
 
@@ -227,6 +292,23 @@ class WeaviateClient(VectorDBBase):
 
             return SearchResult(ids=[ids], documents=[texts], metadatas=[metas], distances=[[]])
 
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
+    ) -> Optional[SearchResult]:
+        client = await self._get_async_client()
+        if client is None or filter:
+            return await super().asearch(collection_name, vectors, limit, filter)
+        if not vectors:
+            return None
+
+        coll = client.collections.get(self._collection_name(collection_name))
+        res = await coll.query.near_vector(near_vector=vectors[0], limit=limit)
+        return self._near_vector_result(res)
+
     def query(self, collection_name: str, filter: Dict, limit: Optional[int] = None) -> Optional[GetResult]:
         # 简化实现：取回集合后在本地基于 metadata 做过滤
         all_items = self.get(collection_name)
@@ -284,6 +366,50 @@ class WeaviateClient(VectorDBBase):
                 metas.append(obj.get("metadata"))
             return GetResult(ids=[ids], documents=[texts], metadatas=[metas])
 
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        client = self._require_client()
+        if not hasattr(client, "collections"):
+            # v3 has no cursor API here; page through get()
+            yield from super().iter_get(collection_name, batch_size, include_vectors)
+            return
+
+        # v4 cursor iterator, fetching batch_size objects per request
+        coll = client.collections.get(self._collection_name(collection_name))
+        objects = coll.iterator(include_vector=include_vectors, cache_size=batch_size)
+        page = []
+        for obj in objects:
+            page.append(obj)
+            if len(page) == batch_size:
+                yield self._objects_to_page(page, include_vectors)
+                page = []
+        if page:
+            yield self._objects_to_page(page, include_vectors)
+
+    @staticmethod
+    def _objects_to_page(objects: list, include_vectors: bool) -> GetResult:
+        ids, texts, metas, vectors = [], [], [], []
+        for obj in objects:
+            ids.append(str(obj.uuid))
+            properties = getattr(obj, "properties", {}) or {}
+            texts.append(properties.get("text"))
+            metas.append(properties.get("metadata"))
+            if include_vectors:
+                vector = getattr(obj, "vector", None) or {}
+                if isinstance(vector, dict):
+                    vector = vector.get("default")
+                vectors.append(vector)
+        return GetResult(
+            ids=[ids],
+            documents=[texts],
+            metadatas=[metas],
+            vectors=[vectors] if include_vectors else None,
+        )
+
     def delete(
         self,
         collection_name: str,
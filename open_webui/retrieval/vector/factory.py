@@ -61,6 +61,10 @@ class Vector:
                 from open_webui.retrieval.vector.dbs.weaviate import WeaviateClient
 
                 return WeaviateClient()
+            case VectorType.LOCAL:
+                from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+
+                return LocalVectorClient()
             case _:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
@@ -1,6 +1,16 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Union
+
+from open_webui.env import VECTOR_DB_ASYNC_MAX_WORKERS, VECTOR_DB_ITER_BATCH_SIZE
+
+log = logging.getLogger(__name__)
 
 
 class VectorItem(BaseModel):
@@ -14,6 +24,8 @@ class GetResult(BaseModel):
     ids: Optional[List[List[str]]]
     documents: Optional[List[List[str]]]
     metadatas: Optional[List[List[Any]]]
+    # Only filled by iter_get(include_vectors=True)
+    vectors: Optional[List[List[List[float | int]]]] = None
 
 
 class SearchResult(GetResult):
@@ -26,6 +38,87 @@ def get_retrieval_vector_db():
     return VECTOR_DB_CLIENT
 
 
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_vector_db_executor() -> ThreadPoolExecutor:
+    """Bounded pool shared by the async wrappers around synchronous clients."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=VECTOR_DB_ASYNC_MAX_WORKERS,
+                thread_name_prefix="vector-db",
+            )
+        return _executor
+
+
+async def run_in_vector_db_executor(func: Callable, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_vector_db_executor(), partial(func, *args, **kwargs)
+    )
+
+
+# Called with the collection name after every write, or with None after a
+# reset, so caches of search results can tell when a collection changed.
+_write_listeners: List[Callable[[Optional[str]], None]] = []
+
+# Methods that change a collection; wrapped on every backend class
+WRITE_METHODS = (
+    "insert",
+    "upsert",
+    "delete",
+    "delete_collection",
+    "ainsert",
+    "aupsert",
+    "adelete",
+    "adelete_collection",
+)
+RESET_METHODS = ("reset", "areset")
+
+
+def add_write_listener(listener: Callable[[Optional[str]], None]) -> None:
+    _write_listeners.append(listener)
+
+
+def notify_write(collection_name: Optional[str]) -> None:
+    for listener in _write_listeners:
+        try:
+            listener(collection_name)
+        except Exception:
+            log.exception("Vector write listener failed")
+
+
+def _notifying(func: Callable, reset: bool) -> Callable:
+    def collection_of(args, kwargs) -> Optional[str]:
+        if reset:
+            return None
+        return kwargs.get("collection_name", args[0] if args else None)
+
+    # Listeners run after the write, whether or not it succeeded
+    if asyncio.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                notify_write(collection_of(args, kwargs))
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            notify_write(collection_of(args, kwargs))
+
+    return wrapper
+
+
 class VectorDBBase(ABC):
     """
     Abstract base class for all vector database backends.
@@ -37,6 +130,13 @@ class VectorDBBase(ABC):
     implement all abstract methods.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in WRITE_METHODS + RESET_METHODS:
+            func = cls.__dict__.get(name)
+            if callable(func) and not getattr(func, "__isabstractmethod__", False):
+                setattr(cls, name, _notifying(func, reset=name in RESET_METHODS))
+
     @abstractmethod
     def has_collection(self, collection_name: str) -> bool:
         """Check if the collection exists in the vector DB."""
@@ -59,9 +159,17 @@ class VectorDBBase(ABC):
 
     @abstractmethod
     def search(
-        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
     ) -> Optional[SearchResult]:
-        """Search for similar vectors in a collection."""
+        """Search for similar vectors in a collection.
+
+        filter restricts the candidates to items whose metadata matches every
+        key/value pair, the same way as in query() and delete().
+        """
         pass
 
     @abstractmethod
@@ -91,6 +199,117 @@ class VectorDBBase(ABC):
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
 
+    def iter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> Iterator[GetResult]:
+        """
+        Iterate over a collection one page of at most batch_size items at a
+        time, so callers that export, migrate or reindex a collection never
+        hold more than one page in memory.
+
+        Backends override this with their native cursor (scroll, keyset or
+        query iterator). This fallback pages through the result of get() and
+        cannot return vectors.
+        """
+        result = self.get(collection_name)
+        if not result or not result.ids:
+            return
+        ids, documents, metadatas = (
+            result.ids[0],
+            result.documents[0],
+            result.metadatas[0],
+        )
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            yield GetResult(
+                ids=[ids[start:end]],
+                documents=[documents[start:end]],
+                metadatas=[metadatas[start:end]],
+            )
+
+    # Async interface. Backends with a native async client override these;
+    # the defaults run the synchronous methods in a bounded thread pool so
+    # concurrent calls from the event loop still overlap.
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await run_in_vector_db_executor(self.has_collection, collection_name)
+
+    async def adelete_collection(self, collection_name: str) -> None:
+        return await run_in_vector_db_executor(self.delete_collection, collection_name)
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await run_in_vector_db_executor(self.insert, collection_name, items)
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await run_in_vector_db_executor(self.upsert, collection_name, items)
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
+    ) -> Optional[SearchResult]:
+        # Only pass filter when set, for subclasses whose search() predates it
+        kwargs = {"filter": filter} if filter else {}
+        return await run_in_vector_db_executor(
+            self.search, collection_name, vectors, limit, **kwargs
+        )
+
+    async def aquery(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return await run_in_vector_db_executor(
+            self.query, collection_name, filter, limit
+        )
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        return await run_in_vector_db_executor(self.get, collection_name)
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        return await run_in_vector_db_executor(
+            self.delete, collection_name, ids=ids, filter=filter
+        )
+
+    async def areset(self) -> None:
+        return await run_in_vector_db_executor(self.reset)
+
+    async def aiter_get(
+        self,
+        collection_name: str,
+        batch_size: int = VECTOR_DB_ITER_BATCH_SIZE,
+        include_vectors: bool = False,
+    ) -> AsyncIterator[GetResult]:
+        pages = self.iter_get(collection_name, batch_size, include_vectors)
+        done = object()
+        while (page := await run_in_vector_db_executor(next, pages, done)) is not done:
+            yield page
+
+
+def collect_get_pages(pages: Iterator[GetResult]) -> Optional[GetResult]:
+    """
+    Concatenate the pages of iter_get into one GetResult, or None when the
+    collection is empty or missing (like get()). Only the ids, documents and
+    metadata are kept, and the backend is never asked for the whole
+    collection in a single response.
+    """
+    ids, documents, metadatas = [], [], []
+    for page in pages:
+        ids.extend(page.ids[0])
+        documents.extend(page.documents[0])
+        metadatas.extend(page.metadatas[0])
+    if not ids:
+        return None
+    return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
+
 
 # Convenience accessor used across routers/services that expect a factory function
 def get_retrieval_vector_db():
@@ -40,6 +40,8 @@ from open_webui.config import (
     EXTERNAL_WEB_LOADER_API_KEY,
 )
 from open_webui.env import SRC_LOG_LEVELS, AIOHTTP_CLIENT_SESSION_SSL
+from open_webui.services.html_extractor import html_extractor
+from open_webui.services.web_page_cache import content_hash, web_page_cache
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
@@ -505,31 +507,52 @@ class SafeWebBaseLoader(WebBaseLoader):
         self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
     ) -> str:
         async with aiohttp.ClientSession(trust_env=self.trust_env) as session:
-            for i in range(retries):
-                try:
-                    kwargs: Dict = dict(
-                        headers=self.session.headers,
-                        cookies=self.session.cookies.get_dict(),
+            _, text, _ = await self._fetch_with_session(
+                session, url, retries=retries, cooldown=cooldown, backoff=backoff
+            )
+            return text
+
+    async def _fetch_with_session(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        retries: int = 3,
+        cooldown: int = 2,
+        backoff: float = 1.5,
+    ) -> tuple[int, str, Dict[str, str]]:
+        """Fetch a url on a shared session, returning (status, body, validators)."""
+        for i in range(retries):
+            try:
+                kwargs: Dict = dict(
+                    headers={**self.session.headers, **(headers or {})},
+                    cookies=self.session.cookies.get_dict(),
+                )
+                if not self.session.verify:
+                    kwargs["ssl"] = False
+
+                async with session.get(
+                    url,
+                    **(self.requests_kwargs | kwargs),
+                ) as response:
+                    validators_ = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                    if response.status == 304:
+                        return response.status, "", validators_
+                    if self.raise_for_status:
+                        response.raise_for_status()
+                    return response.status, await response.text(), validators_
+            except aiohttp.ClientConnectionError as e:
+                if i == retries - 1:
+                    raise
+                else:
+                    log.warning(
+                        f"Error fetching {url} with attempt "
+                        f"{i + 1}/{retries}: {e}. Retrying..."
                     )
-                    if not self.session.verify:
-                        kwargs["ssl"] = False
-
-                    async with session.get(
-                        url,
-                        **(self.requests_kwargs | kwargs),
-                    ) as response:
-                        if self.raise_for_status:
-                            response.raise_for_status()
-                        return await response.text()
-                except aiohttp.ClientConnectionError as e:
-                    if i == retries - 1:
-                        raise
-                    else:
-                        log.warning(
-                            f"Error fetching {url} with attempt "
-                            f"{i + 1}/{retries}: {e}. Retrying..."
-                        )
-                        await asyncio.sleep(cooldown * backoff**i)
+                    await asyncio.sleep(cooldown * backoff**i)
         raise ValueError("retry count exceeded")
 
     def _unpack_fetch_results(
@@ -557,40 +580,149 @@ class SafeWebBaseLoader(WebBaseLoader):
         results = await self.fetch_all(urls)
         return self._unpack_fetch_results(results, urls, parser=parser)
 
+    def _parser_for(self, path: str) -> str:
+        parser = "xml" if path.endswith(".xml") else self.default_parser
+        self._check_parser(parser)
+        return parser
+
+    def _extracted_document(self, path: str, page_hash: str) -> Optional[Document]:
+        """Return the cached extract for unchanged page content."""
+        cached = web_page_cache.get_extract(page_hash)
+        if cached is None:
+            return None
+        return Document(
+            page_content=cached["text"],
+            metadata={**cached["metadata"], "source": path},
+        )
+
+    async def _extract_document(
+        self, path: str, html: str, page_hash: str
+    ) -> Document:
+        """Parse a page body in the extraction pool unless the content is unchanged."""
+        if document := self._extracted_document(path, page_hash):
+            return document
+        text, metadata = await html_extractor.extract(
+            html, path, self._parser_for(path), self.bs_get_text_kwargs or None
+        )
+        web_page_cache.put_extract(page_hash, text, metadata)
+        return Document(page_content=text, metadata=metadata)
+
+    def _extract_document_sync(self, path: str, html: str, page_hash: str) -> Document:
+        if document := self._extracted_document(path, page_hash):
+            return document
+        text, metadata = html_extractor.extract_sync(
+            html, path, self._parser_for(path), self.bs_get_text_kwargs or None
+        )
+        web_page_cache.put_extract(page_hash, text, metadata)
+        return Document(page_content=text, metadata=metadata)
+
+    def _cached_document(self, path: str, page: Optional[Dict]) -> Optional[Document]:
+        """Return the cached document for a page that answered 304 Not Modified."""
+        cached = page and web_page_cache.get_extract(page["content_hash"])
+        if not cached:
+            return None
+        web_page_cache.mark_revalidated(path)
+        return Document(
+            page_content=cached["text"],
+            metadata={**cached["metadata"], "source": path},
+        )
+
     def lazy_load(self) -> Iterator[Document]:
         """Lazy load text from the url(s) in web_path with error handling."""
         for path in self.web_paths:
             try:
-                soup = self._scrape(path, bs_kwargs=self.bs_kwargs)
-                text = soup.get_text(**self.bs_get_text_kwargs)
-
-                # Build metadata
-                metadata = extract_metadata(soup, path)
-
-                yield Document(page_content=text, metadata=metadata)
+                page = web_page_cache.get_page(path)
+                response = self.session.get(
+                    path,
+                    headers=web_page_cache.conditional_headers(page),
+                    **self.requests_kwargs,
+                )
+                if response.status_code == 304:
+                    if document := self._cached_document(path, page):
+                        yield document
+                        continue
+                    response = self.session.get(path, **self.requests_kwargs)
+                if self.raise_for_status:
+                    response.raise_for_status()
+                if self.encoding is not None:
+                    response.encoding = self.encoding
+                elif self.autoset_encoding:
+                    response.encoding = response.apparent_encoding
+
+                page_hash = content_hash(response.text)
+                document = self._extract_document_sync(
+                    path, response.text, page_hash
+                )
+                web_page_cache.put_page(
+                    path,
+                    page_hash,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+                yield document
             except Exception as e:
                 # Log the error and continue with the next URL
                 log.exception(f"Error loading {path}: {e}")
 
-    async def alazy_load(self) -> AsyncIterator[Document]:
-        """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
-            text = soup.get_text(**self.bs_get_text_kwargs)
-            metadata = {"source": path}
-            if title := soup.find("title"):
-                metadata["title"] = title.get_text()
-            if description := soup.find("meta", attrs={"name": "description"}):
-                metadata["description"] = description.get(
-                    "content", "No description found."
+    async def _aload_one(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        path: str,
+    ) -> Optional[Document]:
+        async with semaphore:
+            try:
+                page = web_page_cache.get_page(path)
+                status, html, validators_ = await self._fetch_with_session(
+                    session, path, headers=web_page_cache.conditional_headers(page)
                 )
-            if html := soup.find("html"):
-                metadata["language"] = html.get("lang", "No language found.")
-            yield Document(page_content=text, metadata=metadata)
+                if status == 304:
+                    document = self._cached_document(path, page)
+                    if document is not None:
+                        return document
+                    # The cached extract was pruned meanwhile, fetch the full page
+                    status, html, validators_ = await self._fetch_with_session(
+                        session, path
+                    )
+
+                page_hash = content_hash(html)
+                document = await self._extract_document(path, html, page_hash)
+                web_page_cache.put_page(path, page_hash, **validators_)
+                return document
+            except Exception as e:
+                if self.continue_on_failure:
+                    log.warning(f"Error loading {path}, skipping due to: {e}")
+                    return None
+                raise
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        """Async lazy load text from the url(s) in web_path.
+
+        Documents are yielded as soon as each page is extracted, so callers can
+        start chunking and embedding before the slowest page has finished.
+        """
+        semaphore = asyncio.Semaphore(self.requests_per_second)
+        async with aiohttp.ClientSession(trust_env=self.trust_env) as session:
+            tasks = [
+                asyncio.create_task(self._aload_one(session, semaphore, path))
+                for path in self.web_paths
+            ]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    document = await task
+                    if document is not None:
+                        yield document
+            finally:
+                for task in tasks:
+                    task.cancel()
 
     async def aload(self) -> list[Document]:
-        """Load data into Document objects."""
-        return [document async for document in self.alazy_load()]
+        """Load data into Document objects, in the order of web_paths."""
+        order = {path: i for i, path in enumerate(self.web_paths)}
+        documents = [document async for document in self.alazy_load()]
+        return sorted(
+            documents, key=lambda d: order.get(d.metadata.get("source"), len(order))
+        )
 
 
 def get_web_loader(
@@ -8,7 +8,7 @@ from pathlib import Path
 from pydub import AudioSegment
 from pydub.silence import split_on_silence
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from fnmatch import fnmatch
 import aiohttp
@@ -29,7 +29,7 @@ from fastapi import (
     APIRouter,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 
@@ -45,11 +45,20 @@ from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import (
     AIOHTTP_CLIENT_SESSION_SSL,
     AIOHTTP_CLIENT_TIMEOUT,
+    AUDIO_SEGMENT_TARGET_SECONDS,
+    AUDIO_TRANSCRIPTION_MAX_WORKERS,
     ENV,
     SRC_LOG_LEVELS,
     DEVICE_TYPE,
     ENABLE_FORWARD_USER_INFO_HEADERS,
 )
+from open_webui.services.audio_transcription import (
+    Segment,
+    audio_segmenter,
+    stitch_transcripts,
+    transcript_cache,
+)
+from open_webui.services.speech_cache import speech_cache
 
 
 router = APIRouter()
@@ -63,7 +72,7 @@ AZURE_MAX_FILE_SIZE = AZURE_MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to byte
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["AUDIO"])
 
-SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
+SPEECH_CACHE_DIR = speech_cache.cache_dir
 SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
@@ -305,6 +314,37 @@ def load_speech_pipeline(request):
         )
 
 
+async def synthesize_speech(url: str, **kwargs) -> AsyncIterator[bytes]:
+    """POST to a TTS backend and yield the audio as it arrives."""
+    try:
+        timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+            async with session.post(
+                url, ssl=AIOHTTP_CLIENT_SESSION_SSL, **kwargs
+            ) as r:
+                if r.status >= 400:
+                    detail = f"External: {r.reason}"
+                    try:
+                        res = await r.json(content_type=None)
+                        if "error" in res:
+                            error = res["error"]
+                            detail = f"External: {error.get('message', '') if isinstance(error, dict) else error}"
+                    except Exception:
+                        pass
+                    raise HTTPException(status_code=r.status, detail=detail)
+
+                async for chunk in r.content.iter_chunked(64 * 1024):
+                    yield chunk
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=500,
+            detail="Open WebUI: Server Connection Error",
+        )
+
+
 @router.post("/speech")
 async def speech(request: Request, user=Depends(get_verified_user)):
     body = await request.body()
@@ -318,8 +358,8 @@ async def speech(request: Request, user=Depends(get_verified_user)):
     file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
 
     # Check if the file already exists in the cache
-    if file_path.is_file():
-        return FileResponse(file_path)
+    if (cached_path := speech_cache.get(name)) is not None:
+        return FileResponse(cached_path)
 
     payload = None
     try:
@@ -328,66 +368,32 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         log.exception(e)
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
-    r = None
     if request.app.state.config.TTS_ENGINE == "openai":
         payload["model"] = request.app.state.config.TTS_MODEL
 
-        try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                r = await session.post(
-                    url=f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
-                    json=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
-                        **(
-                            {
-                                "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
-                                "X-OpenWebUI-User-Id": user.id,
-                                "X-OpenWebUI-User-Email": user.email,
-                                "X-OpenWebUI-User-Role": user.role,
-                            }
-                            if ENABLE_FORWARD_USER_INFO_HEADERS
-                            else {}
-                        ),
-                    },
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                )
-
-                r.raise_for_status()
-
-                async with aiofiles.open(file_path, "wb") as f:
-                    await f.write(await r.read())
-
-                async with aiofiles.open(file_body_path, "w") as f:
-                    await f.write(json.dumps(payload))
-
-            return FileResponse(file_path)
-
-        except Exception as e:
-            log.exception(e)
-            detail = None
-
-            status_code = 500
-            detail = f"Open WebUI: Server Connection Error"
-
-            if r is not None:
-                status_code = r.status
-
-                try:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error']}"
-                except Exception:
-                    detail = f"External: {e}"
-
-            raise HTTPException(
-                status_code=status_code,
-                detail=detail,
-            )
+        stream = await speech_cache.generate(
+            name,
+            synthesize_speech(
+                f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
+                json=payload,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
+                    **(
+                        {
+                            "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
+                            "X-OpenWebUI-User-Id": user.id,
+                            "X-OpenWebUI-User-Email": user.email,
+                            "X-OpenWebUI-User-Role": user.role,
+                        }
+                        if ENABLE_FORWARD_USER_INFO_HEADERS
+                        else {}
+                    ),
+                },
+            ),
+            payload,
+        )
+        return StreamingResponse(stream, media_type="audio/mpeg")
 
     elif request.app.state.config.TTS_ENGINE == "elevenlabs":
         voice_id = payload.get("voice", "")
@@ -398,110 +404,51 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                 detail="Invalid voice id",
             )
 
-        try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
-                    json={
-                        "text": payload["input"],
-                        "model_id": request.app.state.config.TTS_MODEL,
-                        "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
-                    },
-                    headers={
-                        "Accept": "audio/mpeg",
-                        "Content-Type": "application/json",
-                        "xi-api-key": request.app.state.config.TTS_API_KEY,
-                    },
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
-
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
-
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
-
-            return FileResponse(file_path)
-
-        except Exception as e:
-            log.exception(e)
-            detail = None
-
-            try:
-                if r.status != 200:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error'].get('message', '')}"
-            except Exception:
-                detail = f"External: {e}"
-
-            raise HTTPException(
-                status_code=getattr(r, "status", 500) if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
-            )
+        stream = await speech_cache.generate(
+            name,
+            synthesize_speech(
+                f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
+                json={
+                    "text": payload["input"],
+                    "model_id": request.app.state.config.TTS_MODEL,
+                    "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
+                },
+                headers={
+                    "Accept": "audio/mpeg",
+                    "Content-Type": "application/json",
+                    "xi-api-key": request.app.state.config.TTS_API_KEY,
+                },
+            ),
+            payload,
+        )
+        return StreamingResponse(stream, media_type="audio/mpeg")
 
     elif request.app.state.config.TTS_ENGINE == "azure":
-        try:
-            payload = json.loads(body.decode("utf-8"))
-        except Exception as e:
-            log.exception(e)
-            raise HTTPException(status_code=400, detail="Invalid JSON payload")
-
         region = request.app.state.config.TTS_AZURE_SPEECH_REGION or "eastus"
         base_url = request.app.state.config.TTS_AZURE_SPEECH_BASE_URL
         language = request.app.state.config.TTS_VOICE
         locale = "-".join(request.app.state.config.TTS_VOICE.split("-")[:1])
         output_format = request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT
 
-        try:
-            data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
+        data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
                 <voice name="{language}">{payload["input"]}</voice>
             </speak>"""
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    (base_url or f"https://{region}.tts.speech.microsoft.com")
-                    + "/cognitiveservices/v1",
-                    headers={
-                        "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
-                        "Content-Type": "application/ssml+xml",
-                        "X-Microsoft-OutputFormat": output_format,
-                    },
-                    data=data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
-
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
-
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
-
-                    return FileResponse(file_path)
-
-        except Exception as e:
-            log.exception(e)
-            detail = None
 
-            try:
-                if r.status != 200:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error'].get('message', '')}"
-            except Exception:
-                detail = f"External: {e}"
-
-            raise HTTPException(
-                status_code=getattr(r, "status", 500) if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
-            )
+        stream = await speech_cache.generate(
+            name,
+            synthesize_speech(
+                (base_url or f"https://{region}.tts.speech.microsoft.com")
+                + "/cognitiveservices/v1",
+                headers={
+                    "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
+                    "Content-Type": "application/ssml+xml",
+                    "X-Microsoft-OutputFormat": output_format,
+                },
+                data=data,
+            ),
+            payload,
+        )
+        return StreamingResponse(stream, media_type="audio/mpeg")
 
     elif request.app.state.config.TTS_ENGINE == "transformers":
         payload = None
@@ -540,6 +487,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         async with aiofiles.open(file_body_path, "w") as f:
             await f.write(json.dumps(payload))
 
+        speech_cache.add(name)
         return FileResponse(file_path)
 
 
@@ -572,8 +520,15 @@ def transcription_handler(request, file_path, metadata):
             % (info.language, info.language_probability)
         )
 
-        transcript = "".join([segment.text for segment in list(segments)])
-        data = {"text": transcript.strip()}
+        segments = list(segments)
+        transcript = "".join([segment.text for segment in segments])
+        data = {
+            "text": transcript.strip(),
+            "segments": [
+                {"start": segment.start, "end": segment.end, "text": segment.text}
+                for segment in segments
+            ],
+        }
 
         # save the transcript to a json file
         transcript_file = f"{file_dir}/{id}.json"
@@ -809,6 +764,101 @@ def transcription_handler(request, file_path, metadata):
 def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None):
     log.info(f"transcribe: {file_path} {metadata}")
 
+    cache_key = transcript_cache.key(
+        file_path,
+        request.app.state.config.STT_ENGINE,
+        request.app.state.config.STT_MODEL or request.app.state.config.WHISPER_MODEL,
+        (metadata or {}).get("language"),
+    )
+    if (cached := transcript_cache.get(cache_key)) is not None:
+        log.info(f"transcribe: using cached transcript for {file_path}")
+        return cached
+
+    if audio_segmenter.available:
+        result = transcribe_segments(request, file_path, metadata)
+    else:
+        result = transcribe_chunks(request, file_path, metadata)
+
+    transcript_cache.put(cache_key, result)
+    return result
+
+
+def get_audio_duration(file_path: str) -> Optional[float]:
+    try:
+        return float(mediainfo(file_path).get("duration"))
+    except Exception:
+        return None
+
+
+def transcribe_segments(
+    request: Request, file_path: str, metadata: Optional[dict] = None
+):
+    """
+    Decode the audio once through ffmpeg and cut it at silences close to the
+    target duration. Segments are transcribed in parallel while decoding
+    continues, then stitched back together with absolute timestamps.
+    """
+    duration = get_audio_duration(file_path)
+    if (
+        duration is not None
+        and duration <= AUDIO_SEGMENT_TARGET_SECONDS
+        and os.path.getsize(file_path) <= MAX_FILE_SIZE
+        and not is_audio_conversion_required(file_path)
+    ):
+        # Short, directly supported audio does not need to be re-encoded
+        segment = Segment(0, file_path, 0.0, duration)
+        return stitch_transcripts(
+            [(segment, transcription_handler(request, file_path, metadata))]
+        )
+
+    submitted = []
+    try:
+        with ThreadPoolExecutor(
+            max_workers=AUDIO_TRANSCRIPTION_MAX_WORKERS
+        ) as executor:
+            try:
+                for segment in audio_segmenter.segments(file_path):
+                    submitted.append(
+                        (
+                            segment,
+                            executor.submit(
+                                transcription_handler, request, segment.path, metadata
+                            ),
+                        )
+                    )
+            except Exception as e:
+                log.exception(e)
+                for _, future in submitted:
+                    future.cancel()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=ERROR_MESSAGES.DEFAULT(e),
+                )
+
+            results = []
+            for segment, future in submitted:
+                try:
+                    results.append((segment, future.result()))
+                except Exception as transcribe_exc:
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail=f"Error transcribing chunk: {transcribe_exc}",
+                    )
+    finally:
+        for segment, _ in submitted:
+            if os.path.isfile(segment.path):
+                try:
+                    os.remove(segment.path)
+                except Exception:
+                    pass
+
+    return stitch_transcripts(results)
+
+
+def transcribe_chunks(
+    request: Request, file_path: str, metadata: Optional[dict] = None
+):
+    """Fallback used when no ffmpeg binary is available for streaming decode."""
     if is_audio_conversion_required(file_path):
         file_path = convert_audio_to_mp3(file_path)
 
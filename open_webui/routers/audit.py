@@ -0,0 +1,60 @@
+"""
+审计日志查询路由
+
+通过审计存储的索引按用户、路径前缀、方法和时间范围查询审计记录（仅管理员）
+"""
+
+import asyncio
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.services.audit_store import audit_store
+from open_webui.utils.auth import get_admin_user
+
+router = APIRouter()
+
+
+class AuditLogListResponse(BaseModel):
+    items: list[dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+@router.get("/logs", response_model=AuditLogListResponse)
+async def search_audit_logs(
+    user_id: Optional[str] = None,
+    path: Optional[str] = None,
+    verb: Optional[str] = None,
+    start: Optional[int] = Query(None, description="Unix 时间戳，包含"),
+    end: Optional[int] = Query(None, description="Unix 时间戳，包含"),
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    user=Depends(get_admin_user),
+):
+    """查询审计记录，按时间倒序分页"""
+    try:
+        items, next_cursor = await asyncio.to_thread(
+            audit_store.search,
+            user_id=user_id,
+            path=path,
+            verb=verb,
+            start=start,
+            end=end,
+            cursor=cursor,
+            limit=max(1, min(limit, 500)),
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Invalid cursor"),
+        )
+
+    return AuditLogListResponse(items=items, next_cursor=next_cursor)
+
+
+@router.get("/stats")
+async def get_audit_log_stats(user=Depends(get_admin_user)):
+    """审计写入队列的积压、已写入和丢弃条数"""
+    return audit_store.get_stats()
@@ -19,6 +19,7 @@ from open_webui.models.feedbacks import Feedbacks, FeedbackForm
 from open_webui.models.knowledge import Knowledges
 from open_webui.retrieval.utils import get_embedding_function
 from open_webui.routers.retrieval import get_ef
+from open_webui.routers.search import record_trending_text
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.services.vendor_command_service import vendor_command_service
 from open_webui.services.ai.regenerate_service import (
@@ -79,6 +80,7 @@ async def create_case(body: CaseCreateForm, user=Depends(get_verified_user)):
 
     # 先创建案例
     case = cases_table.insert_new_case(user_id=user.id, form=body)
+    record_trending_text(body.title or case.title, timestamp=case.created_at)
 
     # 再创建初始化节点与边
     from open_webui.internal.db import get_db
@@ -666,7 +668,7 @@ async def get_node_knowledge(
     agg: List[Dict[str, Any]] = []
     for kb in kbs:
         try:
-            res = VECTOR_DB_CLIENT.search(collection_name=kb.id, vectors=[qvec], limit=topK)
+            res = await VECTOR_DB_CLIENT.asearch(collection_name=kb.id, vectors=[qvec], limit=topK)
             if not res or not res.ids:
                 continue
             for i, _id in enumerate(res.ids[0]):
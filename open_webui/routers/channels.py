@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from typing import Optional
@@ -25,8 +26,9 @@ from open_webui.env import SRC_LOG_LEVELS
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
-from open_webui.utils.access_control import has_access, get_users_with_access
-from open_webui.utils.webhook import post_webhook
+from open_webui.services.notification_dispatcher import notification_dispatcher
+from open_webui.utils.access_control import has_access
+from open_webui.utils.webhook import build_webhook_payload
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -197,29 +199,39 @@ async def get_channel_messages(
 
 
 async def send_notification(name, webui_url, channel, message, active_user_ids):
-    users = get_users_with_access("read", channel.access_control)
-
-    for user in users:
-        if user.id in active_user_ids:
+    # Users with read access and a webhook configured, in one query
+    recipients = await asyncio.to_thread(
+        Users.get_webhook_urls_by_access,
+        channel.access_control,
+        "read",
+        list(active_user_ids),
+    )
+    if not recipients:
+        return
+
+    url = f"{webui_url}/channels/{channel.id}"
+    content = f"#{channel.name} - {url}\n\n{message.content}"
+    event_data = {
+        "action": "channel",
+        "message": message.content,
+        "title": channel.name,
+        "url": url,
+    }
+
+    # Delivered in the background; recipients sharing a webhook get one post
+    deliveries = []
+    for webhook_url in dict.fromkeys(webhook_url for _, webhook_url in recipients):
+        try:
+            payload = build_webhook_payload(name, webhook_url, content, event_data)
+        except Exception as e:
+            log.warning(f"Skipping webhook {webhook_url} for {message.id}: {e}")
             continue
-        else:
-            if user.settings:
-                webhook_url = user.settings.ui.get("notifications", {}).get(
-                    "webhook_url", None
-                )
+        deliveries.append((webhook_url, payload))
 
-                if webhook_url:
-                    post_webhook(
-                        name,
-                        webhook_url,
-                        f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
-                        {
-                            "action": "channel",
-                            "message": message.content,
-                            "title": channel.name,
-                            "url": f"{webui_url}/channels/{channel.id}",
-                        },
-                    )
+    if deliveries:
+        await notification_dispatcher.enqueue(
+            f"channel-message:{message.id}", deliveries
+        )
 
 
 @router.post("/{id}/messages/post", response_model=Optional[MessageModel])
@@ -6,6 +6,7 @@ from typing import Optional
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.config import get_config, save_config
 from open_webui.config import BannerModel
+from open_webui.services.model_catalog import model_catalog
 
 from open_webui.utils.tools import (
     get_tool_server_data,
@@ -29,6 +30,7 @@ class ImportConfigForm(BaseModel):
 @router.post("/import", response_model=dict)
 async def import_config(form_data: ImportConfigForm, user=Depends(get_admin_user)):
     save_config(form_data.config)
+    model_catalog.bump("config import", connections=True)
     return get_config()
 
 
@@ -72,6 +74,7 @@ async def set_connections_config(
     request.app.state.config.ENABLE_BASE_MODELS_CACHE = (
         form_data.ENABLE_BASE_MODELS_CACHE
     )
+    model_catalog.bump("connections config", connections=True)
 
     return {
         "ENABLE_DIRECT_CONNECTIONS": request.app.state.config.ENABLE_DIRECT_CONNECTIONS,
@@ -285,6 +288,7 @@ async def set_models_config(
 ):
     request.app.state.config.DEFAULT_MODELS = form_data.DEFAULT_MODELS
     request.app.state.config.MODEL_ORDER_LIST = form_data.MODEL_ORDER_LIST
+    model_catalog.bump("models config")
     return {
         "DEFAULT_MODELS": request.app.state.config.DEFAULT_MODELS,
         "MODEL_ORDER_LIST": request.app.state.config.MODEL_ORDER_LIST,
@@ -1,5 +1,8 @@
+import asyncio
+import json
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from open_webui.models.users import Users, UserModel
@@ -9,9 +12,12 @@ from open_webui.models.feedbacks import (
     FeedbackForm,
     Feedbacks,
 )
+from open_webui.models.model_ratings import OVERALL, ModelRatingModel, ModelRatings
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.services.model_catalog import model_catalog
+from open_webui.services.rating_engine import rating_engine
 
 router = APIRouter()
 
@@ -50,6 +56,7 @@ async def update_config(
         config.ENABLE_EVALUATION_ARENA_MODELS = form_data.ENABLE_EVALUATION_ARENA_MODELS
     if form_data.EVALUATION_ARENA_MODELS is not None:
         config.EVALUATION_ARENA_MODELS = form_data.EVALUATION_ARENA_MODELS
+    model_catalog.bump("arena config")
     return {
         "ENABLE_EVALUATION_ARENA_MODELS": config.ENABLE_EVALUATION_ARENA_MODELS,
         "EVALUATION_ARENA_MODELS": config.EVALUATION_ARENA_MODELS,
@@ -71,32 +78,83 @@ class FeedbackUserResponse(FeedbackResponse):
     user: Optional[UserResponse] = None
 
 
+def with_users(feedbacks: list[FeedbackModel]) -> list[FeedbackUserResponse]:
+    users = {
+        user.id: user
+        for user in Users.get_users_by_user_ids(
+            list({feedback.user_id for feedback in feedbacks})
+        )
+    }
+    return [
+        FeedbackUserResponse(
+            **feedback.model_dump(),
+            user=(
+                UserResponse(**users[feedback.user_id].model_dump())
+                if feedback.user_id in users
+                else None
+            ),
+        )
+        for feedback in feedbacks
+    ]
+
+
 @router.get("/feedbacks/all", response_model=list[FeedbackUserResponse])
 async def get_all_feedbacks(user=Depends(get_admin_user)):
-    feedbacks = Feedbacks.get_all_feedbacks()
-
-    feedback_list = []
-    for feedback in feedbacks:
-        user = Users.get_user_by_id(feedback.user_id)
-        feedback_list.append(
-            FeedbackUserResponse(
-                **feedback.model_dump(),
-                user=UserResponse(**user.model_dump()) if user else None,
-            )
+    feedbacks = Feedbacks.get_all_feedbacks(include_snapshot=False)
+    return with_users(feedbacks)
+
+
+class FeedbackListResponse(BaseModel):
+    items: list[FeedbackUserResponse]
+    next_cursor: Optional[str] = None
+
+
+@router.get("/feedbacks/list", response_model=FeedbackListResponse)
+async def get_feedbacks_list(
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    type: Optional[str] = None,
+    user=Depends(get_admin_user),
+):
+    try:
+        feedbacks, next_cursor = Feedbacks.get_feedbacks_page(
+            cursor=cursor, limit=max(1, min(limit, 1000)), type=type
         )
-    return feedback_list
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return FeedbackListResponse(items=with_users(feedbacks), next_cursor=next_cursor)
 
 
 @router.delete("/feedbacks/all")
 async def delete_all_feedbacks(user=Depends(get_admin_user)):
     success = Feedbacks.delete_all_feedbacks()
+    await asyncio.to_thread(ModelRatings.delete_all)
     return success
 
 
-@router.get("/feedbacks/all/export", response_model=list[FeedbackModel])
-async def get_all_feedbacks(user=Depends(get_admin_user)):
-    feedbacks = Feedbacks.get_all_feedbacks()
-    return feedbacks
+@router.get("/feedbacks/all/export")
+async def export_all_feedbacks(user=Depends(get_admin_user)):
+    # Streamed page by page without snapshots so large exports stay small in memory
+    async def generate():
+        yield "["
+        cursor, first = None, True
+        while True:
+            feedbacks, cursor = await asyncio.to_thread(
+                Feedbacks.get_feedbacks_page, cursor, 500
+            )
+            for feedback in feedbacks:
+                yield ("" if first else ",") + json.dumps(feedback.model_dump())
+                first = False
+            if cursor is None:
+                break
+        yield "]"
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/json",
+        headers={"Content-Disposition": "attachment; filename=feedbacks.json"},
+    )
 
 
 @router.get("/feedbacks/user", response_model=list[FeedbackUserResponse])
@@ -107,7 +165,23 @@ async def get_feedbacks(user=Depends(get_verified_user)):
 
 @router.delete("/feedbacks", response_model=bool)
 async def delete_feedbacks(user=Depends(get_verified_user)):
+    # Only this user's ratings leave the leaderboard, no full rebuild
+    ratings, cursor = [], None
+    while True:
+        feedbacks, cursor = await asyncio.to_thread(
+            Feedbacks.get_feedbacks_page,
+            cursor=cursor,
+            limit=500,
+            type="rating",
+            user_id=user.id,
+        )
+        ratings.extend(feedbacks)
+        if cursor is None:
+            break
+
     success = Feedbacks.delete_feedbacks_by_user_id(user.id)
+    if success:
+        await asyncio.to_thread(rating_engine.discard, ratings)
     return success
 
 
@@ -124,6 +198,7 @@ async def create_feedback(
             detail=ERROR_MESSAGES.DEFAULT(),
         )
 
+    await asyncio.to_thread(rating_engine.apply, None, feedback)
     return feedback
 
 
@@ -146,6 +221,7 @@ async def get_feedback_by_id(id: str, user=Depends(get_verified_user)):
 async def update_feedback_by_id(
     id: str, form_data: FeedbackForm, user=Depends(get_verified_user)
 ):
+    previous = Feedbacks.get_feedback_by_id(id=id)
     if user.role == "admin":
         feedback = Feedbacks.update_feedback_by_id(id=id, form_data=form_data)
     else:
@@ -158,11 +234,13 @@ async def update_feedback_by_id(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
         )
 
+    await asyncio.to_thread(rating_engine.apply, previous, feedback)
     return feedback
 
 
 @router.delete("/feedback/{id}")
 async def delete_feedback_by_id(id: str, user=Depends(get_verified_user)):
+    previous = Feedbacks.get_feedback_by_id(id=id)
     if user.role == "admin":
         success = Feedbacks.delete_feedback_by_id(id=id)
     else:
@@ -173,4 +251,33 @@ async def delete_feedback_by_id(id: str, user=Depends(get_verified_user)):
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
         )
 
+    await asyncio.to_thread(rating_engine.apply, previous, None)
     return success
+
+
+############################
+# Leaderboard
+############################
+
+
+@router.get("/leaderboard", response_model=list[ModelRatingModel])
+async def get_leaderboard(tag: str = OVERALL, user=Depends(get_admin_user)):
+    return rating_engine.get_leaderboard(tag)
+
+
+@router.get("/leaderboard/tags", response_model=list[str])
+async def get_leaderboard_tags(user=Depends(get_admin_user)):
+    return rating_engine.get_tags()
+
+
+@router.get(
+    "/leaderboard/models/{model_id:path}", response_model=list[ModelRatingModel]
+)
+async def get_model_ratings(model_id: str, user=Depends(get_admin_user)):
+    return rating_engine.get_model_breakdown(model_id)
+
+
+@router.post("/leaderboard/rebuild")
+async def rebuild_leaderboard(user=Depends(get_admin_user)):
+    count = await asyncio.to_thread(rating_engine.rebuild)
+    return {"feedbacks": count}
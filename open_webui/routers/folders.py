@@ -169,6 +169,15 @@ async def update_folder_parent_id_by_id(
                 detail=ERROR_MESSAGES.DEFAULT("Folder already exists"),
             )
 
+        # The whole subtree moves with the folder; it cannot move into itself
+        if form_data.parent_id and form_data.parent_id in (
+            Folders.get_subtree_folder_ids_by_id_and_user_id(id, user.id)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERROR_MESSAGES.DEFAULT("Cannot move a folder into itself"),
+            )
+
         try:
             folder = Folders.update_folder_parent_id_by_id_and_user_id(
                 id, user.id, form_data.parent_id
@@ -245,8 +254,7 @@ async def delete_folder_by_id(
     if folder:
         try:
             folder_ids = Folders.delete_folder_by_id_and_user_id(id, user.id)
-            for folder_id in folder_ids:
-                Chats.delete_chats_by_user_id_and_folder_id(user.id, folder_id)
+            Chats.delete_chats_by_user_id_and_folder_ids(user.id, folder_ids)
 
             return True
         except Exception as e:
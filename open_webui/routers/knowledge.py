@@ -200,8 +200,8 @@ async def reindex_knowledge_files(request: Request, user=Depends(get_verified_us
             file_ids = knowledge_base.data.get("file_ids", [])
             files = Files.get_files_by_ids(file_ids)
             try:
-                if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_base.id):
-                    VECTOR_DB_CLIENT.delete_collection(
+                if await VECTOR_DB_CLIENT.ahas_collection(collection_name=knowledge_base.id):
+                    await VECTOR_DB_CLIENT.adelete_collection(
                         collection_name=knowledge_base.id
                     )
             except Exception as e:
@@ -630,7 +630,7 @@ async def delete_knowledge_by_id(id: str, user=Depends(get_verified_user)):
 
     # Clean up vector DB
     try:
-        VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        await VECTOR_DB_CLIENT.adelete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
@@ -663,7 +663,7 @@ async def reset_knowledge_by_id(id: str, user=Depends(get_verified_user)):
         )
 
     try:
-        VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        await VECTOR_DB_CLIENT.adelete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
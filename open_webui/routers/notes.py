@@ -41,18 +41,31 @@ async def get_notes(request: Request, user=Depends(get_verified_user)):
             detail=ERROR_MESSAGES.UNAUTHORIZED,
         )
 
-    notes = [
+    return get_note_user_responses(Notes.get_notes_by_user_id(user.id, "write"))
+
+
+def get_note_user_responses(notes: list[NoteModel]) -> list[NoteUserResponse]:
+    # Load all note owners in one query
+    users = {
+        note_user.id: note_user
+        for note_user in Users.get_users_by_user_ids(
+            list({note.user_id for note in notes})
+        )
+    }
+    return [
         NoteUserResponse(
             **{
                 **note.model_dump(),
-                "user": UserResponse(**Users.get_user_by_id(note.user_id).model_dump()),
+                "user": (
+                    UserResponse(**users[note.user_id].model_dump())
+                    if note.user_id in users
+                    else None
+                ),
             }
         )
-        for note in Notes.get_notes_by_user_id(user.id, "write")
+        for note in notes
     ]
 
-    return notes
-
 
 class NoteTitleIdResponse(BaseModel):
     id: str
@@ -80,6 +93,51 @@ async def get_note_list(request: Request, user=Depends(get_verified_user)):
     return notes
 
 
+############################
+# SearchNotes
+############################
+
+
+class NoteListResponse(BaseModel):
+    items: list[NoteUserResponse]
+    next_cursor: Optional[str] = None
+
+
+@router.get("/search", response_model=NoteListResponse)
+async def search_notes(
+    request: Request,
+    query: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    user=Depends(get_verified_user),
+):
+    if user.role != "admin" and not has_permission(
+        user.id, "features.notes", request.app.state.config.USER_PERMISSIONS
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERROR_MESSAGES.UNAUTHORIZED,
+        )
+
+    try:
+        notes, next_cursor = Notes.search_notes_by_user_id(
+            user.id,
+            "write",
+            query=query,
+            cursor=cursor,
+            limit=max(1, min(limit, 100)),
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Invalid cursor"),
+        )
+
+    return NoteListResponse(
+        items=get_note_user_responses(notes), next_cursor=next_cursor
+    )
+
+
 ############################
 # CreateNewNote
 ############################
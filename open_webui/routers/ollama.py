@@ -51,6 +51,7 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.services.model_catalog import model_catalog
 
 
 from open_webui.config import (
@@ -316,6 +317,8 @@ async def update_config(
         if key in keys
     }
 
+    model_catalog.bump("ollama connections", connections=True)
+
     return {
         "ENABLE_OLLAMA_API": request.app.state.config.ENABLE_OLLAMA_API,
         "OLLAMA_BASE_URLS": request.app.state.config.OLLAMA_BASE_URLS,
@@ -20,9 +20,6 @@ from pydantic import BaseModel
 from starlette.background import BackgroundTask
 
 from open_webui.models.models import Models
-from open_webui.config import (
-    CACHE_DIR,
-)
 from open_webui.env import (
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
@@ -47,6 +44,8 @@ from open_webui.utils.misc import (
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.services.model_catalog import model_catalog
+from open_webui.services.speech_cache import speech_cache
 
 
 log = logging.getLogger(__name__)
@@ -181,6 +180,8 @@ async def update_config(
         if key in keys
     }
 
+    model_catalog.bump("openai connections", connections=True)
+
     return {
         "ENABLE_OPENAI_API": request.app.state.config.ENABLE_OPENAI_API,
         "OPENAI_API_BASE_URLS": request.app.state.config.OPENAI_API_BASE_URLS,
@@ -200,14 +201,14 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         body = await request.body()
         name = hashlib.sha256(body).hexdigest()
 
-        SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
+        SPEECH_CACHE_DIR = speech_cache.cache_dir
         SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
         file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
         file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
 
         # Check if the file already exists in the cache
-        if file_path.is_file():
-            return FileResponse(file_path)
+        if (cached_path := speech_cache.get(name)) is not None:
+            return FileResponse(cached_path)
 
         url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
 
@@ -250,6 +251,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
             with open(file_body_path, "w") as f:
                 json.dump(json.loads(body.decode("utf-8")), f)
+            speech_cache.add(name)
 
             # Return the saved file
             return FileResponse(file_path)
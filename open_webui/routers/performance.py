@@ -5,11 +5,15 @@
 """
 
 from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 
+from open_webui.config import RAG_EMBEDDING_QUERY_PREFIX
+from open_webui.models.knowledge import Knowledges
+from open_webui.utils.access_control import has_access
 from open_webui.utils.auth import get_verified_user, get_admin_user
 from open_webui.services.performance_service import performance_service
+from open_webui.services.vector_query_cache import vector_query_cache
 
 router = APIRouter()
 
@@ -68,6 +72,7 @@ async def get_cache_stats(user=Depends(get_admin_user)):
         return {
             "main_cache": performance_service.cache_manager.get_stats(),
             "vector_cache": performance_service.vector_cache.get_stats(),
+            "vector_query_cache": vector_query_cache.get_stats(),
             "connection_pool": performance_service.connection_pool.get_stats()
         }
     except Exception as e:
@@ -90,16 +95,33 @@ async def get_optimization_suggestions(user=Depends(get_admin_user)):
 
 @router.post("/search/batch")
 async def batch_vector_search(
+    request: Request,
     queries: List[str] = Query(..., description="批量搜索查询列表"),
+    collection_name: str = Query(..., description="要搜索的知识库集合"),
     limit: int = Query(10, description="每个查询的结果数量"),
     user=Depends(get_verified_user)
 ):
     """批量向量搜索优化"""
+    if len(queries) > 50:
+        raise HTTPException(status_code=400, detail="批量查询数量不能超过50个")
+
+    if user.role != "admin":
+        knowledge = Knowledges.get_knowledge_by_id(collection_name)
+        if not knowledge or (
+            knowledge.user_id != user.id
+            and not has_access(user.id, "read", knowledge.access_control)
+        ):
+            raise HTTPException(status_code=403, detail="无权访问该集合")
+
     try:
-        if len(queries) > 50:
-            raise HTTPException(status_code=400, detail="批量查询数量不能超过50个")
-        
-        results = await performance_service.batch_vector_search(queries, limit)
+        results = await performance_service.batch_vector_search(
+            queries,
+            limit,
+            collection_name=collection_name,
+            embedding_function=lambda texts: request.app.state.EMBEDDING_FUNCTION(
+                texts, prefix=RAG_EMBEDDING_QUERY_PREFIX, user=user
+            ),
+        )
         
         return {
             "results": results,
@@ -9,7 +9,7 @@ import asyncio
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -69,6 +69,7 @@ from open_webui.retrieval.web.firecrawl import search_firecrawl
 from open_webui.retrieval.web.external import search_external
 
 from open_webui.retrieval.utils import (
+    get_doc,
     get_embedding_function,
     get_reranking_function,
     get_model_path,
@@ -81,6 +82,7 @@ from open_webui.utils.misc import (
     calculate_sha256_string,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.services.web_page_cache import web_page_cache
 
 from open_webui.config import (
     ENV,
@@ -1132,6 +1134,7 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    cache_embeddings: bool = False,
 ) -> bool:
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
@@ -1296,11 +1299,22 @@ def save_docs_to_vector_db(
             ),
         )
 
-        embeddings = embedding_function(
-            list(map(lambda x: x.replace("\n", " "), texts)),
-            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-            user=user,
-        )
+        embedding_texts = list(map(lambda x: x.replace("\n", " "), texts))
+        if cache_embeddings:
+            # Reuse vectors for chunks that were already embedded (e.g. unchanged web pages)
+            embeddings = web_page_cache.embed_with_cache(
+                embedding_texts,
+                lambda batch: embedding_function(
+                    batch, prefix=RAG_EMBEDDING_CONTENT_PREFIX, user=user
+                ),
+                namespace=f"{request.app.state.config.RAG_EMBEDDING_ENGINE}|{request.app.state.config.RAG_EMBEDDING_MODEL}|{RAG_EMBEDDING_CONTENT_PREFIX}",
+            )
+        else:
+            embeddings = embedding_function(
+                embedding_texts,
+                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                user=user,
+            )
 
         items = [
             {
@@ -1638,7 +1652,12 @@ def process_web(
 
         if not request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL:
             save_docs_to_vector_db(
-                request, docs, collection_name, overwrite=True, user=user
+                request,
+                docs,
+                collection_name,
+                overwrite=True,
+                user=user,
+                cache_embeddings=True,
             )
         else:
             collection_name = None
@@ -1913,6 +1932,72 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
         raise Exception("No search engine API key found in environment variables")
 
 
+def web_search_collection_name(queries: List[str]) -> str:
+    return f"web-search-{calculate_sha256_string('-'.join(queries))}"[:63]
+
+
+async def stream_docs_to_vector_db(
+    request: Request,
+    documents: AsyncIterator[Document],
+    collection_name: str,
+    user=None,
+) -> List[Document]:
+    """
+    Save documents into one collection while they are still being loaded.
+
+    Documents that arrive while a batch is being embedded are saved together
+    in the next batch. The first successful batch replaces any existing
+    collection and later batches are appended to it.
+    """
+    loaded: List[Document] = []
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for document in documents:
+                loaded.append(document)
+                queue.put_nowait(document)
+        finally:
+            queue.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    first = True
+    done = False
+    try:
+        while not done:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch[-1] is None:
+                done = True
+                batch.pop()
+            if not batch:
+                continue
+
+            try:
+                await run_in_threadpool(
+                    save_docs_to_vector_db,
+                    request,
+                    batch,
+                    collection_name,
+                    overwrite=first,
+                    add=not first,
+                    user=user,
+                    cache_embeddings=True,
+                )
+                first = False
+            except Exception as e:
+                log.debug(f"error saving docs: {e}")
+
+        # Surface loader errors that were not handled by the loader itself
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+
+    return loaded
+
+
 @router.post("/process/web/search")
 async def process_web_search(
     request: Request, form_data: SearchForm, user=Depends(get_verified_user)
@@ -1979,7 +2064,20 @@ async def process_web_search(
                 requests_per_second=request.app.state.config.WEB_SEARCH_CONCURRENT_REQUESTS,
                 trust_env=request.app.state.config.WEB_SEARCH_TRUST_ENV,
             )
-            docs = await loader.aload()
+            if request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL:
+                docs = await loader.aload()
+            else:
+                # Chunk and embed each page as soon as it is extracted
+                docs = await stream_docs_to_vector_db(
+                    request,
+                    loader.alazy_load(),
+                    web_search_collection_name(form_data.queries),
+                    user=user,
+                )
+                order = {url: i for i, url in enumerate(urls)}
+                docs.sort(
+                    key=lambda d: order.get(d.metadata.get("source"), len(order))
+                )
 
         urls = [
             doc.metadata.get("source") for doc in docs if doc.metadata.get("source")
@@ -2001,23 +2099,21 @@ async def process_web_search(
             }
         else:
             # Create a single collection for all documents
-            collection_name = (
-                f"web-search-{calculate_sha256_string('-'.join(form_data.queries))}"[
-                    :63
-                ]
-            )
+            collection_name = web_search_collection_name(form_data.queries)
 
-            try:
-                await run_in_threadpool(
-                    save_docs_to_vector_db,
-                    request,
-                    docs,
-                    collection_name,
-                    overwrite=True,
-                    user=user,
-                )
-            except Exception as e:
-                log.debug(f"error saving docs: {e}")
+            if request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER:
+                try:
+                    await run_in_threadpool(
+                        save_docs_to_vector_db,
+                        request,
+                        docs,
+                        collection_name,
+                        overwrite=True,
+                        user=user,
+                        cache_embeddings=True,
+                    )
+                except Exception as e:
+                    log.debug(f"error saving docs: {e}")
 
             return {
                 "status": True,
@@ -2051,7 +2147,7 @@ def query_doc_handler(
     try:
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH:
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
+            collection_results[form_data.collection_name] = get_doc(
                 collection_name=form_data.collection_name
             )
             return query_doc_with_hybrid_search(
@@ -297,15 +297,20 @@ def get_scim_auth(
         )
 
 
-def user_to_scim(user: UserModel, request: Request) -> SCIMUser:
+def user_to_scim(
+    user: UserModel,
+    request: Request,
+    user_groups: Optional[list[GroupModel]] = None,
+) -> SCIMUser:
     """Convert internal User model to SCIM User"""
     # Parse display name into name components
     name_parts = user.name.split(" ", 1) if user.name else ["", ""]
     given_name = name_parts[0] if name_parts else ""
     family_name = name_parts[1] if len(name_parts) > 1 else ""
 
-    # Get user's groups
-    user_groups = Groups.get_groups_by_member_id(user.id)
+    # Get user's groups, unless they were loaded for a whole page of users
+    if user_groups is None:
+        user_groups = Groups.get_groups_by_member_id(user.id)
     groups = [
         {
             "value": group.id,
@@ -346,11 +351,21 @@ def user_to_scim(user: UserModel, request: Request) -> SCIMUser:
     )
 
 
-def group_to_scim(group: GroupModel, request: Request) -> SCIMGroup:
+def group_to_scim(
+    group: GroupModel,
+    request: Request,
+    users: Optional[dict[str, UserModel]] = None,
+) -> SCIMGroup:
     """Convert internal Group model to SCIM Group"""
+    # Load all members in one query, unless they were loaded for a whole page
+    if users is None:
+        users = {
+            user.id: user for user in Users.get_users_by_user_ids(group.user_ids)
+        }
+
     members = []
     for user_id in group.user_ids:
-        user = Users.get_user_by_id(user_id)
+        user = users.get(user_id)
         if user:
             members.append(
                 SCIMGroupMember(
@@ -505,8 +520,11 @@ async def get_users(
         users_list = response["users"]
         total = response["total"]
 
-    # Convert to SCIM format
-    scim_users = [user_to_scim(user, request) for user in users_list]
+    # Convert to SCIM format, loading the groups of the whole page at once
+    groups_by_user = Groups.get_groups_by_member_ids([user.id for user in users_list])
+    scim_users = [
+        user_to_scim(user, request, groups_by_user[user.id]) for user in users_list
+    ]
 
     return SCIMListResponse(
         totalResults=total,
@@ -715,17 +733,26 @@ async def get_groups(
     _: bool = Depends(get_scim_auth),
 ):
     """List SCIM Groups"""
-    # Get all groups
-    groups_list = Groups.get_groups()
+    # Simple filter parsing - supports displayName eq "name"
+    name = None
+    if filter and "displayName eq" in filter:
+        name = filter.split('"')[1]
+
+    # Filter and paginate in the database
+    paginated_groups, total = Groups.get_groups_page(
+        skip=startIndex - 1, limit=count, name=name
+    )
 
-    # Apply pagination
-    total = len(groups_list)
-    start = startIndex - 1
-    end = start + count
-    paginated_groups = groups_list[start:end]
+    # Load the members of all groups on the page in one query
+    users = {
+        user.id: user
+        for user in Users.get_users_by_user_ids(
+            list({user_id for group in paginated_groups for user_id in group.user_ids})
+        )
+    }
 
     # Convert to SCIM format
-    scim_groups = [group_to_scim(group, request) for group in paginated_groups]
+    scim_groups = [group_to_scim(group, request, users) for group in paginated_groups]
 
     return SCIMListResponse(
         totalResults=total,
@@ -3,7 +3,9 @@
 包含智能搜索建议、热词推荐、历史记录等功能
 """
 
+import asyncio
 import logging
+import time
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any, Set
@@ -20,7 +22,7 @@ from sqlalchemy import func, desc, and_, or_, distinct
 
 from open_webui.env import SRC_LOG_LEVELS, REDIS_HOST, REDIS_PORT, REDIS_PASSWORD
 from open_webui.utils.auth import get_verified_user
-from open_webui.models.cases import Cases
+from open_webui.models.cases import Case, Cases
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.files import Files
 from open_webui.internal.db import get_db
@@ -34,6 +36,7 @@ from open_webui.config import (
     RAG_OPENAI_API_KEY,
 )
 from open_webui.services.usage_tracker import UsageTracker
+from open_webui.services.trending_terms import trending_terms
 
 # 初始化 logging
 log = logging.getLogger(__name__)
@@ -84,10 +87,6 @@ class SearchHistoryItem(BaseModel):
 # 内存中的搜索历史存储（Redis不可用时的后备）
 _search_history: Dict[str, List[SearchHistoryItem]] = {}
 
-# 热词缓存
-_hot_words_cache: Dict[str, List[tuple]] = {}
-_hot_words_cache_time: Dict[str, datetime] = {}
-
 # 停用词集合（扩展版）
 STOP_WORDS = {
     '的', '是', '在', '和', '了', '有', '我', '你', '他', '她', '它', 
@@ -324,76 +323,59 @@ async def get_search_suggestions(
         )
 
 
-async def get_hot_words() -> List[tuple]:
-    """获取热词列表（返回词和热度分数）"""
-    # 检查Redis缓存
-    if REDIS_AVAILABLE:
-        try:
-            cache_key = "search:hotwords:global"
-            cached_data = redis_client.get(cache_key)
-            if cached_data:
-                return json.loads(cached_data)
-        except Exception as e:
-            log.debug(f"Failed to get hotwords from Redis: {e}")
-    
-    # 检查内存缓存
-    cache_key = "global"
-    if cache_key in _hot_words_cache:
-        cache_time = _hot_words_cache_time.get(cache_key)
-        if cache_time and (datetime.utcnow() - cache_time).seconds < 3600:  # 1小时缓存
-            return _hot_words_cache[cache_key]
-    
+HOT_WORDS_LIMIT = 20
+
+
+def record_trending_text(text: str, timestamp: Optional[float] = None) -> None:
+    """把一段文本（搜索词、案例标题）的关键词计入热词统计"""
+    trending_terms.record_text(
+        text,
+        tokenizer=lambda t: extract_keywords(t, top_k=5),
+        timestamp=timestamp,
+    )
+
+
+def _seed_trending_terms() -> None:
+    """冷启动回填：从最近7天的案例标题中补齐热词统计（多 worker 下只执行一次）"""
+    seed_window = 7 * 24 * 3600
+    if not trending_terms.try_claim_seed(ttl=seed_window):
+        return
+
+    start_ts = int(time.time()) - seed_window
+    with get_db() as db:
+        recent_cases = (
+            db.query(Case.title, Case.created_at)
+            .filter(Case.created_at >= start_ts)
+            .order_by(Case.created_at.desc())
+            .limit(1000)
+            .all()
+        )
+
+    for case in recent_cases:
+        if case.title:
+            record_trending_text(case.title, timestamp=case.created_at)
+    trending_terms.maybe_sync(force=True)
+
+
+async def get_hot_words(window: str = "7d") -> List[tuple]:
+    """获取热词列表（返回词和热度分数）
+
+    热词由流式统计引擎维护，这里只读取预先排好序的窗口结果
+    """
     try:
-        db = next(get_db())
-        
-        # 从最近7天的案例中提取热词
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=7)
-        
-        recent_cases = db.query(Cases.title).filter(
-            and_(
-                Cases.created_at >= start_date,
-                Cases.created_at <= end_date,
-                Cases.is_deleted == False
-            )
-        ).limit(100).all()
-        
-        # 提取所有关键词
-        all_keywords = []
-        for case in recent_cases:
-            if case.title:
-                keywords = extract_keywords(case.title)
-                all_keywords.extend(keywords)
-        
-        # 统计词频
-        word_counter = Counter(all_keywords)
-        
-        # 获取前20个热词，计算热度分数
-        total_count = sum(word_counter.values())
-        hot_words = []
-        for word, count in word_counter.most_common(20):
-            # 计算归一化的热度分数
-            heat_score = min(1.0, count / max(5, total_count / 100))
-            hot_words.append((word, heat_score))
-        
-        # 更新缓存
-        _hot_words_cache[cache_key] = hot_words
-        _hot_words_cache_time[cache_key] = datetime.utcnow()
-        
-        # 存储到Redis
-        if REDIS_AVAILABLE:
-            try:
-                redis_key = "search:hotwords:global"
-                redis_client.setex(
-                    redis_key,
-                    3600,  # 1小时过期
-                    json.dumps(hot_words)
-                )
-            except Exception as e:
-                log.debug(f"Failed to cache hotwords to Redis: {e}")
-        
-        return hot_words
-        
+        await asyncio.to_thread(trending_terms.maybe_sync)
+
+        if trending_terms.is_empty():
+            await asyncio.to_thread(_seed_trending_terms)
+
+        ranked = trending_terms.top(window=window, n=HOT_WORDS_LIMIT)
+        if not ranked:
+            return []
+
+        # 以窗口内最热的词为基准归一化热度分数
+        top_score = ranked[0][1] or 1.0
+        return [(word, min(1.0, score / top_score)) for word, score, _ in ranked]
+
     except Exception as e:
         log.error(f"Failed to get hot words: {str(e)}")
         return []
@@ -435,7 +417,7 @@ async def get_semantic_suggestions(query: str, limit: int = 5) -> List[SearchSug
         for kb in knowledge_bases[:3]:  # 限制搜索的知识库数量
             try:
                 # 向量搜索
-                results = VECTOR_DB_CLIENT.search(
+                results = await VECTOR_DB_CLIENT.asearch(
                     collection_name=kb.id,
                     vectors=[query_vector],
                     limit=3
@@ -596,6 +578,9 @@ async def save_search_history(
         except Exception as e:
             log.error(f"Failed to save history to Redis: {e}")
     
+    # 计入热词统计
+    record_trending_text(history_item.query)
+
     # 同时保存到内存（作为后备）
     if user_id not in _search_history:
         _search_history[user_id] = []
@@ -635,6 +620,30 @@ async def clear_search_history(user=Depends(get_verified_user)):
     return {"message": "搜索历史已清除"}
 
 
+@router.get("/hotwords")
+async def get_hot_words_by_window(
+    window: str = Query(default="7d", description="统计窗口：1h / 24h / 7d"),
+    limit: int = Query(default=10, ge=1, le=HOT_WORDS_LIMIT, description="返回数量"),
+    user=Depends(get_verified_user),
+):
+    """
+    获取指定时间窗口内的热词
+    """
+    if window not in trending_terms.window_names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"不支持的统计窗口: {window}，可选值: {', '.join(trending_terms.window_names)}",
+        )
+
+    hot_words = await get_hot_words(window)
+    return {
+        "window": window,
+        "hotwords": [
+            {"word": word, "heat_score": score} for word, score in hot_words[:limit]
+        ],
+    }
+
+
 @router.get("/trending")
 async def get_trending_searches(
     days: int = Query(default=7, ge=1, le=30, description="统计天数"),
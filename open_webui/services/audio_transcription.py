@@ -0,0 +1,266 @@
+"""
+音频转写分段服务
+通过本地 ffmpeg 管道只解码一次音频，在接近目标时长的静音处切分并逐段编码，
+分段产生后即可开始转写；转写结果按音频内容哈希缓存
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from open_webui.env import (
+    AUDIO_SEGMENT_SEARCH_SECONDS,
+    AUDIO_SEGMENT_TARGET_SECONDS,
+    CACHE_DIR,
+)
+
+log = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # s16le
+WINDOW_MS = 30
+
+
+class Segment(NamedTuple):
+    index: int
+    path: str
+    start: float
+    end: float
+
+
+class SilenceSegmenter:
+    """把 16kHz 单声道 s16le PCM 流切成接近目标时长的分段，切点选在搜索范围内能量最低的窗口"""
+
+    def __init__(
+        self,
+        target_seconds: float = AUDIO_SEGMENT_TARGET_SECONDS,
+        search_seconds: float = AUDIO_SEGMENT_SEARCH_SECONDS,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        self.sample_rate = sample_rate
+        self.window_bytes = sample_rate * WINDOW_MS // 1000 * SAMPLE_WIDTH
+        bytes_per_second = sample_rate * SAMPLE_WIDTH
+        search_seconds = min(search_seconds, target_seconds / 2)
+        self.min_bytes = int((target_seconds - search_seconds) * bytes_per_second)
+        self.max_bytes = int((target_seconds + search_seconds) * bytes_per_second)
+
+        self._buffer = bytearray()
+        # 缓冲区中每个完整窗口的 RMS 能量
+        self._energies: List[float] = []
+        self._offset_bytes = 0
+
+    def _analyze(self) -> None:
+        start = len(self._energies) * self.window_bytes
+        complete = (len(self._buffer) - start) // self.window_bytes
+        end = start + complete * self.window_bytes
+        if end <= start:
+            return
+        samples = np.frombuffer(bytes(self._buffer[start:end]), dtype=np.int16)
+        windows = samples.reshape(-1, self.window_bytes // SAMPLE_WIDTH)
+        rms = np.sqrt(np.mean(windows.astype(np.float32) ** 2, axis=1))
+        self._energies.extend(rms.tolist())
+
+    def _emit(self, size: int) -> Tuple[float, bytes]:
+        start = self._offset_bytes / (self.sample_rate * SAMPLE_WIDTH)
+        pcm = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        del self._energies[: size // self.window_bytes]
+        self._offset_bytes += size
+        return start, pcm
+
+    def feed(self, pcm: bytes) -> Iterator[Tuple[float, bytes]]:
+        """写入 PCM 数据，返回已经确定切点的分段 (起始秒数, PCM)"""
+        self._buffer.extend(pcm)
+        self._analyze()
+        while len(self._buffer) >= self.max_bytes:
+            first = self.min_bytes // self.window_bytes
+            last = self.max_bytes // self.window_bytes
+            candidates = self._energies[first:last]
+            cut = first + int(np.argmin(candidates)) if candidates else last
+            yield self._emit(max(cut, 1) * self.window_bytes)
+
+    def flush(self) -> Optional[Tuple[float, bytes]]:
+        if not self._buffer:
+            return None
+        return self._emit(len(self._buffer))
+
+
+class AudioSegmenter:
+    """ffmpeg 流式解码 + 静音切分"""
+
+    def __init__(
+        self,
+        target_seconds: float = AUDIO_SEGMENT_TARGET_SECONDS,
+        search_seconds: float = AUDIO_SEGMENT_SEARCH_SECONDS,
+        ffmpeg: Optional[str] = None,
+    ):
+        self.target_seconds = target_seconds
+        self.search_seconds = search_seconds
+        self.ffmpeg = ffmpeg or shutil.which("ffmpeg")
+
+    @property
+    def available(self) -> bool:
+        return self.ffmpeg is not None
+
+    def _encode(self, pcm: bytes, path: str) -> None:
+        subprocess.run(
+            [
+                self.ffmpeg,
+                "-nostdin",
+                "-v",
+                "error",
+                "-y",
+                "-f",
+                "s16le",
+                "-ar",
+                str(SAMPLE_RATE),
+                "-ac",
+                "1",
+                "-i",
+                "-",
+                "-b:a",
+                "32k",
+                path,
+            ],
+            input=pcm,
+            check=True,
+            capture_output=True,
+        )
+
+    def segments(self, file_path: str) -> Iterator[Segment]:
+        """解码并逐段产出 mp3 分段，调用方负责删除分段文件"""
+        base = str(Path(file_path).with_suffix(""))
+        segmenter = SilenceSegmenter(self.target_seconds, self.search_seconds)
+        bytes_per_second = SAMPLE_RATE * SAMPLE_WIDTH
+
+        def make_segment(index: int, start: float, pcm: bytes) -> Segment:
+            path = f"{base}_segment_{index}.mp3"
+            self._encode(pcm, path)
+            return Segment(index, path, start, start + len(pcm) / bytes_per_second)
+
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                [
+                    self.ffmpeg,
+                    "-nostdin",
+                    "-v",
+                    "error",
+                    "-i",
+                    file_path,
+                    "-f",
+                    "s16le",
+                    "-ac",
+                    "1",
+                    "-ar",
+                    str(SAMPLE_RATE),
+                    "-",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+            )
+            index = 0
+            try:
+                while chunk := process.stdout.read(bytes_per_second):
+                    for start, pcm in segmenter.feed(chunk):
+                        yield make_segment(index, start, pcm)
+                        index += 1
+
+                if process.wait() != 0:
+                    stderr.seek(0)
+                    raise RuntimeError(
+                        f"ffmpeg failed to decode {file_path}: "
+                        f"{stderr.read().decode(errors='ignore').strip()}"
+                    )
+
+                if tail := segmenter.flush():
+                    yield make_segment(index, *tail)
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                process.stdout.close()
+
+
+def stitch_transcripts(results: List[Tuple[Segment, Dict[str, Any]]]) -> Dict:
+    """按分段起始时间平移各分段内的时间戳，合并为完整转写结果"""
+    texts = []
+    segments = []
+    for segment, result in sorted(results, key=lambda item: item[0].index):
+        text = (result.get("text") or "").strip()
+        if text:
+            texts.append(text)
+
+        inner = result.get("segments") or []
+        if inner and all("start" in s and "end" in s for s in inner):
+            for s in inner:
+                segments.append(
+                    {
+                        "start": round(segment.start + s["start"], 3),
+                        "end": round(segment.start + s["end"], 3),
+                        "text": s.get("text", "").strip(),
+                    }
+                )
+        elif text:
+            segments.append(
+                {
+                    "start": round(segment.start, 3),
+                    "end": round(segment.end, 3),
+                    "text": text,
+                }
+            )
+
+    return {"text": " ".join(texts), "segments": segments}
+
+
+class TranscriptCache:
+    """以音频内容哈希和转写配置为键的转写结果缓存"""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir or Path(CACHE_DIR) / "audio" / "transcripts")
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(file_path: str, *config: Any) -> str:
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                sha256.update(chunk)
+        sha256.update(json.dumps(config, default=str).encode("utf-8"))
+        return sha256.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.stats["hits"] += 1
+            return data
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+        except Exception as e:
+            log.warning(f"Failed to read cached transcript {path}: {e}")
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, data: Dict) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_dir / f"{key}.json")
+        except Exception as e:
+            log.warning(f"Failed to cache transcript: {e}")
+
+
+# 创建全局实例
+audio_segmenter = AudioSegmenter()
+transcript_cache = TranscriptCache()
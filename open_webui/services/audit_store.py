@@ -0,0 +1,335 @@
+"""
+审计日志存储
+
+请求路径只把审计条目放入有界队列，由后台线程批量写入按时间分区的段文件，
+队列满时丢弃条目并计数，不阻塞请求。每个段是 gzip 压缩的 JSONL，
+每批追加为一个独立的 gzip member；SQLite 索引记录每条的用户、路径、方法、
+状态码、时间以及所在的段和 member 位置。查询先走索引，只解压命中的 member，
+不需要扫描整个日志文件。
+段文件名包含进程号，多个 worker 共用目录时各自追加自己的段文件，
+索引里记录的 member 位置不会指向其他进程写入的内容
+"""
+
+import gzip
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from opentelemetry import metrics
+
+from open_webui.env import (
+    AUDIT_LOG_BATCH_SIZE,
+    AUDIT_LOG_QUEUE_SIZE,
+    AUDIT_LOG_SEGMENT_SECONDS,
+    AUDIT_LOGS_DIR,
+)
+
+log = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+audit_entries_dropped = meter.create_counter(
+    name="audit_log.dropped",
+    description="Audit log entries dropped because the writer queue was full",
+    unit="1",
+)
+
+_STOP = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_entry (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT,
+    timestamp INTEGER NOT NULL,
+    user_id TEXT,
+    verb TEXT,
+    path TEXT,
+    status_code INTEGER,
+    segment TEXT NOT NULL,
+    member_offset INTEGER NOT NULL,
+    member_length INTEGER NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audit_entry_timestamp
+    ON audit_entry (timestamp, seq);
+CREATE INDEX IF NOT EXISTS idx_audit_entry_user_id
+    ON audit_entry (user_id, timestamp, seq);
+CREATE INDEX IF NOT EXISTS idx_audit_entry_path
+    ON audit_entry (path, timestamp, seq);
+"""
+
+
+def encode_cursor(entry: Dict[str, Any]) -> str:
+    return f"{entry['timestamp']}:{entry['seq']}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        timestamp, seq = cursor.split(":")
+        return int(timestamp), int(seq)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+class AuditStore:
+    """有界队列 + 后台写线程 + 分段压缩存储和 SQLite 索引"""
+
+    def __init__(
+        self,
+        directory: str = AUDIT_LOGS_DIR,
+        queue_size: int = AUDIT_LOG_QUEUE_SIZE,
+        segment_seconds: int = AUDIT_LOG_SEGMENT_SECONDS,
+        batch_size: int = AUDIT_LOG_BATCH_SIZE,
+        flush_interval: float = 1.0,
+    ):
+        self.directory = Path(directory)
+        self.index_path = self.directory / "index.db"
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self.segment_seconds = segment_seconds
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        self.written = 0
+        self.dropped = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.index_path, timeout=30)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def _ensure_writer(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with closing(self._connect()) as db:
+                    db.execute("PRAGMA journal_mode=WAL")
+                    db.executescript(SCHEMA)
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, entry: Dict[str, Any]) -> bool:
+        """不阻塞地提交一条审计条目，队列已满时丢弃并返回 False"""
+        self._ensure_writer()
+        try:
+            self.queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            audit_entries_dropped.add(1)
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """等待队列中已提交的条目全部写完"""
+        if self._thread is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self.queue.all_tasks_done.wait(remaining)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """写完剩余条目后停止写线程"""
+        thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            log.warning("审计日志写线程未能及时清空队列")
+            return
+        thread.join(timeout)
+
+    # ---------------------------------------------------------------- 写入
+
+    def _next_batch(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """阻塞取到第一条后，在 flush_interval 内继续攒批"""
+        first = self.queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    entry = self.queue.get(timeout=remaining)
+                else:
+                    entry = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self) -> None:
+        with closing(self._connect()) as db:
+            stopping = False
+            while not stopping:
+                batch, stopping = self._next_batch()
+                try:
+                    if batch:
+                        self._write_batch(db, batch)
+                        self.written += len(batch)
+                except Exception as e:
+                    log.error(f"写入审计日志失败，丢弃 {len(batch)} 条: {e}")
+                finally:
+                    # STOP 哨兵也占一个 task
+                    for _ in range(len(batch) + int(stopping)):
+                        self.queue.task_done()
+
+    def segment_name(self, timestamp: int) -> str:
+        start = timestamp - timestamp % self.segment_seconds
+        period = time.strftime("%Y%m%d-%H%M%S", time.gmtime(start))
+        # 每个进程只追加自己的段文件，偏移量不受其他 worker 的写入影响
+        return f"{period}-{os.getpid()}.jsonl.gz"
+
+    def _write_batch(self, db: sqlite3.Connection, batch: List[Dict[str, Any]]):
+        segments: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in batch:
+            segments.setdefault(self.segment_name(entry["timestamp"]), []).append(entry)
+
+        rows = []
+        for segment, entries in segments.items():
+            lines = [json.dumps(entry, default=str) for entry in entries]
+            member = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+            with open(self.directory / segment, "ab") as f:
+                offset = f.tell()
+                f.write(member)
+
+            for line, entry in enumerate(entries):
+                rows.append(
+                    (
+                        entry.get("id"),
+                        entry["timestamp"],
+                        (entry.get("user") or {}).get("id"),
+                        entry.get("verb"),
+                        urlsplit(entry.get("request_uri") or "").path,
+                        entry.get("response_status_code"),
+                        segment,
+                        offset,
+                        len(member),
+                        line,
+                    )
+                )
+
+        with db:
+            db.executemany(
+                "INSERT INTO audit_entry (id, timestamp, user_id, verb, path, "
+                "status_code, segment, member_offset, member_length, line) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    # ---------------------------------------------------------------- 查询
+
+    def _read_member(self, segment: str, offset: int, length: int) -> List[str]:
+        with open(self.directory / segment, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        return gzip.decompress(data).decode("utf-8").splitlines()
+
+    def search(
+        self,
+        user_id: Optional[str] = None,
+        path: Optional[str] = None,
+        verb: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        按时间倒序查询审计条目，返回 (条目, 下一页游标)
+
+        path 为路径前缀，start/end 为包含端点的 Unix 时间戳
+        """
+        if not self.index_path.exists():
+            return [], None
+
+        clauses, params = [], []
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if path:
+            # 前缀匹配写成范围条件，可以使用 path 索引
+            clauses.append("path >= ? AND path < ?")
+            params.extend([path, path + "\U0010ffff"])
+        if verb:
+            clauses.append("verb = ?")
+            params.append(verb.upper())
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(end)
+        if cursor:
+            timestamp, seq = decode_cursor(cursor)
+            clauses.append("(timestamp < ? OR (timestamp = ? AND seq < ?))")
+            params.extend([timestamp, timestamp, seq])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT seq, timestamp, segment, member_offset, member_length, line "
+                f"FROM audit_entry {where} "
+                "ORDER BY timestamp DESC, seq DESC LIMIT ?",
+                [*params, limit + 1],
+            ).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        members: Dict[Tuple[str, int], Optional[List[str]]] = {}
+        entries = []
+        for row in rows:
+            key = (row["segment"], row["member_offset"])
+            if key not in members:
+                try:
+                    members[key] = self._read_member(
+                        row["segment"], row["member_offset"], row["member_length"]
+                    )
+                except (OSError, EOFError, zlib.error, UnicodeDecodeError) as e:
+                    log.warning(f"审计日志段 {row['segment']}@{key[1]} 无法读取: {e}")
+                    members[key] = None
+            lines = members[key]
+            try:
+                entry = json.loads(lines[row["line"]])
+            except (TypeError, IndexError, ValueError):
+                # member 损坏时跳过这一条，不影响同一页的其他条目
+                continue
+            entry["seq"] = row["seq"]
+            entries.append(entry)
+
+        # 游标取自索引行，跳过损坏条目后分页仍然连续
+        next_cursor = encode_cursor(rows[-1]) if has_more else None
+        return entries, next_cursor
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+# 创建全局实例
+audit_store = AuditStore()
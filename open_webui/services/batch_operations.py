@@ -673,7 +673,7 @@ class KnowledgeBatchOperations:
                 # 删除旧索引
                 collection_name = f"knowledge_{knowledge_id}"
                 try:
-                    VECTOR_DB_CLIENT.delete_collection(collection_name)
+                    await VECTOR_DB_CLIENT.adelete_collection(collection_name)
                 except:
                     pass
                 
@@ -0,0 +1,240 @@
+"""
+网页正文提取服务
+在进程池中解析 HTML、去除导航/脚本等模板内容并规范化文本，避免大页面的解析阻塞事件循环。
+每个页面受 CPU 时间和 HTML 大小限制：超过大小限制的页面截断到限制字节数后再解析，
+超过 CPU 时间限制的页面放弃提取并抛出 ValueError
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import re
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from open_webui.env import (
+    WEB_EXTRACT_CPU_TIME_LIMIT,
+    WEB_EXTRACT_MAX_PAGE_BYTES,
+    WEB_EXTRACT_MAX_WORKERS,
+)
+
+log = logging.getLogger(__name__)
+
+# 不属于正文的标签
+BOILERPLATE_TAGS = [
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "form",
+]
+
+_SPACES = re.compile(r"[ \t\r\f\v\u00a0]+")
+
+
+class ExtractionLimitExceeded(Exception):
+    """页面超过 CPU 时间限制"""
+
+
+def normalize_text(text: str) -> str:
+    """合并行内空白，去掉空行"""
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+def _on_cpu_limit(signum, frame):
+    raise ExtractionLimitExceeded()
+
+
+def extract_html(
+    html: str,
+    url: str,
+    parser: str = "html.parser",
+    get_text_kwargs: Optional[Dict[str, Any]] = None,
+    cpu_time_limit: Optional[float] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    解析 HTML 返回 (正文, 元数据)，在工作进程中执行。
+    CPU 时间限制通过 ITIMER_PROF 实现，只在主线程中生效
+    """
+    from bs4 import BeautifulSoup
+
+    use_timer = (
+        bool(cpu_time_limit)
+        and hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_timer:
+        previous = signal.signal(signal.SIGPROF, _on_cpu_limit)
+        signal.setitimer(signal.ITIMER_PROF, cpu_time_limit)
+    try:
+        soup = BeautifulSoup(html, parser)
+
+        metadata = {"source": url}
+        if title := soup.find("title"):
+            metadata["title"] = title.get_text()
+        if description := soup.find("meta", attrs={"name": "description"}):
+            metadata["description"] = description.get(
+                "content", "No description found."
+            )
+        if html_tag := soup.find("html"):
+            metadata["language"] = html_tag.get("lang", "No language found.")
+
+        for tag in soup(BOILERPLATE_TAGS):
+            tag.decompose()
+        text = soup.get_text(**(get_text_kwargs or {"separator": "\n"}))
+        return normalize_text(text), metadata
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+
+class HTMLExtractor:
+    """HTML 正文提取器，工作进程池按需创建"""
+
+    def __init__(
+        self,
+        max_workers: int = WEB_EXTRACT_MAX_WORKERS,
+        cpu_time_limit: Optional[float] = WEB_EXTRACT_CPU_TIME_LIMIT,
+        max_page_bytes: int = WEB_EXTRACT_MAX_PAGE_BYTES,
+    ):
+        self.max_workers = max_workers
+        self.cpu_time_limit = cpu_time_limit
+        self.max_page_bytes = max_page_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.stats = {
+            "pages": 0,
+            "truncated": 0,
+            "limit_exceeded": 0,
+            "inline": 0,
+            "total_time": 0.0,
+        }
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers < 1:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                # 服务进程里已有多个线程，fork 出的子进程可能卡在其他线程持有的锁上，
+                # 工作进程改由 forkserver（不支持时用 spawn）启动
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=_mp_context()
+                )
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _prepare(self, html: str, url: str) -> str:
+        """超过 max_page_bytes（UTF-8 字节）的页面截断后再解析，不会跳过"""
+        if not self.max_page_bytes or len(html) <= self.max_page_bytes // 4:
+            return html
+        data = html.encode("utf-8")
+        if len(data) <= self.max_page_bytes:
+            return html
+        log.info(f"Truncating {url} from {len(data)} to {self.max_page_bytes} bytes")
+        self.stats["truncated"] += 1
+        # 截断处可能落在多字节字符中间，丢弃不完整的字符
+        return data[: self.max_page_bytes].decode("utf-8", errors="ignore")
+
+    def _record(self, start: float) -> None:
+        self.stats["pages"] += 1
+        self.stats["total_time"] += time.perf_counter() - start
+
+    async def extract(
+        self,
+        html: str,
+        url: str,
+        parser: str = "html.parser",
+        get_text_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """在进程池中提取正文；进程池不可用时退回到线程中执行"""
+        start = time.perf_counter()
+        args = (
+            self._prepare(html, url),
+            url,
+            parser,
+            get_text_kwargs,
+            self.cpu_time_limit,
+        )
+        loop = asyncio.get_running_loop()
+        try:
+            pool = self._get_pool()
+            if pool is not None:
+                try:
+                    return await loop.run_in_executor(pool, extract_html, *args)
+                except BrokenProcessPool as e:
+                    log.warning(f"HTML extraction pool broken, running inline: {e}")
+                    self._reset_pool()
+            self.stats["inline"] += 1
+            return await asyncio.to_thread(extract_html, *args)
+        except ExtractionLimitExceeded:
+            self.stats["limit_exceeded"] += 1
+            raise ValueError(
+                f"Extracting {url} exceeded {self.cpu_time_limit}s of CPU time"
+            )
+        finally:
+            self._record(start)
+
+    def extract_sync(
+        self,
+        html: str,
+        url: str,
+        parser: str = "html.parser",
+        get_text_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """同步版本，供同步加载器使用"""
+        start = time.perf_counter()
+        args = (
+            self._prepare(html, url),
+            url,
+            parser,
+            get_text_kwargs,
+            self.cpu_time_limit,
+        )
+        try:
+            pool = self._get_pool()
+            if pool is not None:
+                try:
+                    return pool.submit(extract_html, *args).result()
+                except BrokenProcessPool as e:
+                    log.warning(f"HTML extraction pool broken, running inline: {e}")
+                    self._reset_pool()
+            self.stats["inline"] += 1
+            return extract_html(*args)
+        except ExtractionLimitExceeded:
+            self.stats["limit_exceeded"] += 1
+            raise ValueError(
+                f"Extracting {url} exceeded {self.cpu_time_limit}s of CPU time"
+            )
+        finally:
+            self._record(start)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "max_workers": self.max_workers}
+
+
+# 创建全局实例
+html_extractor = HTMLExtractor()
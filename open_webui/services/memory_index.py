@@ -0,0 +1,125 @@
+"""
+用户记忆向量索引
+
+所有用户的记忆写入同一个向量集合，metadata 中记录 user_id，检索时按 user_id 过滤，
+取代每个用户一个 user-memory-{id} 集合的做法。记忆的新增、修改、删除在路由中
+增量同步到索引；重建时分批向量化。旧的按用户集合在该用户首次重建时删除
+"""
+
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+from open_webui.env import MEMORY_EMBEDDING_BATCH_SIZE, MEMORY_VECTOR_COLLECTION
+from open_webui.models.memories import Memories, MemoryModel
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import SearchResult
+
+log = logging.getLogger(__name__)
+
+
+def legacy_collection_name(user_id: str) -> str:
+    return f"user-memory-{user_id}"
+
+
+class MemoryIndex:
+    """按 user_id 分区的共享记忆索引"""
+
+    def __init__(
+        self,
+        collection_name: str = MEMORY_VECTOR_COLLECTION,
+        batch_size: int = MEMORY_EMBEDDING_BATCH_SIZE,
+        client=None,
+    ):
+        self.collection_name = collection_name
+        self.batch_size = max(1, batch_size)
+        self.client = client or VECTOR_DB_CLIENT
+
+    async def _embed(
+        self, contents: List[str], embedding_function: Callable, user=None
+    ) -> List[List[float]]:
+        # 向量化是同步调用（本地模型或 HTTP），放到线程中执行
+        return await asyncio.to_thread(embedding_function, contents, user=user)
+
+    async def upsert(
+        self, memories: List[MemoryModel], embedding_function: Callable, user=None
+    ) -> int:
+        """分批向量化并写入，返回写入条数"""
+        for start in range(0, len(memories), self.batch_size):
+            batch = memories[start : start + self.batch_size]
+            vectors = await self._embed(
+                [memory.content for memory in batch], embedding_function, user
+            )
+            await self.client.aupsert(
+                collection_name=self.collection_name,
+                items=[
+                    {
+                        "id": memory.id,
+                        "text": memory.content,
+                        "vector": vector,
+                        "metadata": {
+                            "user_id": memory.user_id,
+                            "created_at": memory.created_at,
+                            "updated_at": memory.updated_at,
+                        },
+                    }
+                    for memory, vector in zip(batch, vectors)
+                ],
+            )
+        return len(memories)
+
+    async def delete(self, ids: List[str]) -> None:
+        await self.client.adelete(collection_name=self.collection_name, ids=ids)
+
+    async def delete_user(self, user_id: str) -> None:
+        if await self.client.ahas_collection(self.collection_name):
+            await self.client.adelete(
+                collection_name=self.collection_name, filter={"user_id": user_id}
+            )
+        await self._drop_legacy_collection(user_id)
+
+    async def _drop_legacy_collection(self, user_id: str) -> None:
+        try:
+            if await self.client.ahas_collection(legacy_collection_name(user_id)):
+                await self.client.adelete_collection(legacy_collection_name(user_id))
+        except Exception as e:
+            log.warning(f"Failed to drop legacy memory collection of {user_id}: {e}")
+
+    async def rebuild_user(
+        self, user_id: str, embedding_function: Callable, user=None
+    ) -> int:
+        """按数据库中的记忆重建该用户的索引"""
+        await self.delete_user(user_id)
+        memories = Memories.get_memories_by_user_id(user_id) or []
+        return await self.upsert(memories, embedding_function, user)
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        embedding_function: Callable,
+        k: int = 1,
+        user=None,
+    ) -> Optional[SearchResult]:
+        vector = await asyncio.to_thread(embedding_function, query, user=user)
+        result = await self.client.asearch(
+            collection_name=self.collection_name,
+            vectors=[vector],
+            limit=k,
+            filter={"user_id": user_id},
+        )
+
+        if result is None or not result.ids or not result.ids[0]:
+            # 记忆还在旧的按用户集合中（或索引丢失），重建后再查一次
+            if await self.rebuild_user(user_id, embedding_function, user):
+                result = await self.client.asearch(
+                    collection_name=self.collection_name,
+                    vectors=[vector],
+                    limit=k,
+                    filter={"user_id": user_id},
+                )
+        return result
+
+
+# 创建全局实例
+memory_index = MemoryIndex()
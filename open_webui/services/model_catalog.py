@@ -0,0 +1,204 @@
+"""
+模型目录物化服务
+将 get_all_models 的合并结果物化为快照，只有在模型、函数、连接或配置发生变更
+（版本号递增）时才重建；版本号通过 Redis 在多个 worker 之间共享
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from open_webui.env import REDIS_URL, REDIS_KEY_PREFIX
+
+log = logging.getLogger(__name__)
+
+
+class CatalogSnapshot:
+    """一次构建得到的模型目录"""
+
+    def __init__(
+        self,
+        models: List[dict],
+        version: int,
+        acl: Optional[Dict[str, Tuple[Optional[str], Optional[dict]]]] = None,
+        order_list: Optional[List[str]] = None,
+    ):
+        self.models = models
+        self.version = version
+        self.built_at = time.monotonic()
+        self.by_id = {model["id"]: model for model in models}
+        # model_id -> (owner_id, access_control)；不在其中的模型普通用户不可见
+        self.acl = acl or {}
+        self.listing = self._build_listing(models, order_list or [])
+
+    @staticmethod
+    def _build_listing(models: List[dict], order_list: List[str]) -> List[dict]:
+        """预先计算 /api/models 的返回列表：过滤 filter 管道、合并标签并排序"""
+        listing = []
+        for model in models:
+            if "pipeline" in model and model["pipeline"].get("type", None) == "filter":
+                continue
+
+            try:
+                model_tags = [
+                    tag.get("name")
+                    for tag in model.get("info", {}).get("meta", {}).get("tags", [])
+                ]
+                tags = [tag.get("name") for tag in model.get("tags", [])]
+                model["tags"] = [{"name": tag} for tag in set(model_tags + tags)]
+            except Exception as e:
+                log.debug(f"Error processing model tags: {e}")
+                model["tags"] = []
+
+            listing.append(model)
+
+        if order_list:
+            order = {model_id: i for i, model_id in enumerate(order_list)}
+            listing.sort(key=lambda x: (order.get(x["id"], float("inf")), x["name"]))
+        return listing
+
+    def filter_for_user(
+        self, models: List[dict], user_id: str, group_ids: List[str]
+    ) -> List[dict]:
+        """按预计算的 ACL 视图过滤，不再逐个模型查询数据库"""
+        group_ids = set(group_ids)
+
+        def allowed(model_id: str) -> bool:
+            if model_id not in self.acl:
+                return False
+            owner_id, access_control = self.acl[model_id]
+            if owner_id is not None and owner_id == user_id:
+                return True
+            if access_control is None:
+                return True
+            read = access_control.get("read", {})
+            return user_id in read.get("user_ids", []) or not group_ids.isdisjoint(
+                read.get("group_ids", [])
+            )
+
+        return [model for model in models if allowed(model["id"])]
+
+
+class ModelCatalog:
+    """版本化的模型目录缓存"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        version_key: str = f"{REDIS_KEY_PREFIX}:models:catalog:version",
+        version_check_interval: float = 1.0,
+    ):
+        self.version_key = version_key
+        self.version_check_interval = version_check_interval
+
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self.build_lock = asyncio.Lock()
+        self._local_version = 0
+        self._remote_version = 0
+        # 连接配置单独计数，用于失效缓存的上游连接模型列表
+        self._local_connections_version = 0
+        self._remote_connections_version = 0
+        self._remote_checked_at = 0.0
+        self.stats = {"hits": 0, "builds": 0, "bumps": 0}
+
+        self.redis_client = None
+        if redis_url:
+            try:
+                self.redis_client = redis.from_url(
+                    redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                )
+                self.redis_client.ping()
+            except Exception as e:
+                log.warning(f"Model catalog version sharing via Redis disabled: {e}")
+                self.redis_client = None
+
+    def _sync_remote(self) -> None:
+        """按间隔读取 Redis 中的共享版本"""
+        if self.redis_client is None:
+            return
+        now = time.monotonic()
+        if now - self._remote_checked_at < self.version_check_interval:
+            return
+        try:
+            version, connections_version = self.redis_client.mget(
+                self.version_key, f"{self.version_key}:connections"
+            )
+            self._remote_version = int(version or 0)
+            self._remote_connections_version = int(connections_version or 0)
+            self._remote_checked_at = now
+        except Exception as e:
+            log.warning(f"Failed to read model catalog version: {e}")
+
+    def current_version(self) -> int:
+        """本地版本与 Redis 共享版本之和"""
+        self._sync_remote()
+        return self._local_version + self._remote_version
+
+    def connections_version(self) -> int:
+        self._sync_remote()
+        return self._local_connections_version + self._remote_connections_version
+
+    def bump(self, reason: str = "", connections: bool = False) -> None:
+        """
+        模型、函数、连接或配置变更后调用，使所有 worker 的目录失效；
+        connections=True 时同时丢弃缓存的上游连接模型列表
+        """
+        self._local_version += 1
+        if connections:
+            self._local_connections_version += 1
+        self.stats["bumps"] += 1
+        if self.redis_client is not None:
+            try:
+                pipe = self.redis_client.pipeline()
+                pipe.incr(self.version_key)
+                if connections:
+                    pipe.incr(f"{self.version_key}:connections")
+                pipe.execute()
+                # 本 worker 立即读取最新版本
+                self._remote_checked_at = 0.0
+            except Exception as e:
+                log.warning(f"Failed to publish model catalog version: {e}")
+        log.debug(f"Model catalog invalidated: {reason}")
+
+    def get(self, max_age: Optional[float] = None) -> Optional[CatalogSnapshot]:
+        """返回仍然有效的快照；版本变化或超过 max_age 时返回 None"""
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.version != self.current_version():
+            return None
+        if max_age is not None and time.monotonic() - snapshot.built_at > max_age:
+            return None
+        self.stats["hits"] += 1
+        return snapshot
+
+    def publish(
+        self,
+        models: List[dict],
+        version: int,
+        acl: Optional[Dict[str, Tuple[Optional[str], Optional[dict]]]] = None,
+        order_list: Optional[List[str]] = None,
+    ) -> CatalogSnapshot:
+        snapshot = CatalogSnapshot(models, version, acl=acl, order_list=order_list)
+        self.snapshot = snapshot
+        self.stats["builds"] += 1
+        return snapshot
+
+    def invalidate(self) -> None:
+        self.snapshot = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            **self.stats,
+            "version": self.current_version(),
+            "models": len(snapshot.models) if snapshot else 0,
+            "shared": self.redis_client is not None,
+        }
+
+
+# 创建全局实例
+model_catalog = ModelCatalog(redis_url=REDIS_URL)
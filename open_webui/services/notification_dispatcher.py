@@ -0,0 +1,217 @@
+"""
+Webhook 通知投递
+
+通知先写入 webhook_delivery 表（持久化队列），同一事件对同一 webhook 地址只保留
+一条投递；后台任务按到期时间认领投递，通过共享的 aiohttp 会话发送，
+每个 webhook 主机单独限制并发。失败的投递按指数退避重试，超过最多尝试次数或
+遇到不可重试的 4xx 响应后标记为失败。进程退出时未完成的投递在租约过期后
+由任意实例重新认领
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+from opentelemetry import metrics
+
+from open_webui.env import (
+    WEBHOOK_DELIVERY_CONCURRENCY_PER_HOST,
+    WEBHOOK_DELIVERY_MAX_ATTEMPTS,
+    WEBHOOK_DELIVERY_RETENTION,
+    WEBHOOK_DELIVERY_TIMEOUT,
+)
+from open_webui.models.webhook_deliveries import (
+    WebhookDeliveries,
+    WebhookDeliveryModel,
+)
+
+log = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+webhook_delivery_attempts = meter.create_counter(
+    name="webhook_delivery.attempts",
+    description="Webhook delivery attempts by outcome",
+    unit="1",
+)
+
+
+class NotificationDispatcher:
+    """基于数据库队列的 webhook 投递器"""
+
+    def __init__(
+        self,
+        concurrency_per_host: int = WEBHOOK_DELIVERY_CONCURRENCY_PER_HOST,
+        max_attempts: int = WEBHOOK_DELIVERY_MAX_ATTEMPTS,
+        timeout: float = WEBHOOK_DELIVERY_TIMEOUT,
+        retention: int = WEBHOOK_DELIVERY_RETENTION,
+        batch_size: int = 100,
+        poll_interval: float = 5.0,
+        retry_base: float = 2.0,
+        retry_max: float = 600.0,
+        lease: float = 600.0,
+    ):
+        self.concurrency_per_host = concurrency_per_host
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.retention = retention
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease_ns = int(lease * 1e9)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_prune = 0.0
+
+    async def enqueue(
+        self, event_key: str, deliveries: List[Tuple[str, dict]]
+    ) -> int:
+        """
+        写入一个事件的 (url, payload) 投递并唤醒后台任务，返回新增条数
+
+        去重键为 event_key + url，重复提交同一事件不会重复投递
+        """
+        rows = [(f"{event_key}:{url}", url, payload) for url, payload in deliveries]
+        count = await asyncio.to_thread(WebhookDeliveries.insert_new_deliveries, rows)
+        if count and self._wakeup is not None:
+            self._wakeup.set()
+        return count
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """停止后台任务；未完成的投递在租约过期后重新认领"""
+        tasks = [task for task in (self._task, *self._inflight) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._inflight.clear()
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=self.concurrency_per_host
+                ),
+            )
+        return self._session
+
+    async def _run(self) -> None:
+        while True:
+            backlog = False
+            try:
+                free = self.batch_size - len(self._inflight)
+                if free > 0:
+                    deliveries = await asyncio.to_thread(
+                        WebhookDeliveries.claim_due_deliveries, free, self.lease_ns
+                    )
+                    for delivery in deliveries:
+                        task = asyncio.create_task(self._deliver(delivery))
+                        self._inflight.add(task)
+                        task.add_done_callback(self._on_done)
+                    backlog = len(deliveries) == free
+
+                await self._prune()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"认领 webhook 投递失败: {e}")
+
+            # 认领满批时可能还有到期的投递，等有空位时再认领；
+            # 否则最多等待 poll_interval，以便处理到期的重试
+            timer = None
+            if not backlog:
+                timer = asyncio.get_running_loop().call_later(
+                    self.poll_interval, self._wakeup.set
+                )
+            try:
+                await self._wakeup.wait()
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            self._wakeup.clear()
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._inflight.discard(task)
+        if self._wakeup is not None and len(self._inflight) < self.batch_size:
+            self._wakeup.set()
+
+    async def _prune(self) -> None:
+        now = time.time()
+        if now - self._last_prune < 3600:
+            return
+        self._last_prune = now
+        before = time.time_ns() - int(self.retention * 1e9)
+        count = await asyncio.to_thread(
+            WebhookDeliveries.delete_finished_deliveries_before, before
+        )
+        if count:
+            log.debug(f"清理了 {count} 条已完成的 webhook 投递")
+
+    async def _deliver(self, delivery: WebhookDeliveryModel) -> None:
+        host = urlsplit(delivery.url).netloc
+        limit = self._host_limits.setdefault(
+            host, asyncio.Semaphore(self.concurrency_per_host)
+        )
+
+        async with limit:
+            try:
+                async with self._get_session().post(
+                    delivery.url, json=delivery.payload
+                ) as r:
+                    if r.status < 300:
+                        webhook_delivery_attempts.add(1, {"outcome": "delivered"})
+                        await asyncio.to_thread(
+                            WebhookDeliveries.mark_delivered, delivery.id
+                        )
+                        return
+                    error = f"HTTP {r.status}"
+                    # 其余 4xx 说明请求本身有问题，重试也不会成功
+                    retryable = r.status == 429 or r.status >= 500
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e) or type(e).__name__
+                retryable = True
+            except Exception as e:
+                # 其他异常（例如记录投递结果时的数据库错误）同样计入尝试次数，
+                # 否则这一行会一直停在 sending，每次租约过期后都被重新投递
+                log.exception(f"webhook 投递异常: {delivery.url}")
+                error = f"{type(e).__name__}: {e}"
+                retryable = True
+
+        attempts = delivery.attempts + 1
+        retry_at = None
+        if retryable and attempts < self.max_attempts:
+            delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+            retry_at = time.time_ns() + int(delay * 1e9)
+
+        webhook_delivery_attempts.add(
+            1, {"outcome": "retry" if retry_at is not None else "failed"}
+        )
+        log.warning(f"webhook 投递失败 ({attempts} 次): {delivery.url} {error}")
+        try:
+            await asyncio.to_thread(
+                WebhookDeliveries.mark_attempt_failed, delivery.id, error, retry_at
+            )
+        except Exception as e:
+            # 记录失败本身出错时只能等租约过期后重新认领
+            log.error(f"记录 webhook 投递失败出错: {delivery.id} {e}")
+
+
+# 创建全局实例
+notification_dispatcher = NotificationDispatcher()
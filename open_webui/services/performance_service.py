@@ -8,7 +8,7 @@ import asyncio
 import time
 import hashlib
 import json
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from functools import wraps
 import logging
@@ -337,60 +337,94 @@ class PerformanceService:
             logger.error(f"向量搜索优化失败: {e}")
             return []
     
-    async def batch_vector_search(self, queries: List[str], limit: int = 10) -> Dict[str, List[Dict]]:
-        """批量向量搜索优化"""
+    async def batch_vector_search(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        collection_name: str = "",
+        embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+    ) -> Dict[str, List[Dict]]:
+        """批量向量搜索：未命中缓存的查询一次性向量化，再并发搜索"""
         results = {}
-        
+
         # 检查缓存
         uncached_queries = []
-        for query in queries:
-            cache_key = self.vector_cache._generate_key("vector_search", query=query, limit=limit)
+        for query in dict.fromkeys(queries):
+            cache_key = self.vector_cache._generate_key(
+                "vector_search", collection=collection_name, query=query, limit=limit
+            )
             cached_result = self.vector_cache.get(cache_key)
-            
+
             if cached_result:
                 results[query] = cached_result
             else:
                 uncached_queries.append(query)
-        
-        # 批量执行未缓存的查询
-        if uncached_queries:
-            vector_db = get_retrieval_vector_db()
-            if vector_db:
-                start_time = time.time()
-                
-                # 并发执行搜索
-                tasks = []
-                for query in uncached_queries:
-                    task = asyncio.create_task(self._single_vector_search(vector_db, query, limit))
-                    tasks.append((query, task))
-                
-                # 等待所有任务完成
-                for query, task in tasks:
-                    try:
-                        search_results = await task
-                        results[query] = search_results
-                        
-                        # 缓存结果
-                        cache_key = self.vector_cache._generate_key("vector_search", query=query, limit=limit)
-                        self.vector_cache.set(cache_key, search_results)
-                        
-                    except Exception as e:
-                        logger.error(f"批量搜索失败 {query}: {e}")
-                        results[query] = []
-                
-                total_time = time.time() - start_time
-                self.query_optimizer.record_query("batch_vector_search", total_time, len(uncached_queries))
-        
+
+        if not uncached_queries:
+            return results
+
+        vector_db = get_retrieval_vector_db()
+        if not vector_db or embedding_function is None:
+            for query in uncached_queries:
+                results[query] = []
+            return results
+
+        start_time = time.time()
+        embeddings = await asyncio.to_thread(embedding_function, uncached_queries)
+
+        # 并发执行搜索
+        search_results = await asyncio.gather(
+            *(
+                self._single_vector_search(vector_db, collection_name, embedding, limit)
+                for embedding in embeddings
+            )
+        )
+
+        for query, search_result in zip(uncached_queries, search_results):
+            results[query] = search_result
+            if search_result:
+                cache_key = self.vector_cache._generate_key(
+                    "vector_search",
+                    collection=collection_name,
+                    query=query,
+                    limit=limit,
+                )
+                self.vector_cache.set(cache_key, search_result)
+
+        total_time = time.time() - start_time
+        self.performance_metrics['vector_search_times'].append(total_time)
+        self.query_optimizer.record_query(
+            "batch_vector_search", total_time, len(uncached_queries)
+        )
+
         return results
-    
-    async def _single_vector_search(self, vector_db, query: str, limit: int) -> List[Dict]:
-        """单个向量搜索"""
+
+    async def _single_vector_search(
+        self, vector_db, collection_name: str, embedding: List[float], limit: int
+    ) -> List[Dict]:
+        """单个向量搜索，结果展开为可缓存的字典列表"""
         try:
-            return vector_db.search(query=query, limit=limit)
+            result = await vector_db.asearch(
+                collection_name=collection_name, vectors=[embedding], limit=limit
+            )
         except Exception as e:
-            logger.error(f"向量搜索失败: {e}")
+            logger.error(f"向量搜索失败 {collection_name}: {e}")
             return []
-    
+
+        if not result or not result.ids:
+            return []
+
+        distances = result.distances[0] if result.distances else []
+        return [
+            {
+                "id": id,
+                "document": result.documents[0][i] if result.documents else None,
+                "metadata": result.metadatas[0][i] if result.metadatas else None,
+                "distance": distances[i] if i < len(distances) else None,
+            }
+            for i, id in enumerate(result.ids[0])
+        ]
+
     def record_api_response_time(self, endpoint: str, response_time: float):
         """记录API响应时间"""
         self.performance_metrics['api_response_times'].append({
@@ -0,0 +1,216 @@
+"""
+函数/工具插件缓存服务
+缓存插件的数据库记录、valves、编译后的模块和工具 spec；模块与 spec 以内容哈希为键，
+内容不变就不会重新编译。插件更新时本地失效并通过 Redis pub/sub 通知其他 worker
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import redis
+
+from open_webui.env import REDIS_URL, REDIS_KEY_PREFIX
+
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class PluginCache:
+    """按 (类型, ID) 索引的插件缓存，类型为 function 或 tool"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        channel: str = f"{REDIS_KEY_PREFIX}:plugins:invalidate",
+    ):
+        self.channel = channel
+
+        self._lock = threading.Lock()
+        # (kind, id) -> (记录, 内容哈希)
+        self._rows: Dict[Tuple[str, str], Tuple[Any, Optional[str]]] = {}
+        self._valves: Dict[Tuple[str, str], dict] = {}
+        # (kind, 查询名) -> 列表查询结果，该类型任一插件变更即失效
+        self._queries: Dict[Tuple[str, str], Any] = {}
+        # (kind, id) -> (内容哈希, 模块)
+        self._modules: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+        self._specs: Dict[Tuple[str, str], Tuple[str, list]] = {}
+        self.version = 0
+        self.stats = {"hits": 0, "misses": 0, "compiles": 0, "invalidations": 0}
+
+        self.redis_client = None
+        self._listening = False
+        if redis_url:
+            try:
+                self.redis_client = redis.from_url(
+                    redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                )
+                self.redis_client.ping()
+                threading.Thread(
+                    target=self._listen, name="plugin-cache-listener", daemon=True
+                ).start()
+            except Exception as e:
+                log.warning(f"Plugin cache invalidation via Redis disabled: {e}")
+                self.redis_client = None
+
+    @property
+    def enabled(self) -> bool:
+        # 多 worker 部署下，只有在能收到失效通知时才缓存数据库记录
+        return self.redis_client is None or self._listening
+
+    @staticmethod
+    def content_hash(content: Optional[str]) -> Optional[str]:
+        if content is None:
+            return None
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get_row(
+        self, kind: str, id: str, loader: Callable[[str], Any]
+    ) -> Tuple[Any, Optional[str]]:
+        """返回 (记录, 内容哈希)，未命中时通过 loader 读取数据库"""
+        key = (kind, id)
+        if self.enabled:
+            entry = self._rows.get(key)
+            if entry is not None:
+                self.stats["hits"] += 1
+                return entry
+
+        self.stats["misses"] += 1
+        version = self.version
+        row = loader(id)
+        entry = (row, self.content_hash(getattr(row, "content", None)))
+        if row is not None and self.enabled:
+            with self._lock:
+                # 读取期间发生失效时不写入旧数据
+                if version == self.version:
+                    self._rows[key] = entry
+        return entry
+
+    def get_query(self, kind: str, name: str, loader: Callable[[], Any]) -> Any:
+        """缓存按类型的列表查询，如全局过滤器、启用的过滤器"""
+        key = (kind, name)
+        if self.enabled:
+            result = self._queries.get(key, _MISSING)
+            if result is not _MISSING:
+                self.stats["hits"] += 1
+                return result
+
+        self.stats["misses"] += 1
+        version = self.version
+        result = loader()
+        if self.enabled:
+            with self._lock:
+                if version == self.version:
+                    self._queries[key] = result
+        return result
+
+    def get_valves(self, kind: str, id: str, loader: Callable[[str], Any]) -> Any:
+        key = (kind, id)
+        if self.enabled:
+            valves = self._valves.get(key, _MISSING)
+            if valves is not _MISSING:
+                self.stats["hits"] += 1
+                return valves
+
+        self.stats["misses"] += 1
+        version = self.version
+        valves = loader(id)
+        if valves is not None and self.enabled:
+            with self._lock:
+                if version == self.version:
+                    self._valves[key] = valves
+        return valves
+
+    def get_module(self, kind: str, id: str, content_hash: Optional[str]) -> Any:
+        entry = self._modules.get((kind, id))
+        if entry is not None and content_hash is not None and entry[0] == content_hash:
+            return entry[1]
+        return None
+
+    def set_module(
+        self, kind: str, id: str, content_hash: Optional[str], module: Any
+    ) -> None:
+        if content_hash is None:
+            return
+        self.stats["compiles"] += 1
+        with self._lock:
+            self._modules[(kind, id)] = (content_hash, module)
+
+    def get_specs(self, kind: str, id: str, content_hash: Optional[str]) -> Any:
+        entry = self._specs.get((kind, id))
+        if entry is not None and content_hash is not None and entry[0] == content_hash:
+            return entry[1]
+        return None
+
+    def set_specs(
+        self, kind: str, id: str, content_hash: Optional[str], specs: list
+    ) -> None:
+        if content_hash is None:
+            return
+        with self._lock:
+            self._specs[(kind, id)] = (content_hash, specs)
+
+    def invalidate(
+        self, kind: str, id: Optional[str] = None, broadcast: bool = True
+    ) -> None:
+        """
+        插件新增、更新、删除或 valves 变更后调用；id 为空时失效该类型的全部记录。
+        模块和 spec 以内容哈希校验，内容未变的仍可复用
+        """
+        with self._lock:
+            self.version += 1
+            for cache in (self._rows, self._valves):
+                for key in [k for k in cache if k[0] == kind and id in (None, k[1])]:
+                    del cache[key]
+            for key in [k for k in self._queries if k[0] == kind]:
+                del self._queries[key]
+            self.stats["invalidations"] += 1
+
+        if broadcast and self.redis_client is not None:
+            try:
+                self.redis_client.publish(self.channel, f"{kind}:{id or ''}")
+            except Exception as e:
+                log.warning(f"Failed to broadcast plugin invalidation: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._rows.clear()
+            self._valves.clear()
+            self._queries.clear()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # 断线期间可能错过失效通知，重新订阅后清空缓存
+                self.clear()
+                self._listening = True
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        kind, _, id = message["data"].partition(":")
+                        self.invalidate(kind, id or None, broadcast=False)
+            except Exception as e:
+                log.warning(f"Plugin cache listener disconnected: {e}")
+            finally:
+                self._listening = False
+            time.sleep(5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "version": self.version,
+            "rows": len(self._rows),
+            "modules": len(self._modules),
+        }
+
+
+# 创建全局实例
+plugin_cache = PluginCache(redis_url=REDIS_URL)
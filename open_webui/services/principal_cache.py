@@ -0,0 +1,166 @@
+"""
+已验证身份缓存服务
+在短时间内复用 token -> 用户 的解析结果，避免每个请求都查询数据库；
+用户信息或角色变更时本地失效，并通过 Redis pub/sub 通知其他 worker
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+import redis
+
+from open_webui.env import AUTH_PRINCIPAL_CACHE_TTL, REDIS_URL, REDIS_KEY_PREFIX
+
+log = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+    """token ID / 用户 ID 双索引的短期身份缓存"""
+
+    def __init__(
+        self,
+        ttl: int = AUTH_PRINCIPAL_CACHE_TTL,
+        max_entries: int = 10000,
+        redis_url: Optional[str] = None,
+        channel: str = f"{REDIS_KEY_PREFIX}:auth:principal:invalidate",
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.channel = channel
+
+        self._lock = threading.Lock()
+        # token_id -> (user, user_id, expires_at)
+        self._entries: "OrderedDict[str, Tuple[Any, str, float]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._last_active: Dict[str, float] = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+        self.redis_client = None
+        self._listening = False
+        if redis_url and ttl > 0:
+            try:
+                self.redis_client = redis.from_url(
+                    redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                )
+                self.redis_client.ping()
+                threading.Thread(
+                    target=self._listen, name="principal-cache-listener", daemon=True
+                ).start()
+            except Exception as e:
+                log.warning(f"Principal cache invalidation via Redis disabled: {e}")
+                self.redis_client = None
+
+    @property
+    def enabled(self) -> bool:
+        # 多 worker 部署下，只有在能收到失效通知时才使用缓存
+        return self.ttl > 0 and (self.redis_client is None or self._listening)
+
+    def get(self, token_id: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(token_id)
+            if entry is None or entry[2] <= time.monotonic():
+                if entry is not None:
+                    self._remove(token_id)
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(token_id)
+            self.stats["hits"] += 1
+            return entry[0].model_copy()
+
+    def set(self, token_id: str, user: Any, exp: Optional[int] = None) -> None:
+        """缓存身份，有效期不超过 token 本身的过期时间"""
+        if not self.enabled:
+            return
+
+        ttl = self.ttl
+        if exp is not None:
+            ttl = min(ttl, exp - time.time())
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._remove(token_id)
+            self._entries[token_id] = (user, user.id, time.monotonic() + ttl)
+            self._by_user.setdefault(user.id, set()).add(token_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, token_id: str) -> None:
+        entry = self._entries.pop(token_id, None)
+        if entry is not None:
+            tokens = self._by_user.get(entry[1])
+            if tokens is not None:
+                tokens.discard(token_id)
+                if not tokens:
+                    del self._by_user[entry[1]]
+
+    def invalidate_token(self, token_id: str) -> None:
+        with self._lock:
+            self._remove(token_id)
+
+    def invalidate_user(self, user_id: str, broadcast: bool = True) -> None:
+        """用户信息、角色变更或删除时调用"""
+        with self._lock:
+            for token_id in list(self._by_user.get(user_id, ())):
+                self._remove(token_id)
+            self._last_active.pop(user_id, None)
+            self.stats["invalidations"] += 1
+
+        if broadcast and self.redis_client is not None:
+            try:
+                self.redis_client.publish(self.channel, user_id)
+            except Exception as e:
+                log.warning(f"Failed to broadcast principal invalidation: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+            self._last_active.clear()
+
+    def should_touch_last_active(self, user_id: str, interval: int = 60) -> bool:
+        """限制 last_active_at 的写入频率"""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_active.get(user_id)
+            if last is not None and now - last < interval:
+                return False
+            self._last_active[user_id] = now
+            return True
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # 断线期间可能错过失效通知，重新订阅后清空缓存
+                self.clear()
+                self._listening = True
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.invalidate_user(message["data"], broadcast=False)
+            except Exception as e:
+                log.warning(f"Principal cache listener disconnected: {e}")
+            finally:
+                self._listening = False
+            time.sleep(5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "ttl": self.ttl,
+        }
+
+
+# 创建全局实例
+principal_cache = PrincipalCache(redis_url=REDIS_URL)
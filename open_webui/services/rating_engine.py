@@ -0,0 +1,235 @@
+"""
+模型评分引擎
+
+用 Bradley-Terry 模型计算竞技场排行榜。每条 rating 类型的反馈（data.rating 为 1/-1/0，
+带 model_id 和 sibling_model_ids）与每个对手记一场胜/负/平，按 (标签, 模型对) 累加到
+model_rating_pair 表；反馈新增、修改、删除时只增减对应的计数，再重新拟合受影响的标签，
+评分、95% 置信区间和胜负数写入 model_rating 表，排行榜直接读取。
+Bradley-Terry 的结果与反馈顺序无关，所以增量更新与全量重建的结果一致。
+计数的更新、重新拟合和重建都在同一个数据库事务里完成，并持有数据库级的写锁，
+多个 worker 同时更新或重建时不会互相覆盖或重复计数。
+回填完成后才接受增量更新，之前的修改由回填从反馈表统一计入，计数不会出现负数
+"""
+
+import logging
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from open_webui.models.feedbacks import FeedbackModel, Feedbacks
+from open_webui.models.model_ratings import (
+    OVERALL,
+    ModelRatingModel,
+    ModelRatingPairModel,
+    ModelRatings,
+)
+
+log = logging.getLogger(__name__)
+
+# data.rating -> 当前模型对每个对手的 (胜, 负, 平)
+OUTCOMES = {"1": (1, 0, 0), "-1": (0, 1, 0), "0": (0, 0, 1)}
+
+# 评分换算到 Elo 刻度，虚拟参照模型为 1000 分
+ELO_SCALE = 400 / math.log(10)
+ELO_BASE = 1000.0
+
+Counts = Dict[Tuple[str, str, str], Tuple[int, int, int]]
+
+
+def feedback_comparisons(feedback: Optional[FeedbackModel]) -> Counts:
+    """一条反馈贡献的对战计数，键为 (标签, model_a, model_b)，model_a < model_b"""
+    if feedback is None or feedback.type != "rating":
+        return {}
+
+    data = feedback.data or {}
+    model_id = data.get("model_id")
+    outcome = OUTCOMES.get(str(data.get("rating")))
+    if not model_id or outcome is None:
+        return {}
+
+    tags = (feedback.meta or {}).get("tags") or []
+    tags = [OVERALL, *sorted({tag for tag in tags if isinstance(tag, str) and tag})]
+
+    counts: Counts = {}
+    for opponent in dict.fromkeys(data.get("sibling_model_ids") or []):
+        if not opponent or opponent == model_id:
+            continue
+        won, lost, tied = outcome
+        if model_id < opponent:
+            key, delta = (model_id, opponent), (won, lost, tied)
+        else:
+            key, delta = (opponent, model_id), (lost, won, tied)
+        for tag in tags:
+            counts[(tag, *key)] = delta
+    return counts
+
+
+def merge_counts(target: Counts, counts: Counts, sign: int = 1) -> Counts:
+    for key, delta in counts.items():
+        current = target.get(key, (0, 0, 0))
+        target[key] = tuple(c + sign * d for c, d in zip(current, delta))
+    return target
+
+
+def fit_bradley_terry(
+    pairs: Iterable[ModelRatingPairModel],
+    prior: float = 1.0,
+    iterations: int = 500,
+    tolerance: float = 1e-9,
+) -> List[dict]:
+    """
+    用 MM 算法拟合 Bradley-Terry 强度，返回每个模型的评分、置信区间和胜负数
+
+    每个模型与强度为 1 的虚拟参照模型各有 prior 场平局，用来固定刻度，
+    并让全胜或全负的模型得到有限的评分
+    """
+    pairs = list(pairs)
+    models = sorted({p.model_a for p in pairs} | {p.model_b for p in pairs})
+    if not models:
+        return []
+
+    index = {model_id: i for i, model_id in enumerate(models)}
+    n = len(models)
+    wins = np.zeros((n, n))
+    record = np.zeros((n, 3), dtype=int)
+    for pair in pairs:
+        a, b = index[pair.model_a], index[pair.model_b]
+        wins[a, b] += pair.wins_a + pair.ties / 2
+        wins[b, a] += pair.wins_b + pair.ties / 2
+        record[a] += (pair.wins_a, pair.wins_b, pair.ties)
+        record[b] += (pair.wins_b, pair.wins_a, pair.ties)
+
+    games = wins + wins.T
+    total_wins = wins.sum(axis=1) + prior / 2
+
+    strength = np.ones(n)
+    for _ in range(iterations):
+        denominator = (games / (strength[:, None] + strength[None, :])).sum(axis=1)
+        denominator += prior / (strength + 1)
+        updated = total_wins / denominator
+        converged = np.max(np.abs(np.log(updated) - np.log(strength))) < tolerance
+        strength = updated
+        if converged:
+            break
+
+    # log 强度的 Fisher 信息矩阵，取逆得到方差
+    weight = (
+        games
+        * strength[:, None]
+        * strength[None, :]
+        / (strength[:, None] + strength[None, :]) ** 2
+    )
+    information = -weight
+    np.fill_diagonal(
+        information, weight.sum(axis=1) + prior * strength / (strength + 1) ** 2
+    )
+    stderr = np.sqrt(np.diag(np.linalg.inv(information)))
+
+    ratings = []
+    for i, model_id in enumerate(models):
+        rating = ELO_BASE + ELO_SCALE * math.log(strength[i])
+        margin = 1.96 * ELO_SCALE * stderr[i]
+        won, lost, tied = (int(value) for value in record[i])
+        ratings.append(
+            {
+                "model_id": model_id,
+                "rating": round(rating, 2),
+                "ci_low": round(rating - margin, 2),
+                "ci_high": round(rating + margin, 2),
+                "won": won,
+                "lost": lost,
+                "ties": tied,
+            }
+        )
+    return ratings
+
+
+class RatingEngine:
+    """维护对战计数和各标签的排行榜"""
+
+    def __init__(self, prior: float = 1.0, batch_size: int = 500):
+        self.prior = prior
+        self.batch_size = batch_size
+        # 同一进程内先在这里排队，跨进程由数据库写锁串行化
+        self._lock = threading.Lock()
+
+    def apply(self, old: Optional[FeedbackModel], new: Optional[FeedbackModel]) -> None:
+        """反馈从 old 变为 new（新增时 old 为 None，删除时 new 为 None）"""
+        counts = merge_counts(
+            merge_counts({}, feedback_comparisons(new)), feedback_comparisons(old), -1
+        )
+        self._apply_counts(counts)
+
+    def discard(self, feedbacks: Iterable[FeedbackModel]) -> None:
+        """撤销一批已删除反馈的贡献，只更新一次"""
+        counts: Counts = {}
+        for feedback in feedbacks:
+            merge_counts(counts, feedback_comparisons(feedback), -1)
+        self._apply_counts(counts)
+
+    def _apply_counts(self, counts: Counts) -> None:
+        counts = {key: delta for key, delta in counts.items() if any(delta)}
+        if not counts:
+            return
+
+        with self._lock:
+            applied = ModelRatings.add_pair_deltas(counts, self._fit)
+        if not applied:
+            # 还没有完成回填：反馈表已包含这次修改，直接回填一次
+            self.rebuild(only_if_unbuilt=True)
+
+    def rebuild(self, only_if_unbuilt: bool = False) -> Optional[int]:
+        """
+        从反馈表重新计算全部计数和排行榜，并记录已完成回填，返回参与计算的反馈数
+
+        only_if_unbuilt 时只在还没有完成过回填时重建，已经完成（例如其他 worker
+        刚回填完）则返回 None
+        """
+        total = 0
+
+        def load_counts() -> Counts:
+            nonlocal total
+            counts: Counts = {}
+            cursor = None
+            while True:
+                feedbacks, cursor = Feedbacks.get_feedbacks_page(
+                    cursor=cursor, limit=self.batch_size, type="rating"
+                )
+                for feedback in feedbacks:
+                    merge_counts(counts, feedback_comparisons(feedback))
+                total += len(feedbacks)
+                if cursor is None:
+                    return counts
+
+        with self._lock:
+            counts = ModelRatings.rebuild(load_counts, self._fit, only_if_unbuilt)
+        if counts is None:
+            return None
+        log.info(f"排行榜已重建: {total} 条反馈, {len(counts)} 组对战")
+        return total
+
+    def ensure_built(self) -> None:
+        """还没有完成回填时（例如刚升级）从反馈表重建一次，多个 worker 只会执行一次"""
+        try:
+            self.rebuild(only_if_unbuilt=True)
+        except Exception as e:
+            log.error(f"重建排行榜失败: {e}")
+
+    def _fit(self, pairs: List[ModelRatingPairModel]) -> List[dict]:
+        return fit_bradley_terry(pairs, prior=self.prior)
+
+    def get_leaderboard(self, tag: str = OVERALL) -> List[ModelRatingModel]:
+        return ModelRatings.get_ratings_by_tag(tag)
+
+    def get_model_breakdown(self, model_id: str) -> List[ModelRatingModel]:
+        """模型在总榜和每个标签下的评分"""
+        return ModelRatings.get_ratings_by_model_id(model_id)
+
+    def get_tags(self) -> List[str]:
+        return ModelRatings.get_tags()
+
+
+# 创建全局实例
+rating_engine = RatingEngine()
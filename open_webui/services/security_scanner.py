@@ -12,6 +12,11 @@ import os
 import hashlib
 import mimetypes
 import logging
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import magic
@@ -19,6 +24,115 @@ from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# 读取文件的块大小，第一个块同时用于文件头和 MIME 类型检测
+SCAN_CHUNK_SIZE = 64 * 1024
+
+# 可执行文件特征
+EXECUTABLE_SIGNATURES = [
+    b'MZ',  # PE executable
+    b'\x7fELF',  # ELF executable
+    b'\xfe\xed\xfa',  # Mach-O executable
+    b'\xcf\xfa\xed\xfe',  # Mach-O executable
+]
+
+# 可疑脚本内容
+SUSPICIOUS_PATTERNS = [
+    'eval(',
+    'exec(',
+    'system(',
+    'shell_exec(',
+    'passthru(',
+    'base64_decode(',
+    'javascript:',
+    'vbscript:',
+    'powershell',
+    'cmd.exe',
+    '/bin/sh',
+    'wget',
+    'curl'
+]
+
+ALLOWED_MIME_TYPES = {
+    'application/pdf',
+    'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'text/plain',
+    'text/markdown',
+    'application/rtf',
+    'application/vnd.ms-excel',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'text/csv',
+    'application/vnd.ms-powerpoint',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'image/jpeg',
+    'image/png',
+    'image/gif',
+    'image/bmp',
+    'image/webp',
+    'application/zip',
+    'application/x-rar-compressed',
+    'application/x-7z-compressed',
+    'application/x-tar',
+    'application/gzip'
+}
+
+DANGEROUS_MIME_TYPES = {
+    'application/x-executable',
+    'application/x-msdos-program',
+    'application/x-msdownload',
+    'application/x-dosexec'
+}
+
+
+class PatternMatcher:
+    """Aho-Corasick 多模式匹配器，按字节流增量匹配（ASCII 大小写不敏感）"""
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        self._goto: List[Dict[int, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[set] = [set()]
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for byte in pattern.lower().encode('utf-8'):
+                if byte not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(set())
+                    self._goto[state][byte] = len(self._goto) - 1
+                state = self._goto[state][byte]
+            self._output[state].add(index)
+
+        # 广度优先构建失败指针
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for byte, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and byte not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(byte, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def feed(self, data: bytes, state: int = 0, found: Optional[set] = None) -> Tuple[int, set]:
+        """处理一个数据块，返回新的状态和命中的模式下标；状态可跨块延续"""
+        found = set() if found is None else found
+        goto, fail, output = self._goto, self._fail, self._output
+        for byte in data.lower():
+            while state and byte not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(byte, 0)
+            if output[state]:
+                found |= output[state]
+        return state, found
+
+
+_pattern_matcher = PatternMatcher(SUSPICIOUS_PATTERNS)
+
 class ScanResult(BaseModel):
     """扫描结果模型"""
     is_safe: bool
@@ -33,7 +147,7 @@ class ScanResult(BaseModel):
 class SecurityScanner:
     """文件安全扫描器"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024, max_workers: Optional[int] = None):
         self.allowed_extensions = {
             '.pdf', '.doc', '.docx', '.txt', '.md', '.rtf',
             '.xls', '.xlsx', '.csv', '.ppt', '.pptx',
@@ -48,6 +162,18 @@ class SecurityScanner:
         }
         
         self.max_file_size = 100 * 1024 * 1024  # 100MB
+        # 文本内容只检查前 10KB
+        self.content_scan_limit = 10240
+        
+        # 按内容哈希缓存与文件名无关的检查结果（MIME、内容）
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.stats = {"scans": 0, "cache_hits": 0}
+        
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
     
     def scan_file(self, file_path: str, filename: str = None) -> ScanResult:
         """
@@ -60,7 +186,6 @@ class SecurityScanner:
         Returns:
             ScanResult: 扫描结果
         """
-        import time
         start_time = time.time()
         
         try:
@@ -69,10 +194,10 @@ class SecurityScanner:
                 raise FileNotFoundError(f"文件不存在: {file_path}")
             
             filename = filename or file_path.name
-            file_size = file_path.stat().st_size
             
-            # 计算文件哈希
-            md5_hash = self._calculate_md5(file_path)
+            # 单次读取文件，同时计算哈希、检测类型并匹配可疑内容
+            content = self._scan_content(file_path)
+            file_size = content["file_size"]
             
             # 检查文件大小
             size_check = self._check_file_size(file_size)
@@ -80,11 +205,8 @@ class SecurityScanner:
             # 检查文件扩展名
             extension_check = self._check_file_extension(filename)
             
-            # 检查文件类型（MIME类型）
-            mime_check = self._check_mime_type(file_path)
-            
-            # 检查文件内容
-            content_check = self._check_file_content(file_path)
+            mime_check = content["mime_check"]
+            content_check = content["content_check"]
             
             # 综合评估
             threats = []
@@ -116,13 +238,15 @@ class SecurityScanner:
                 threats=threats,
                 file_type=mime_check["mime_type"],
                 file_size=file_size,
-                md5_hash=md5_hash,
+                md5_hash=content["md5_hash"],
                 scan_time=scan_time,
                 details={
                     "size_check": size_check,
                     "extension_check": extension_check,
                     "mime_check": mime_check,
                     "content_check": content_check,
+                    "sha256": content["sha256"],
+                    "cached": content["cached"],
                 }
             )
             
@@ -139,13 +263,66 @@ class SecurityScanner:
                 details={"error": str(e)}
             )
     
-    def _calculate_md5(self, file_path: Path) -> str:
-        """计算文件MD5哈希"""
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+    def _scan_content(self, file_path: Path) -> Dict:
+        """
+        分块读取文件一次：MD5/SHA256 哈希、文件头特征、MIME 嗅探和
+        多模式匹配共用同一个缓冲区。内容检查结果按 SHA256 缓存
+        """
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        file_size = 0
+        head = b''
+        state, found = 0, set()
+        scanned = 0
+        
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(SCAN_CHUNK_SIZE), b''):
+                md5.update(chunk)
+                sha256.update(chunk)
+                if not head:
+                    head = chunk
+                if scanned < self.content_scan_limit:
+                    window = chunk[:self.content_scan_limit - scanned]
+                    state, found = _pattern_matcher.feed(window, state, found)
+                    scanned += len(window)
+                file_size += len(chunk)
+        
+        digest = sha256.hexdigest()
+        cached = self._cache_get(digest)
+        if cached is None:
+            cached = {
+                "mime_check": self._check_mime_type(head),
+                "content_check": self._check_file_content(head, found),
+            }
+            self._cache_put(digest, cached)
+        
+        return {
+            "file_size": file_size,
+            "md5_hash": md5.hexdigest(),
+            "sha256": digest,
+            "mime_check": cached["mime_check"],
+            "content_check": cached["content_check"],
+            "cached": cached.get("cached", False),
+        }
+    
+    def _cache_get(self, digest: str) -> Optional[Dict]:
+        with self._cache_lock:
+            self.stats["scans"] += 1
+            entry = self._cache.get(digest)
+            if entry is None:
+                return None
+            self._cache.move_to_end(digest)
+            self.stats["cache_hits"] += 1
+            return {**entry, "cached": True}
+    
+    def _cache_put(self, digest: str, entry: Dict) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[digest] = entry
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
     
     def _check_file_size(self, file_size: int) -> Dict:
         """检查文件大小"""
@@ -186,45 +363,13 @@ class SecurityScanner:
             "threats": []
         }
     
-    def _check_mime_type(self, file_path: Path) -> Dict:
-        """检查MIME类型"""
+    def _check_mime_type(self, head: bytes) -> Dict:
+        """根据文件开头的数据检查MIME类型"""
         try:
             # 使用python-magic检测真实文件类型
-            mime_type = magic.from_file(str(file_path), mime=True)
-            
-            # 检查是否为允许的MIME类型
-            allowed_mime_types = {
-                'application/pdf',
-                'application/msword',
-                'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                'text/plain',
-                'text/markdown',
-                'application/rtf',
-                'application/vnd.ms-excel',
-                'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                'text/csv',
-                'application/vnd.ms-powerpoint',
-                'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-                'image/jpeg',
-                'image/png',
-                'image/gif',
-                'image/bmp',
-                'image/webp',
-                'application/zip',
-                'application/x-rar-compressed',
-                'application/x-7z-compressed',
-                'application/x-tar',
-                'application/gzip'
-            }
+            mime_type = magic.from_buffer(head, mime=True)
             
-            dangerous_mime_types = {
-                'application/x-executable',
-                'application/x-msdos-program',
-                'application/x-msdownload',
-                'application/x-dosexec'
-            }
-            
-            if mime_type in dangerous_mime_types:
+            if mime_type in DANGEROUS_MIME_TYPES:
                 return {
                     "safe": False,
                     "risk_level": "high",
@@ -232,7 +377,7 @@ class SecurityScanner:
                     "mime_type": mime_type
                 }
             
-            if mime_type not in allowed_mime_types:
+            if mime_type not in ALLOWED_MIME_TYPES:
                 return {
                     "safe": False,
                     "risk_level": "medium",
@@ -256,99 +401,73 @@ class SecurityScanner:
                 "mime_type": "unknown"
             }
     
-    def _check_file_content(self, file_path: Path) -> Dict:
-        """检查文件内容"""
+    def _check_file_content(self, head: bytes, found_patterns: set) -> Dict:
+        """根据文件头和匹配到的可疑模式检查文件内容"""
         threats = []
         risk_level = "low"
         
-        try:
-            # 检查文件头部特征
-            with open(file_path, 'rb') as f:
-                header = f.read(1024)
-            
-            # 检查可执行文件特征
-            executable_signatures = [
-                b'MZ',  # PE executable
-                b'\x7fELF',  # ELF executable
-                b'\xfe\xed\xfa',  # Mach-O executable
-                b'\xcf\xfa\xed\xfe',  # Mach-O executable
-            ]
-            
-            for sig in executable_signatures:
-                if header.startswith(sig):
-                    threats.append("检测到可执行文件特征")
-                    risk_level = "high"
-                    break
-            
-            # 检查脚本内容（对于文本文件）
-            if self._is_text_file(file_path):
-                text_threats = self._check_text_content(file_path)
-                threats.extend(text_threats)
-                if text_threats:
-                    risk_level = "medium"
-            
-            return {
-                "safe": len(threats) == 0,
-                "risk_level": risk_level,
-                "threats": threats
-            }
-            
-        except Exception as e:
-            logger.warning(f"文件内容检查失败: {e}")
-            return {
-                "safe": True,
-                "risk_level": "low",
-                "threats": []
-            }
-    
-    def _is_text_file(self, file_path: Path) -> bool:
-        """判断是否为文本文件"""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                f.read(1024)
-            return True
-        except:
-            return False
-    
-    def _check_text_content(self, file_path: Path) -> List[str]:
-        """检查文本文件内容"""
-        threats = []
+        # 检查可执行文件特征
+        for sig in EXECUTABLE_SIGNATURES:
+            if head.startswith(sig):
+                threats.append("检测到可执行文件特征")
+                risk_level = "high"
+                break
         
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read(10240)  # 只读取前10KB
-            
-            # 检查可疑脚本内容
-            suspicious_patterns = [
-                'eval(',
-                'exec(',
-                'system(',
-                'shell_exec(',
-                'passthru(',
-                'base64_decode(',
-                'javascript:',
-                'vbscript:',
-                'powershell',
-                'cmd.exe',
-                '/bin/sh',
-                'wget',
-                'curl'
-            ]
-            
-            content_lower = content.lower()
-            for pattern in suspicious_patterns:
-                if pattern in content_lower:
-                    threats.append(f"检测到可疑代码模式: {pattern}")
-            
-        except Exception as e:
-            logger.warning(f"文本内容检查失败: {e}")
+        # 检查脚本内容，按模式定义的顺序输出
+        text_threats = [
+            f"检测到可疑代码模式: {pattern}"
+            for index, pattern in enumerate(SUSPICIOUS_PATTERNS)
+            if index in found_patterns
+        ]
+        threats.extend(text_threats)
+        if text_threats and risk_level == "low":
+            risk_level = "medium"
         
-        return threats
+        return {
+            "safe": len(threats) == 0,
+            "risk_level": risk_level,
+            "threats": threats
+        }
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # 服务进程里已有多个线程，fork 出的子进程可能卡在其他线程持有的锁上，
+                # 工作进程改由 forkserver（不支持时用 spawn）启动
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    "forkserver" if "forkserver" in methods else "spawn"
+                )
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=context
+                )
+            return self._pool
     
     def scan_multiple_files(self, file_paths: List[str]) -> Dict[str, ScanResult]:
-        """批量扫描多个文件"""
+        """批量扫描多个文件，多个文件时在进程池中并行扫描"""
         results = {}
         
+        if len(file_paths) > 1 and self.max_workers > 1:
+            try:
+                pool = self._get_pool()
+                for file_path, result in zip(
+                    file_paths, pool.map(_scan_file_in_worker, file_paths)
+                ):
+                    results[file_path] = ScanResult(**result)
+                    # 子进程的结果写回本进程的缓存
+                    details = result["details"]
+                    if "sha256" in details:
+                        self._cache_put(details["sha256"], {
+                            "mime_check": details["mime_check"],
+                            "content_check": details["content_check"],
+                        })
+                return results
+            except Exception as e:
+                logger.warning(f"进程池扫描失败，改为顺序扫描: {e}")
+                with self._pool_lock:
+                    self._pool = None
+                results = {}
+        
         for file_path in file_paths:
             try:
                 results[file_path] = self.scan_file(file_path)
@@ -366,10 +485,21 @@ class SecurityScanner:
                 )
         
         return results
+    
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "cache_entries": len(self._cache),
+            "max_workers": self.max_workers,
+        }
 
 # 全局扫描器实例
 security_scanner = SecurityScanner()
 
+def _scan_file_in_worker(file_path: str) -> Dict:
+    """进程池中执行的扫描函数（scan_file 本身不会抛出异常）"""
+    return security_scanner.scan_file(file_path).model_dump()
+
 def scan_file_security(file_path: str, filename: str = None) -> ScanResult:
     """扫描单个文件的安全性"""
     return security_scanner.scan_file(file_path, filename)
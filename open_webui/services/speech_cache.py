@@ -0,0 +1,235 @@
+"""
+语音合成缓存服务
+按字节预算做 LRU 淘汰；同一个键同时只合成一次，并发的相同请求共享同一次合成，
+音频边生成边返回给所有等待的客户端，同时写入缓存文件
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiofiles
+from opentelemetry import metrics
+
+from open_webui.env import CACHE_DIR, SPEECH_CACHE_MAX_SIZE_MB
+
+log = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+speech_cache_requests = meter.create_counter(
+    name="speech_cache.requests",
+    description="Speech cache lookups by result (hit, miss, coalesced)",
+    unit="1",
+)
+
+
+class _Generation:
+    """一次进行中的合成，保存已生成的音频块供所有等待者读取"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.condition = asyncio.Condition()
+
+
+class SpeechCache:
+    """语音合成结果缓存，文件保存在 CACHE_DIR/audio/speech 下"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: int = SPEECH_CACHE_MAX_SIZE_MB * 1024 * 1024,
+    ):
+        self.cache_dir = Path(cache_dir or Path(CACHE_DIR) / "audio" / "speech")
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # name -> 文件大小，按最近使用排序
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+        self._inflight: Dict[str, _Generation] = {}
+        self._tasks: set = set()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def _path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.mp3"
+
+    def _body_path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.json"
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        """首次使用时扫描缓存目录，按修改时间重建 LRU 顺序"""
+        if self._entries is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            files = []
+            for path in self.cache_dir.glob("*.mp3"):
+                try:
+                    stat = path.stat()
+                    files.append((stat.st_mtime, path.stem, stat.st_size))
+                except OSError:
+                    continue
+            self._entries = OrderedDict(
+                (name, size) for _, name, size in sorted(files)
+            )
+            self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def get(self, name: str) -> Optional[Path]:
+        """返回缓存文件路径并更新其最近使用时间，未命中返回 None"""
+        path = self._path(name)
+        with self._lock:
+            entries = self._load_index()
+            try:
+                size = path.stat().st_size
+            except OSError:
+                if name in entries:
+                    self._total_bytes -= entries.pop(name)
+                return None
+
+            if name not in entries:
+                # 其他 worker 写入的文件
+                self._total_bytes += size
+            entries[name] = size
+            entries.move_to_end(name)
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.stats["hits"] += 1
+        speech_cache_requests.add(1, {"result": "hit"})
+        return path
+
+    def add(self, name: str) -> None:
+        """登记由外部直接写入缓存目录的文件"""
+        try:
+            size = self._path(name).stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            entries = self._load_index()
+            self._total_bytes += size - entries.get(name, 0)
+            entries[name] = size
+            entries.move_to_end(name)
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = self._entries
+        while self._total_bytes > self.max_bytes and len(entries) > 1:
+            name, size = entries.popitem(last=False)
+            self._total_bytes -= size
+            self.stats["evictions"] += 1
+            for path in (self._path(name), self._body_path(name)):
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError as e:
+                    log.warning(f"Failed to evict {path}: {e}")
+
+    async def generate(
+        self,
+        name: str,
+        producer: AsyncIterator[bytes],
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        合成并缓存音频，返回可流式读取的迭代器。
+        已有相同请求在合成时直接跟随该次合成；在第一个音频块到达前失败时抛出异常
+        """
+        generation = self._inflight.get(name)
+        if generation is None:
+            self.stats["misses"] += 1
+            speech_cache_requests.add(1, {"result": "miss"})
+            generation = _Generation()
+            self._inflight[name] = generation
+            task = asyncio.create_task(self._run(name, generation, producer, payload))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self.stats["coalesced"] += 1
+            speech_cache_requests.add(1, {"result": "coalesced"})
+            await producer.aclose()
+
+        async with generation.condition:
+            await generation.condition.wait_for(
+                lambda: generation.chunks or generation.done
+            )
+        if generation.error is not None and not generation.chunks:
+            raise generation.error
+        return self._follow(generation)
+
+    async def _follow(self, generation: _Generation) -> AsyncIterator[bytes]:
+        sent = 0
+        while True:
+            async with generation.condition:
+                await generation.condition.wait_for(
+                    lambda: len(generation.chunks) > sent or generation.done
+                )
+                chunks = generation.chunks[sent:]
+                finished = generation.done
+            for chunk in chunks:
+                yield chunk
+            sent += len(chunks)
+            if finished and sent == len(generation.chunks):
+                if generation.error is not None:
+                    raise generation.error
+                return
+
+    async def _run(
+        self,
+        name: str,
+        generation: _Generation,
+        producer: AsyncIterator[bytes],
+        payload: Optional[Dict[str, Any]],
+    ) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_dir / f"{name}.{uuid.uuid4().hex}.tmp"
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in producer:
+                    if not chunk:
+                        continue
+                    await f.write(chunk)
+                    async with generation.condition:
+                        generation.chunks.append(chunk)
+                        generation.condition.notify_all()
+
+            os.replace(tmp_path, self._path(name))
+            if payload is not None:
+                async with aiofiles.open(self._body_path(name), "w") as f:
+                    await f.write(json.dumps(payload))
+            self.add(name)
+        except BaseException as e:
+            generation.error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            self._inflight.pop(name, None)
+            async with generation.condition:
+                generation.done = True
+                generation.condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._load_index()
+            return {
+                **self.stats,
+                "entries": len(entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "inflight": len(self._inflight),
+            }
+
+
+# 创建全局实例
+speech_cache = SpeechCache()
@@ -5,6 +5,10 @@ JWT Token黑名单服务
 
 import redis
 import json
+import hashlib
+import math
+import threading
+import time
 from typing import Optional
 from datetime import datetime, timedelta
 import logging
@@ -12,11 +16,48 @@ from open_webui.config import REDIS_URL
 
 log = logging.getLogger(__name__)
 
+
+class BloomFilter:
+    """
+    布隆过滤器
+    
+    判断"不存在"是确定的，判断"可能存在"时需要再向 Redis 确认
+    """
+    
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+    
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
 class TokenBlacklistService:
     """Token黑名单管理服务"""
     
+    CHANNEL = "token_blacklist:revoked"
+    # 黑名单条目会自动过期，定期重建布隆过滤器以清除已过期的条目
+    BLOOM_REBUILD_INTERVAL = 3600
+    
     def __init__(self):
         """初始化Redis连接"""
+        self._bloom = BloomFilter()
+        self._bloom_ready = False
+        self._bloom_lock = threading.Lock()
+        
         try:
             # 解析Redis URL
             if REDIS_URL:
@@ -41,11 +82,55 @@ class TokenBlacklistService:
             self.redis_client.ping()
             self.enabled = True
             log.info("Token blacklist service initialized successfully")
+            
+            # 在后台订阅吊销通知，把黑名单镜像到本地布隆过滤器
+            threading.Thread(
+                target=self._sync_bloom, name="token-blacklist-sync", daemon=True
+            ).start()
         except Exception as e:
             log.warning(f"Failed to connect to Redis: {e}. Token blacklist disabled.")
             self.redis_client = None
             self.enabled = False
     
+    @staticmethod
+    def token_id(token: str) -> str:
+        """token 的稳定标识（黑名单 key 与身份缓存共用）"""
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    def _rebuild_bloom(self):
+        """从 Redis 中现存的黑名单条目重建布隆过滤器"""
+        bloom = BloomFilter()
+        for key in self.redis_client.scan_iter(match="token_blacklist:*", count=1000):
+            bloom.add(key.split(":", 1)[1])
+        with self._bloom_lock:
+            self._bloom = bloom
+    
+    def _sync_bloom(self):
+        """订阅吊销通知；断线期间回退为逐次查询 Redis"""
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                # 先订阅再重建，保证重建期间发生的吊销不会丢失
+                self._rebuild_bloom()
+                self._bloom_ready = True
+                rebuilt_at = time.monotonic()
+                
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        with self._bloom_lock:
+                            self._bloom.add(message["data"])
+                    
+                    if time.monotonic() - rebuilt_at > self.BLOOM_REBUILD_INTERVAL:
+                        self._rebuild_bloom()
+                        rebuilt_at = time.monotonic()
+            except Exception as e:
+                log.warning(f"Token blacklist sync disconnected: {e}")
+            finally:
+                self._bloom_ready = False
+            time.sleep(5)
+    
     def add_to_blacklist(self, token: str, exp_timestamp: int) -> bool:
         """
         将token添加到黑名单
@@ -74,8 +159,7 @@ class TokenBlacklistService:
             ttl = int((exp_time - now).total_seconds())
             
             # 使用token的hash作为key，避免key过长
-            import hashlib
-            token_hash = hashlib.sha256(token.encode()).hexdigest()
+            token_hash = self.token_id(token)
             key = f"token_blacklist:{token_hash}"
             
             # 存储token信息和过期时间
@@ -92,6 +176,11 @@ class TokenBlacklistService:
                 json.dumps(data)
             )
             
+            # 更新本地布隆过滤器并通知其他 worker
+            with self._bloom_lock:
+                self._bloom.add(token_hash)
+            self.redis_client.publish(self.CHANNEL, token_hash)
+            
             log.info(f"Token added to blacklist, will expire in {ttl} seconds")
             return True
             
@@ -114,8 +203,12 @@ class TokenBlacklistService:
             return False
             
         try:
-            import hashlib
-            token_hash = hashlib.sha256(token.encode()).hexdigest()
+            token_hash = self.token_id(token)
+            
+            # 布隆过滤器确认不存在时无需访问 Redis
+            if self._bloom_ready and token_hash not in self._bloom:
+                return False
+            
             key = f"token_blacklist:{token_hash}"
             
             # 检查key是否存在
@@ -146,8 +239,7 @@ class TokenBlacklistService:
             return False
             
         try:
-            import hashlib
-            token_hash = hashlib.sha256(token.encode()).hexdigest()
+            token_hash = self.token_id(token)
             key = f"token_blacklist:{token_hash}"
             
             result = self.redis_client.delete(key)
@@ -214,6 +306,8 @@ class TokenBlacklistService:
                 "enabled": True,
                 "total_entries": len(keys),
                 "redis_connected": True,
+                "bloom_ready": self._bloom_ready,
+                "bloom_entries": self._bloom.count,
                 "redis_info": self.redis_client.info("server")
             }
             
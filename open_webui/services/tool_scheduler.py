@@ -0,0 +1,122 @@
+"""
+工具调用调度服务
+同一轮模型输出中的多个工具调用彼此独立，并发执行以降低整轮延迟；
+每个调用有独立的超时，整体受并发上限约束，结果顺序与调用顺序一致
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from opentelemetry import metrics
+
+from open_webui.env import TOOL_CALL_MAX_CONCURRENCY, TOOL_CALL_TIMEOUT
+
+log = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+tool_call_duration = meter.create_histogram(
+    name="tool_calls.duration",
+    description="Tool call execution latency",
+    unit="ms",
+)
+tool_call_failures = meter.create_counter(
+    name="tool_calls.failures",
+    description="Tool calls that raised or timed out",
+    unit="1",
+)
+
+# (工具名, 返回协程的函数, 超时秒数；None 使用默认值)
+ToolJob = Tuple[str, Callable[[], Awaitable[Any]], Optional[float]]
+
+
+class ToolCallScheduler:
+    """并发执行一轮中的工具调用"""
+
+    def __init__(
+        self,
+        max_concurrency: int = TOOL_CALL_MAX_CONCURRENCY,
+        timeout: Optional[float] = TOOL_CALL_TIMEOUT,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.stats: Dict[str, Any] = {"calls": 0, "failures": 0, "timeouts": 0}
+        self.tool_stats: Dict[str, Dict[str, float]] = {}
+
+    async def run(self, jobs: List[ToolJob]) -> List[Any]:
+        """
+        执行所有调用并按输入顺序返回结果；
+        异常和超时不会中断其他调用，而是以错误信息作为该调用的结果
+        """
+        if not jobs:
+            return []
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_job(name, call, timeout):
+            async with semaphore:
+                return await self._execute(name, call, timeout)
+
+        return await asyncio.gather(
+            *(run_job(name, call, timeout) for name, call, timeout in jobs)
+        )
+
+    async def _execute(
+        self, name: str, call: Callable[[], Awaitable[Any]], timeout: Optional[float]
+    ) -> Any:
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            if timeout:
+                return await asyncio.wait_for(call(), timeout=timeout)
+            return await call()
+        except asyncio.TimeoutError:
+            status = "timeout"
+            log.warning(f"Tool call {name} timed out after {timeout}s")
+            return f"Tool {name} timed out after {timeout} seconds"
+        except Exception as e:
+            status = "error"
+            log.debug(f"Tool call {name} failed: {e}")
+            return str(e)
+        finally:
+            self._record(name, (time.perf_counter() - start) * 1000, status)
+
+    def _record(self, name: str, elapsed_ms: float, status: str) -> None:
+        self.stats["calls"] += 1
+        entry = self.tool_stats.setdefault(
+            name, {"calls": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        entry["calls"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+        attributes = {"tool": name, "status": status}
+        tool_call_duration.record(elapsed_ms, attributes)
+        if status != "ok":
+            entry["failures"] += 1
+            self.stats["failures"] += 1
+            if status == "timeout":
+                self.stats["timeouts"] += 1
+            tool_call_failures.add(1, attributes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
+            "tools": {
+                name: {
+                    "calls": entry["calls"],
+                    "failures": entry["failures"],
+                    "avg_ms": round(entry["total_ms"] / entry["calls"], 2),
+                    "max_ms": round(entry["max_ms"], 2),
+                }
+                for name, entry in self.tool_stats.items()
+            },
+        }
+
+
+# 创建全局实例
+tool_scheduler = ToolCallScheduler()
@@ -0,0 +1,500 @@
+"""
+热词趋势统计服务
+基于 Count-Min Sketch + Top-K 的流式重词（heavy hitters）统计，
+按时间衰减窗口聚合搜索词与案例标题，支持通过 Redis 在多个 worker 间合并
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+def sketch_cells(key: str, width: int, depth: int) -> List[int]:
+    """计算 key 在每一行中的格子下标（扁平化后的绝对下标），同尺寸 sketch 共用"""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [row * width + (h1 + row * h2) % width for row in range(depth)]
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch
+
+    固定内存的频次估计结构，估计值只会偏大不会偏小；
+    两个相同尺寸的 sketch 逐格相加即可合并
+    """
+
+    def __init__(self, width: int = 1024, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = array("q", [0]) * (width * depth)
+        self.total = 0
+
+    def indexes(self, key: str) -> List[int]:
+        return sketch_cells(key, self.width, self.depth)
+
+    def add(self, key: str, count: int = 1) -> int:
+        """累加计数并返回该 key 的新估计值"""
+        estimate = None
+        for idx in self.indexes(key):
+            self.table[idx] += count
+            value = self.table[idx]
+            estimate = value if estimate is None else min(estimate, value)
+        self.total += count
+        return estimate or 0
+
+    def estimate(self, key: str) -> int:
+        """估计 key 的出现次数"""
+        return min(self.table[idx] for idx in self.indexes(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """合并另一个同尺寸的 sketch"""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge sketches with different dimensions")
+        for idx, value in enumerate(other.table):
+            if value:
+                self.table[idx] += value
+        self.total += other.total
+
+
+class TopK:
+    """
+    有界的候选重词集合
+
+    只保留估计值最高的 capacity 个词，容量固定，因此查询代价与数据流规模无关
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.items: Dict[str, int] = {}
+
+    def offer(self, key: str, estimate: int) -> None:
+        """提交一个词的最新估计值"""
+        if key in self.items or len(self.items) < self.capacity:
+            self.items[key] = estimate
+            return
+
+        min_key = min(self.items, key=self.items.get)
+        if estimate > self.items[min_key]:
+            del self.items[min_key]
+            self.items[key] = estimate
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        return sorted(self.items.items(), key=lambda x: x[1], reverse=True)[:n]
+
+
+@dataclass
+class WindowSpec:
+    """时间窗口配置：由 slots 个长度为 slot_seconds 的时间片组成"""
+
+    name: str
+    slot_seconds: int
+    slots: int
+    decay: float = 0.85  # 每往前一个时间片，权重乘以该系数
+
+    @property
+    def span_seconds(self) -> int:
+        return self.slot_seconds * self.slots
+
+
+DEFAULT_WINDOWS = [
+    WindowSpec(name="1h", slot_seconds=300, slots=12),
+    WindowSpec(name="24h", slot_seconds=3600, slots=24),
+    WindowSpec(name="7d", slot_seconds=86400, slots=7),
+]
+
+
+class _Slot:
+    """单个时间片：一个 sketch 加上一组候选词"""
+
+    def __init__(self, width: int, depth: int, capacity: int):
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = TopK(capacity)
+
+
+class DecayedWindow:
+    """
+    时间衰减的滑动窗口
+
+    窗口由环形排列的时间片构成，过期时间片整体丢弃；
+    热度 = Σ 时间片内估计次数 × decay^时间片年龄
+    """
+
+    def __init__(self, spec: WindowSpec, width: int, depth: int, capacity: int):
+        self.spec = spec
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.slots: Dict[int, _Slot] = {}
+        self._cached: Optional[Tuple[int, List[Tuple[str, float, int]]]] = None
+
+    def slot_index(self, timestamp: float) -> int:
+        return int(timestamp // self.spec.slot_seconds)
+
+    def _expire(self, current: int) -> None:
+        oldest = current - self.spec.slots + 1
+        for idx in [i for i in self.slots if i < oldest]:
+            del self.slots[idx]
+
+    def add(self, term: str, count: int, timestamp: float) -> int:
+        """记录一次出现，返回所在时间片下标"""
+        idx = self.slot_index(timestamp)
+        slot = self.slots.get(idx)
+        if slot is None:
+            slot = self.slots[idx] = _Slot(self.width, self.depth, self.capacity)
+        estimate = slot.sketch.add(term, count)
+        slot.candidates.offer(term, estimate)
+        self._cached = None
+        return idx
+
+    def top(self, n: int, now: float) -> List[Tuple[str, float, int]]:
+        """返回 [(词, 衰减后热度, 窗口内估计次数)]，同一时间片内重复查询直接命中缓存"""
+        current = self.slot_index(now)
+        if self._cached is not None and self._cached[0] == current:
+            return self._cached[1][:n]
+
+        self._expire(current)
+        terms = set()
+        for slot in self.slots.values():
+            terms.update(slot.candidates.items)
+
+        ranked = []
+        for term in terms:
+            score = 0.0
+            count = 0
+            for idx, slot in self.slots.items():
+                estimate = slot.sketch.estimate(term)
+                score += estimate * (self.spec.decay ** (current - idx))
+                count += estimate
+            ranked.append((term, score, count))
+
+        ranked.sort(key=lambda x: x[1], reverse=True)
+        ranked = ranked[: self.capacity]
+        self._cached = (current, ranked)
+        return ranked[:n]
+
+
+class TrendingTermsEngine:
+    """
+    热词统计引擎
+
+    - 本地：每个时间窗口维护一组带 Count-Min Sketch 与 Top-K 的时间片
+    - 跨 worker：后台线程每隔 sync_interval 把本地增量以 HINCRBY 写入 Redis 中
+      对应时间片的 sketch 格子，并按合并后的估计值更新候选词有序集合；读取时汇总
+      各时间片的候选词，结果缓存在本地，查询热词只需读取预先排好序的列表。
+      只记录、不查询热词的 worker 也会推送增量；待推送的增量最多 max_pending 项，
+      达到上限时提前推送，仍推送不出去时丢弃新词的增量
+    """
+
+    def __init__(
+        self,
+        windows: Optional[List[WindowSpec]] = None,
+        width: int = 1024,
+        depth: int = 4,
+        capacity: int = 64,
+        redis_client=None,
+        key_prefix: str = "search:trending",
+        sync_interval: int = 30,
+        max_pending: int = 10000,
+    ):
+        self.windows: Dict[str, DecayedWindow] = {
+            spec.name: DecayedWindow(spec, width, depth, capacity)
+            for spec in (windows or DEFAULT_WINDOWS)
+        }
+        self.capacity = capacity
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.sync_interval = sync_interval
+        self.max_pending = max_pending
+        self.worker_id = uuid.uuid4().hex[:8]
+
+        self._lock = threading.Lock()
+        # window -> slot -> term -> 待同步的增量
+        self._pending: Dict[str, Dict[int, Dict[str, int]]] = defaultdict(
+            lambda: defaultdict(lambda: defaultdict(int))
+        )
+        self._pending_size = 0
+        self.pending_dropped = 0
+        self._global_view: Dict[str, List[Tuple[str, float, int]]] = {}
+        self._last_sync = 0.0
+        self._seed_attempted = False
+
+        self._sync_thread: Optional[threading.Thread] = None
+        self._sync_wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    @property
+    def window_names(self) -> List[str]:
+        return list(self.windows)
+
+    def record(
+        self,
+        terms: Iterable[str],
+        weight: int = 1,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """记录一组词的出现"""
+        timestamp = timestamp or time.time()
+        with self._lock:
+            for term in terms:
+                term = term.strip().lower()
+                if not term:
+                    continue
+                for name, window in self.windows.items():
+                    idx = window.add(term, weight, timestamp)
+                    if self.redis_client is not None:
+                        self._add_pending(name, idx, term, weight)
+        if self.redis_client is not None:
+            self._ensure_sync_thread()
+
+    def _add_pending(self, window: str, slot: int, term: str, weight: int) -> None:
+        terms = self._pending[window][slot]
+        if term not in terms:
+            if self._pending_size >= self.max_pending:
+                # Redis 长时间不可用时不让待推送的增量无限增长
+                self.pending_dropped += weight
+                self._sync_wakeup.set()
+                return
+            self._pending_size += 1
+            if self._pending_size >= self.max_pending:
+                self._sync_wakeup.set()
+        terms[term] += weight
+
+    def _ensure_sync_thread(self) -> None:
+        if self._sync_thread is not None or self._stopped.is_set():
+            return
+        with self._lock:
+            if self._sync_thread is None:
+                self._sync_thread = threading.Thread(
+                    target=self._sync_loop, name="trending-terms-sync", daemon=True
+                )
+                self._sync_thread.start()
+
+    def _sync_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._sync_wakeup.wait(self.sync_interval)
+            self._sync_wakeup.clear()
+            if not self._stopped.is_set():
+                self.maybe_sync(force=True)
+
+    def close(self) -> None:
+        """停止后台同步线程，并推送剩余的增量"""
+        self._stopped.set()
+        self._sync_wakeup.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join(timeout=5)
+        self.maybe_sync(force=True)
+
+    def record_text(
+        self,
+        text: str,
+        tokenizer: Callable[[str], List[str]],
+        weight: int = 1,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """分词后记录一段文本，同一文本中重复出现的词只计一次"""
+        if not text:
+            return
+        try:
+            terms = list(dict.fromkeys(tokenizer(text)))
+        except Exception as e:
+            log.debug(f"Failed to tokenize text for trending terms: {e}")
+            return
+        self.record(terms, weight=weight, timestamp=timestamp)
+
+    def top(
+        self, window: str = "7d", n: int = 20, now: Optional[float] = None
+    ) -> List[Tuple[str, float, int]]:
+        """
+        获取窗口内的热词
+
+        Returns:
+            [(词, 衰减后热度, 估计次数)]，按热度降序
+        """
+        if window not in self.windows:
+            raise ValueError(f"Unknown window: {window}")
+
+        view = self._global_view.get(window)
+        if view is not None:
+            return view[:n]
+
+        with self._lock:
+            return self.windows[window].top(n, now or time.time())
+
+    def is_empty(self) -> bool:
+        return not any(window.slots for window in self.windows.values()) and not any(
+            self._global_view.values()
+        )
+
+    # ------------------------------------------------------------------
+    # Redis 同步
+    # ------------------------------------------------------------------
+
+    def _slot_key(self, window: str, slot: int) -> str:
+        return f"{self.key_prefix}:{window}:{slot}"
+
+    def maybe_sync(self, force: bool = False) -> bool:
+        """距上次同步超过 sync_interval 时推送本地增量并拉取全局视图"""
+        if self.redis_client is None:
+            return False
+        if not force and time.time() - self._last_sync < self.sync_interval:
+            return False
+        self._last_sync = time.time()
+
+        try:
+            self._push()
+            self._pull()
+            return True
+        except Exception as e:
+            log.debug(f"Failed to sync trending terms with Redis: {e}")
+            # Redis 不可用时退回本地视图
+            self._global_view = {}
+            return False
+
+    def _push(self) -> None:
+        with self._lock:
+            pending = self._pending
+            self._pending = defaultdict(
+                lambda: defaultdict(lambda: defaultdict(int))
+            )
+            self._pending_size = 0
+        if not pending:
+            return
+
+        # 第一轮：合并 sketch 格子，HINCRBY 的返回值即合并后的格子值
+        pipe = self.redis_client.pipeline(transaction=False)
+        plan = []
+        for name, slots in pending.items():
+            window = self.windows[name]
+            for slot, terms in slots.items():
+                key = f"{self._slot_key(name, slot)}:cms"
+                for term, count in terms.items():
+                    cells = sketch_cells(term, window.width, window.depth)
+                    for cell in cells:
+                        pipe.hincrby(key, str(cell), count)
+                    plan.append((name, slot, term, len(cells)))
+        results = pipe.execute()
+
+        # 第二轮：用合并后的估计值更新候选词集合，裁剪到固定容量并设置过期
+        pipe = self.redis_client.pipeline(transaction=False)
+        pos = 0
+        touched = set()
+        for name, slot, term, n_cells in plan:
+            estimate = min(results[pos : pos + n_cells])
+            pos += n_cells
+            pipe.zadd(f"{self._slot_key(name, slot)}:terms", {term: estimate}, gt=True)
+            touched.add((name, slot))
+        for name, slot in touched:
+            spec = self.windows[name].spec
+            ttl = spec.span_seconds + spec.slot_seconds
+            key = self._slot_key(name, slot)
+            pipe.zremrangebyrank(f"{key}:terms", 0, -(self.capacity + 1))
+            pipe.expire(f"{key}:terms", ttl)
+            pipe.expire(f"{key}:cms", ttl)
+        pipe.execute()
+
+    def _pull(self) -> None:
+        now = time.time()
+        pipe = self.redis_client.pipeline(transaction=False)
+        plan = []
+        for name, window in self.windows.items():
+            current = window.slot_index(now)
+            for slot in range(current - window.spec.slots + 1, current + 1):
+                pipe.zrange(
+                    f"{self._slot_key(name, slot)}:terms", 0, -1, withscores=True
+                )
+                plan.append((name, current - slot))
+        results = pipe.execute()
+
+        scores: Dict[str, Dict[str, List[float]]] = defaultdict(
+            lambda: defaultdict(lambda: [0.0, 0])
+        )
+        for (name, age), entries in zip(plan, results):
+            decay = self.windows[name].spec.decay ** age
+            for term, estimate in entries or []:
+                if isinstance(term, bytes):
+                    term = term.decode("utf-8")
+                acc = scores[name][term]
+                acc[0] += estimate * decay
+                acc[1] += int(estimate)
+
+        view = {}
+        for name in self.windows:
+            ranked = [
+                (term, score, count) for term, (score, count) in scores[name].items()
+            ]
+            ranked.sort(key=lambda x: x[1], reverse=True)
+            view[name] = ranked[: self.capacity]
+        self._global_view = view
+
+    def try_claim_seed(self, ttl: int) -> bool:
+        """多个 worker 冷启动时只允许一个回填历史数据，每个进程也只尝试一次"""
+        with self._lock:
+            if self._seed_attempted:
+                return False
+            self._seed_attempted = True
+        if self.redis_client is None:
+            return True
+        try:
+            return bool(
+                self.redis_client.set(
+                    f"{self.key_prefix}:seeded", self.worker_id, nx=True, ex=ttl
+                )
+            )
+        except Exception as e:
+            log.debug(f"Failed to claim trending seed lock: {e}")
+            return True
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "worker_id": self.worker_id,
+            "redis_enabled": self.redis_client is not None,
+            "last_sync": self._last_sync,
+            "pending_terms": self._pending_size,
+            "pending_dropped": self.pending_dropped,
+            "windows": {
+                name: {
+                    "slots": len(window.slots),
+                    "slot_seconds": window.spec.slot_seconds,
+                    "span_seconds": window.spec.span_seconds,
+                }
+                for name, window in self.windows.items()
+            },
+        }
+
+
+def _create_redis_client():
+    try:
+        from open_webui.env import REDIS_URL, REDIS_HOST, REDIS_PORT, REDIS_PASSWORD
+        import redis
+
+        if REDIS_URL:
+            client = redis.from_url(
+                REDIS_URL, decode_responses=True, socket_connect_timeout=5
+            )
+        else:
+            client = redis.Redis(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                password=REDIS_PASSWORD or None,
+                decode_responses=True,
+                socket_connect_timeout=5,
+            )
+        client.ping()
+        return client
+    except Exception as e:
+        log.warning(f"Redis not available for trending terms: {e}. Using local counters.")
+        return None
+
+
+# 创建全局实例
+trending_terms = TrendingTermsEngine(redis_client=_create_redis_client())
@@ -0,0 +1,300 @@
+"""
+向量检索结果缓存
+以 (集合, 集合版本, 查询向量哈希, k, 过滤条件) 为键缓存检索结果；
+向量层的每次写入都会提升对应集合的版本，旧版本的条目不会再被命中。
+多 worker 部署时通过 Redis pub/sub 同步版本变更
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import redis
+from opentelemetry import metrics
+
+from open_webui.env import (
+    REDIS_KEY_PREFIX,
+    REDIS_URL,
+    VECTOR_QUERY_CACHE_MAX_COLLECTION_BYTES,
+    VECTOR_QUERY_CACHE_MAX_COLLECTION_ITEMS,
+    VECTOR_QUERY_CACHE_MAX_ENTRIES,
+)
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    add_write_listener,
+)
+
+log = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+vector_query_cache_requests = meter.create_counter(
+    name="vector_query_cache.requests",
+    description="Vector search cache lookups by kind (search, collection) and result",
+    unit="1",
+)
+
+# 按集合统计命中率时保留的集合数
+MAX_TRACKED_COLLECTIONS = 1000
+
+# 估算集合大小时每个条目的固定开销（id、列表和字典对象）
+ITEM_OVERHEAD_BYTES = 200
+
+
+def embedding_hash(vector: List[float]) -> str:
+    return hashlib.sha1(np.asarray(vector, dtype=np.float32).tobytes()).hexdigest()
+
+
+def estimate_size(result: GetResult) -> int:
+    """集合内容占用内存的粗略估计：文档和元数据的文本长度加上每条的固定开销"""
+    size = len(result.ids[0]) * ITEM_OVERHEAD_BYTES
+    for document in result.documents[0] if result.documents else []:
+        size += len(document or "")
+    for metadata in result.metadatas[0] if result.metadatas else []:
+        size += len(str(metadata)) if metadata else 0
+    if getattr(result, "embeddings", None):
+        size += sum(len(vector) * 8 for vector in result.embeddings[0] or [])
+    return size
+
+
+class VectorQueryCache:
+    """进程内 LRU 缓存，集合版本变化时条目自动失效"""
+
+    def __init__(
+        self,
+        max_entries: int = VECTOR_QUERY_CACHE_MAX_ENTRIES,
+        max_collection_items: int = VECTOR_QUERY_CACHE_MAX_COLLECTION_ITEMS,
+        max_collection_bytes: int = VECTOR_QUERY_CACHE_MAX_COLLECTION_BYTES,
+        redis_url: Optional[str] = None,
+        channel: str = f"{REDIS_KEY_PREFIX}:vector:collection:changed",
+    ):
+        self.max_entries = max_entries
+        self.max_collection_items = max_collection_items
+        self.max_collection_bytes = max_collection_bytes
+        self.channel = channel
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        # 整个集合的内容体积大，按估算的总字节数限制
+        self._collections: "OrderedDict[Tuple, Tuple[GetResult, int]]" = OrderedDict()
+        self._collection_bytes = 0
+        self._versions: Dict[str, int] = {}
+        # reset 后所有集合一起失效
+        self._epoch = 0
+        # 集合 -> [命中, 未命中]
+        self._collection_stats: "OrderedDict[str, List[int]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+        self.redis_client = None
+        self._listening = False
+        if redis_url and max_entries > 0:
+            try:
+                self.redis_client = redis.from_url(
+                    redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                )
+                self.redis_client.ping()
+                threading.Thread(
+                    target=self._listen, name="vector-query-cache-listener", daemon=True
+                ).start()
+            except Exception as e:
+                log.warning(f"Vector query cache invalidation via Redis disabled: {e}")
+                self.redis_client = None
+
+    @property
+    def enabled(self) -> bool:
+        # 多 worker 部署下，只有在能收到版本变更通知时才使用缓存
+        return self.max_entries > 0 and (
+            self.redis_client is None or self._listening
+        )
+
+    def _version(self, collection_name: str) -> Tuple[int, int]:
+        return self._epoch, self._versions.get(collection_name, 0)
+
+    def _record(self, collection_name: str, kind: str, hit: bool) -> None:
+        with self._lock:
+            self.stats["hits" if hit else "misses"] += 1
+            counts = self._collection_stats.setdefault(collection_name, [0, 0])
+            counts[0 if hit else 1] += 1
+            self._collection_stats.move_to_end(collection_name)
+            while len(self._collection_stats) > MAX_TRACKED_COLLECTIONS:
+                self._collection_stats.popitem(last=False)
+        vector_query_cache_requests.add(
+            1, {"kind": kind, "result": "hit" if hit else "miss"}
+        )
+
+    def _lookup(self, store: OrderedDict, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            value = store.get(key)
+            if value is not None:
+                store.move_to_end(key)
+            return value
+
+    def _store(self, store: OrderedDict, key: Tuple, value: Any, limit: int) -> None:
+        with self._lock:
+            # 写入期间版本已变化的结果不再缓存
+            if key[1] != self._version(key[0]):
+                return
+            store[key] = value
+            store.move_to_end(key)
+            while len(store) > limit:
+                store.popitem(last=False)
+
+    def _store_collection(self, key: Tuple, result: GetResult, size: int) -> None:
+        with self._lock:
+            if key[1] != self._version(key[0]):
+                return
+            if key in self._collections:
+                self._collection_bytes -= self._collections[key][1]
+            self._collections[key] = (result, size)
+            self._collections.move_to_end(key)
+            self._collection_bytes += size
+            while self._collection_bytes > self.max_collection_bytes:
+                _, (_, evicted) = self._collections.popitem(last=False)
+                self._collection_bytes -= evicted
+
+    def _drop_collections(self, collection_name: Optional[str]) -> None:
+        """释放失效集合占用的内存；collection_name 为 None 表示全部"""
+        for key in list(self._collections):
+            if collection_name is None or key[0] == collection_name:
+                self._collection_bytes -= self._collections.pop(key)[1]
+
+    def search(
+        self,
+        collection_name: str,
+        query_embedding: List[float],
+        k: int,
+        search: Callable[[], Optional[SearchResult]],
+        filter: Optional[Dict] = None,
+    ) -> Optional[SearchResult]:
+        """返回缓存的检索结果，未命中时调用 search 并缓存其结果"""
+        if not self.enabled:
+            return search()
+
+        with self._lock:
+            version = self._version(collection_name)
+        key = (
+            collection_name,
+            version,
+            embedding_hash(query_embedding),
+            k,
+            json.dumps(filter, sort_keys=True, default=str),
+        )
+        cached = self._lookup(self._entries, key)
+        self._record(collection_name, "search", cached is not None)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        result = search()
+        if result is not None:
+            self._store(
+                self._entries, key, result.model_copy(deep=True), self.max_entries
+            )
+        return result
+
+    def get_collection(
+        self, collection_name: str, get: Callable[[], Optional[GetResult]]
+    ) -> Optional[GetResult]:
+        """
+        混合检索使用的整个集合内容。条数超过 max_collection_items 的集合不缓存，
+        已缓存集合的估算总大小不超过 max_collection_bytes，超出时淘汰最久未用的集合
+        """
+        if (
+            not self.enabled
+            or self.max_collection_items <= 0
+            or self.max_collection_bytes <= 0
+        ):
+            return get()
+
+        with self._lock:
+            key = (collection_name, self._version(collection_name))
+        cached = self._lookup(self._collections, key)
+        self._record(collection_name, "collection", cached is not None)
+        if cached is not None:
+            return cached[0]
+
+        result = get()
+        if (
+            result is not None
+            and result.ids
+            and len(result.ids[0]) <= self.max_collection_items
+        ):
+            size = estimate_size(result)
+            if size <= self.max_collection_bytes:
+                # 集合内容只读使用，不做拷贝
+                self._store_collection(key, result, size)
+        return result
+
+    def invalidate(self, collection_name: Optional[str], broadcast: bool = True):
+        """集合写入后调用；collection_name 为 None 表示整个向量库被重置"""
+        with self._lock:
+            if collection_name is None:
+                self._epoch += 1
+                self._entries.clear()
+            else:
+                self._versions[collection_name] = (
+                    self._versions.get(collection_name, 0) + 1
+                )
+            self._drop_collections(collection_name)
+            self.stats["invalidations"] += 1
+
+        if broadcast and self.redis_client is not None:
+            try:
+                self.redis_client.publish(self.channel, collection_name or "")
+            except Exception as e:
+                log.warning(f"Failed to broadcast vector collection change: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._drop_collections(None)
+            self._epoch += 1
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # 断线期间可能错过变更通知，重新订阅后清空缓存
+                self.clear()
+                self._listening = True
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.invalidate(message["data"] or None, broadcast=False)
+            except Exception as e:
+                log.warning(f"Vector query cache listener disconnected: {e}")
+            finally:
+                self._listening = False
+            time.sleep(5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            collections = {
+                name: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses) * 100, 2),
+                }
+                for name, (hits, misses) in self._collection_stats.items()
+            }
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / total * 100, 2) if total else 0,
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "cached_collections": len(self._collections),
+                "cached_collection_bytes": self._collection_bytes,
+                "collections": collections,
+            }
+
+
+# 创建全局实例
+vector_query_cache = VectorQueryCache(redis_url=REDIS_URL)
+add_write_listener(vector_query_cache.invalidate)
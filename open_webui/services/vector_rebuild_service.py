@@ -234,7 +234,7 @@ class VectorRebuildService:
             
             # 删除旧的向量索引
             try:
-                VECTOR_DB_CLIENT.delete(collection_name=f"knowledge-{doc_id}")
+                await VECTOR_DB_CLIENT.adelete(collection_name=f"knowledge-{doc_id}")
             except Exception as e:
                 logger.debug(f"删除旧索引失败 (可能不存在): {e}")
             
@@ -0,0 +1,297 @@
+"""
+网页缓存服务
+按规范化 URL 记录 ETag / Last-Modified 以便条件请求重新验证；
+页面正文的提取结果和分块向量按内容哈希缓存，内容未变的页面跳过解析和向量化。
+数据保存在 CACHE_DIR 下的 SQLite 文件中，多个 worker 共享
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from open_webui.env import (
+    CACHE_DIR,
+    ENABLE_WEB_PAGE_CACHE,
+    WEB_PAGE_CACHE_MAX_ENTRIES,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """规范化 URL：小写协议和主机、去掉默认端口和片段、查询参数排序"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8", errors="ignore")).hexdigest()
+
+
+class WebPageCache:
+    """基于 SQLite 的网页与向量缓存"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = WEB_PAGE_CACHE_MAX_ENTRIES,
+        enabled: bool = ENABLE_WEB_PAGE_CACHE,
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.path = path or Path(CACHE_DIR) / "web_pages.db"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self.stats = {
+            "revalidated": 0,
+            "extract_hits": 0,
+            "embedding_hits": 0,
+            "embedding_misses": 0,
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url_key TEXT PRIMARY KEY,
+                    url TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT,
+                    fetched_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS extracts (
+                    content_hash TEXT PRIMARY KEY,
+                    text TEXT,
+                    metadata TEXT,
+                    accessed_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    vector BLOB,
+                    accessed_at REAL
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(sql, params).fetchall()
+            conn.commit()
+            return rows
+
+    ####################
+    # 页面
+    ####################
+
+    def get_page(self, url: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            rows = self._execute(
+                "SELECT etag, last_modified, content_hash, fetched_at FROM pages WHERE url_key = ?",
+                (normalize_url(url),),
+            )
+        except Exception as e:
+            log.warning(f"Web page cache read failed: {e}")
+            return None
+        if not rows:
+            return None
+        etag, last_modified, page_hash, fetched_at = rows[0]
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": page_hash,
+            "fetched_at": fetched_at,
+        }
+
+    def conditional_headers(self, page: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """根据缓存的验证器生成条件请求头；正文已不在缓存中时不做条件请求"""
+        if not page or self.get_extract(page["content_hash"], touch=False) is None:
+            return {}
+        headers = {}
+        if page.get("etag"):
+            headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            headers["If-Modified-Since"] = page["last_modified"]
+        return headers
+
+    def put_page(
+        self,
+        url: str,
+        page_hash: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        try:
+            self._execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), url, etag, last_modified, page_hash, time.time()),
+            )
+            self._maybe_prune()
+        except Exception as e:
+            log.warning(f"Web page cache write failed: {e}")
+
+    def mark_revalidated(self, url: str) -> None:
+        self.stats["revalidated"] += 1
+        try:
+            self._execute(
+                "UPDATE pages SET fetched_at = ? WHERE url_key = ?",
+                (time.time(), normalize_url(url)),
+            )
+        except Exception as e:
+            log.warning(f"Web page cache write failed: {e}")
+
+    ####################
+    # 正文提取结果
+    ####################
+
+    def get_extract(self, page_hash: str, touch: bool = True) -> Optional[Dict]:
+        if not self.enabled or not page_hash:
+            return None
+        try:
+            rows = self._execute(
+                "SELECT text, metadata FROM extracts WHERE content_hash = ?",
+                (page_hash,),
+            )
+            if not rows:
+                return None
+            if touch:
+                self.stats["extract_hits"] += 1
+                self._execute(
+                    "UPDATE extracts SET accessed_at = ? WHERE content_hash = ?",
+                    (time.time(), page_hash),
+                )
+            return {"text": rows[0][0], "metadata": json.loads(rows[0][1] or "{}")}
+        except Exception as e:
+            log.warning(f"Web page cache read failed: {e}")
+            return None
+
+    def put_extract(self, page_hash: str, text: str, metadata: Dict) -> None:
+        if not self.enabled:
+            return
+        try:
+            self._execute(
+                "INSERT OR REPLACE INTO extracts VALUES (?, ?, ?, ?)",
+                (page_hash, text, json.dumps(metadata, ensure_ascii=False), time.time()),
+            )
+        except Exception as e:
+            log.warning(f"Web page cache write failed: {e}")
+
+    ####################
+    # 分块向量
+    ####################
+
+    @staticmethod
+    def embedding_key(namespace: str, text: str) -> str:
+        return hashlib.sha256(f"{namespace}\x00{text}".encode("utf-8")).hexdigest()
+
+    def embed_with_cache(
+        self,
+        texts: List[str],
+        embed: Callable[[List[str]], List[List[float]]],
+        namespace: str,
+    ) -> List[List[float]]:
+        """
+        只对缓存中没有的文本块调用 embed；namespace 区分向量化引擎、模型和前缀，
+        不同模型的向量不会混用
+        """
+        if not self.enabled or not texts:
+            return embed(texts)
+
+        keys = [self.embedding_key(namespace, text) for text in texts]
+        cached: Dict[str, List[float]] = {}
+        try:
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                rows = self._execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+                for key, blob in rows:
+                    cached[key] = list(struct.unpack(f"{len(blob) // 4}f", blob))
+                if rows:
+                    self._execute(
+                        f"UPDATE embeddings SET accessed_at = ? WHERE key IN ({','.join('?' * len(rows))})",
+                        [time.time(), *(key for key, _ in rows)],
+                    )
+        except Exception as e:
+            log.warning(f"Web page cache read failed: {e}")
+
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        self.stats["embedding_hits"] += len(texts) - len(missing)
+        self.stats["embedding_misses"] += len(missing)
+
+        if missing:
+            vectors = embed([texts[i] for i in missing])
+            rows = []
+            for i, vector in zip(missing, vectors):
+                cached[keys[i]] = vector
+                rows.append((keys[i], struct.pack(f"{len(vector)}f", *vector), time.time()))
+            try:
+                with self._lock:
+                    conn = self._connection()
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows
+                    )
+                    conn.commit()
+                self._maybe_prune()
+            except Exception as e:
+                log.warning(f"Web page cache write failed: {e}")
+
+        return [cached[key] for key in keys]
+
+    ####################
+    # 容量控制
+    ####################
+
+    def _maybe_prune(self) -> None:
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        """每张表只保留最近使用的 max_entries 条记录"""
+        for table, column in (
+            ("pages", "fetched_at"),
+            ("extracts", "accessed_at"),
+            ("embeddings", "accessed_at"),
+        ):
+            key = {"pages": "url_key", "extracts": "content_hash"}.get(table, "key")
+            self._execute(
+                f"DELETE FROM {table} WHERE {key} IN ("
+                f"SELECT {key} FROM {table} ORDER BY {column} DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "enabled": self.enabled, "path": str(self.path)}
+
+
+# 创建全局实例
+web_page_cache = WebPageCache()
@@ -7,7 +7,6 @@ import sys
 import time
 from typing import Dict, Set
 from redis import asyncio as aioredis
-import pycrdt as Y
 
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
@@ -132,7 +131,20 @@ else:
 
 
 YDOC_MANAGER = YdocManager(
-    redis=REDIS,
+    # Yjs updates are stored as raw bytes, so this connection must not decode
+    redis=(
+        get_redis_connection(
+            redis_url=WEBSOCKET_REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
+            ),
+            redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+            async_mode=True,
+            decode_responses=False,
+        )
+        if WEBSOCKET_MANAGER == "redis"
+        else None
+    ),
     redis_key_prefix=f"{REDIS_KEY_PREFIX}:ydoc:documents",
 )
 
@@ -421,14 +433,11 @@ async def ydoc_document_join(sid, data):
 
         active_session_ids = get_session_ids_from_room(f"doc_{document_id}")
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        # Send only what the joiner is missing relative to its state vector
+        state_vector = data.get("state_vector")
+        state_update = await YDOC_MANAGER.get_state(
+            document_id, bytes(state_vector) if state_vector else None
+        )
         await sio.emit(
             "ydoc:document:state",
             {
@@ -497,14 +506,10 @@ async def yjs_document_state(sid, data):
             log.warning(f"Document {document_id} not found")
             return
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        state_vector = data.get("state_vector")
+        state_update = await YDOC_MANAGER.get_state(
+            document_id, bytes(state_vector) if state_vector else None
+        )
 
         await sio.emit(
             "ydoc:document:state",
@@ -536,7 +541,7 @@ async def yjs_document_update(sid, data):
 
         await YDOC_MANAGER.append_to_updates(
             document_id=document_id,
-            update=update,  # Convert list of bytes to bytes
+            update=bytes(update),  # Convert list of bytes to bytes
         )
 
         # Broadcast update to all other users in the document
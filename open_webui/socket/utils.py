@@ -1,10 +1,14 @@
+import asyncio
 import json
+import logging
 import uuid
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
 from typing import Optional, List, Tuple
 import pycrdt as Y
 
+log = logging.getLogger(__name__)
+
 
 class RedisLock:
     def __init__(
@@ -109,52 +113,180 @@ class RedisDict:
 
 
 class YdocManager:
+    """
+    Stores Yjs document updates for collaborative editing.
+
+    Updates are kept as raw bytes. Once a document accumulates
+    ``compaction_threshold`` updates, everything except the newest
+    ``compaction_tail`` updates is merged into a single binary snapshot, so
+    loading a document costs one snapshot plus a short tail regardless of how
+    long it has been edited. The Redis client must be created with
+    ``decode_responses=False``.
+    """
+
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:documents",
+        compaction_threshold: int = 200,
+        compaction_tail: int = 20,
+        compaction_lock_timeout: int = 30,
     ):
         self._updates = {}
+        self._snapshots = {}
         self._users = {}
         self._redis = redis
         self._redis_key_prefix = redis_key_prefix
+        self._compaction_threshold = compaction_threshold
+        self._compaction_tail = compaction_tail
+        self._compaction_lock_timeout = compaction_lock_timeout
+        self._compacting = set()
+
+    def _key(self, document_id: str, suffix: str) -> str:
+        return f"{self._redis_key_prefix}:{document_id}:{suffix}"
+
+    @staticmethod
+    def _decode_update(update) -> bytes:
+        # Entries written before updates were stored as raw bytes are JSON lists
+        if isinstance(update, (bytes, bytearray)) and update[:1] == b"[":
+            try:
+                return bytes(json.loads(update))
+            except (ValueError, TypeError):
+                pass
+        return bytes(update)
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
+        update = bytes(update)
+
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
+            length = await self._redis.rpush(self._key(document_id, "updates"), update)
         else:
             if document_id not in self._updates:
                 self._updates[document_id] = []
             self._updates[document_id].append(update)
+            length = len(self._updates[document_id])
+
+        if (
+            length >= self._compaction_threshold
+            and document_id not in self._compacting
+        ):
+            self._compacting.add(document_id)
+            asyncio.create_task(self._compact_in_background(document_id))
+
+    async def _compact_in_background(self, document_id: str):
+        try:
+            await self.compact(document_id)
+        except Exception as e:
+            log.warning(f"Failed to compact ydoc {document_id}: {e}")
+        finally:
+            self._compacting.discard(document_id)
+
+    async def compact(self, document_id: str) -> bool:
+        """Merge the snapshot and all but the newest updates into a new snapshot."""
+        document_id = document_id.replace(":", "_")
+
+        if self._redis:
+            updates_key = self._key(document_id, "updates")
+            snapshot_key = self._key(document_id, "snapshot")
+            lock_key = self._key(document_id, "compaction_lock")
+
+            if not await self._redis.set(
+                lock_key, b"1", nx=True, ex=self._compaction_lock_timeout
+            ):
+                return False
+            try:
+                length = await self._redis.llen(updates_key)
+                count = length - self._compaction_tail
+                if count <= 0:
+                    return False
+
+                snapshot = await self._redis.get(snapshot_key)
+                updates = await self._redis.lrange(updates_key, 0, count - 1)
+                merged = self._merge(snapshot, updates)
+
+                # Updates appended meanwhile by other workers land after index
+                # `count`, so trimming by position never drops them.
+                pipe = self._redis.pipeline(transaction=True)
+                pipe.set(snapshot_key, merged)
+                pipe.ltrim(updates_key, count, -1)
+                await pipe.execute()
+            finally:
+                await self._redis.delete(lock_key)
+        else:
+            updates = self._updates.get(document_id, [])
+            count = len(updates) - self._compaction_tail
+            if count <= 0:
+                return False
+
+            self._snapshots[document_id] = self._merge(
+                self._snapshots.get(document_id), updates[:count]
+            )
+            self._updates[document_id] = updates[count:]
+
+        log.debug(f"Compacted {count} updates of ydoc {document_id}")
+        return True
+
+    def _merge(self, snapshot: Optional[bytes], updates: List[bytes]) -> bytes:
+        parts = [self._decode_update(u) for u in updates]
+        if snapshot:
+            parts.insert(0, bytes(snapshot))
+        if not parts:
+            return Y.Doc().get_update()
+        if len(parts) == 1:
+            return parts[0]
+        return Y.merge_updates(*parts)
 
     async def get_updates(self, document_id: str) -> List[bytes]:
+        """Return the snapshot (if any) followed by the uncompacted updates."""
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.get(self._key(document_id, "snapshot"))
+            pipe.lrange(self._key(document_id, "updates"), 0, -1)
+            snapshot, updates = await pipe.execute()
         else:
-            return self._updates.get(document_id, [])
+            snapshot = self._snapshots.get(document_id)
+            updates = self._updates.get(document_id, [])
+
+        updates = [self._decode_update(update) for update in updates]
+        return [bytes(snapshot)] + updates if snapshot else updates
+
+    async def get_state(
+        self, document_id: str, state_vector: Optional[bytes] = None
+    ) -> bytes:
+        """
+        Return the document as a single update. With a state vector, only the
+        changes missing from that state are returned.
+        """
+        state = self._merge(None, await self.get_updates(document_id))
+        if state_vector:
+            return Y.get_update(state, bytes(state_vector))
+        return state
 
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            return await self._redis.exists(redis_key) > 0
+            return (
+                await self._redis.exists(
+                    self._key(document_id, "updates"),
+                    self._key(document_id, "snapshot"),
+                )
+                > 0
+            )
         else:
-            return document_id in self._updates
+            return document_id in self._updates or document_id in self._snapshots
 
     async def get_users(self, document_id: str) -> List[str]:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            users = await self._redis.smembers(redis_key)
-            return list(users)
+            users = await self._redis.smembers(self._key(document_id, "users"))
+            return [
+                user.decode() if isinstance(user, bytes) else user for user in users
+            ]
         else:
             return self._users.get(document_id, [])
 
@@ -162,8 +294,7 @@ class YdocManager:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.sadd(redis_key, user_id)
+            await self._redis.sadd(self._key(document_id, "users"), user_id)
         else:
             if document_id not in self._users:
                 self._users[document_id] = set()
@@ -173,22 +304,22 @@ class YdocManager:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.srem(redis_key, user_id)
+            await self._redis.srem(self._key(document_id, "users"), user_id)
         else:
             if document_id in self._users and user_id in self._users[document_id]:
                 self._users[document_id].remove(user_id)
 
     async def remove_user_from_all_documents(self, user_id: str):
         if self._redis:
-            keys = await self._redis.keys(f"{self._redis_key_prefix}:*")
+            keys = await self._redis.keys(f"{self._redis_key_prefix}:*:users")
             for key in keys:
-                if key.endswith(":users"):
-                    await self._redis.srem(key, user_id)
+                if isinstance(key, bytes):
+                    key = key.decode()
+                await self._redis.srem(key, user_id)
 
-                    document_id = key.split(":")[-2]
-                    if len(await self.get_users(document_id)) == 0:
-                        await self.clear_document(document_id)
+                document_id = key.split(":")[-2]
+                if len(await self.get_users(document_id)) == 0:
+                    await self.clear_document(document_id)
 
         else:
             for document_id in list(self._users.keys()):
@@ -203,12 +334,12 @@ class YdocManager:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.delete(redis_key)
-            redis_users_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.delete(redis_users_key)
+            await self._redis.delete(
+                self._key(document_id, "updates"),
+                self._key(document_id, "snapshot"),
+                self._key(document_id, "users"),
+            )
         else:
-            if document_id in self._updates:
-                del self._updates[document_id]
-            if document_id in self._users:
-                del self._users[document_id]
+            self._updates.pop(document_id, None)
+            self._snapshots.pop(document_id, None)
+            self._users.pop(document_id, None)
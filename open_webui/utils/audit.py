@@ -2,8 +2,8 @@ from contextlib import asynccontextmanager
 from dataclasses import asdict, dataclass
 from enum import Enum
 import re
+import time
 from typing import (
-    TYPE_CHECKING,
     Any,
     AsyncGenerator,
     Dict,
@@ -25,14 +25,11 @@ from loguru import logger
 from starlette.requests import Request
 
 from open_webui.env import AUDIT_LOG_LEVEL, MAX_BODY_LOG_SIZE
+from open_webui.services.audit_store import AuditStore, audit_store
 from open_webui.utils.auth import get_current_user, get_http_authorization_cred
 from open_webui.models.users import UserModel
 
 
-if TYPE_CHECKING:
-    from loguru import Logger
-
-
 @dataclass(frozen=True)
 class AuditLogEntry:
     # `Metadata` audit level properties
@@ -59,33 +56,27 @@ class AuditLevel(str, Enum):
 
 class AuditLogger:
     """
-    A helper class that encapsulates audit logging functionality. It uses Loguru’s logger with an auditable binding to ensure that audit log entries are filtered correctly.
+    A helper class that hands audit log entries to the audit store. The store queues them for a background writer, so the request path never waits on disk writes, compression or indexing.
 
     Parameters:
-    logger (Logger): An instance of Loguru’s logger.
+    store (AuditStore): The store that persists and indexes the entries.
     """
 
-    def __init__(self, logger: "Logger"):
-        self.logger = logger.bind(auditable=True)
+    def __init__(self, store: Optional[AuditStore] = None):
+        self.store = store or audit_store
 
     def write(
         self,
         audit_entry: AuditLogEntry,
         *,
-        log_level: str = "INFO",
         extra: Optional[dict] = None,
     ):
 
         entry = asdict(audit_entry)
+        entry["timestamp"] = int(time.time())
+        entry["extra"] = extra or {}
 
-        if extra:
-            entry["extra"] = extra
-
-        self.logger.log(
-            log_level,
-            "",
-            **entry,
-        )
+        self.store.submit(entry)
 
 
 class AuditContext:
@@ -132,9 +123,10 @@ class AuditLoggingMiddleware:
         excluded_paths: Optional[list[str]] = None,
         max_body_size: int = MAX_BODY_LOG_SIZE,
         audit_level: AuditLevel = AuditLevel.NONE,
+        store: Optional[AuditStore] = None,
     ) -> None:
         self.app = app
-        self.audit_logger = AuditLogger(logger)
+        self.audit_logger = AuditLogger(store)
         self.excluded_paths = excluded_paths or []
         self.max_body_size = max_body_size
         self.audit_level = audit_level
@@ -191,6 +183,12 @@ class AuditLoggingMiddleware:
             await self._log_audit_entry(request, context)
 
     async def _get_authenticated_user(self, request: Request) -> Optional[UserModel]:
+        # The auth dependency leaves the user it resolved on the request state,
+        # so the token is only decoded here for routes that did not run it
+        user = getattr(request.state, "user", None)
+        if user is not None:
+            return user
+
         auth_header = request.headers.get("Authorization")
 
         try:
@@ -23,6 +23,7 @@ from opentelemetry import trace
 
 from open_webui.models.users import Users
 from open_webui.services.token_blacklist import token_blacklist
+from open_webui.services.principal_cache import principal_cache
 
 from open_webui.constants import ERROR_MESSAGES
 
@@ -259,18 +260,25 @@ def get_current_user(
             current_span.set_attribute("client.user.role", user.role)
             current_span.set_attribute("client.auth.type", "api_key")
 
+        request.state.user = user
         return user
 
     # auth by jwt token
     try:
-        data = decode_token(token)
-        
-        # Check if token is blacklisted
+        token_id = token_blacklist.token_id(token)
+
+        # Check if token is blacklisted (local bloom filter, Redis only on a possible hit)
         if token_blacklist.is_blacklisted(token):
+            principal_cache.invalidate_token(token_id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has been revoked",
             )
+
+        user = principal_cache.get(token_id)
+        data = None
+        if user is None:
+            data = decode_token(token)
     except HTTPException:
         raise
     except Exception as e:
@@ -279,47 +287,50 @@ def get_current_user(
             detail="Invalid token",
         )
 
-    if data is not None and "id" in data:
+    if user is None:
+        if data is None or "id" not in data:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=ERROR_MESSAGES.UNAUTHORIZED,
+            )
+
         user = Users.get_user_by_id(data["id"])
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=ERROR_MESSAGES.INVALID_TOKEN,
             )
-        else:
-            if WEBUI_AUTH_TRUSTED_EMAIL_HEADER:
-                trusted_email = request.headers.get(
-                    WEBUI_AUTH_TRUSTED_EMAIL_HEADER, ""
-                ).lower()
-                if trusted_email and user.email != trusted_email:
-                    # Delete the token cookie
-                    response.delete_cookie("token")
-                    # Delete OAuth token if present
-                    if request.cookies.get("oauth_id_token"):
-                        response.delete_cookie("oauth_id_token")
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="User mismatch. Please sign in again.",
-                    )
-
-            # Add user info to current span
-            current_span = trace.get_current_span()
-            if current_span:
-                current_span.set_attribute("client.user.id", user.id)
-                current_span.set_attribute("client.user.email", user.email)
-                current_span.set_attribute("client.user.role", user.role)
-                current_span.set_attribute("client.auth.type", "jwt")
-
-            # Refresh the user's last active timestamp asynchronously
-            # to prevent blocking the request
-            if background_tasks:
-                background_tasks.add_task(Users.update_user_last_active_by_id, user.id)
-        return user
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=ERROR_MESSAGES.UNAUTHORIZED,
-        )
+        principal_cache.set(token_id, user, exp=data.get("exp"))
+
+    if WEBUI_AUTH_TRUSTED_EMAIL_HEADER:
+        trusted_email = request.headers.get(WEBUI_AUTH_TRUSTED_EMAIL_HEADER, "").lower()
+        if trusted_email and user.email != trusted_email:
+            # Delete the token cookie
+            response.delete_cookie("token")
+            # Delete OAuth token if present
+            if request.cookies.get("oauth_id_token"):
+                response.delete_cookie("oauth_id_token")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User mismatch. Please sign in again.",
+            )
+
+    # Add user info to current span
+    current_span = trace.get_current_span()
+    if current_span:
+        current_span.set_attribute("client.user.id", user.id)
+        current_span.set_attribute("client.user.email", user.email)
+        current_span.set_attribute("client.user.role", user.role)
+        current_span.set_attribute("client.auth.type", "jwt")
+
+    # Refresh the user's last active timestamp asynchronously
+    # to prevent blocking the request
+    if background_tasks and principal_cache.should_touch_last_active(user.id):
+        background_tasks.add_task(Users.update_user_last_active_by_id, user.id)
+
+    # Keep the resolved user for the audit middleware
+    request.state.user = user
+    return user
 
 
 def get_current_user_by_api_key(api_key: str):
@@ -37,12 +37,14 @@ from open_webui.routers.pipelines import (
 )
 
 from open_webui.models.functions import Functions
+from open_webui.services.plugin_cache import plugin_cache
 from open_webui.models.models import Models
 
 
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    get_function_by_id_from_cache,
 )
 from open_webui.utils.models import get_all_models, check_model_access
 from open_webui.utils.payload import convert_payload_openai_to_ollama
@@ -328,7 +330,7 @@ async def chat_completed(request: Request, form_data: dict, user: Any):
 
     try:
         filter_functions = [
-            Functions.get_function_by_id(filter_id)
+            get_function_by_id_from_cache(filter_id)
             for filter_id in get_sorted_filter_ids(
                 request, model, metadata.get("filter_ids", [])
             )
@@ -352,7 +354,7 @@ async def chat_action(request: Request, action_id: str, form_data: dict, user: A
     else:
         sub_action_id = None
 
-    action = Functions.get_function_by_id(action_id)
+    action = get_function_by_id_from_cache(action_id)
     if not action:
         raise Exception(f"Action not found: {action_id}")
 
@@ -393,7 +395,9 @@ async def chat_action(request: Request, action_id: str, form_data: dict, user: A
     function_module, _, _ = get_function_module_from_cache(request, action_id)
 
     if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-        valves = Functions.get_function_valves_by_id(action_id)
+        valves = plugin_cache.get_valves(
+            "function", action_id, Functions.get_function_valves_by_id
+        )
         function_module.valves = function_module.Valves(**(valves if valves else {}))
 
     if hasattr(function_module, "action"):
@@ -1,18 +1,46 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
-from typing import Optional
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Set, Tuple
 
 import aiohttp
 import websockets
+from opentelemetry import metrics
 from pydantic import BaseModel
 
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import (
+    JUPYTER_KERNEL_IDLE_TIMEOUT,
+    JUPYTER_KERNEL_LEASE_TIMEOUT,
+    JUPYTER_KERNEL_MAX_LIFETIME,
+    JUPYTER_KERNEL_POOL_MAX_KERNELS,
+    JUPYTER_KERNEL_POOL_SIZE,
+    SRC_LOG_LEVELS,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+meter = metrics.get_meter(__name__)
+kernel_lease_wait = meter.create_histogram(
+    name="jupyter_kernel_pool.lease_wait",
+    description="Time spent waiting to lease a Jupyter kernel",
+    unit="ms",
+)
+kernel_starts = meter.create_counter(
+    name="jupyter_kernel_pool.kernel_starts",
+    description="Jupyter kernels started by the kernel pool",
+    unit="1",
+)
+kernel_reclaims = meter.create_counter(
+    name="jupyter_kernel_pool.kernel_reclaims",
+    description="Kernels taken from idle chats because the pool was full",
+    unit="1",
+)
+
 
 class ResultModel(BaseModel):
     """
@@ -81,26 +109,7 @@ class JupyterCodeExecuter:
         return self.result
 
     async def sign_in(self) -> None:
-        # password authentication
-        if self.password and not self.token:
-            async with self.session.get("login") as response:
-                response.raise_for_status()
-                xsrf_token = response.cookies["_xsrf"].value
-                if not xsrf_token:
-                    raise ValueError("_xsrf token not found")
-                self.session.cookie_jar.update_cookies(response.cookies)
-                self.session.headers.update({"X-XSRFToken": xsrf_token})
-            async with self.session.post(
-                "login",
-                data={"_xsrf": xsrf_token, "password": self.password},
-                allow_redirects=False,
-            ) as response:
-                response.raise_for_status()
-                self.session.cookie_jar.update_cookies(response.cookies)
-
-        # token authentication
-        if self.token:
-            self.params.update({"token": self.token})
+        self.params = await sign_in(self.session, self.token, self.password)
 
     async def init_kernel(self) -> None:
         async with self.session.post(url="api/kernels", params=self.params) as response:
@@ -109,21 +118,13 @@ class JupyterCodeExecuter:
             self.kernel_id = kernel_data["id"]
 
     def init_ws(self) -> (str, dict):
-        ws_base = self.base_url.replace("http", "ws", 1)
-        ws_params = "?" + "&".join([f"{key}={val}" for key, val in self.params.items()])
-        websocket_url = f"{ws_base}api/kernels/{self.kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
-        ws_headers = {}
-        if self.password and not self.token:
-            ws_headers = {
-                "Cookie": "; ".join(
-                    [
-                        f"{cookie.key}={cookie.value}"
-                        for cookie in self.session.cookie_jar
-                    ]
-                ),
-                **self.session.headers,
-            }
-        return websocket_url, ws_headers
+        return websocket_target(
+            self.session,
+            self.base_url,
+            self.kernel_id,
+            self.params,
+            use_cookies=bool(self.password and not self.token),
+        )
 
     async def execute_code(self) -> None:
         # initialize ws
@@ -135,74 +136,599 @@ class JupyterCodeExecuter:
             await self.execute_in_jupyter(ws)
 
     async def execute_in_jupyter(self, ws) -> None:
-        # send message
-        msg_id = uuid.uuid4().hex
-        await ws.send(
-            json.dumps(
-                {
-                    "header": {
-                        "msg_id": msg_id,
-                        "msg_type": "execute_request",
-                        "username": "user",
-                        "session": uuid.uuid4().hex,
-                        "date": "",
-                        "version": "5.3",
-                    },
-                    "parent_header": {},
-                    "metadata": {},
-                    "content": {
-                        "code": self.code,
-                        "silent": False,
-                        "store_history": True,
-                        "user_expressions": {},
-                        "allow_stdin": False,
-                        "stop_on_error": True,
-                    },
-                    "channel": "shell",
-                }
+        self.result, _ = await run_code(ws, self.code, self.timeout)
+
+
+async def sign_in(
+    session: aiohttp.ClientSession, token: str = "", password: str = ""
+) -> dict:
+    """Authenticate the session and return the query params for API calls"""
+    # password authentication
+    if password and not token:
+        async with session.get("login") as response:
+            response.raise_for_status()
+            xsrf_token = response.cookies["_xsrf"].value
+            if not xsrf_token:
+                raise ValueError("_xsrf token not found")
+            session.cookie_jar.update_cookies(response.cookies)
+            session.headers.update({"X-XSRFToken": xsrf_token})
+        async with session.post(
+            "login",
+            data={"_xsrf": xsrf_token, "password": password},
+            allow_redirects=False,
+        ) as response:
+            response.raise_for_status()
+            session.cookie_jar.update_cookies(response.cookies)
+
+    # token authentication
+    if token:
+        return {"token": token}
+    return {}
+
+
+def websocket_target(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    kernel_id: str,
+    params: dict,
+    use_cookies: bool = False,
+) -> Tuple[str, dict]:
+    """Build the channels websocket URL and headers of a kernel"""
+    ws_base = base_url.replace("http", "ws", 1)
+    ws_params = "?" + "&".join([f"{key}={val}" for key, val in params.items()])
+    websocket_url = f"{ws_base}api/kernels/{kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
+    ws_headers = {}
+    if use_cookies:
+        ws_headers = {
+            "Cookie": "; ".join(
+                [f"{cookie.key}={cookie.value}" for cookie in session.cookie_jar]
+            ),
+            **session.headers,
+        }
+    return websocket_url, ws_headers
+
+
+async def run_code(
+    ws, code: str, timeout: float, session_id: Optional[str] = None
+) -> Tuple[ResultModel, bool]:
+    """
+    Send an execute request over a kernel websocket and collect its output.
+    Returns the result and whether the execution timed out.
+    """
+    msg_id = await send_execute_request(ws, code, session_id)
+    return await collect_output(ws, msg_id, timeout)
+
+
+async def send_execute_request(
+    ws, code: str, session_id: Optional[str] = None
+) -> str:
+    """Send an execute request and return its message id"""
+    msg_id = uuid.uuid4().hex
+    await ws.send(
+        json.dumps(
+            {
+                "header": {
+                    "msg_id": msg_id,
+                    "msg_type": "execute_request",
+                    "username": "user",
+                    "session": session_id or uuid.uuid4().hex,
+                    "date": "",
+                    "version": "5.3",
+                },
+                "parent_header": {},
+                "metadata": {},
+                "content": {
+                    "code": code,
+                    "silent": False,
+                    "store_history": True,
+                    "user_expressions": {},
+                    "allow_stdin": False,
+                    "stop_on_error": True,
+                },
+                "channel": "shell",
+            }
+        )
+    )
+    return msg_id
+
+
+async def collect_output(
+    ws, msg_id: str, timeout: float
+) -> Tuple[ResultModel, bool]:
+    """Collect the output of an execute request until the kernel is idle"""
+    stdout, stderr, result = "", "", []
+    timed_out = False
+    while True:
+        try:
+            # wait for message
+            message = await asyncio.wait_for(ws.recv(), timeout)
+            message_data = json.loads(message)
+            # msg id not match, skip
+            if message_data.get("parent_header", {}).get("msg_id") != msg_id:
+                continue
+            # check message type
+            msg_type = message_data.get("msg_type")
+            match msg_type:
+                case "stream":
+                    if message_data["content"]["name"] == "stdout":
+                        stdout += message_data["content"]["text"]
+                    elif message_data["content"]["name"] == "stderr":
+                        stderr += message_data["content"]["text"]
+                case "execute_result" | "display_data":
+                    data = message_data["content"]["data"]
+                    if "image/png" in data:
+                        result.append(f"data:image/png;base64,{data['image/png']}")
+                    elif "text/plain" in data:
+                        result.append(data["text/plain"])
+                case "error":
+                    stderr += "\n".join(message_data["content"]["traceback"])
+                case "status":
+                    if message_data["content"]["execution_state"] == "idle":
+                        break
+
+        except asyncio.TimeoutError:
+            stderr += "\nExecution timed out."
+            timed_out = True
+            break
+    return (
+        ResultModel(
+            stdout=stdout.strip(),
+            stderr=stderr.strip(),
+            result="\n".join(result).strip() if result else "",
+        ),
+        timed_out,
+    )
+
+
+class PooledKernel:
+    """A kernel owned by a JupyterKernelPool, with a reusable websocket"""
+
+    def __init__(self, pool: "JupyterKernelPool", kernel_id: str):
+        self.pool = pool
+        self.kernel_id = kernel_id
+        self.session_id = uuid.uuid4().hex
+        self.ws = None
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        # chat the kernel is bound to; its state is kept between executions
+        self.chat_id: Optional[str] = None
+        self.leased = False
+        self.broken = False
+
+    def expired(self, now: float) -> bool:
+        return now - self.created_at > self.pool.max_lifetime
+
+    async def connect(self) -> None:
+        if self.ws is None:
+            self.ws = await self.pool.connect(self.kernel_id)
+
+    async def disconnect(self) -> None:
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+    async def execute(self, code: str, timeout: float) -> ResultModel:
+        # the websocket survives between leases; reconnect once if it was
+        # dropped. Only the send is retried: once the request went out the
+        # code may already be running, and running it twice is not safe.
+        for attempt in range(2):
+            await self.connect()
+            try:
+                msg_id = await send_execute_request(self.ws, code, self.session_id)
+                break
+            except websockets.ConnectionClosed:
+                self.ws = None
+                if attempt:
+                    raise
+
+        try:
+            result, timed_out = await collect_output(self.ws, msg_id, timeout)
+        except websockets.ConnectionClosed:
+            self.ws = None
+            raise
+
+        if timed_out and not await self.pool.interrupt(self):
+            self.broken = True
+        return result
+
+
+class JupyterKernelPool:
+    """
+    Keep pre-started kernels warm on one Jupyter server.
+
+    Kernels are leased per chat: a chat keeps its kernel (and interpreter
+    state) until it has been idle for idle_timeout, then the kernel is
+    restarted and returned to the pool. Leases without a chat are restarted
+    right after use. Kernels older than max_lifetime are shut down and
+    replaced. One HTTP session is shared by all kernels of the pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str = "",
+        password: str = "",
+        size: int = JUPYTER_KERNEL_POOL_SIZE,
+        max_kernels: int = JUPYTER_KERNEL_POOL_MAX_KERNELS,
+        idle_timeout: float = JUPYTER_KERNEL_IDLE_TIMEOUT,
+        max_lifetime: float = JUPYTER_KERNEL_MAX_LIFETIME,
+        lease_timeout: float = JUPYTER_KERNEL_LEASE_TIMEOUT,
+    ):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.token = token or ""
+        self.password = password or ""
+        self.max_kernels = max(1, max_kernels)
+        self.size = min(size, self.max_kernels)
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.lease_timeout = lease_timeout
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.params: dict = {}
+        self.kernels: Dict[str, PooledKernel] = {}
+        # warm kernels not bound to any chat
+        self.idle: Deque[PooledKernel] = deque()
+        self.by_chat: Dict[str, PooledKernel] = {}
+        self.starting = 0
+        self.condition = asyncio.Condition()
+        self.tasks: Set[asyncio.Task] = set()
+        self.maintenance: Optional[asyncio.Task] = None
+
+    ####################
+    # Jupyter API
+    ####################
+
+    async def _session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                trust_env=True, base_url=self.base_url
             )
+            self.params = await sign_in(self.session, self.token, self.password)
+        return self.session
+
+    async def _request(self, method: str, path: str):
+        for attempt in range(2):
+            session = await self._session()
+            try:
+                async with session.request(
+                    method, path, params=self.params
+                ) as response:
+                    response.raise_for_status()
+                    if response.content_type == "application/json":
+                        return await response.json()
+                    return None
+            except aiohttp.ClientResponseError as e:
+                # the login cookie may have expired; sign in again once
+                if attempt or e.status not in (401, 403):
+                    raise
+                await session.close()
+
+    async def connect(self, kernel_id: str):
+        session = await self._session()
+        websocket_url, ws_headers = websocket_target(
+            session,
+            self.base_url,
+            kernel_id,
+            self.params,
+            use_cookies=bool(self.password and not self.token),
+        )
+        return await websockets.connect(websocket_url, additional_headers=ws_headers)
+
+    async def _start_kernel(self) -> PooledKernel:
+        data = await self._request("POST", "api/kernels")
+        kernel_starts.add(1)
+        return PooledKernel(self, data["id"])
+
+    async def _shutdown_kernel(self, kernel: PooledKernel) -> None:
+        self.kernels.pop(kernel.kernel_id, None)
+        await kernel.disconnect()
+        try:
+            await self._request("DELETE", f"api/kernels/{kernel.kernel_id}")
+        except Exception as e:
+            logger.warning(f"Failed to shut down kernel {kernel.kernel_id}: {e}")
+
+    async def interrupt(self, kernel: PooledKernel) -> bool:
+        try:
+            await self._request("POST", f"api/kernels/{kernel.kernel_id}/interrupt")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to interrupt kernel {kernel.kernel_id}: {e}")
+            return False
+
+    async def _reset_kernel(self, kernel: PooledKernel) -> bool:
+        # a restart clears all interpreter state but keeps the kernel id
+        try:
+            await self._request("POST", f"api/kernels/{kernel.kernel_id}/restart")
+            kernel.session_id = uuid.uuid4().hex
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to restart kernel {kernel.kernel_id}: {e}")
+            return False
+
+    ####################
+    # Leasing
+    ####################
+
+    @asynccontextmanager
+    async def lease(
+        self, chat_id: Optional[str] = None
+    ) -> AsyncIterator[PooledKernel]:
+        start = time.perf_counter()
+        kernel = await self._acquire(chat_id)
+        kernel_lease_wait.record((time.perf_counter() - start) * 1000)
+        try:
+            yield kernel
+        except BaseException:
+            kernel.broken = True
+            raise
+        finally:
+            await self._release(kernel)
+
+    async def _acquire(self, chat_id: Optional[str]) -> PooledKernel:
+        self._ensure_maintenance()
+        deadline = time.monotonic() + self.lease_timeout
+        reclaimed = None
+
+        async with self.condition:
+            while True:
+                kernel = self.by_chat.get(chat_id) if chat_id else None
+                if kernel is not None:
+                    # executions of one chat run one at a time on its kernel
+                    if not kernel.leased:
+                        kernel.leased = True
+                        return kernel
+                elif self.idle:
+                    kernel = self.idle.popleft()
+                    self._bind(kernel, chat_id)
+                    self._fill()
+                    return kernel
+                elif len(self.kernels) + self.starting < self.max_kernels:
+                    self.starting += 1
+                    break
+                else:
+                    reclaimed = self._reclaim()
+                    if reclaimed is not None:
+                        break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("No Jupyter kernel available")
+                try:
+                    await asyncio.wait_for(self.condition.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+        if reclaimed is not None:
+            # the kernel of an idle chat is reset before it is handed over
+            expired = reclaimed.expired(time.monotonic())
+            if not expired and await self._reset_kernel(reclaimed):
+                async with self.condition:
+                    self._bind(reclaimed, chat_id)
+                return reclaimed
+            await self._shutdown_kernel(reclaimed)
+            async with self.condition:
+                self.condition.notify_all()
+            return await self._acquire(chat_id)
+
+        # nothing warm: start a kernel for this lease outside the lock
+        try:
+            kernel = await self._start_kernel()
+        finally:
+            async with self.condition:
+                self.starting -= 1
+                self.condition.notify_all()
+
+        async with self.condition:
+            self.kernels[kernel.kernel_id] = kernel
+            self._bind(kernel, chat_id)
+            self._fill()
+        return kernel
+
+    def _reclaim(self) -> Optional[PooledKernel]:
+        """
+        Take the kernel of the least recently used chat that is not running
+        anything, when the pool is full; call under lock. That chat loses its
+        interpreter state as if it had reached idle_timeout.
+        """
+        candidates = [kernel for kernel in self.by_chat.values() if not kernel.leased]
+        if not candidates:
+            return None
+        kernel = min(candidates, key=lambda kernel: kernel.last_used)
+        logger.info(f"Reclaiming kernel {kernel.kernel_id} of chat {kernel.chat_id}")
+        self._unbind(kernel)
+        kernel.leased = True
+        kernel_reclaims.add(1)
+        return kernel
+
+    def _bind(self, kernel: PooledKernel, chat_id: Optional[str]) -> None:
+        kernel.leased = True
+        kernel.chat_id = chat_id
+        if chat_id:
+            self.by_chat[chat_id] = kernel
+
+    async def _release(self, kernel: PooledKernel) -> None:
+        async with self.condition:
+            kernel.leased = False
+            kernel.last_used = time.monotonic()
+            if kernel.broken or not kernel.chat_id:
+                self._unbind(kernel)
+                self._spawn(self._recycle(kernel))
+            self.condition.notify_all()
+
+    def _unbind(self, kernel: PooledKernel) -> None:
+        if kernel.chat_id and self.by_chat.get(kernel.chat_id) is kernel:
+            del self.by_chat[kernel.chat_id]
+        kernel.chat_id = None
+
+    async def _recycle(self, kernel: PooledKernel) -> None:
+        """Reset a kernel that is no longer bound and return it to the pool"""
+        if (
+            kernel.broken
+            or kernel.expired(time.monotonic())
+            or not await self._reset_kernel(kernel)
+        ):
+            await self._shutdown_kernel(kernel)
+        else:
+            async with self.condition:
+                self.idle.append(kernel)
+        async with self.condition:
+            self._fill()
+            self.condition.notify_all()
+
+    ####################
+    # Warm-up and maintenance
+    ####################
+
+    def _spawn(self, coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def _fill(self) -> None:
+        """Start kernels until `size` are idle or warming up; call under lock"""
+        missing = min(
+            self.size - len(self.idle) - self.starting,
+            self.max_kernels - len(self.kernels) - self.starting,
         )
-        # parse message
-        stdout, stderr, result = "", "", []
+        for _ in range(max(0, missing)):
+            self.starting += 1
+            self._spawn(self._warm())
+
+    async def _warm(self) -> None:
+        kernel = None
+        try:
+            kernel = await self._start_kernel()
+            await kernel.connect()
+        except Exception as e:
+            logger.warning(f"Failed to start a warm Jupyter kernel: {e}")
+            if kernel is not None:
+                await self._shutdown_kernel(kernel)
+            kernel = None
+        async with self.condition:
+            self.starting -= 1
+            if kernel is not None:
+                self.kernels[kernel.kernel_id] = kernel
+                self.idle.append(kernel)
+            self.condition.notify_all()
+
+    def _ensure_maintenance(self) -> None:
+        if self.maintenance is None or self.maintenance.done():
+            self.maintenance = asyncio.create_task(self._maintain())
+
+    async def _maintain(self) -> None:
+        interval = max(1.0, min(30.0, self.idle_timeout / 2))
         while True:
             try:
-                # wait for message
-                message = await asyncio.wait_for(ws.recv(), self.timeout)
-                message_data = json.loads(message)
-                # msg id not match, skip
-                if message_data.get("parent_header", {}).get("msg_id") != msg_id:
-                    continue
-                # check message type
-                msg_type = message_data.get("msg_type")
-                match msg_type:
-                    case "stream":
-                        if message_data["content"]["name"] == "stdout":
-                            stdout += message_data["content"]["text"]
-                        elif message_data["content"]["name"] == "stderr":
-                            stderr += message_data["content"]["text"]
-                    case "execute_result" | "display_data":
-                        data = message_data["content"]["data"]
-                        if "image/png" in data:
-                            result.append(f"data:image/png;base64,{data['image/png']}")
-                        elif "text/plain" in data:
-                            result.append(data["text/plain"])
-                    case "error":
-                        stderr += "\n".join(message_data["content"]["traceback"])
-                    case "status":
-                        if message_data["content"]["execution_state"] == "idle":
-                            break
-
-            except asyncio.TimeoutError:
-                stderr += "\nExecution timed out."
-                break
-        self.result.stdout = stdout.strip()
-        self.result.stderr = stderr.strip()
-        self.result.result = "\n".join(result).strip() if result else ""
+                async with self.condition:
+                    self._expire(time.monotonic())
+                    self._fill()
+            except Exception as e:
+                logger.warning(f"Jupyter kernel pool maintenance failed: {e}")
+            await asyncio.sleep(interval)
+
+    def _expire(self, now: float) -> None:
+        """Unbind idle chats and retire expired kernels; call under lock"""
+        for kernel in list(self.by_chat.values()):
+            if not kernel.leased and (
+                now - kernel.last_used > self.idle_timeout or kernel.expired(now)
+            ):
+                self._unbind(kernel)
+                self._spawn(self._recycle(kernel))
+
+        for kernel in [kernel for kernel in self.idle if kernel.expired(now)]:
+            self.idle.remove(kernel)
+            # free the slot now so the following _fill can replace it
+            self.kernels.pop(kernel.kernel_id, None)
+            self._spawn(self._shutdown_kernel(kernel))
+
+    async def close(self) -> None:
+        if self.maintenance is not None:
+            self.maintenance.cancel()
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        for kernel in list(self.kernels.values()):
+            await self._shutdown_kernel(kernel)
+        self.idle.clear()
+        self.by_chat.clear()
+        if self.session is not None:
+            await self.session.close()
+
+    def counts(self) -> Dict[str, int]:
+        """Kernels by state; bound kernels are kept for a chat between leases"""
+        leased = [kernel for kernel in self.kernels.values() if kernel.leased]
+        return {
+            "idle": len(self.idle),
+            "leased": len(leased),
+            "bound": len(self.by_chat) - sum(k.chat_id is not None for k in leased),
+            "starting": self.starting,
+        }
+
+
+# one pool per Jupyter server and credentials
+_kernel_pools: Dict[Tuple[str, str, str], JupyterKernelPool] = {}
+
+
+def get_kernel_pool(
+    base_url: str, token: str = "", password: str = ""
+) -> JupyterKernelPool:
+    key = (base_url, token or "", password or "")
+    pool = _kernel_pools.get(key)
+    if pool is None:
+        pool = _kernel_pools[key] = JupyterKernelPool(base_url, token, password)
+    return pool
+
+
+async def close_kernel_pools() -> None:
+    pools = list(_kernel_pools.values())
+    _kernel_pools.clear()
+    for pool in pools:
+        await pool.close()
+
+
+def observe_kernel_pool(
+    options: metrics.CallbackOptions,
+):
+    totals: Dict[str, int] = {}
+    for pool in _kernel_pools.values():
+        for state, count in pool.counts().items():
+            totals[state] = totals.get(state, 0) + count
+    return [
+        metrics.Observation(value=count, attributes={"state": state})
+        for state, count in totals.items()
+    ]
+
+
+meter.create_observable_gauge(
+    name="jupyter_kernel_pool.kernels",
+    description="Kernels held by the Jupyter kernel pools, by state",
+    unit="kernels",
+    callbacks=[observe_kernel_pool],
+)
 
 
 async def execute_code_jupyter(
-    base_url: str, code: str, token: str = "", password: str = "", timeout: int = 60
+    base_url: str,
+    code: str,
+    token: str = "",
+    password: str = "",
+    timeout: int = 60,
+    chat_id: Optional[str] = None,
 ) -> dict:
+    if JUPYTER_KERNEL_POOL_SIZE > 0:
+        try:
+            async with get_kernel_pool(base_url, token, password).lease(
+                chat_id
+            ) as kernel:
+                result = await kernel.execute(code, timeout)
+        except Exception as err:
+            logger.exception("execute code failed, %s", err)
+            result = ResultModel(stderr=f"Error: {err}")
+        return result.model_dump()
+
     async with JupyterCodeExecuter(
         base_url, code, token, password, timeout
     ) as executor:
@@ -7,9 +7,6 @@ from loguru import logger
 from opentelemetry import trace
 from open_webui.env import (
     AUDIT_UVICORN_LOGGER_NAMES,
-    AUDIT_LOG_FILE_ROTATION_SIZE,
-    AUDIT_LOG_LEVEL,
-    AUDIT_LOGS_FILE_PATH,
     GLOBAL_LOG_LEVEL,
     ENABLE_OTEL,
     ENABLE_OTEL_LOGS,
@@ -84,45 +81,11 @@ class InterceptHandler(logging.Handler):
         return extras
 
 
-def file_format(record: "Record"):
-    """
-    Formats audit log records into a structured JSON string for file output.
-
-    Parameters:
-    record (Record): A Loguru record containing extra audit data.
-    Returns:
-    str: A JSON-formatted string representing the audit data.
-    """
-
-    audit_data = {
-        "id": record["extra"].get("id", ""),
-        "timestamp": int(record["time"].timestamp()),
-        "user": record["extra"].get("user", dict()),
-        "audit_level": record["extra"].get("audit_level", ""),
-        "verb": record["extra"].get("verb", ""),
-        "request_uri": record["extra"].get("request_uri", ""),
-        "response_status_code": record["extra"].get("response_status_code", 0),
-        "source_ip": record["extra"].get("source_ip", ""),
-        "user_agent": record["extra"].get("user_agent", ""),
-        "request_object": record["extra"].get("request_object", b""),
-        "response_object": record["extra"].get("response_object", b""),
-        "extra": record["extra"].get("extra", {}),
-    }
-
-    record["extra"]["file_extra"] = json.dumps(audit_data, default=str)
-    return "{extra[file_extra]}\n"
-
-
 def start_logger():
     """
-    Initializes and configures Loguru's logger with distinct handlers:
-
-    A console (stdout) handler for general log messages (excluding those marked as auditable).
-    An optional file handler for audit logs if audit logging is enabled.
+    Initializes and configures Loguru's logger with a console (stdout) handler for general log messages (excluding those marked as auditable).
+    Audit entries are not written through Loguru; they go to the audit store (see open_webui.services.audit_store).
     Additionally, this function reconfigures Python’s standard logging to route through Loguru and adjusts logging levels for Uvicorn.
-
-    Parameters:
-    enable_audit_logging (bool): Determines whether audit-specific log entries should be recorded to file.
     """
     logger.remove()
 
@@ -132,18 +95,6 @@ def start_logger():
         format=stdout_format,
         filter=lambda record: "auditable" not in record["extra"],
     )
-    if AUDIT_LOG_LEVEL != "NONE":
-        try:
-            logger.add(
-                AUDIT_LOGS_FILE_PATH,
-                level="INFO",
-                rotation=AUDIT_LOG_FILE_ROTATION_SIZE,
-                compression="zip",
-                format=file_format,
-                filter=lambda record: record["extra"].get("auditable") is True,
-            )
-        except Exception as e:
-            logger.error(f"Failed to initialize audit log file handler: {str(e)}")
 
     logging.basicConfig(
         handlers=[InterceptHandler()], level=GLOBAL_LOG_LEVEL, force=True
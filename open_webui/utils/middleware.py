@@ -77,7 +77,10 @@ from open_webui.utils.misc import (
     convert_logit_bias_input_to_json,
 )
 from open_webui.utils.tools import get_tools
-from open_webui.utils.plugin import load_function_module_by_id
+from open_webui.utils.plugin import (
+    load_function_module_by_id,
+    get_function_by_id_from_cache,
+)
 from open_webui.utils.filter import (
     get_sorted_filter_ids,
     process_filter_functions,
@@ -86,6 +89,7 @@ from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_model_system_prompt_to_body
 
 from open_webui.tasks import create_task
+from open_webui.services.tool_scheduler import tool_scheduler
 
 from open_webui.config import (
     CACHE_DIR,
@@ -840,7 +844,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
 
     try:
         filter_functions = [
-            Functions.get_function_by_id(filter_id)
+            get_function_by_id_from_cache(filter_id)
             for filter_id in get_sorted_filter_ids(
                 request, model, metadata.get("filter_ids", [])
             )
@@ -1393,7 +1397,7 @@ async def process_chat_response(
         "__model__": model,
     }
     filter_functions = [
-        Functions.get_function_by_id(filter_id)
+        get_function_by_id_from_cache(filter_id)
         for filter_id in get_sorted_filter_ids(
             request, model, metadata.get("filter_ids", [])
         )
@@ -2181,10 +2185,7 @@ async def process_chat_response(
 
                     tools = metadata.get("tools", {})
 
-                    results = []
-
-                    for tool_call in response_tool_calls:
-                        tool_call_id = tool_call.get("id", "")
+                    def make_tool_job(tool_call):
                         tool_name = tool_call.get("function", {}).get("name", "")
                         tool_args = tool_call.get("function", {}).get("arguments", "{}")
 
@@ -2214,49 +2215,59 @@ async def process_chat_response(
                             tool_function_params
                         )
 
-                        tool_result = None
+                        async def call_tool():
+                            if tool_name not in tools:
+                                return None
 
-                        if tool_name in tools:
                             tool = tools[tool_name]
                             spec = tool.get("spec", {})
 
-                            try:
-                                allowed_params = (
-                                    spec.get("parameters", {})
-                                    .get("properties", {})
-                                    .keys()
+                            allowed_params = (
+                                spec.get("parameters", {}).get("properties", {}).keys()
+                            )
+                            params = {
+                                k: v
+                                for k, v in tool_function_params.items()
+                                if k in allowed_params
+                            }
+
+                            if tool.get("direct", False):
+                                return await event_caller(
+                                    {
+                                        "type": "execute:tool",
+                                        "data": {
+                                            "id": str(uuid4()),
+                                            "name": tool_name,
+                                            "params": params,
+                                            "server": tool.get("server", {}),
+                                            "session_id": metadata.get(
+                                                "session_id", None
+                                            ),
+                                        },
+                                    }
                                 )
 
-                                tool_function_params = {
-                                    k: v
-                                    for k, v in tool_function_params.items()
-                                    if k in allowed_params
-                                }
+                            tool_function = tool["callable"]
+                            return await tool_function(**params)
 
-                                if tool.get("direct", False):
-                                    tool_result = await event_caller(
-                                        {
-                                            "type": "execute:tool",
-                                            "data": {
-                                                "id": str(uuid4()),
-                                                "name": tool_name,
-                                                "params": tool_function_params,
-                                                "server": tool.get("server", {}),
-                                                "session_id": metadata.get(
-                                                    "session_id", None
-                                                ),
-                                            },
-                                        }
-                                    )
+                        return (
+                            tool_name,
+                            call_tool,
+                            tools.get(tool_name, {}).get("timeout"),
+                        )
 
-                                else:
-                                    tool_function = tool["callable"]
-                                    tool_result = await tool_function(
-                                        **tool_function_params
-                                    )
+                    # Independent tool calls from the same turn run concurrently,
+                    # results keep the order of the calls
+                    tool_results = await tool_scheduler.run(
+                        [make_tool_job(tool_call) for tool_call in response_tool_calls]
+                    )
 
-                            except Exception as e:
-                                tool_result = str(e)
+                    results = []
+
+                    for tool_call, tool_result in zip(
+                        response_tool_calls, tool_results
+                    ):
+                        tool_call_id = tool_call.get("id", "")
 
                         tool_result_files = []
                         if isinstance(tool_result, list):
@@ -2392,6 +2403,7 @@ async def process_chat_response(
                                             else None
                                         ),
                                         request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT,
+                                        chat_id=metadata.get("chat_id"),
                                     )
                                 else:
                                     output = {
@@ -12,6 +12,7 @@ from open_webui.functions import get_function_models
 
 from open_webui.models.functions import Functions
 from open_webui.models.models import Models
+from open_webui.services.model_catalog import model_catalog
 
 
 from open_webui.utils.plugin import (
@@ -25,7 +26,11 @@ from open_webui.config import (
     DEFAULT_ARENA_MODEL,
 )
 
-from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    GLOBAL_LOG_LEVEL,
+    MODELS_CATALOG_REFRESH_INTERVAL,
+)
 from open_webui.models.users import UserModel
 
 
@@ -77,22 +82,80 @@ async def get_all_base_models(request: Request, user: UserModel = None):
 
 
 async def get_all_models(request, refresh: bool = False, user: UserModel = None):
+    snapshot = await get_model_catalog(request, refresh=refresh, user=user)
+    return snapshot.models if snapshot else []
+
+
+async def get_model_catalog(request, refresh: bool = False, user: UserModel = None):
+    """
+    Return the materialized model catalog, rebuilding it only when the shared
+    catalog version changed (models, functions, connections or config) or,
+    without ENABLE_BASE_MODELS_CACHE, when the connection model lists are due
+    for a refresh.
+    """
+    max_age = (
+        None
+        if request.app.state.config.ENABLE_BASE_MODELS_CACHE
+        else MODELS_CATALOG_REFRESH_INTERVAL
+    )
+
+    if not refresh:
+        snapshot = model_catalog.get(max_age=max_age)
+        if snapshot is not None:
+            request.app.state.MODELS = snapshot.by_id
+            return snapshot
+
+    async with model_catalog.build_lock:
+        # Another request may have rebuilt the catalog while we were waiting
+        if not refresh:
+            snapshot = model_catalog.get(max_age=max_age)
+            if snapshot is not None:
+                request.app.state.MODELS = snapshot.by_id
+                return snapshot
+
+        version = model_catalog.current_version()
+        models, acl = await build_all_models(request, refresh=refresh, user=user)
+
+        # If there are no models, don't materialize an empty catalog
+        if len(models) == 0:
+            return None
+
+        snapshot = model_catalog.publish(
+            models,
+            version,
+            acl=acl,
+            order_list=request.app.state.config.MODEL_ORDER_LIST,
+        )
+        log.debug(f"get_all_models() returned {len(models)} models")
+
+        request.app.state.MODELS = snapshot.by_id
+        return snapshot
+
+
+async def build_all_models(request, refresh: bool = False, user: UserModel = None):
+    connections_version = model_catalog.connections_version()
     if (
-        request.app.state.MODELS
-        and request.app.state.BASE_MODELS
-        and (request.app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh)
+        request.app.state.BASE_MODELS
+        and request.app.state.config.ENABLE_BASE_MODELS_CACHE
+        and getattr(request.app.state, "BASE_MODELS_VERSION", None)
+        == connections_version
+        and not refresh
     ):
         base_models = request.app.state.BASE_MODELS
     else:
         base_models = await get_all_base_models(request, user=user)
         request.app.state.BASE_MODELS = base_models
+        request.app.state.BASE_MODELS_VERSION = connections_version
 
     # deep copy the base models to avoid modifying the original list
     models = [model.copy() for model in base_models]
 
     # If there are no models, return an empty list
     if len(models) == 0:
-        return []
+        return [], {}
+
+    # model_id -> (owner_id, access_control), used to filter models per user
+    acl = {}
 
     # Add arena models
     if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
@@ -129,73 +192,76 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
             ]
         models = models + arena_models
 
-    global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
-    ]
-    enabled_action_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
-    ]
+    # Load all functions once and resolve action/filter ids from memory
+    functions = {function.id: function for function in Functions.get_functions()}
 
-    global_filter_ids = [
-        function.id for function in Functions.get_global_filter_functions()
-    ]
-    enabled_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
+    def function_ids(type, global_only=False):
+        return {
+            function.id
+            for function in functions.values()
+            if function.type == type
+            and function.is_active
+            and (function.is_global or not global_only)
+        }
+
+    global_action_ids = function_ids("action", global_only=True)
+    enabled_action_ids = function_ids("action")
+    global_filter_ids = function_ids("filter", global_only=True)
+    enabled_filter_ids = function_ids("filter")
+
+    # Index models by id and by the id without tag, so merging custom models
+    # is a lookup instead of a scan over the whole list
+    models_by_id = {}
+    models_by_base_id = {}
+    for model in models:
+        models_by_id.setdefault(model["id"], []).append(model)
+        models_by_base_id.setdefault(model["id"].split(":")[0], []).append(model)
+
+    removed = set()
+    presets = []
+
+    def remove_model(model):
+        removed.add(id(model))
+        models_by_id[model["id"]].remove(model)
+        models_by_base_id[model["id"].split(":")[0]].remove(model)
 
     custom_models = Models.get_all_models()
     for custom_model in custom_models:
         if custom_model.base_model_id is None:
             # Applied directly to a base model
-            for model in models:
-                if custom_model.id == model["id"] or (
-                    model.get("owned_by") == "ollama"
-                    and custom_model.id
-                    == model["id"].split(":")[
-                        0
-                    ]  # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
-                ):
-                    if custom_model.is_active:
-                        model["name"] = custom_model.name
-                        model["info"] = custom_model.model_dump()
-
-                        # Set action_ids and filter_ids
-                        action_ids = []
-                        filter_ids = []
-
-                        if "info" in model and "meta" in model["info"]:
-                            action_ids.extend(
-                                model["info"]["meta"].get("actionIds", [])
-                            )
-                            filter_ids.extend(
-                                model["info"]["meta"].get("filterIds", [])
-                            )
-
-                        model["action_ids"] = action_ids
-                        model["filter_ids"] = filter_ids
-                    else:
-                        models.remove(model)
-
-        elif custom_model.is_active and (
-            custom_model.id not in [model["id"] for model in models]
-        ):
+            # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
+            matches = list(models_by_id.get(custom_model.id, [])) + [
+                model
+                for model in models_by_base_id.get(custom_model.id, [])
+                if model.get("owned_by") == "ollama" and model["id"] != custom_model.id
+            ]
+            for model in matches:
+                if custom_model.is_active:
+                    model["name"] = custom_model.name
+                    model["info"] = custom_model.model_dump()
+
+                    # Set action_ids and filter_ids
+                    meta = model["info"].get("meta") or {}
+                    model["action_ids"] = list(meta.get("actionIds", []))
+                    model["filter_ids"] = list(meta.get("filterIds", []))
+                else:
+                    remove_model(model)
+
+        elif custom_model.is_active and not models_by_id.get(custom_model.id):
             owned_by = "openai"
             pipe = None
 
             action_ids = []
             filter_ids = []
 
-            for model in models:
-                if (
-                    custom_model.base_model_id == model["id"]
-                    or custom_model.base_model_id == model["id"].split(":")[0]
-                ):
-                    owned_by = model.get("owned_by", "unknown owner")
-                    if "pipe" in model:
-                        pipe = model["pipe"]
-                    break
+            base_candidates = models_by_id.get(
+                custom_model.base_model_id
+            ) or models_by_base_id.get(custom_model.base_model_id)
+            if base_candidates:
+                base_model = base_candidates[0]
+                owned_by = base_model.get("owned_by", "unknown owner")
+                if "pipe" in base_model:
+                    pipe = base_model["pipe"]
 
             if custom_model.meta:
                 meta = custom_model.meta.model_dump()
@@ -206,20 +272,25 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
                 if "filterIds" in meta:
                     filter_ids.extend(meta["filterIds"])
 
-            models.append(
-                {
-                    "id": f"{custom_model.id}",
-                    "name": custom_model.name,
-                    "object": "model",
-                    "created": custom_model.created_at,
-                    "owned_by": owned_by,
-                    "info": custom_model.model_dump(),
-                    "preset": True,
-                    **({"pipe": pipe} if pipe is not None else {}),
-                    "action_ids": action_ids,
-                    "filter_ids": filter_ids,
-                }
-            )
+            preset = {
+                "id": f"{custom_model.id}",
+                "name": custom_model.name,
+                "object": "model",
+                "created": custom_model.created_at,
+                "owned_by": owned_by,
+                "info": custom_model.model_dump(),
+                "preset": True,
+                **({"pipe": pipe} if pipe is not None else {}),
+                "action_ids": action_ids,
+                "filter_ids": filter_ids,
+            }
+            presets.append(preset)
+            models_by_id.setdefault(preset["id"], []).append(preset)
+            models_by_base_id.setdefault(preset["id"].split(":")[0], []).append(preset)
+
+        acl[custom_model.id] = (custom_model.user_id, custom_model.access_control)
+
+    models = [model for model in models + presets if id(model) not in removed]
 
     # Process action_ids to get the actions
     def get_action_items_from_module(function, module):
@@ -270,20 +341,26 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
         return function_module
 
     for model in models:
+        if model.get("arena"):
+            acl[model["id"]] = (
+                None,
+                model.get("info", {}).get("meta", {}).get("access_control", {}),
+            )
+
         action_ids = [
             action_id
-            for action_id in list(set(model.pop("action_ids", []) + global_action_ids))
+            for action_id in set(model.pop("action_ids", [])) | global_action_ids
             if action_id in enabled_action_ids
         ]
         filter_ids = [
             filter_id
-            for filter_id in list(set(model.pop("filter_ids", []) + global_filter_ids))
+            for filter_id in set(model.pop("filter_ids", [])) | global_filter_ids
             if filter_id in enabled_filter_ids
         ]
 
         model["actions"] = []
         for action_id in action_ids:
-            action_function = Functions.get_function_by_id(action_id)
+            action_function = functions.get(action_id)
             if action_function is None:
                 raise Exception(f"Action not found: {action_id}")
 
@@ -294,7 +371,7 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
 
         model["filters"] = []
         for filter_id in filter_ids:
-            filter_function = Functions.get_function_by_id(filter_id)
+            filter_function = functions.get(filter_id)
             if filter_function is None:
                 raise Exception(f"Filter not found: {filter_id}")
 
@@ -305,10 +382,8 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
                     get_filter_items_from_module(filter_function, function_module)
                 )
 
-    log.debug(f"get_all_models() returned {len(models)} models")
+    return models, acl
 
-    request.app.state.MODELS = {model["id"]: model for model in models}
-    return models
 
 
 def check_model_access(user, model):
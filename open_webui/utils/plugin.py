@@ -10,6 +10,7 @@ import logging
 from open_webui.env import SRC_LOG_LEVELS, PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
+from open_webui.services.plugin_cache import plugin_cache
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
@@ -166,13 +167,23 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         os.unlink(temp_file.name)
 
 
+def get_function_by_id_from_cache(function_id):
+    function, _ = plugin_cache.get_row(
+        "function", function_id, Functions.get_function_by_id
+    )
+    return function
+
+
 def get_function_module_from_cache(request, function_id, load_from_db=True):
     if load_from_db:
-        # Always load from the database by default
+        # Always check the latest function content by default
         # This is useful for hooks like "inlet" or "outlet" where the content might change
-        # and we want to ensure the latest content is used.
+        # and we want to ensure the latest content is used. The function row is
+        # served from the plugin cache, which is invalidated on every update.
 
-        function = Functions.get_function_by_id(function_id)
+        function, content_hash = plugin_cache.get_row(
+            "function", function_id, Functions.get_function_by_id
+        )
         if not function:
             raise Exception(f"Function not found: {function_id}")
         content = function.content
@@ -180,18 +191,13 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
         new_content = replace_imports(content)
         if new_content != content:
             content = new_content
+            content_hash = plugin_cache.content_hash(content)
             # Update the function content in the database
             Functions.update_function_by_id(function_id, {"content": content})
 
-        if (
-            hasattr(request.app.state, "FUNCTION_CONTENTS")
-            and function_id in request.app.state.FUNCTION_CONTENTS
-        ) and (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            if request.app.state.FUNCTION_CONTENTS[function_id] == content:
-                return request.app.state.FUNCTIONS[function_id], None, None
+        function_module = plugin_cache.get_module("function", function_id, content_hash)
+        if function_module is not None:
+            return function_module, None, None
 
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id, content
@@ -209,15 +215,15 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id
         )
+        content_hash = plugin_cache.get_row(
+            "function", function_id, Functions.get_function_by_id
+        )[1]
 
     if not hasattr(request.app.state, "FUNCTIONS"):
         request.app.state.FUNCTIONS = {}
 
-    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
-        request.app.state.FUNCTION_CONTENTS = {}
-
     request.app.state.FUNCTIONS[function_id] = function_module
-    request.app.state.FUNCTION_CONTENTS[function_id] = content
+    plugin_cache.set_module("function", function_id, content_hash, function_module)
 
     return function_module, function_type, frontmatter
 
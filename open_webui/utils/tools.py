@@ -35,6 +35,7 @@ from langchain_core.utils.function_calling import (
 
 from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
+from open_webui.services.plugin_cache import plugin_cache
 from open_webui.utils.plugin import load_tool_module_by_id
 from open_webui.env import (
     SRC_LOG_LEVELS,
@@ -67,13 +68,44 @@ def get_async_tool_function_and_apply_extra_params(
         return new_function
 
 
+def get_tool_specs_for_module(specs: list[dict], module) -> list[dict]:
+    """
+    Normalize stored tool specs for the LLM payload. The result only depends on
+    the tool content, so it is cached by content hash.
+    """
+    specs = copy.deepcopy(specs)
+    for spec in specs:
+        # TODO: Fix hack for OpenAI API
+        # Some times breaks OpenAI but others don't. Leaving the comment
+        for val in spec.get("parameters", {}).get("properties", {}).values():
+            if val.get("type") == "str":
+                val["type"] = "string"
+
+        # Remove internal reserved parameters (e.g. __id__, __user__)
+        spec["parameters"]["properties"] = {
+            key: val
+            for key, val in spec["parameters"]["properties"].items()
+            if not key.startswith("__")
+        }
+
+        # TODO: Support Pydantic models as parameters
+        function_name = spec["name"]
+        doc = getattr(module, function_name).__doc__
+        if doc and doc.strip() != "":
+            s = re.split(":(param|return)", doc, 1)
+            spec["description"] = s[0]
+        else:
+            spec["description"] = function_name
+    return specs
+
+
 def get_tools(
     request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
 ) -> dict[str, dict]:
     tools_dict = {}
 
     for tool_id in tool_ids:
-        tool = Tools.get_tool_by_id(tool_id)
+        tool, content_hash = plugin_cache.get_row("tool", tool_id, Tools.get_tool_by_id)
         if tool is None:
             if tool_id.startswith("server:"):
                 server_idx = int(tool_id.split(":")[1])
@@ -141,36 +173,37 @@ def get_tools(
             else:
                 continue
         else:
-            module = request.app.state.TOOLS.get(tool_id, None)
+            # Compiled modules are reused as long as the tool content is unchanged
+            module = plugin_cache.get_module("tool", tool_id, content_hash)
             if module is None:
                 module, _ = load_tool_module_by_id(tool_id)
+                # Loading may rewrite the stored content (imports), re-read the hash
+                tool, content_hash = plugin_cache.get_row(
+                    "tool", tool_id, Tools.get_tool_by_id
+                )
+                plugin_cache.set_module("tool", tool_id, content_hash, module)
                 request.app.state.TOOLS[tool_id] = module
 
             extra_params["__id__"] = tool_id
 
             # Set valves for the tool
             if hasattr(module, "valves") and hasattr(module, "Valves"):
-                valves = Tools.get_tool_valves_by_id(tool_id) or {}
+                valves = (
+                    plugin_cache.get_valves("tool", tool_id, Tools.get_tool_valves_by_id)
+                    or {}
+                )
                 module.valves = module.Valves(**valves)
             if hasattr(module, "UserValves"):
                 extra_params["__user__"]["valves"] = module.UserValves(  # type: ignore
                     **Tools.get_user_valves_by_id_and_user_id(tool_id, user.id)
                 )
 
-            for spec in tool.specs:
-                # TODO: Fix hack for OpenAI API
-                # Some times breaks OpenAI but others don't. Leaving the comment
-                for val in spec.get("parameters", {}).get("properties", {}).values():
-                    if val.get("type") == "str":
-                        val["type"] = "string"
-
-                # Remove internal reserved parameters (e.g. __id__, __user__)
-                spec["parameters"]["properties"] = {
-                    key: val
-                    for key, val in spec["parameters"]["properties"].items()
-                    if not key.startswith("__")
-                }
+            specs = plugin_cache.get_specs("tool", tool_id, content_hash)
+            if specs is None:
+                specs = get_tool_specs_for_module(tool.specs, module)
+                plugin_cache.set_specs("tool", tool_id, content_hash, specs)
 
+            for spec in copy.deepcopy(specs):
                 # convert to function that takes only model params and inserts custom params
                 function_name = spec["name"]
                 tool_function = getattr(module, function_name)
@@ -178,13 +211,6 @@ def get_tools(
                     tool_function, extra_params
                 )
 
-                # TODO: Support Pydantic models as parameters
-                if callable.__doc__ and callable.__doc__.strip() != "":
-                    s = re.split(":(param|return)", callable.__doc__, 1)
-                    spec["description"] = s[0]
-                else:
-                    spec["description"] = function_name
-
                 tool_dict = {
                     "tool_id": tool_id,
                     "callable": callable,
@@ -0,0 +1,53 @@
+"""
+限流器测试（本地令牌桶回退路径）
+"""
+
+import pytest
+
+from open_webui.middleware.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def limiter():
+    limiter = RateLimiter(redis_url="redis://127.0.0.1:1/0")
+    limiter.enabled = False
+    return limiter
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_local_bucket_enforces_limit(self, limiter):
+        results = [
+            (await limiter.check_rate_limit("rate_limit:user:u1", 3, 60))[0]
+            for _ in range(4)
+        ]
+        assert results == [True, True, True, False]
+        assert limiter.get_stats()["rejections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_weighted_cost(self, limiter):
+        allowed, info = await limiter.check_rate_limit("rate_limit:ip:1", 10, 60, cost=8)
+        assert allowed and info["remaining"] == 2
+
+        allowed, info = await limiter.check_rate_limit("rate_limit:ip:1", 10, 60, cost=3)
+        assert not allowed
+        assert info["scope"] == "ip"
+        assert info["retry_after"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_rules_are_all_or_nothing(self, limiter):
+        rules = [("rate_limit:user:u2", 5, 60), ("rate_limit:global", 1, 60)]
+        assert (await limiter.check_rate_limits(rules))[0]
+
+        allowed, info = await limiter.check_rate_limits(rules)
+        assert not allowed and info["scope"] == "global"
+        # 被拒绝的请求不消耗用户配额
+        assert limiter._buckets["rate_limit:user:u2"].tokens == pytest.approx(4, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_redis_unreachable(self):
+        limiter = RateLimiter(redis_url="redis://127.0.0.1:1/0")
+        allowed, _ = await limiter.check_rate_limit("rate_limit:user:u3", 1, 60)
+        assert allowed
+        assert limiter.get_stats()["local_decisions"] == 1
+        assert not limiter.get_stats()["redis_available"]
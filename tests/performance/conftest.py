@@ -0,0 +1,66 @@
+"""
+基准测试 fixtures
+
+所有基准共用一个 BenchmarkRecorder，会话结束时在终端摘要中输出指标并与 baseline.json 对比：
+- 默认只对比查询数、事件数等与机器无关的指标；BENCHMARK_TIMINGS=1 时也对比耗时和吞吐
+- BENCHMARK_UPDATE_BASELINE=1 时把本次结果写回基线
+- BENCHMARK_REPORT=<path> 时把本次结果写成 JSON 报告
+"""
+
+import json
+import os
+
+import pytest
+
+from tests.performance.harness import (
+    BENCHMARK_UPDATE_BASELINE,
+    BenchmarkRecorder,
+    generate_corpus,
+    scaled,
+)
+
+benchmark_recorder_key = pytest.StashKey[BenchmarkRecorder]()
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(request):
+    recorder = BenchmarkRecorder()
+    request.config.stash[benchmark_recorder_key] = recorder
+    yield recorder
+
+    if not recorder.metrics:
+        return
+
+    report_path = os.environ.get("BENCHMARK_REPORT")
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(
+                {name: vars(metric) for name, metric in recorder.metrics.items()},
+                f,
+                indent=2,
+            )
+
+    if BENCHMARK_UPDATE_BASELINE:
+        recorder.save_baseline()
+        return
+
+    regressions = recorder.compare()
+    if regressions:
+        pytest.fail("Benchmark regressions:\n" + "\n".join(regressions))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    recorder = config.stash.get(benchmark_recorder_key, None)
+    if recorder is None or not recorder.metrics:
+        return
+    terminalreporter.section("benchmark metrics")
+    for line in recorder.report().splitlines():
+        terminalreporter.write_line(line)
+
+
+@pytest.fixture(scope="session")
+def benchmark_corpus():
+    return generate_corpus(
+        num_documents=scaled(200),
+        num_queries=scaled(50),
+    )
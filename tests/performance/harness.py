@@ -0,0 +1,395 @@
+"""
+端到端基准测试工具
+
+提供本地替身，让基准测试直接运行被测代码而不是 mock：
+- FakeOpenAIServer: 本地 OpenAI 兼容服务，支持流式对话补全和 embeddings
+- HashEmbedder: 基于哈希的确定性向量化函数
+- generate_corpus: 固定种子的合成语料
+- count_queries: 统计代码块内执行的 SQL 语句数
+- BenchmarkRecorder: 记录指标并与保存的基线对比
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from sqlalchemy import event
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# 工作量倍数，CI 上可以调小，本地分析时调大
+BENCHMARK_SCALE = float(os.environ.get("BENCHMARK_SCALE", "1"))
+# 耗时类指标允许相对基线变慢的倍数；不同机器的绝对耗时差异较大
+BENCHMARK_TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "3"))
+# 耗时类指标只在 BENCHMARK_TIMINGS=1 时与基线对比（在固定的机器上运行），
+# 默认只对比查询数、事件数等与机器无关的指标
+BENCHMARK_TIMINGS = os.environ.get("BENCHMARK_TIMINGS", "") == "1"
+BENCHMARK_UPDATE_BASELINE = os.environ.get("BENCHMARK_UPDATE_BASELINE", "") == "1"
+
+
+def scaled(n: int) -> int:
+    return max(1, int(n * BENCHMARK_SCALE))
+
+
+####################################
+# 语料与向量化
+####################################
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashEmbedder:
+    """特征哈希向量化：相同文本得到相同向量，词重叠越多余弦相似度越高
+
+    同时提供 SentenceTransformer 风格的 encode 和检索代码使用的
+    embedding_function(query, prefix=None, user=None) 调用方式
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dim] += 1.0 if (value >> 63) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            return self._embed(texts)
+        return np.stack([self._embed(text) for text in texts])
+
+    def __call__(self, query, prefix=None, user=None):
+        return self.encode(query).tolist()
+
+
+@dataclass
+class Corpus:
+    documents: List[Dict]
+    queries: List[str]
+
+
+def generate_corpus(
+    num_documents: int = 200,
+    words_per_document: int = 400,
+    num_queries: int = 50,
+    vocabulary_size: int = 5000,
+    seed: int = 42,
+) -> Corpus:
+    """生成固定种子的合成语料；词频近似 Zipf 分布，查询取自文档原句"""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ren", "sa", "tu", "vex", "zo", "pri", "dan"]
+    vocabulary = sorted(
+        {
+            "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+            for _ in range(vocabulary_size)
+        }
+    )
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+
+    documents = []
+    for i in range(num_documents):
+        words = rng.choices(vocabulary, weights=weights, k=words_per_document)
+        sentences = [
+            " ".join(words[start : start + 12]) + "."
+            for start in range(0, len(words), 12)
+        ]
+        documents.append(
+            {
+                "id": f"doc-{i}",
+                "name": f"document-{i}.txt",
+                "content": "\n".join(sentences),
+            }
+        )
+
+    queries = []
+    for _ in range(num_queries):
+        sentence = rng.choice(rng.choice(documents)["content"].split("\n"))
+        words = sentence.rstrip(".").split()
+        start = rng.randint(0, max(0, len(words) - 6))
+        queries.append(" ".join(words[start : start + 6]))
+
+    return Corpus(documents=documents, queries=queries)
+
+
+####################################
+# 本地 OpenAI 兼容服务
+####################################
+
+
+class FakeOpenAIServer:
+    """在后台线程运行的 OpenAI 兼容服务
+
+    /v1/chat/completions 按 SSE 格式逐 token 返回固定内容，
+    /v1/embeddings 使用 HashEmbedder 生成向量
+    """
+
+    def __init__(
+        self,
+        tokens_per_response: int = 500,
+        token_delay: float = 0.0,
+        seed: int = 42,
+        embedder: Optional[HashEmbedder] = None,
+    ):
+        rng = random.Random(seed)
+        words = generate_corpus(num_documents=1, seed=seed).documents[0]["content"]
+        words = words.split()
+        self.tokens = [f"{rng.choice(words)} " for _ in range(tokens_per_response)]
+        self.token_delay = token_delay
+        self.embedder = embedder or HashEmbedder()
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stream_chunks(self, model: str = "fake-model") -> Iterator[bytes]:
+        created = int(time.time())
+        for token in self.tokens:
+            chunk = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": token}}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+        done = {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        yield f"data: {json.dumps(done)}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, payload: dict, status: int = 200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._json({"data": [{"id": "fake-model", "object": "model"}]})
+                else:
+                    self._json({"error": "not found"}, 404)
+
+            def do_POST(self):
+                server.requests += 1
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+
+                if self.path.endswith("/embeddings"):
+                    texts = payload.get("input", [])
+                    texts = [texts] if isinstance(texts, str) else texts
+                    vectors = server.embedder.encode(texts).tolist()
+                    self._json(
+                        {
+                            "object": "list",
+                            "data": [
+                                {"object": "embedding", "index": i, "embedding": v}
+                                for i, v in enumerate(vectors)
+                            ],
+                        }
+                    )
+                elif self.path.endswith("/chat/completions"):
+                    model = payload.get("model", "fake-model")
+                    if not payload.get("stream"):
+                        content = "".join(server.tokens)
+                        self._json(
+                            {
+                                "id": "chatcmpl-bench",
+                                "object": "chat.completion",
+                                "model": model,
+                                "choices": [
+                                    {
+                                        "index": 0,
+                                        "message": {
+                                            "role": "assistant",
+                                            "content": content,
+                                        },
+                                        "finish_reason": "stop",
+                                    }
+                                ],
+                            }
+                        )
+                        return
+
+                    # HTTP/1.0：不带 Content-Length，写完后关闭连接
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.end_headers()
+                    for chunk in server.stream_chunks(model):
+                        self.wfile.write(chunk)
+                        self.wfile.flush()
+                        if server.token_delay:
+                            time.sleep(server.token_delay)
+                else:
+                    self._json({"error": "not found"}, 404)
+
+        return Handler
+
+
+####################################
+# SQL 语句计数
+####################################
+
+
+@contextmanager
+def count_queries(engine) -> Iterator[List[str]]:
+    """代码块内执行的 SQL 语句，yield 的列表在退出时已填充"""
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+####################################
+# 指标记录与基线对比
+####################################
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        "p50": at(0.50),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "mean": statistics.mean(ordered),
+    }
+
+
+@dataclass
+class Metric:
+    value: float
+    unit: str
+    # lower: 越小越好（耗时）；higher: 越大越好（吞吐）；exact: 不允许增加（查询数）
+    better: str = "lower"
+
+
+@dataclass
+class BenchmarkRecorder:
+    baseline_path: str = BASELINE_PATH
+    metrics: Dict[str, Metric] = field(default_factory=dict)
+
+    def record(self, name: str, value: float, unit: str, better: str = "lower"):
+        self.metrics[name] = Metric(round(float(value), 4), unit, better)
+
+    def record_latencies(self, name: str, samples_ms: List[float]):
+        for key, value in percentiles(samples_ms).items():
+            self.record(f"{name}.{key}", value, "ms")
+
+    def load_baseline(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.baseline_path):
+            return {}
+        with open(self.baseline_path) as f:
+            return json.load(f)
+
+    def compare(
+        self,
+        tolerance: float = BENCHMARK_TOLERANCE,
+        timings: bool = BENCHMARK_TIMINGS,
+    ) -> List[str]:
+        """
+        返回相对基线退化或缺失的指标说明。本次记录了但基线里没有的指标，以及
+        同一组（名称第一段）指标已记录、基线里有但本次没有记录的指标都算失败；
+        耗时类指标只在 timings 为真时判定
+        """
+        baseline = self.load_baseline()
+        regressions = []
+
+        groups = {name.split(".", 1)[0] for name in self.metrics}
+        for name in sorted(baseline):
+            if name.split(".", 1)[0] in groups and name not in self.metrics:
+                reference = baseline[name]["value"]
+                regressions.append(f"{name}: not recorded (baseline {reference})")
+
+        for name, metric in sorted(self.metrics.items()):
+            expected = baseline.get(name)
+            if expected is None:
+                regressions.append(
+                    f"{name}: missing from baseline "
+                    "(run with BENCHMARK_UPDATE_BASELINE=1)"
+                )
+                continue
+            if metric.better != "exact" and not timings:
+                continue
+            reference = expected["value"]
+            if metric.better == "exact":
+                regressed = metric.value > reference
+            elif metric.better == "higher":
+                regressed = metric.value * tolerance < reference
+            else:
+                regressed = metric.value > reference * tolerance
+            if regressed:
+                regressions.append(
+                    f"{name}: {metric.value} {metric.unit} (baseline {reference})"
+                )
+        return regressions
+
+    def save_baseline(self) -> None:
+        baseline = self.load_baseline()
+        baseline.update(
+            {
+                name: {"value": m.value, "unit": m.unit, "better": m.better}
+                for name, m in self.metrics.items()
+            }
+        )
+        with open(self.baseline_path, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    def report(self) -> str:
+        baseline = self.load_baseline()
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            reference = baseline.get(name, {}).get("value", "-")
+            lines.append(
+                f"{name:<48} {metric.value:>12} {metric.unit:<10} baseline {reference}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,341 @@
+"""
+检索与对话端到端基准测试
+
+直接运行被测代码，只把外部依赖换成本地替身：向量库用嵌入式 LocalVectorClient，
+向量化用 HashEmbedder，模型服务用 FakeOpenAIServer，数据库用配置的 SQLite。
+指标与 tests/performance/baseline.json 对比，见 conftest.py
+"""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+
+from open_webui.internal.db import engine
+from open_webui.retrieval import utils as retrieval_utils
+from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+from tests.performance.harness import (
+    FakeOpenAIServer,
+    HashEmbedder,
+    count_queries,
+    scaled,
+)
+
+COLLECTION = "benchmark-corpus"
+
+# 查询数基准使用固定规模，保证与基线可比
+LIST_ITEMS = 50
+
+
+def make_request(embedder: HashEmbedder):
+    config = SimpleNamespace(
+        TEXT_SPLITTER="",
+        CHUNK_SIZE=1000,
+        CHUNK_OVERLAP=100,
+        RAG_EMBEDDING_ENGINE="",
+        RAG_EMBEDDING_MODEL="hash-embedder",
+        RAG_EMBEDDING_BATCH_SIZE=32,
+        RAG_OPENAI_API_BASE_URL="",
+        RAG_OPENAI_API_KEY="",
+        RAG_OLLAMA_BASE_URL="",
+        RAG_OLLAMA_API_KEY="",
+        RAG_AZURE_OPENAI_BASE_URL="",
+        RAG_AZURE_OPENAI_API_KEY="",
+        USER_PERMISSIONS={},
+        WEBUI_URL="http://localhost",
+    )
+    state = SimpleNamespace(config=config, ef=embedder, redis=None, WEBUI_NAME="bench")
+    return SimpleNamespace(app=SimpleNamespace(state=state))
+
+
+def chunk_items(corpus, embedder, sentences_per_chunk=8):
+    items = []
+    for document in corpus.documents:
+        sentences = document["content"].split("\n")
+        for start in range(0, len(sentences), sentences_per_chunk):
+            text = " ".join(sentences[start : start + sentences_per_chunk])
+            items.append(
+                {
+                    "id": f"{document['id']}-{start}",
+                    "text": text,
+                    "vector": embedder(text),
+                    "metadata": {"file_id": document["id"], "name": document["name"]},
+                }
+            )
+    return items
+
+
+@pytest.fixture(scope="module")
+def embedder():
+    return HashEmbedder()
+
+
+@pytest.fixture(scope="module")
+def indexed_client(tmp_path_factory, benchmark_corpus, embedder):
+    client = LocalVectorClient(str(tmp_path_factory.mktemp("benchmark-vectors")))
+    client.insert(COLLECTION, chunk_items(benchmark_corpus, embedder))
+    return client
+
+
+class TestRetrievalBenchmark:
+    def test_ingestion_throughput(
+        self, benchmark_recorder, benchmark_corpus, embedder, tmp_path
+    ):
+        from langchain_core.documents import Document
+
+        from open_webui.routers import retrieval
+
+        client = LocalVectorClient(str(tmp_path))
+        request = make_request(embedder)
+        documents = benchmark_corpus.documents
+
+        with patch.object(retrieval, "VECTOR_DB_CLIENT", client):
+            start = time.perf_counter()
+            for document in documents:
+                retrieval.save_docs_to_vector_db(
+                    request,
+                    [
+                        Document(
+                            page_content=document["content"],
+                            metadata={"name": document["name"]},
+                        )
+                    ],
+                    "benchmark-ingest",
+                    metadata={"file_id": document["id"]},
+                    add=True,
+                )
+            elapsed = time.perf_counter() - start
+
+        chunks = sum(len(page.ids[0]) for page in client.iter_get("benchmark-ingest"))
+        assert chunks >= len(documents)
+        benchmark_recorder.record(
+            "ingestion.documents_per_second",
+            len(documents) / elapsed,
+            "docs/s",
+            better="higher",
+        )
+        benchmark_recorder.record(
+            "ingestion.chunks_per_second", chunks / elapsed, "chunks/s", better="higher"
+        )
+
+    def test_vector_search_latency(
+        self, benchmark_recorder, benchmark_corpus, embedder, indexed_client
+    ):
+        latencies = []
+        with patch.object(retrieval_utils, "VECTOR_DB_CLIENT", indexed_client):
+            for query in benchmark_corpus.queries:
+                start = time.perf_counter()
+                result = retrieval_utils.query_collection(
+                    [COLLECTION], [query], embedder, k=5
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert len(result["documents"][0]) == 5
+
+        benchmark_recorder.record_latencies("vector_search.latency", latencies)
+
+    def test_hybrid_search_latency(
+        self, benchmark_recorder, benchmark_corpus, embedder, indexed_client
+    ):
+        def search(query):
+            return retrieval_utils.query_collection_with_hybrid_search(
+                collection_names=[COLLECTION],
+                queries=[query],
+                embedding_function=embedder,
+                k=5,
+                reranking_function=None,
+                k_reranker=5,
+                r=0.0,
+                hybrid_bm25_weight=0.5,
+            )
+
+        latencies = []
+        with patch.object(retrieval_utils, "VECTOR_DB_CLIENT", indexed_client):
+            # 首次查询包含读取整个集合的开销，单独记录
+            start = time.perf_counter()
+            search(benchmark_corpus.queries[0])
+            benchmark_recorder.record(
+                "hybrid_search.first_query",
+                (time.perf_counter() - start) * 1000,
+                "ms",
+            )
+
+            for query in benchmark_corpus.queries:
+                start = time.perf_counter()
+                result = search(query)
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert result["documents"][0]
+
+        benchmark_recorder.record_latencies("hybrid_search.latency", latencies)
+
+
+class TestChatStreamingBenchmark:
+    def test_streaming_token_overhead(self, benchmark_recorder):
+        from open_webui.utils import middleware
+
+        tokens = scaled(500)
+
+        async def open_stream(server):
+            session = aiohttp.ClientSession()
+            response = await session.post(
+                f"{server.base_url}/chat/completions",
+                json={"model": "fake-model", "stream": True, "messages": []},
+            )
+
+            async def cleanup():
+                response.close()
+                await session.close()
+
+            return response, cleanup
+
+        async def consume_raw(server):
+            response, cleanup = await open_stream(server)
+            lines = 0
+            async for line in response.content:
+                lines += bool(line.strip())
+            await cleanup()
+            return lines
+
+        async def consume_through_middleware(server):
+            response, cleanup = await open_stream(server)
+            emitted = []
+            created = []
+
+            async def event_emitter(event):
+                emitted.append(event)
+
+            async def event_caller(event):
+                return None
+
+            async def create_task(redis, coroutine, id=None):
+                created.append(asyncio.create_task(coroutine))
+                return "benchmark-task", created[-1]
+
+            chats = MagicMock()
+            chats.get_message_by_id_and_message_id.return_value = None
+            chats.get_messages_by_chat_id.return_value = {}
+            chats.get_chat_title_by_id.return_value = "benchmark"
+
+            with patch.multiple(
+                middleware,
+                Chats=chats,
+                get_event_emitter=lambda metadata: event_emitter,
+                get_event_call=lambda metadata: event_caller,
+                create_task=create_task,
+                get_active_status_by_user_id=lambda user_id: True,
+                get_sorted_filter_ids=lambda *args, **kwargs: [],
+            ):
+                await middleware.process_chat_response(
+                    make_request(HashEmbedder()),
+                    StreamingResponse(
+                        response.content,
+                        media_type="text/event-stream",
+                        background=BackgroundTask(cleanup),
+                    ),
+                    {"model": "fake-model", "messages": []},
+                    SimpleNamespace(id="benchmark-user"),
+                    {
+                        "chat_id": "benchmark-chat",
+                        "message_id": "benchmark-message",
+                        "session_id": "benchmark-session",
+                        "user_id": "benchmark-user",
+                    },
+                    {"id": "fake-model"},
+                    [],
+                    {},
+                )
+                await created[0]
+            return emitted
+
+        async def run():
+            with FakeOpenAIServer(tokens_per_response=tokens) as server:
+                # 预热连接与导入
+                await consume_raw(server)
+
+                start = time.perf_counter()
+                lines = await consume_raw(server)
+                raw = time.perf_counter() - start
+
+                start = time.perf_counter()
+                emitted = await consume_through_middleware(server)
+                processed = time.perf_counter() - start
+            return lines, raw, emitted, processed
+
+        lines, raw, emitted, processed = asyncio.run(run())
+
+        assert lines == tokens + 2
+        assert emitted[-1]["data"]["done"] is True
+        benchmark_recorder.record(
+            "streaming.overhead_per_token",
+            max(0.0, processed - raw) / tokens * 1e6,
+            "us",
+        )
+        benchmark_recorder.record(
+            "streaming.events_per_token", len(emitted) / tokens, "events", "exact"
+        )
+
+
+class TestListEndpointQueries:
+    @pytest.fixture
+    def seeded_user(self):
+        from open_webui.models.chats import ChatForm, Chats
+        from open_webui.models.folders import FolderForm, Folders
+        from open_webui.models.notes import NoteForm, Notes
+        from open_webui.models.users import Users
+
+        user_id = f"benchmark-{uuid.uuid4()}"
+        user = Users.insert_new_user(
+            user_id, "Benchmark", f"{user_id}@example.com", role="admin"
+        )
+        folders = [
+            Folders.insert_new_folder(user_id, FolderForm(name=f"folder {i}"))
+            for i in range(LIST_ITEMS // 5)
+        ]
+        for i in range(LIST_ITEMS):
+            Chats.insert_new_chat(
+                user_id,
+                ChatForm(
+                    chat={"title": f"chat {i}", "messages": []},
+                    # 列表接口只返回不在文件夹里的对话，一半放进文件夹
+                    folder_id=folders[i % len(folders)].id if i % 2 else None,
+                ),
+            )
+        notes = [
+            Notes.insert_new_note(NoteForm(title=f"note {i}"), user_id)
+            for i in range(LIST_ITEMS)
+        ]
+
+        yield user
+
+        for note in notes:
+            Notes.delete_note_by_id(note.id)
+        for folder in folders:
+            Folders.delete_folder_by_id_and_user_id(folder.id, user_id)
+        Users.delete_user_by_id(user_id)
+
+    def test_list_endpoint_query_counts(self, benchmark_recorder, seeded_user):
+        from open_webui.routers import chats, folders, notes
+
+        request = make_request(HashEmbedder())
+        endpoints = {
+            "chats": lambda: chats.get_session_user_chat_list(user=seeded_user),
+            "chats_page": lambda: chats.get_session_user_chat_list(
+                user=seeded_user, page=1
+            ),
+            "folders": lambda: folders.get_folders(user=seeded_user),
+            "notes": lambda: notes.get_notes(request, user=seeded_user),
+            "notes_list": lambda: notes.get_note_list(request, user=seeded_user),
+        }
+
+        for name, call in endpoints.items():
+            with count_queries(engine) as statements:
+                result = asyncio.run(call())
+            assert len(result) >= LIST_ITEMS // 5
+            benchmark_recorder.record(
+                f"list.{name}.queries", len(statements), "queries", "exact"
+            )
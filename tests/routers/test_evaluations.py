@@ -71,7 +71,7 @@ class TestFeedbacksAdmin:
         """Test GET /feedbacks/all endpoint"""
         with patch("open_webui.routers.evaluations.get_admin_user", return_value=mock_admin_user):
             with patch("open_webui.routers.evaluations.Feedbacks.get_all_feedbacks", return_value=[]):
-                with patch("open_webui.routers.evaluations.Users.get_user_by_id"):
+                with patch("open_webui.routers.evaluations.Users.get_users_by_user_ids", return_value=[]):
                     response = await async_client.get("/api/v1/evaluations/feedbacks/all")
                     assert response.status_code in [200, 401]
     
@@ -85,7 +85,7 @@ class TestFeedbacksAdmin:
     async def test_export_all_feedbacks(self, async_client: AsyncClient, mock_admin_user):
         """Test GET /feedbacks/all/export endpoint"""
         with patch("open_webui.routers.evaluations.get_admin_user", return_value=mock_admin_user):
-            with patch("open_webui.routers.evaluations.Feedbacks.get_all_feedbacks", return_value=[]):
+            with patch("open_webui.routers.evaluations.Feedbacks.get_feedbacks_page", return_value=([], None)):
                 response = await async_client.get("/api/v1/evaluations/feedbacks/all/export")
                 assert response.status_code in [200, 401]
 
@@ -103,9 +103,10 @@ class TestFeedbacksUser:
     async def test_delete_user_feedbacks(self, async_client: AsyncClient, mock_verified_user):
         """Test DELETE /feedbacks endpoint"""
         with patch("open_webui.routers.evaluations.get_verified_user", return_value=mock_verified_user):
-            with patch("open_webui.routers.evaluations.Feedbacks.delete_feedbacks_by_user_id", return_value=True):
-                response = await async_client.delete("/api/v1/evaluations/feedbacks")
-                assert response.status_code in [200, 401]
+            with patch("open_webui.routers.evaluations.Feedbacks.get_feedbacks_page", return_value=([], None)):
+                with patch("open_webui.routers.evaluations.Feedbacks.delete_feedbacks_by_user_id", return_value=True):
+                    response = await async_client.delete("/api/v1/evaluations/feedbacks")
+                    assert response.status_code in [200, 401]
     
     async def test_create_feedback(self, async_client: AsyncClient, mock_verified_user, mock_feedback):
         """Test POST /feedback endpoint"""
@@ -84,8 +84,8 @@ class TestSCIMUsers:
         """Test GET /Users endpoint"""
         with patch("open_webui.routers.scim.Users.get_users") as mock_get:
             mock_get.return_value = {"users": [mock_user], "total": 1}
-            with patch("open_webui.routers.scim.Groups.get_groups_by_member_id") as mock_groups:
-                mock_groups.return_value = []
+            with patch("open_webui.routers.scim.Groups.get_groups_by_member_ids") as mock_groups:
+                mock_groups.return_value = {mock_user.id: []}
                 response = await async_client.get(
                     "/api/v1/scim/v2/Users",
                     headers={"Authorization": "Bearer test-token"}
@@ -100,8 +100,8 @@ class TestSCIMUsers:
         """Test GET /Users with filter"""
         with patch("open_webui.routers.scim.Users.get_user_by_email") as mock_get:
             mock_get.return_value = mock_user
-            with patch("open_webui.routers.scim.Groups.get_groups_by_member_id") as mock_groups:
-                mock_groups.return_value = []
+            with patch("open_webui.routers.scim.Groups.get_groups_by_member_ids") as mock_groups:
+                mock_groups.return_value = {mock_user.id: []}
                 response = await async_client.get(
                     '/api/v1/scim/v2/Users?filter=userName eq "test@example.com"',
                     headers={"Authorization": "Bearer test-token"}
@@ -260,10 +260,10 @@ class TestSCIMGroups:
     @pytest.mark.asyncio
     async def test_list_groups(self, async_client: AsyncClient, mock_scim_auth, mock_group):
         """Test GET /Groups endpoint"""
-        with patch("open_webui.routers.scim.Groups.get_groups") as mock_get:
-            mock_get.return_value = [mock_group]
-            with patch("open_webui.routers.scim.Users.get_user_by_id") as mock_user:
-                mock_user.return_value = MagicMock(id="user123", name="Test User")
+        with patch("open_webui.routers.scim.Groups.get_groups_page") as mock_get:
+            mock_get.return_value = ([mock_group], 1)
+            with patch("open_webui.routers.scim.Users.get_users_by_user_ids") as mock_user:
+                mock_user.return_value = [MagicMock(id="user123", name="Test User")]
                 
                 response = await async_client.get(
                     "/api/v1/scim/v2/Groups",
@@ -279,8 +279,8 @@ class TestSCIMGroups:
         """Test GET /Groups/{group_id} endpoint"""
         with patch("open_webui.routers.scim.Groups.get_group_by_id") as mock_get:
             mock_get.return_value = mock_group
-            with patch("open_webui.routers.scim.Users.get_user_by_id") as mock_user:
-                mock_user.return_value = MagicMock(id="user123", name="Test User")
+            with patch("open_webui.routers.scim.Users.get_users_by_user_ids") as mock_user:
+                mock_user.return_value = [MagicMock(id="user123", name="Test User")]
                 
                 response = await async_client.get(
                     "/api/v1/scim/v2/Groups/group123",
@@ -300,8 +300,8 @@ class TestSCIMGroups:
                 mock_insert.return_value = mock_group
                 with patch("open_webui.routers.scim.Groups.get_group_by_id") as mock_get:
                     mock_get.return_value = mock_group
-                    with patch("open_webui.routers.scim.Users.get_user_by_id") as mock_user:
-                        mock_user.return_value = MagicMock(id="user123", name="Test User")
+                    with patch("open_webui.routers.scim.Users.get_users_by_user_ids") as mock_user:
+                        mock_user.return_value = [MagicMock(id="user123", name="Test User")]
                         
                         group_data = {
                             "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"],
@@ -325,8 +325,8 @@ class TestSCIMGroups:
             mock_get.return_value = mock_group
             with patch("open_webui.routers.scim.Groups.update_group_by_id") as mock_update:
                 mock_update.return_value = mock_group
-                with patch("open_webui.routers.scim.Users.get_user_by_id") as mock_user:
-                    mock_user.return_value = MagicMock(id="user123", name="Test User")
+                with patch("open_webui.routers.scim.Users.get_users_by_user_ids") as mock_user:
+                    mock_user.return_value = [MagicMock(id="user123", name="Test User")]
                     
                     group_data = {
                         "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"],
@@ -349,8 +349,8 @@ class TestSCIMGroups:
             mock_get.return_value = mock_group
             with patch("open_webui.routers.scim.Groups.update_group_by_id") as mock_update:
                 mock_update.return_value = mock_group
-                with patch("open_webui.routers.scim.Users.get_user_by_id") as mock_user:
-                    mock_user.return_value = MagicMock(id="user123", name="Test User")
+                with patch("open_webui.routers.scim.Users.get_users_by_user_ids") as mock_user:
+                    mock_user.return_value = [MagicMock(id="user123", name="Test User")]
                     
                     patch_data = {
                         "schemas": ["urn:ietf:params:scim:api:messages:2.0:PatchOp"],
@@ -0,0 +1,86 @@
+"""
+音频分段转写测试
+"""
+
+import numpy as np
+
+from open_webui.services.audio_transcription import (
+    SAMPLE_RATE,
+    Segment,
+    SilenceSegmenter,
+    TranscriptCache,
+    stitch_transcripts,
+)
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16).tobytes()
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16).tobytes()
+
+
+def feed_all(segmenter, pcm, chunk_seconds=1):
+    step = SAMPLE_RATE * 2 * chunk_seconds
+    out = []
+    for i in range(0, len(pcm), step):
+        out.extend(segmenter.feed(pcm[i : i + step]))
+    if tail := segmenter.flush():
+        out.append(tail)
+    return out
+
+
+class TestSilenceSegmenter:
+    def test_cuts_at_silence_near_target(self):
+        pcm = tone(8.5) + silence(0.5) + tone(9) + silence(0.3) + tone(6)
+        segments = feed_all(SilenceSegmenter(target_seconds=10, search_seconds=2), pcm)
+
+        starts = [start for start, _ in segments]
+        assert len(segments) == 3
+        assert 8.5 <= starts[1] <= 9.0
+        assert 18.0 <= starts[2] <= 18.3
+        assert sum(len(p) for _, p in segments) == len(pcm)
+
+    def test_short_audio_is_single_segment(self):
+        pcm = tone(3)
+        segments = feed_all(SilenceSegmenter(target_seconds=10, search_seconds=2), pcm)
+        assert segments == [(0.0, pcm)]
+
+
+def test_stitch_offsets_timestamps():
+    results = [
+        (
+            Segment(1, "b.mp3", 600.0, 900.0),
+            {
+                "text": "second",
+                "segments": [{"start": 1.0, "end": 2.5, "text": " second"}],
+            },
+        ),
+        (Segment(0, "a.mp3", 0.0, 600.0), {"text": "first "}),
+    ]
+    assert stitch_transcripts(results) == {
+        "text": "first second",
+        "segments": [
+            {"start": 0.0, "end": 600.0, "text": "first"},
+            {"start": 601.0, "end": 602.5, "text": "second"},
+        ],
+    }
+
+
+def test_transcript_cache_keyed_by_content_and_config(tmp_path):
+    cache = TranscriptCache(tmp_path / "cache")
+    first = tmp_path / "a.wav"
+    copy = tmp_path / "b.wav"
+    first.write_bytes(b"audio")
+    copy.write_bytes(b"audio")
+
+    key = cache.key(str(first), "openai", "whisper-1", None)
+    assert cache.get(key) is None
+    cache.put(key, {"text": "hello"})
+
+    assert cache.get(cache.key(str(copy), "openai", "whisper-1", None)) == {
+        "text": "hello"
+    }
+    assert cache.key(str(copy), "openai", "whisper-1", "de") != key
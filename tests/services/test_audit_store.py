@@ -0,0 +1,169 @@
+"""
+审计日志存储测试
+
+验证后台批量写入、按时间分段的压缩存储、索引查询与分页、队列满时丢弃，
+多个进程各自写自己的段文件、损坏的 member 在查询时被跳过，
+以及审计中间件复用认证依赖已解析的用户
+"""
+
+import gzip
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from open_webui.models.users import UserModel
+from open_webui.services.audit_store import AuditStore
+from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
+
+HOUR = 3600
+BASE = 1_700_000_000 - 1_700_000_000 % HOUR
+
+
+def entry(i, user_id, path, timestamp, verb="POST"):
+    return {
+        "id": f"e{i}",
+        "timestamp": timestamp,
+        "user": {"id": user_id},
+        "verb": verb,
+        "request_uri": f"http://localhost{path}?n={i}",
+        "response_status_code": 200,
+        "request_object": f"body {i}",
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AuditStore(
+        directory=str(tmp_path), segment_seconds=HOUR, batch_size=4, flush_interval=0
+    )
+    yield store
+    store.close()
+
+
+class TestAuditStore:
+    def test_segments_are_compressed_and_partitioned_by_time(self, store, tmp_path):
+        for i in range(10):
+            store.submit(entry(i, "alice", "/api/v1/chats/new", BASE + i * 1000))
+        store.flush()
+
+        segments = sorted(path.name for path in tmp_path.glob("*.jsonl.gz"))
+        assert len(segments) == 3
+        assert segments[0] == store.segment_name(BASE)
+        with gzip.open(tmp_path / segments[0], "rt") as f:
+            assert len(f.readlines()) == 4
+        assert store.get_stats() == {"queued": 0, "written": 10, "dropped": 0}
+
+    def test_search_filters_and_pagination(self, store):
+        for i in range(12):
+            user_id = "alice" if i % 2 else "bob"
+            path = "/api/v1/files/" if i % 3 else "/api/v1/users/update"
+            store.submit(entry(i, user_id, path, BASE + i * 600))
+        store.flush()
+
+        items, cursor = store.search(user_id="alice", path="/api/v1/files")
+        assert [item["id"] for item in items] == ["e11", "e7", "e5", "e1"]
+        assert cursor is None
+        assert items[0]["request_object"] == "body 11"
+
+        items, _ = store.search(start=BASE + 3000, end=BASE + 4800)
+        assert [item["id"] for item in items] == ["e8", "e7", "e6", "e5"]
+
+        pages, cursor = [], None
+        while True:
+            items, cursor = store.search(cursor=cursor, limit=5)
+            pages.extend(item["id"] for item in items)
+            if cursor is None:
+                break
+        assert pages == [f"e{i}" for i in reversed(range(12))]
+
+        with pytest.raises(ValueError):
+            store.search(cursor="not-a-cursor")
+
+    def test_workers_append_to_their_own_segments(self, store, tmp_path):
+        store.submit(entry(0, "alice", "/a", BASE))
+        store.flush()
+        # 另一个 worker 进程在同一时段写入，段文件按进程号区分
+        with patch("open_webui.services.audit_store.os.getpid", return_value=1):
+            store.submit(entry(1, "bob", "/a", BASE + 1))
+            store.flush()
+        store.submit(entry(2, "alice", "/a", BASE + 2))
+        store.flush()
+
+        assert len(list(tmp_path.glob("*.jsonl.gz"))) == 2
+        items, _ = store.search()
+        assert [item["id"] for item in items] == ["e2", "e1", "e0"]
+
+    def test_search_skips_unreadable_members(self, store, tmp_path):
+        store.submit(entry(0, "alice", "/a", BASE))
+        store.flush()
+        segment = tmp_path / store.segment_name(BASE)
+        size = segment.stat().st_size
+        for i in (1, 2, 3):
+            store.submit(entry(i, "alice", "/a", BASE + i))
+            store.flush()
+
+        # 破坏第一个 member，后面的 member 不受影响
+        with open(segment, "r+b") as f:
+            f.seek(size // 2)
+            f.write(b"\x00" * 8)
+
+        items, cursor = store.search(limit=2)
+        assert [item["id"] for item in items] == ["e3", "e2"]
+        items, cursor = store.search(cursor=cursor, limit=2)
+        assert [item["id"] for item in items] == ["e1"]
+        assert cursor is None
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        store = AuditStore(directory=str(tmp_path), queue_size=2)
+        # 写线程不消费，队列很快被占满
+        with patch.object(store, "_run"):
+            assert store.submit(entry(0, "alice", "/a", BASE))
+            assert store.submit(entry(1, "alice", "/a", BASE))
+            assert not store.submit(entry(2, "alice", "/a", BASE))
+        assert store.dropped == 1
+        assert store.search() == ([], None)
+
+
+class TestAuditMiddleware:
+    def test_reuses_user_resolved_by_auth(self, store):
+        user = UserModel(
+            id="u1",
+            name="Alice",
+            email="alice@example.com",
+            role="admin",
+            profile_image_url="",
+            last_active_at=0,
+            updated_at=0,
+            created_at=0,
+        )
+
+        app = FastAPI()
+
+        @app.post("/api/v1/files/upload")
+        async def upload(request: Request):
+            request.state.user = user
+            return {"ok": True}
+
+        app.add_middleware(
+            AuditLoggingMiddleware,
+            audit_level=AuditLevel.METADATA,
+            excluded_paths=["chats"],
+            store=store,
+        )
+        with (
+            patch("open_webui.utils.audit.AUDIT_LOG_LEVEL", "METADATA"),
+            patch("open_webui.utils.audit.get_current_user") as get_current_user,
+        ):
+            client = TestClient(app)
+            response = client.post(
+                "/api/v1/files/upload", headers={"Authorization": "Bearer t"}
+            )
+        assert response.status_code == 200
+        get_current_user.assert_not_called()
+
+        store.flush()
+        items, _ = store.search(user_id="u1")
+        assert [item["verb"] for item in items] == ["POST"]
+        assert items[0]["user"]["email"] == "alice@example.com"
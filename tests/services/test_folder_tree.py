@@ -0,0 +1,99 @@
+"""
+文件夹树查询测试
+
+使用配置的 SQLite 数据库，验证子树读取、删除和按名称搜索的结果，
+以及语句数不随树的深度增加
+"""
+
+import uuid
+
+import pytest
+
+from open_webui.internal.db import engine
+from open_webui.models.folders import FolderForm, Folders
+from tests.performance.harness import count_queries
+
+
+def build_chain(user_id, depth, name="level"):
+    """返回一条深度为 depth 的文件夹链，每层另带一个叶子文件夹"""
+    chain, leaves = [], []
+    parent_id = None
+    for i in range(depth):
+        folder = Folders.insert_new_folder(
+            user_id, FolderForm(name=f"{name}_{i}"), parent_id
+        )
+        leaf = Folders.insert_new_folder(
+            user_id, FolderForm(name=f"leaf {i}"), folder.id
+        )
+        chain.append(folder)
+        leaves.append(leaf)
+        parent_id = folder.id
+    return chain, leaves
+
+
+@pytest.fixture
+def user_id():
+    user_id = f"folder-tree-{uuid.uuid4()}"
+    yield user_id
+    for folder in Folders.get_folders_by_user_id(user_id):
+        Folders.delete_folder_by_id_and_user_id(folder.id, user_id)
+
+
+class TestFolderTree:
+    def test_children_loaded_in_one_query(self, user_id):
+        chain, leaves = build_chain(user_id, 6)
+        other, _ = build_chain(user_id, 2, name="other")
+
+        with count_queries(engine) as statements:
+            children = Folders.get_children_folders_by_id_and_user_id(
+                chain[2].id, user_id
+            )
+        assert len(statements) == 1
+        assert {folder.id for folder in children} == {
+            folder.id for folder in chain[3:] + leaves[2:]
+        }
+
+        # 其他用户看不到该文件夹
+        assert Folders.get_children_folders_by_id_and_user_id(chain[0].id, "x") is None
+        assert Folders.get_children_folders_by_id_and_user_id(other[1].id, user_id)
+
+    def test_search_by_names_includes_subtree(self, user_id):
+        chain, leaves = build_chain(user_id, 8)
+
+        with count_queries(engine) as statements:
+            folders = Folders.search_folders_by_names(user_id, ["LEVEL 5", "leaf_1"])
+        assert len(statements) == 2
+        assert {folder.id for folder in folders} == {
+            folder.id for folder in chain[5:] + leaves[5:] + [leaves[1]]
+        }
+        assert Folders.search_folders_by_names(user_id, ["missing"]) == []
+
+    def test_delete_subtree_in_constant_statements(self, user_id):
+        shallow, _ = build_chain(user_id, 2, name="shallow")
+        deep, leaves = build_chain(user_id, 10, name="deep")
+
+        with count_queries(engine) as shallow_statements:
+            shallow_ids = Folders.delete_folder_by_id_and_user_id(
+                shallow[0].id, user_id
+            )
+        with count_queries(engine) as deep_statements:
+            deep_ids = Folders.delete_folder_by_id_and_user_id(deep[3].id, user_id)
+
+        assert len(shallow_ids) == 4
+        assert deep_ids[0] == deep[3].id
+        assert set(deep_ids) == {folder.id for folder in deep[3:] + leaves[3:]}
+        assert len(deep_statements) == len(shallow_statements)
+
+        remaining = {folder.id for folder in Folders.get_folders_by_user_id(user_id)}
+        assert remaining == {folder.id for folder in deep[:3] + leaves[:3]}
+        assert Folders.delete_folder_by_id_and_user_id(deep[3].id, user_id) == []
+
+    def test_subtree_ids_guard_moves_into_itself(self, user_id):
+        chain, leaves = build_chain(user_id, 4)
+
+        subtree = Folders.get_subtree_folder_ids_by_id_and_user_id(
+            chain[1].id, user_id
+        )
+        assert chain[1].id in subtree
+        assert leaves[3].id in subtree
+        assert chain[0].id not in subtree
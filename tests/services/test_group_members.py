@@ -0,0 +1,116 @@
+"""
+用户组成员表测试
+
+使用配置的 SQLite 数据库，验证成员的批量增删、按名称同步的差异更新，
+以及分页和批量加载的语句数
+"""
+
+import uuid
+
+import pytest
+
+from open_webui.internal.db import engine
+from open_webui.models.groups import GroupForm, Groups, GroupUpdateForm
+from tests.performance.harness import count_queries
+
+
+@pytest.fixture
+def groups():
+    suffix = uuid.uuid4().hex[:8]
+    created = {
+        name: Groups.insert_new_group(
+            "admin", GroupForm(name=f"{name}-{suffix}", description="")
+        )
+        for name in ["eng", "ops", "sales", "blocked"]
+    }
+    yield suffix, created
+    for group in created.values():
+        Groups.delete_group_by_id(group.id)
+
+
+class TestGroupMembers:
+    def test_add_remove_and_replace_members(self, groups):
+        _, created = groups
+        eng = created["eng"]
+
+        group = Groups.add_users_to_group(eng.id, ["u1", "u2", "u1"])
+        assert group.user_ids == ["u1", "u2"]
+        group = Groups.add_users_to_group(eng.id, ["u2", "u3"])
+        assert sorted(group.user_ids) == ["u1", "u2", "u3"]
+
+        group = Groups.remove_users_from_group(eng.id, ["u1", "missing"])
+        assert sorted(group.user_ids) == ["u2", "u3"]
+
+        group = Groups.update_group_by_id(
+            eng.id,
+            GroupUpdateForm(name=eng.name, description="", user_ids=["u3", "u4"]),
+        )
+        assert sorted(group.user_ids) == ["u3", "u4"]
+        assert Groups.get_group_user_ids_by_id(eng.id) == group.user_ids
+        assert Groups.get_group_user_ids_by_id("missing") is None
+        assert Groups.add_users_to_group("missing", ["u1"]) is None
+
+    def test_sync_by_names_is_one_diff(self, groups):
+        suffix, created = groups
+        user_id = f"user-{suffix}"
+        default_permissions = {"chat": {"delete": True}}
+        Groups.add_users_to_group(created["eng"].id, [user_id])
+        Groups.add_users_to_group(created["blocked"].id, [user_id])
+
+        with count_queries(engine) as statements:
+            assert Groups.sync_groups_by_group_names(
+                user_id,
+                [f"ops-{suffix}", f"sales-{suffix}", "no-such-group"],
+                excluded_group_names=[f"blocked-{suffix}"],
+                default_permissions=default_permissions,
+            )
+        # 两次查询 + 删除 + 插入 + 更新时间 + 默认权限
+        assert len(statements) == 6
+
+        member_of = {group.id for group in Groups.get_groups_by_member_id(user_id)}
+        assert member_of == {
+            created["ops"].id,
+            created["sales"].id,
+            created["blocked"].id,
+        }
+        assert Groups.get_group_by_id(created["ops"].id).permissions == (
+            default_permissions
+        )
+
+        # 没有变化时只有两次查询
+        with count_queries(engine) as statements:
+            Groups.sync_groups_by_group_names(
+                user_id,
+                [f"ops-{suffix}", f"sales-{suffix}"],
+                excluded_group_names=[f"blocked-{suffix}"],
+            )
+        assert len(statements) == 2
+
+        assert Groups.remove_user_from_all_groups(user_id)
+        assert Groups.get_group_ids_by_member_id(user_id) == []
+
+    def test_page_and_batched_lookups(self, groups):
+        suffix, created = groups
+        for i, group in enumerate(created.values()):
+            Groups.add_users_to_group(group.id, [f"a-{suffix}", f"b-{suffix}-{i}"])
+
+        page, total = Groups.get_groups_page(name=f"ops-{suffix}")
+        assert total == 1
+        assert page[0].id == created["ops"].id
+        assert len(page[0].user_ids) == 2
+
+        with count_queries(engine) as statements:
+            page, total = Groups.get_groups_page(skip=0, limit=3)
+        assert len(page) == 3 and total >= 4
+        assert len(statements) == 3
+
+        with count_queries(engine) as statements:
+            by_user = Groups.get_groups_by_member_ids(
+                [f"a-{suffix}", f"b-{suffix}-0", "nobody"]
+            )
+        assert len(statements) == 2
+        assert {group.id for group in by_user[f"a-{suffix}"]} == {
+            group.id for group in created.values()
+        }
+        assert [group.id for group in by_user[f"b-{suffix}-0"]] == [created["eng"].id]
+        assert by_user["nobody"] == []
@@ -0,0 +1,67 @@
+"""
+网页正文提取测试
+"""
+
+import pytest
+
+from open_webui.services.html_extractor import HTMLExtractor, extract_html
+
+PAGE = """
+<html lang="en">
+  <head><title>Example</title><style>body { color: red; }</style></head>
+  <body>
+    <nav><a href="/">Home</a></nav>
+    <article><h1>Heading</h1><p>First   paragraph.</p><p>Second</p></article>
+    <script>var tracking = 1;</script>
+    <footer>Copyright</footer>
+  </body>
+</html>
+"""
+
+
+class TestExtractHtml:
+    def test_removes_boilerplate_and_normalizes(self):
+        text, metadata = extract_html(PAGE, "https://example.com/")
+        assert text == "Example\nHeading\nFirst paragraph.\nSecond"
+        assert metadata == {
+            "source": "https://example.com/",
+            "title": "Example",
+            "language": "en",
+        }
+
+    def test_cpu_time_limit(self):
+        from open_webui.services.html_extractor import ExtractionLimitExceeded
+
+        html = "<div>" + "<p>text</p>" * 200000 + "</div>"
+        with pytest.raises(ExtractionLimitExceeded):
+            extract_html(html, "https://example.com/", cpu_time_limit=0.01)
+
+
+class TestHTMLExtractor:
+    @pytest.mark.asyncio
+    async def test_extracts_in_process_pool(self):
+        extractor = HTMLExtractor(max_workers=1, cpu_time_limit=10)
+        text, _ = await extractor.extract(PAGE, "https://example.com/")
+        assert "First paragraph." in text
+        assert extractor.get_stats()["inline"] == 0
+        assert extractor._pool._mp_context.get_start_method() != "fork"
+
+    @pytest.mark.asyncio
+    async def test_oversized_page_is_truncated(self):
+        extractor = HTMLExtractor(max_workers=0, max_page_bytes=20)
+        text, _ = await extractor.extract(
+            "<p>kept</p><p>dropped</p>", "https://example.com/"
+        )
+        assert text == "kept\ndroppe"
+        assert extractor.get_stats()["truncated"] == 1
+
+    def test_oversized_page_is_truncated_by_bytes_and_still_parsed(self):
+        extractor = HTMLExtractor(max_workers=0, max_page_bytes=15)
+        # "é" 占两个字节，截断点落在字符中间时丢弃该字符
+        text, _ = extractor.extract_sync("<p>ok</p><p>éééé</p>", "https://e.com/")
+        assert text == "ok\né"
+        assert extractor.get_stats()["truncated"] == 1
+
+        text, _ = extractor.extract_sync("<p>small</p>", "https://e.com/")
+        assert text == "small"
+        assert extractor.get_stats()["truncated"] == 1
@@ -0,0 +1,256 @@
+"""
+Jupyter kernel 池测试
+
+使用进程内的 Jupyter 替身服务：每个 kernel 记录执行次数并以 "<kernel_id>:<次数>"
+作为输出，restart 后次数清零，用来判断 kernel 是否复用、状态是否被重置
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+import websockets
+
+from open_webui.utils.code_interpreter import JupyterKernelPool
+
+
+class FakeJupyter:
+    def __init__(self):
+        self.executions = {}
+        self.started = 0
+        self.deleted = []
+        self.restarted = []
+        self.interrupted = []
+        self.websockets = 0
+        # 收到执行请求后断开连接，模拟执行期间连接中断
+        self.drop_after_request = False
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/kernels", self.start)
+        app.router.add_delete("/api/kernels/{id}", self.delete)
+        app.router.add_post("/api/kernels/{id}/restart", self.restart)
+        app.router.add_post("/api/kernels/{id}/interrupt", self.interrupt)
+        app.router.add_get("/api/kernels/{id}/channels", self.channels)
+        return app
+
+    async def start(self, request):
+        self.started += 1
+        kernel_id = f"k{self.started}"
+        self.executions[kernel_id] = 0
+        return web.json_response({"id": kernel_id})
+
+    async def delete(self, request):
+        self.deleted.append(request.match_info["id"])
+        return web.Response(status=204)
+
+    async def restart(self, request):
+        kernel_id = request.match_info["id"]
+        self.restarted.append(kernel_id)
+        self.executions[kernel_id] = 0
+        return web.json_response({"id": kernel_id})
+
+    async def interrupt(self, request):
+        self.interrupted.append(request.match_info["id"])
+        return web.Response(status=204)
+
+    async def channels(self, request):
+        kernel_id = request.match_info["id"]
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.websockets += 1
+        async for message in ws:
+            request_data = json.loads(message.data)
+            if request_data["content"]["code"] == "sleep":
+                continue
+            self.executions[kernel_id] += 1
+            if self.drop_after_request:
+                await ws.close()
+                break
+            parent = {"msg_id": request_data["header"]["msg_id"]}
+            await ws.send_str(
+                json.dumps(
+                    {
+                        "parent_header": parent,
+                        "msg_type": "stream",
+                        "content": {
+                            "name": "stdout",
+                            "text": f"{kernel_id}:{self.executions[kernel_id]}",
+                        },
+                    }
+                )
+            )
+            await ws.send_str(
+                json.dumps(
+                    {
+                        "parent_header": parent,
+                        "msg_type": "status",
+                        "content": {"execution_state": "idle"},
+                    }
+                )
+            )
+        return ws
+
+
+@pytest_asyncio.fixture
+async def jupyter():
+    fake = FakeJupyter()
+    runner = web.AppRunner(fake.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    yield fake, f"http://127.0.0.1:{port}"
+    await runner.cleanup()
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+async def run(pool, code="print()", chat_id=None, timeout=2):
+    async with pool.lease(chat_id) as kernel:
+        return (await kernel.execute(code, timeout)).stdout
+
+
+class TestJupyterKernelPool:
+    @pytest.mark.asyncio
+    async def test_chat_keeps_kernel_and_warm_pool_is_used(self, jupyter):
+        fake, base_url = jupyter
+        pool = JupyterKernelPool(base_url, size=2, max_kernels=4)
+        try:
+            first = await run(pool, chat_id="chat-a")
+            assert first.endswith(":1")
+            await wait_for(lambda: len(pool.idle) == 2)
+
+            # 同一对话复用 kernel 及其状态和 websocket
+            assert await run(pool, chat_id="chat-a") == first.replace(":1", ":2")
+            # 其他对话直接拿到预热好的 kernel，websocket 已在预热时建立
+            warm = {kernel.kernel_id for kernel in pool.idle}
+            websockets = fake.websockets
+            output = await run(pool, chat_id="chat-b")
+            assert output.split(":")[0] in warm
+            assert fake.websockets == websockets
+
+            # 不属于对话的租用结束后重置并放回池中
+            output = await run(pool)
+            kernel_id = output.split(":")[0]
+            await wait_for(lambda: kernel_id in fake.restarted)
+            await wait_for(lambda: len(pool.idle) == 2)
+            assert pool.counts()["bound"] == 2
+        finally:
+            await pool.close()
+        assert sorted(fake.deleted) == sorted(fake.executions)
+
+    @pytest.mark.asyncio
+    async def test_lease_waits_when_pool_is_exhausted(self, jupyter):
+        fake, base_url = jupyter
+        pool = JupyterKernelPool(base_url, size=0, max_kernels=1, lease_timeout=0.2)
+        try:
+            async with pool.lease("chat-a"):
+                with pytest.raises(TimeoutError):
+                    await run(pool, chat_id="chat-b")
+
+            async with pool.lease("chat-a") as kernel:
+                waiting = asyncio.create_task(run(pool, chat_id="chat-a"))
+                await asyncio.sleep(0.05)
+                assert not waiting.done()
+                await kernel.execute("print()", 2)
+            assert await waiting == "k1:2"
+            assert fake.started == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_timeout_and_lifetime(self, jupyter):
+        fake, base_url = jupyter
+        pool = JupyterKernelPool(
+            base_url, size=1, max_kernels=2, idle_timeout=60, max_lifetime=3600
+        )
+        try:
+            kernel_id = (await run(pool, chat_id="chat-a")).split(":")[0]
+            await wait_for(lambda: len(pool.idle) == 1)
+
+            # 对话空闲超时：kernel 重置后回到空闲队列
+            pool.by_chat["chat-a"].last_used -= 120
+            async with pool.condition:
+                pool._expire(time.monotonic())
+            await wait_for(lambda: kernel_id in fake.restarted)
+            await wait_for(lambda: len(pool.idle) == 2)
+            assert "chat-a" not in pool.by_chat
+
+            # 超过最长存活时间的空闲 kernel 被关闭并补充新的
+            for kernel in pool.idle:
+                kernel.created_at -= 7200
+            async with pool.condition:
+                pool._expire(time.monotonic())
+                pool._fill()
+            await wait_for(lambda: len(fake.deleted) == 2)
+            await wait_for(lambda: len(pool.idle) == 1)
+            assert fake.started == 3
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout_interrupts_kernel(self, jupyter):
+        fake, base_url = jupyter
+        pool = JupyterKernelPool(base_url, size=0, max_kernels=1)
+        try:
+            async with pool.lease("chat-a") as kernel:
+                result = await kernel.execute("sleep", 0.1)
+            assert "Execution timed out." in result.stderr
+            assert fake.interrupted == ["k1"]
+            assert await run(pool, chat_id="chat-a") == "k1:1"
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_full_pool_reclaims_least_recently_used_chat(self, jupyter):
+        fake, base_url = jupyter
+        pool = JupyterKernelPool(base_url, size=0, max_kernels=2, lease_timeout=5)
+        try:
+            assert await run(pool, chat_id="chat-a") == "k1:1"
+            assert await run(pool, chat_id="chat-b") == "k2:1"
+            assert await run(pool, chat_id="chat-b") == "k2:2"
+
+            # 池已满：chat-a 最久未用，它的 kernel 重置后交给 chat-c，无需等待
+            start = time.monotonic()
+            assert await run(pool, chat_id="chat-c") == "k1:1"
+            assert time.monotonic() - start < 1
+            assert fake.restarted == ["k1"]
+            assert set(pool.by_chat) == {"chat-b", "chat-c"}
+
+            # 正在执行的对话的 kernel 不会被回收
+            async with pool.lease("chat-b"), pool.lease("chat-c"):
+                pool.lease_timeout = 0.2
+                with pytest.raises(TimeoutError):
+                    await run(pool, chat_id="chat-d")
+            assert fake.started == 2
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_only_before_request_is_sent(self, jupyter):
+        fake, base_url = jupyter
+        pool = JupyterKernelPool(base_url, size=0, max_kernels=1)
+        try:
+            async with pool.lease("chat-a") as kernel:
+                await kernel.execute("print()", 2)
+                # 复用前连接已断开：重新连接后发送，代码只执行一次
+                await kernel.ws.close()
+                assert (await kernel.execute("print()", 2)).stdout == "k1:2"
+
+                # 请求发出后连接断开：不重试，避免代码执行两次
+                fake.drop_after_request = True
+                with pytest.raises(websockets.ConnectionClosed):
+                    await kernel.execute("print()", 2)
+            assert fake.executions["k1"] == 3
+        finally:
+            await pool.close()
@@ -0,0 +1,70 @@
+"""
+嵌入式向量库测试
+"""
+
+import numpy as np
+
+from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+
+
+def make_items(vectors, prefix="id", file_id="f1"):
+    return [
+        {
+            "id": f"{prefix}-{i}",
+            "text": f"text {i}",
+            "vector": vector,
+            "metadata": {"file_id": file_id, "n": i},
+        }
+        for i, vector in enumerate(vectors)
+    ]
+
+
+class TestLocalVectorClient:
+    def test_search_filter_and_delete(self, tmp_path):
+        client = LocalVectorClient(str(tmp_path), ivf_min_rows=1000)
+        client.insert("docs", make_items([[1, 0], [0, 1], [1, 1]]))
+        client.upsert("docs", make_items([[0, 1]], prefix="other", file_id="f2"))
+
+        result = client.search("docs", [[1, 0.1]], 2)
+        assert result.ids == [["id-0", "id-2"]]
+        assert result.distances[0][0] > result.distances[0][1]
+
+        assert client.query("docs", {"file_id": "f2"}).ids == [["other-0"]]
+        client.delete("docs", filter={"file_id": "f1"})
+        assert client.get("docs").ids == [["other-0"]]
+        assert client.search("docs", [[1, 0]], 5).ids == [["other-0"]]
+
+    def test_upsert_replaces_and_survives_reopen(self, tmp_path):
+        client = LocalVectorClient(str(tmp_path))
+        client.upsert("docs", make_items([[1, 0], [0, 1]]))
+        client.upsert(
+            "docs", [{"id": "id-0", "text": "new", "vector": [0, 1], "metadata": {}}]
+        )
+
+        reopened = LocalVectorClient(str(tmp_path))
+        assert reopened.has_collection("docs")
+        assert not reopened.has_collection("missing")
+        result = reopened.search("docs", [[0, 1]], 5)
+        assert sorted(result.ids[0]) == ["id-0", "id-1"]
+        assert "new" in result.documents[0]
+
+    def test_compaction_builds_ivf(self, tmp_path):
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(600, 8)).astype(np.float32)
+        client = LocalVectorClient(str(tmp_path), ivf_min_rows=300, nprobe=4)
+        client.insert("docs", make_items(vectors.tolist()))
+        client.delete("docs", ids=[f"id-{i}" for i in range(0, 600, 3)])
+        # 等待后台压缩结束
+        client._compactor.submit(lambda: None).result()
+
+        with client._open("docs") as collection:
+            collection.compact()
+            assert collection.centroids is not None
+            assert collection.rows == 400
+
+        # 每个向量都能找回自己
+        for i in (1, 2, 599):
+            result = client.search("docs", [vectors[i].tolist()], 1)
+            assert result.ids == [[f"id-{i}"]]
+        assert client.search("docs", [vectors[0].tolist()], 1).ids[0] != ["id-0"]
+        assert sum(len(p.ids[0]) for p in client.iter_get("docs", 150)) == 400
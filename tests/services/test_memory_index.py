@@ -0,0 +1,96 @@
+"""
+用户记忆向量索引测试
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from open_webui.models.memories import MemoryModel
+from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+from open_webui.services.memory_index import MemoryIndex
+
+TOPICS = ["coffee", "tea", "cats", "dogs", "rust", "python"]
+
+
+class TopicEmbedding:
+    """按主题词生成 one-hot 向量，记录每次调用的条数"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _embed(self, text):
+        return [1.0 if topic in text else 0.01 for topic in TOPICS]
+
+    def __call__(self, query, user=None):
+        if isinstance(query, list):
+            self.calls.append(len(query))
+            return [self._embed(text) for text in query]
+        self.calls.append(1)
+        return self._embed(query)
+
+
+def memory(id, user_id, content):
+    return MemoryModel(
+        id=id, user_id=user_id, content=content, created_at=1, updated_at=1
+    )
+
+
+ALICE = [memory(f"a{i}", "alice", f"likes {t}") for i, t in enumerate(TOPICS[:5])]
+BOB = [memory("b0", "bob", "likes coffee"), memory("b1", "bob", "likes python")]
+
+
+@pytest.fixture
+def index(tmp_path):
+    return MemoryIndex(
+        collection_name="memories",
+        batch_size=2,
+        client=LocalVectorClient(str(tmp_path)),
+    )
+
+
+class TestMemoryIndex:
+    @pytest.mark.asyncio
+    async def test_batched_upsert_and_user_partition(self, index):
+        embedding = TopicEmbedding()
+        await index.upsert(ALICE + BOB, embedding)
+        assert embedding.calls == [2, 2, 2, 1]
+
+        result = await index.search("bob", "coffee", embedding, k=5)
+        assert result.ids[0][0] == "b0"
+        assert set(result.ids[0]) == {"b0", "b1"}
+
+        result = await index.search("alice", "coffee", embedding, k=1)
+        assert result.ids == [["a0"]]
+
+    @pytest.mark.asyncio
+    async def test_delete_and_delete_user(self, index):
+        embedding = TopicEmbedding()
+        await index.upsert(ALICE + BOB, embedding)
+
+        await index.delete(["a0"])
+        result = await index.search("alice", "coffee", embedding, k=1)
+        assert result.ids[0] != ["a0"]
+
+        await index.delete_user("bob")
+        with patch(
+            "open_webui.services.memory_index.Memories.get_memories_by_user_id",
+            return_value=[],
+        ):
+            result = await index.search("bob", "coffee", embedding, k=5)
+        assert result.ids == [[]]
+        assert len(index.client.get("memories").ids[0]) == 4
+
+    @pytest.mark.asyncio
+    async def test_search_rebuilds_unindexed_user(self, index):
+        embedding = TopicEmbedding()
+        with patch(
+            "open_webui.services.memory_index.Memories.get_memories_by_user_id",
+            return_value=BOB,
+        ) as get_memories:
+            result = await index.search("bob", "python", embedding, k=1)
+            assert result.ids == [["b1"]]
+
+            # 已建立索引后不再读取数据库
+            await index.search("bob", "coffee", embedding, k=1)
+            assert get_memories.call_count == 1
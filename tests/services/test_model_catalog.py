@@ -0,0 +1,114 @@
+"""
+模型目录物化与版本失效测试
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from open_webui.models.models import ModelModel
+from open_webui.services.model_catalog import ModelCatalog
+from open_webui.utils import models as models_utils
+
+
+def make_request(**config):
+    defaults = {
+        "ENABLE_BASE_MODELS_CACHE": True,
+        "ENABLE_EVALUATION_ARENA_MODELS": False,
+        "EVALUATION_ARENA_MODELS": [],
+        "MODEL_ORDER_LIST": [],
+    }
+    defaults.update(config)
+    state = SimpleNamespace(
+        config=SimpleNamespace(**defaults), MODELS={}, BASE_MODELS=[]
+    )
+    return SimpleNamespace(app=SimpleNamespace(state=state))
+
+
+def custom_model(id, base_model_id=None, is_active=True, **kwargs):
+    return ModelModel(
+        id=id,
+        user_id=kwargs.pop("user_id", "owner"),
+        base_model_id=base_model_id,
+        name=kwargs.pop("name", id),
+        params={},
+        meta={},
+        access_control=kwargs.pop("access_control", None),
+        is_active=is_active,
+        updated_at=0,
+        created_at=0,
+    )
+
+
+BASE_MODELS = [
+    {"id": "llama3:8b", "name": "llama3:8b", "owned_by": "ollama"},
+    {"id": "gpt-4o", "name": "gpt-4o", "owned_by": "openai"},
+    {"id": "gpt-3.5", "name": "gpt-3.5", "owned_by": "openai"},
+]
+
+
+@pytest.fixture
+def catalog():
+    catalog = ModelCatalog()
+    with patch.object(models_utils, "model_catalog", catalog), patch.object(
+        models_utils.Functions, "get_functions", return_value=[]
+    ), patch.object(
+        models_utils,
+        "get_all_base_models",
+        new=AsyncMock(side_effect=lambda *a, **k: [m.copy() for m in BASE_MODELS]),
+    ):
+        yield catalog
+
+
+class TestModelCatalog:
+    @pytest.mark.asyncio
+    async def test_rebuilds_only_after_version_bump(self, catalog):
+        request = make_request()
+        with patch.object(models_utils.Models, "get_all_models", return_value=[]):
+            await models_utils.get_all_models(request)
+            await models_utils.get_all_models(request)
+            assert catalog.get_stats()["builds"] == 1
+
+            catalog.bump("model")
+            await models_utils.get_all_models(request)
+            assert catalog.get_stats()["builds"] == 2
+            assert set(request.app.state.MODELS) == {m["id"] for m in BASE_MODELS}
+
+    @pytest.mark.asyncio
+    async def test_custom_models_are_merged(self, catalog):
+        request = make_request()
+        custom = [
+            custom_model("llama3", name="Llama"),
+            custom_model("gpt-3.5", is_active=False),
+            custom_model("writer", base_model_id="gpt-4o", name="Writer"),
+        ]
+        with patch.object(models_utils.Models, "get_all_models", return_value=custom):
+            models = await models_utils.get_all_models(request)
+
+        by_id = {model["id"]: model for model in models}
+        assert by_id["llama3:8b"]["name"] == "Llama"
+        assert "gpt-3.5" not in by_id
+        assert by_id["writer"]["preset"] and by_id["writer"]["owned_by"] == "openai"
+
+    @pytest.mark.asyncio
+    async def test_acl_view_filters_per_user(self, catalog):
+        request = make_request(MODEL_ORDER_LIST=["gpt-4o"])
+        custom = [
+            custom_model("gpt-4o", access_control=None),
+            custom_model(
+                "llama3:8b",
+                access_control={"read": {"group_ids": ["g1"], "user_ids": []}},
+            ),
+        ]
+        with patch.object(models_utils.Models, "get_all_models", return_value=custom):
+            snapshot = await models_utils.get_model_catalog(request)
+
+        assert snapshot.listing[0]["id"] == "gpt-4o"
+        visible = snapshot.filter_for_user(snapshot.listing, "u1", [])
+        assert [m["id"] for m in visible] == ["gpt-4o"]
+        visible = snapshot.filter_for_user(snapshot.listing, "u1", ["g1"])
+        assert {m["id"] for m in visible} == {"gpt-4o", "llama3:8b"}
+        # 模型所有者总能看到自己的模型
+        visible = snapshot.filter_for_user(snapshot.listing, "owner", [])
+        assert {m["id"] for m in visible} == {"gpt-4o", "llama3:8b"}
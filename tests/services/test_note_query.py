@@ -0,0 +1,159 @@
+"""
+笔记查询测试
+
+使用配置的 SQLite 数据库，验证 SQL 中的访问控制过滤与逐条 has_access 的结果一致，
+以及分页、全文搜索（FTS5 索引随笔记更新）、不支持 JSON 函数的数据库上的回退和首页查询数
+"""
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from open_webui.internal.db import engine
+from open_webui.models.groups import GroupForm, Groups, GroupUpdateForm
+from open_webui.models.notes import NoteForm, Notes, NoteTable, NoteUpdateForm
+from open_webui.utils.access_control import has_access
+from tests.performance.harness import count_queries
+
+
+@pytest.fixture
+def scenario():
+    suffix = uuid.uuid4().hex[:8]
+    alice, bob = f"alice-{suffix}", f"bob-{suffix}"
+
+    group = Groups.insert_new_group(
+        alice, GroupForm(name=f"team-{suffix}", description="")
+    )
+    Groups.update_group_by_id(
+        group.id,
+        GroupUpdateForm(name=group.name, description="", user_ids=[bob]),
+    )
+
+    def acl(read=None, write=None):
+        return {
+            "read": read or {"group_ids": [], "user_ids": []},
+            "write": write or {"group_ids": [], "user_ids": []},
+        }
+
+    specs = {
+        "own": (bob, None),
+        "public": (alice, None),
+        "private": (alice, acl()),
+        "read-user": (alice, acl(read={"user_ids": [bob]})),
+        "write-user": (alice, acl(write={"user_ids": [bob], "group_ids": []})),
+        "read-group": (alice, acl(read={"group_ids": [group.id]})),
+        "write-group": (alice, acl(write={"group_ids": [group.id]})),
+        "other-group": (alice, acl(write={"group_ids": ["no-such-group"]})),
+    }
+    notes = {
+        name: Notes.insert_new_note(
+            NoteForm(
+                title=f"{name} {suffix}",
+                data={"content": {"md": f"body of {name}"}},
+                access_control=access_control,
+            ),
+            owner,
+        )
+        for name, (owner, access_control) in specs.items()
+    }
+
+    yield bob, group, notes
+
+    for note in notes.values():
+        Notes.delete_note_by_id(note.id)
+    Groups.delete_group_by_id(group.id)
+
+
+def visible(notes, user_id, permission):
+    return {
+        name
+        for name, note in notes.items()
+        if note.user_id == user_id
+        or has_access(user_id, permission, note.access_control)
+    }
+
+
+class TestNoteQuery:
+    @pytest.mark.parametrize("permission", ["read", "write"])
+    def test_sql_filter_matches_has_access(self, scenario, permission):
+        bob, _, notes = scenario
+        ids = {note.id: name for name, note in notes.items()}
+
+        result, _ = Notes.search_notes_by_user_id(bob, permission)
+        found = {ids[note.id] for note in result if note.id in ids}
+
+        assert found == visible(notes, bob, permission)
+
+    def test_keyset_pagination(self, scenario):
+        bob, _, notes = scenario
+        expected = [note.id for note in Notes.get_notes_by_user_id(bob, "read")]
+
+        pages, cursor = [], None
+        while True:
+            page, cursor = Notes.search_notes_by_user_id(
+                bob, "read", cursor=cursor, limit=2
+            )
+            assert len(page) <= 2
+            pages.extend(note.id for note in page)
+            if cursor is None:
+                break
+
+        assert pages == expected
+        with pytest.raises(ValueError):
+            Notes.search_notes_by_user_id(bob, "read", cursor="not-a-cursor")
+
+    def test_search_titles_and_content(self, scenario):
+        bob, _, notes = scenario
+        suffix = notes["own"].title.split()[-1]
+
+        result, _ = Notes.search_notes_by_user_id(bob, "read", query=f"GROUP {suffix}")
+        assert [note.id for note in result] == [notes["read-group"].id]
+
+        result, _ = Notes.search_notes_by_user_id(bob, "read", query="body of public")
+        assert notes["public"].id in {note.id for note in result}
+
+        # LIKE 通配符按字面匹配
+        result, _ = Notes.search_notes_by_user_id(bob, "read", query=f"%{suffix}")
+        assert result == []
+
+    def test_first_page_is_one_query(self, scenario):
+        bob, _, _ = scenario
+
+        with count_queries(engine) as statements:
+            Notes.search_notes_by_user_id(bob, "write", query="body", limit=20)
+        assert len(statements) == 1
+
+    def test_full_text_index_follows_updates(self, scenario):
+        bob, _, notes = scenario
+        own = notes["own"]
+
+        with count_queries(engine) as statements:
+            result, _ = Notes.search_notes_by_user_id(bob, "read", query="防火墙策略")
+        assert "note_fts" in statements[0]
+        assert own.id not in {note.id for note in result}
+
+        Notes.update_note_by_id(
+            own.id, NoteUpdateForm(data={"content": {"md": "核心防火墙策略调整"}})
+        )
+        result, _ = Notes.search_notes_by_user_id(bob, "read", query="防火墙策略")
+        assert [note.id for note in result] == [own.id]
+
+        Notes.delete_note_by_id(own.id)
+        result, _ = Notes.search_notes_by_user_id(bob, "read", query="防火墙策略")
+        assert result == []
+
+    def test_fallback_filters_with_has_access(self, scenario):
+        bob, _, notes = scenario
+        ids = {note.id: name for name, note in notes.items()}
+        expected, _ = Notes.search_notes_by_user_id(bob, "read", limit=3)
+
+        # 其他数据库没有这里用到的 JSON 函数，改为逐条 has_access
+        with patch.object(NoteTable, "_access_filter", return_value=None):
+            result, cursor = Notes.search_notes_by_user_id(bob, "read", limit=3)
+            everything, _ = Notes.search_notes_by_user_id(bob, "read")
+
+        assert [note.id for note in result] == [note.id for note in expected]
+        assert cursor is not None
+        found = {ids[note.id] for note in everything if note.id in ids}
+        assert found == visible(notes, bob, "read")
@@ -0,0 +1,289 @@
+"""
+Webhook 通知投递测试
+
+使用配置的 SQLite 数据库作为投递队列，进程内的 aiohttp 服务作为 webhook 端点，
+验证去重、按主机限制并发、重试与失败（包括非网络异常计入尝试次数）、
+一次查询解析收件人，以及单个收件人的 payload 出错不影响其他收件人
+"""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from open_webui.internal.db import engine, get_db
+from open_webui.models.groups import GroupForm, Groups, GroupUpdateForm
+from open_webui.models.users import User, Users
+from open_webui.models.webhook_deliveries import (
+    SENDING,
+    WebhookDeliveries,
+    WebhookDelivery,
+)
+from open_webui.routers.channels import send_notification
+from open_webui.services.notification_dispatcher import NotificationDispatcher
+from open_webui.utils.webhook import build_webhook_payload
+from tests.performance.harness import count_queries
+
+
+class FakeWebhook:
+    def __init__(self):
+        self.received = []
+        self.responses = {}
+        self.active = 0
+        self.max_active = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/{name}", self.handle)
+        return app
+
+    async def handle(self, request):
+        name = request.match_info["name"]
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.05)
+            self.received.append((name, await request.json()))
+            statuses = self.responses.get(name, [])
+            return web.Response(status=statuses.pop(0) if statuses else 200)
+        finally:
+            self.active -= 1
+
+
+@pytest_asyncio.fixture
+async def webhook():
+    fake = FakeWebhook()
+    runner = web.AppRunner(fake.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    yield fake, f"http://127.0.0.1:{port}"
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def dispatcher():
+    event = f"test-{uuid.uuid4().hex[:8]}"
+    dispatcher = NotificationDispatcher(
+        concurrency_per_host=2,
+        max_attempts=3,
+        timeout=2,
+        poll_interval=0.05,
+        retry_base=0.05,
+    )
+    await dispatcher.start()
+    yield dispatcher, event
+    await dispatcher.close()
+    with get_db() as db:
+        db.query(WebhookDelivery).filter(
+            WebhookDelivery.dedupe_key.startswith(event)
+        ).delete(synchronize_session=False)
+        db.commit()
+
+
+async def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.02)
+
+
+def status_of(key):
+    return WebhookDeliveries.get_delivery_by_dedupe_key(key).status
+
+
+class TestNotificationDispatcher:
+    @pytest.mark.asyncio
+    async def test_dedupe_and_per_host_concurrency(self, webhook, dispatcher):
+        fake, base_url = webhook
+        dispatcher, event = dispatcher
+
+        urls = [f"{base_url}/hook{i}" for i in range(6)]
+        deliveries = [(url, {"n": i}) for i, url in enumerate(urls)]
+        assert await dispatcher.enqueue(event, deliveries + deliveries[:2]) == 6
+        # 同一事件重复提交不会再次投递
+        assert await dispatcher.enqueue(event, deliveries[:3]) == 0
+
+        await wait_for(lambda: len(fake.received) == 6)
+        await wait_for(
+            lambda: all(status_of(f"{event}:{url}") == "delivered" for url in urls)
+        )
+        assert sorted(payload["n"] for _, payload in fake.received) == list(range(6))
+        assert fake.max_active <= 2
+
+    @pytest.mark.asyncio
+    async def test_retries_then_gives_up(self, webhook, dispatcher):
+        fake, base_url = webhook
+        dispatcher, event = dispatcher
+        fake.responses = {"flaky": [500, 429], "broken": [503] * 5, "bad": [400]}
+
+        await dispatcher.enqueue(
+            event,
+            [(f"{base_url}/{name}", {"name": name}) for name in fake.responses],
+        )
+
+        keys = {name: f"{event}:{base_url}/{name}" for name in fake.responses}
+        await wait_for(lambda: status_of(keys["flaky"]) == "delivered")
+        await wait_for(lambda: status_of(keys["broken"]) == "failed")
+        await wait_for(lambda: status_of(keys["bad"]) == "failed")
+
+        attempts = {
+            name: WebhookDeliveries.get_delivery_by_dedupe_key(key).attempts
+            for name, key in keys.items()
+        }
+        assert attempts == {"flaky": 3, "broken": 3, "bad": 1}
+        assert (
+            WebhookDeliveries.get_delivery_by_dedupe_key(keys["broken"]).last_error
+            == "HTTP 503"
+        )
+
+    @pytest.mark.asyncio
+    async def test_unexpected_errors_count_as_attempts(self, webhook, dispatcher):
+        fake, base_url = webhook
+        dispatcher, event = dispatcher
+        key = f"{event}:{base_url}/dberror"
+
+        # 记录投递成功时数据库出错：不能停在 sending，按失败计入尝试次数
+        with patch.object(
+            WebhookDeliveries, "mark_delivered", side_effect=RuntimeError("db down")
+        ):
+            await dispatcher.enqueue(event, [(f"{base_url}/dberror", {})])
+            await wait_for(lambda: status_of(key) == "failed")
+
+        delivery = WebhookDeliveries.get_delivery_by_dedupe_key(key)
+        assert delivery.attempts == 3
+        assert delivery.last_error == "RuntimeError: db down"
+        assert len(fake.received) == 3
+
+    @pytest.mark.asyncio
+    async def test_stale_claim_is_delivered_again(self, webhook, dispatcher):
+        fake, base_url = webhook
+        dispatcher, event = dispatcher
+        await dispatcher.close()
+
+        key = f"{event}:{base_url}/crashed"
+        WebhookDeliveries.insert_new_deliveries([(key, f"{base_url}/crashed", {})])
+        # 模拟认领后进程退出：状态停在 sending，更新时间早于租约
+        with get_db() as db:
+            db.query(WebhookDelivery).filter_by(dedupe_key=key).update(
+                {"status": SENDING, "updated_at": time.time_ns() - 10**12}
+            )
+            db.commit()
+
+        await dispatcher.start()
+        await wait_for(lambda: status_of(key) == "delivered")
+        assert [name for name, _ in fake.received] == ["crashed"]
+
+
+class TestWebhookDeliveries:
+    def test_insert_without_upsert_support(self):
+        event = f"test-{uuid.uuid4().hex[:8]}"
+        rows = [(f"{event}:{i}", f"http://h/{i}", {"n": i}) for i in range(3)]
+        try:
+            # 其他数据库（例如 MySQL）没有 ON CONFLICT，逐条插入并跳过已有的键
+            with patch.object(engine.dialect, "name", "mysql"):
+                assert WebhookDeliveries.insert_new_deliveries(rows[:2]) == 2
+                assert WebhookDeliveries.insert_new_deliveries(rows) == 1
+            assert status_of(rows[2][0]) == "pending"
+        finally:
+            with get_db() as db:
+                db.query(WebhookDelivery).filter(
+                    WebhookDelivery.dedupe_key.startswith(event)
+                ).delete(synchronize_session=False)
+                db.commit()
+
+
+class TestWebhookRecipients:
+    def test_recipients_resolved_in_one_query(self):
+        suffix = uuid.uuid4().hex[:8]
+        ids = [f"notify-{suffix}-{i}" for i in range(4)]
+        with get_db() as db:
+            for i, id in enumerate(ids):
+                settings = (
+                    {"ui": {"notifications": {"webhook_url": f"http://h/{i}"}}}
+                    if i != 3
+                    else {"ui": {}}
+                )
+                db.add(
+                    User(
+                        id=id,
+                        name=id,
+                        email=f"{id}@example.com",
+                        role="user",
+                        profile_image_url="",
+                        settings=settings,
+                        last_active_at=0,
+                        updated_at=0,
+                        created_at=0,
+                    )
+                )
+            db.commit()
+
+        group = Groups.insert_new_group(
+            ids[0], GroupForm(name=f"notify-{suffix}", description="")
+        )
+        Groups.update_group_by_id(
+            group.id,
+            GroupUpdateForm(name=group.name, description="", user_ids=[ids[1]]),
+        )
+        try:
+            access_control = {
+                "read": {"group_ids": [group.id], "user_ids": [ids[2], ids[3]]}
+            }
+            with count_queries(engine) as statements:
+                recipients = Users.get_webhook_urls_by_access(
+                    access_control, "read", exclude_user_ids=[ids[2]]
+                )
+            assert len(statements) == 1
+            assert recipients == [(ids[1], "http://h/1")]
+
+            everyone = dict(Users.get_webhook_urls_by_access(None))
+            assert {id: everyone.get(id) for id in ids} == {
+                ids[0]: "http://h/0",
+                ids[1]: "http://h/1",
+                ids[2]: "http://h/2",
+                ids[3]: None,
+            }
+        finally:
+            Groups.delete_group_by_id(group.id)
+            for id in ids:
+                Users.delete_user_by_id(id)
+
+    @pytest.mark.asyncio
+    async def test_bad_payload_skips_only_that_recipient(self):
+        teams = "https://example.webhook.office.com/hook"
+        slack = "https://hooks.slack.com/services/x"
+        broken = "https://broken.example.com/hook"
+        channel = SimpleNamespace(id="c1", name="general", access_control=None)
+        message = SimpleNamespace(id="m1", content="hello")
+
+        def build(name, url, message, event_data):
+            if url == broken:
+                raise ValueError("bad payload")
+            return build_webhook_payload(name, url, message, event_data)
+
+        with (
+            patch(
+                "open_webui.routers.channels.Users.get_webhook_urls_by_access",
+                return_value=[("u1", teams), ("u2", broken), ("u3", slack)],
+            ),
+            patch("open_webui.routers.channels.build_webhook_payload", build),
+            patch(
+                "open_webui.routers.channels.notification_dispatcher.enqueue",
+                new_callable=AsyncMock,
+            ) as enqueue,
+        ):
+            await send_notification("WebUI", "http://w", channel, message, [])
+
+        key, deliveries = enqueue.await_args.args
+        assert key == "channel-message:m1"
+        assert [url for url, _ in deliveries] == [teams, slack]
+        # 频道事件没有 user 字段，Teams 卡片的 facts 为空
+        assert deliveries[0][1]["sections"][0]["facts"] == []
+        assert deliveries[1][1]["text"].startswith("#general")
@@ -0,0 +1,82 @@
+"""
+插件模块与 spec 缓存测试
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from open_webui.services.plugin_cache import PluginCache
+from open_webui.utils import plugin
+
+
+def make_row(content):
+    return SimpleNamespace(id="f1", content=content)
+
+
+class TestPluginCache:
+    def test_rows_cached_until_invalidated(self):
+        cache = PluginCache()
+        loader = MagicMock(return_value=make_row("v1"))
+
+        row, content_hash = cache.get_row("function", "f1", loader)
+        cache.get_row("function", "f1", loader)
+        assert loader.call_count == 1
+        assert content_hash == PluginCache.content_hash("v1")
+
+        cache.invalidate("function", "f1")
+        cache.get_row("function", "f1", loader)
+        assert loader.call_count == 2
+
+    def test_invalidation_scoped_by_kind(self):
+        cache = PluginCache()
+        cache.get_valves("tool", "t1", lambda _: {"a": 1})
+        cache.get_query("function", "global_filters", lambda: ["f1"])
+
+        cache.invalidate("function")
+        loader = MagicMock(return_value={"a": 2})
+        assert cache.get_valves("tool", "t1", loader) == {"a": 1}
+        loader.assert_not_called()
+        assert cache.get_query("function", "global_filters", lambda: []) == []
+
+    def test_stale_read_is_not_cached(self):
+        cache = PluginCache()
+
+        def loader(id):
+            # 读取期间插件被更新
+            cache.invalidate("function", id)
+            return make_row("old")
+
+        cache.get_row("function", "f1", loader)
+        assert cache.get_stats()["rows"] == 0
+
+    def test_modules_keyed_by_content_hash(self):
+        cache = PluginCache()
+        module = object()
+        cache.set_module("tool", "t1", cache.content_hash("v1"), module)
+        assert cache.get_module("tool", "t1", cache.content_hash("v1")) is module
+        assert cache.get_module("tool", "t1", cache.content_hash("v2")) is None
+
+
+class TestFunctionModuleCache:
+    def test_steady_state_skips_db_and_compile(self):
+        cache = PluginCache()
+        request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+        module = object()
+
+        with patch.object(plugin, "plugin_cache", cache), patch.object(
+            plugin.Functions, "get_function_by_id", return_value=make_row("print(1)")
+        ) as get_function, patch.object(
+            plugin, "load_function_module_by_id", return_value=(module, "filter", {})
+        ) as load_module:
+            for _ in range(3):
+                result, _, _ = plugin.get_function_module_from_cache(request, "f1")
+                assert result is module
+
+            assert get_function.call_count == 1
+            assert load_module.call_count == 1
+
+            # 内容变更后重新编译
+            cache.invalidate("function", "f1")
+            get_function.return_value = make_row("print(2)")
+            plugin.get_function_module_from_cache(request, "f1")
+            assert load_module.call_count == 2
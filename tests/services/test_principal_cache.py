@@ -0,0 +1,84 @@
+"""
+身份缓存与吊销布隆过滤器测试
+"""
+
+import time
+from unittest.mock import MagicMock
+
+from pydantic import BaseModel
+
+from open_webui.services.principal_cache import PrincipalCache
+from open_webui.services.token_blacklist import BloomFilter, TokenBlacklistService
+
+
+class FakeUser(BaseModel):
+    id: str
+    role: str = "user"
+
+
+class TestPrincipalCache:
+    def test_hit_and_invalidate_user(self):
+        cache = PrincipalCache(ttl=30)
+        cache.set("token-a", FakeUser(id="u1"))
+        cache.set("token-b", FakeUser(id="u1"))
+        cache.set("token-c", FakeUser(id="u2"))
+
+        assert cache.get("token-a").id == "u1"
+
+        cache.invalidate_user("u1")
+        assert cache.get("token-a") is None
+        assert cache.get("token-b") is None
+        assert cache.get("token-c").id == "u2"
+
+    def test_entry_never_outlives_token(self):
+        cache = PrincipalCache(ttl=30)
+        cache.set("expired", FakeUser(id="u1"), exp=int(time.time()) - 1)
+        assert cache.get("expired") is None
+
+    def test_returns_copies(self):
+        cache = PrincipalCache(ttl=30)
+        cache.set("token", FakeUser(id="u1"))
+        cache.get("token").role = "admin"
+        assert cache.get("token").role == "user"
+
+    def test_bounded_size(self):
+        cache = PrincipalCache(ttl=30, max_entries=2)
+        for i in range(3):
+            cache.set(f"token-{i}", FakeUser(id=f"u{i}"))
+        assert cache.get("token-0") is None
+        assert cache.get_stats()["entries"] == 2
+
+    def test_last_active_is_throttled(self):
+        cache = PrincipalCache(ttl=30)
+        assert cache.should_touch_last_active("u1")
+        assert not cache.should_touch_last_active("u1")
+
+    def test_disabled_with_zero_ttl(self):
+        cache = PrincipalCache(ttl=0)
+        cache.set("token", FakeUser(id="u1"))
+        assert cache.get("token") is None
+
+
+class TestRevocationBloomFilter:
+    def test_membership(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(500):
+            bloom.add(f"revoked-{i}")
+        assert all(f"revoked-{i}" in bloom for i in range(500))
+        false_positives = sum(f"valid-{i}" in bloom for i in range(1000))
+        assert false_positives < 50
+
+    def test_bloom_miss_skips_redis(self):
+        service = TokenBlacklistService.__new__(TokenBlacklistService)
+        service._bloom = BloomFilter()
+        service._bloom_ready = True
+        service.enabled = True
+        service.redis_client = MagicMock()
+
+        assert not service.is_blacklisted("some-token")
+        service.redis_client.exists.assert_not_called()
+
+        service._bloom.add(service.token_id("some-token"))
+        service.redis_client.exists.return_value = 1
+        assert service.is_blacklisted("some-token")
+        service.redis_client.exists.assert_called_once()
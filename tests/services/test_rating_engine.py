@@ -0,0 +1,341 @@
+"""
+模型评分引擎测试
+
+使用配置的 SQLite 数据库，每个测试使用独立的模型 ID 和标签，
+验证增量更新与全量重建一致、修改和删除能撤销贡献、按标签的评分与置信区间、
+并发重建不会重复计数、回填完成前的修改由回填计入且计数不会为负、
+没有 upsert 的数据库上的回退、评测路由的增量更新与导出，以及不含快照的反馈分页
+"""
+
+import json
+import threading
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from open_webui.internal.db import engine as db_engine
+from open_webui.internal.db import get_db
+from open_webui.models.feedbacks import Feedback, FeedbackForm, Feedbacks
+from open_webui.models.model_ratings import (
+    OVERALL,
+    ModelRatingPair,
+    ModelRatingPairModel,
+    ModelRatingState,
+)
+from open_webui.routers import evaluations
+from open_webui.services.rating_engine import RatingEngine, fit_bradley_terry
+from open_webui.utils.auth import get_admin_user, get_verified_user
+
+
+@pytest.fixture
+def arena():
+    suffix = uuid.uuid4().hex[:8]
+    engine = RatingEngine()
+    created = []
+
+    def rate(winner, loser, tags=None, rating=1, user_id=None):
+        feedback = Feedbacks.insert_new_feedback(
+            user_id=user_id or f"rater-{suffix}",
+            form_data=FeedbackForm(
+                type="rating",
+                data={
+                    "rating": rating,
+                    "model_id": winner,
+                    "sibling_model_ids": [loser],
+                },
+                meta={"tags": tags or []},
+                snapshot={"chat": {"messages": ["x" * 1000]}},
+            ),
+        )
+        created.append(feedback.id)
+        engine.apply(None, feedback)
+        return feedback
+
+    models = [f"model-{suffix}-{name}" for name in "abc"]
+    yield engine, rate, models, f"tag-{suffix}"
+
+    with get_db() as db:
+        db.query(Feedback).filter(Feedback.id.in_(created)).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    engine.rebuild()
+
+
+def board(engine, models, tag=OVERALL):
+    return {
+        rating.model_id: (rating.rating, rating.ci_low, rating.ci_high, rating.won)
+        for rating in engine.get_leaderboard(tag)
+        if rating.model_id in models
+    }
+
+
+class TestRatingEngine:
+    def test_incremental_matches_rebuild(self, arena):
+        engine, rate, (a, b, c), tag = arena
+        for _ in range(3):
+            rate(a, b, [tag])
+        rate(b, a)
+        rate(b, c, [tag])
+        rate(c, a, rating=0)
+
+        incremental = board(engine, {a, b, c})
+        tagged = board(engine, {a, b, c}, tag)
+        engine.rebuild()
+
+        assert board(engine, {a, b, c}) == pytest.approx(incremental)
+        assert board(engine, {a, b, c}, tag) == pytest.approx(tagged)
+        assert incremental[a][0] > incremental[c][0]
+        assert {key: value[3] for key, value in incremental.items()} == {
+            a: 3,
+            b: 2,
+            c: 0,
+        }
+
+    def test_update_and_delete_reverse_contribution(self, arena):
+        engine, rate, (a, b, _), tag = arena
+        feedback = rate(a, b, [tag])
+        assert board(engine, {a, b})[a][0] > board(engine, {a, b})[b][0]
+
+        form = FeedbackForm(
+            type="rating",
+            data={"rating": -1, "model_id": a, "sibling_model_ids": [b]},
+            meta={"tags": [tag]},
+        )
+        updated = Feedbacks.update_feedback_by_id(feedback.id, form)
+        engine.apply(feedback, updated)
+        ratings = board(engine, {a, b})
+        assert ratings[b][0] > ratings[a][0]
+        assert ratings[a][3] == 0 and ratings[b][3] == 1
+
+        Feedbacks.delete_feedback_by_id(updated.id)
+        engine.apply(updated, None)
+        assert board(engine, {a, b}) == {}
+        assert tag not in engine.get_tags()
+
+    def test_tag_breakdown_and_confidence(self, arena):
+        engine, rate, (a, b, c), tag = arena
+        rate(a, b, [tag])
+        rate(a, c)
+        rate(c, a)
+        first = board(engine, {a})[a]
+
+        # 同样的胜率，对战越多置信区间越窄
+        for _ in range(10):
+            rate(a, c)
+            rate(c, a)
+        second = board(engine, {a})[a]
+        assert second[2] - second[1] < first[2] - first[1]
+
+        breakdown = engine.get_model_breakdown(a)
+        assert [rating.tag for rating in breakdown] == [OVERALL, tag]
+        assert breakdown[1].won == 1
+        assert tag in engine.get_tags()
+
+    def test_discard_user_feedbacks_matches_rebuild(self, arena):
+        engine, rate, (a, b, c), _ = arena
+        user_id = f"leaver-{uuid.uuid4().hex[:8]}"
+        rate(a, b)
+        rate(c, b)
+        mine = [rate(b, a, user_id=user_id), rate(b, c, user_id=user_id)]
+
+        feedbacks, _ = Feedbacks.get_feedbacks_page(type="rating", user_id=user_id)
+        assert {feedback.id for feedback in feedbacks} == {f.id for f in mine}
+        Feedbacks.delete_feedbacks_by_user_id(user_id)
+        engine.discard(feedbacks)
+
+        discarded = board(engine, {a, b, c})
+        assert discarded[b][3] == 0
+        engine.rebuild()
+        assert board(engine, {a, b, c}) == pytest.approx(discarded)
+
+    def test_concurrent_rebuilds_do_not_double_count(self, arena):
+        engine, rate, (a, b, _), _ = arena
+        rate(a, b)
+        rate(a, b)
+
+        # 每个引擎有自己的进程内锁，只靠数据库写锁串行化，模拟多个 worker
+        engines = [RatingEngine() for _ in range(4)]
+        threads = [threading.Thread(target=other.rebuild) for other in engines]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with get_db() as db:
+            pair = db.query(ModelRatingPair).filter_by(tag=OVERALL, model_a=a).one()
+        assert (pair.wins_a, pair.wins_b) == (2, 0)
+        assert board(engine, {a, b})[a][3] == 2
+
+        # 已经有计数时，启动时的重建什么都不做
+        assert engine.rebuild(only_if_unbuilt=True) is None
+
+    def test_changes_before_backfill_are_counted_by_it(self, arena):
+        engine, rate, (a, b, _), _ = arena
+        old = rate(a, b)
+        rate(a, b)
+        # 模拟升级后回填还没执行：计数为空、没有回填标记
+        with get_db() as db:
+            db.query(ModelRatingPair).delete()
+            db.query(ModelRatingState).update({"built_at": None})
+            db.commit()
+
+        # 修改一条旧反馈，不会写入负数计数，而是触发回填
+        form = FeedbackForm(
+            type="rating",
+            data={"rating": -1, "model_id": a, "sibling_model_ids": [b]},
+        )
+        engine.apply(old, Feedbacks.update_feedback_by_id(old.id, form))
+        assert board(engine, {a, b})[a][3] == 1
+        assert board(engine, {a, b})[b][3] == 1
+        assert engine.rebuild(only_if_unbuilt=True) is None
+
+    def test_counters_never_go_negative(self, arena):
+        engine, rate, (a, b, _), _ = arena
+        counted = rate(a, b)
+        # 删除一条从未计入的反馈，对应的计数停在零
+        uncounted = counted.model_copy(update={"data": {**counted.data, "rating": -1}})
+        engine.apply(uncounted, None)
+
+        with get_db() as db:
+            pair = db.query(ModelRatingPair).filter_by(tag=OVERALL, model_a=a).one()
+        assert (pair.wins_a, pair.wins_b, pair.ties) == (1, 0, 0)
+
+    def test_counters_without_upsert_support(self, arena):
+        engine, rate, (a, b, _), _ = arena
+        rate(a, b)
+        expected = board(engine, {a, b})
+
+        # 其他数据库（例如 MySQL）在写锁内逐行读改写计数
+        with patch.object(db_engine.dialect, "name", "mysql"):
+            second = rate(a, b)
+            engine.apply(second, None)
+        assert board(engine, {a, b}) == pytest.approx(expected)
+
+
+@pytest.fixture
+def client():
+    user = SimpleNamespace(id=f"router-{uuid.uuid4().hex[:8]}", role="user")
+    app = FastAPI()
+    app.include_router(evaluations.router, prefix="/evaluations")
+    app.dependency_overrides[get_verified_user] = lambda: user
+    app.dependency_overrides[get_admin_user] = lambda: user
+    yield TestClient(app), user
+    Feedbacks.delete_feedbacks_by_user_id(user.id)
+
+
+class TestEvaluationsRouter:
+    def post(self, client, winner, loser, rating=1, id=None):
+        path = f"/evaluations/feedback/{id}" if id else "/evaluations/feedback"
+        response = client.post(
+            path,
+            json={
+                "type": "rating",
+                "data": {
+                    "rating": rating,
+                    "model_id": winner,
+                    "sibling_model_ids": [loser],
+                },
+                "meta": {"tags": []},
+                "snapshot": {"chat": {"messages": ["x" * 1000]}},
+            },
+        )
+        assert response.status_code == 200
+        return response.json()["id"]
+
+    def test_writes_apply_deltas_like_a_rebuild(self, arena, client):
+        engine, _, (a, b, c), _ = arena
+        client, _ = client
+
+        first = self.post(client, a, b)
+        self.post(client, b, c)
+        self.post(client, a, b, rating=-1, id=first)
+        third = self.post(client, c, a)
+        assert client.delete(f"/evaluations/feedback/{third}").status_code == 200
+
+        incremental = board(engine, {a, b, c})
+        assert incremental[b][3] == 2 and incremental[a][3] == 0
+        engine.rebuild()
+        assert board(engine, {a, b, c}) == pytest.approx(incremental)
+
+    def test_deleting_own_feedback_discards_without_rebuild(self, arena, client):
+        engine, rate, (a, b, c), _ = arena
+        client, user = client
+        rate(a, b)
+        self.post(client, b, a)
+        self.post(client, c, b)
+
+        with patch.object(RatingEngine, "rebuild") as rebuild:
+            assert client.delete("/evaluations/feedbacks").json() is True
+        rebuild.assert_not_called()
+
+        discarded = board(engine, {a, b, c})
+        assert discarded[a][3] == 1 and c not in discarded
+        engine.rebuild()
+        assert board(engine, {a, b, c}) == pytest.approx(discarded)
+
+    def test_export_streams_all_feedback_without_snapshots(self, arena, client):
+        _, _, (a, b, _), _ = arena
+        client, _ = client
+        ids = {self.post(client, a, b) for _ in range(3)}
+
+        with patch.object(
+            Feedbacks,
+            "get_feedbacks_page",
+            side_effect=lambda cursor, limit: Feedbacks.__class__.get_feedbacks_page(
+                Feedbacks, cursor, 2
+            ),
+        ):
+            response = client.get("/evaluations/feedbacks/all/export")
+        assert response.status_code == 200
+        exported = json.loads(response.text)
+        mine = [item for item in exported if item["id"] in ids]
+        assert len(mine) == 3
+        assert all(item["snapshot"] is None for item in mine)
+        assert len(exported) == len({item["id"] for item in exported})
+
+
+class TestBradleyTerry:
+    def test_symmetric_results_are_centered(self):
+        pairs = [
+            ModelRatingPairModel(tag="", model_a="a", model_b="b", wins_a=5, wins_b=5)
+        ]
+        ratings = {rating["model_id"]: rating for rating in fit_bradley_terry(pairs)}
+        assert ratings["a"]["rating"] == pytest.approx(1000)
+        assert ratings["b"]["rating"] == pytest.approx(1000)
+        assert ratings["a"]["ci_low"] < 1000 < ratings["a"]["ci_high"]
+
+    def test_undefeated_model_has_finite_rating(self):
+        pairs = [ModelRatingPairModel(tag="", model_a="a", model_b="b", wins_a=10)]
+        ratings = {rating["model_id"]: rating for rating in fit_bradley_terry(pairs)}
+        assert 1000 < ratings["a"]["rating"] < 2000
+        total = ratings["a"]["rating"] + ratings["b"]["rating"]
+        assert total == pytest.approx(2000, abs=0.05)
+
+
+class TestFeedbackPages:
+    def test_pages_cover_all_rows_without_snapshot(self, arena):
+        _, rate, (a, b, _), _ = arena
+        user_id = f"pager-{uuid.uuid4().hex[:8]}"
+        ids = {rate(a, b, user_id=user_id).id for _ in range(5)}
+
+        seen, cursor = [], None
+        while True:
+            feedbacks, cursor = Feedbacks.get_feedbacks_page(
+                cursor=cursor, limit=2, type="rating"
+            )
+            seen.extend(feedbacks)
+            if cursor is None:
+                break
+
+        mine = [feedback for feedback in seen if feedback.id in ids]
+        assert {feedback.id for feedback in mine} == ids
+        assert len(seen) == len({feedback.id for feedback in seen})
+        assert all(feedback.snapshot is None for feedback in mine)
+
+        with pytest.raises(ValueError):
+            Feedbacks.get_feedbacks_page(cursor="not-a-cursor")
@@ -0,0 +1,178 @@
+"""
+SCIM 用户组与 OAuth 组同步测试
+
+使用配置的 SQLite 数据库直接调用 SCIM 处理函数，验证 displayName 过滤与分页在 SQL 中完成、
+成员和用户所属组按页批量加载，以及 OAuth 登录时一次差异同步用户组
+（跳过屏蔽的组、按需创建组并使用默认权限）
+"""
+
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from starlette.requests import Request
+
+from open_webui.internal.db import engine, get_db
+from open_webui.models.groups import GroupForm, Groups
+from open_webui.models.users import User, Users
+from open_webui.routers.scim import get_groups, get_users
+from open_webui.utils.oauth import OAuthManager
+from tests.performance.harness import count_queries
+
+
+def scim_request():
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/scim/v2/Groups",
+            "headers": [],
+            "query_string": b"",
+            "scheme": "http",
+            "server": ("testserver", 80),
+        }
+    )
+
+
+@pytest.fixture
+def directory():
+    suffix = uuid.uuid4().hex[:8]
+    user_ids = [f"scim-{suffix}-{i}" for i in range(3)]
+    with get_db() as db:
+        for id in user_ids:
+            db.add(
+                User(
+                    id=id,
+                    name=f"User {id}",
+                    email=f"{id}@example.com",
+                    role="user",
+                    profile_image_url="",
+                    last_active_at=0,
+                    updated_at=0,
+                    created_at=0,
+                )
+            )
+        db.commit()
+
+    groups = {
+        name: Groups.insert_new_group(
+            "admin", GroupForm(name=f"{name}-{suffix}", description="")
+        )
+        for name in ["eng", "ops", "blocked"]
+    }
+    Groups.add_users_to_group(groups["eng"].id, user_ids[:2])
+    Groups.add_users_to_group(groups["ops"].id, user_ids[1:])
+
+    yield suffix, user_ids, groups
+
+    for group in Groups.get_groups():
+        if group.name.endswith(suffix):
+            Groups.delete_group_by_id(group.id)
+    for id in user_ids:
+        Users.delete_user_by_id(id)
+
+
+class TestSCIMGroups:
+    @pytest.mark.asyncio
+    async def test_filter_by_display_name(self, directory):
+        suffix, user_ids, groups = directory
+
+        response = await get_groups(
+            scim_request(),
+            startIndex=1,
+            count=20,
+            filter=f'displayName eq "eng-{suffix}"',
+        )
+        assert response.totalResults == 1
+        [group] = response.Resources
+        assert group.id == groups["eng"].id
+        assert {member.value for member in group.members} == set(user_ids[:2])
+        assert group.members[0].display.startswith("User ")
+
+    @pytest.mark.asyncio
+    async def test_page_loads_members_in_batches(self, directory):
+        _, _, groups = directory
+        total = Groups.get_groups_page(skip=0, limit=1)[1]
+
+        with count_queries(engine) as statements:
+            response = await get_groups(
+                scim_request(), startIndex=1, count=100, filter=None
+            )
+        # 一页组、计数、成员、成员的用户信息，与组和成员数量无关
+        assert len(statements) == 4
+        assert response.totalResults == total
+
+        # startIndex 从 1 开始，翻页结果与数据库分页一致
+        second, _ = Groups.get_groups_page(skip=1, limit=1)
+        response = await get_groups(scim_request(), startIndex=2, count=1, filter=None)
+        assert [group.id for group in response.Resources] == [second[0].id]
+        assert response.itemsPerPage == 1
+
+    @pytest.mark.asyncio
+    async def test_users_page_loads_groups_once(self, directory):
+        _, user_ids, groups = directory
+
+        response = await get_users(
+            scim_request(),
+            startIndex=1,
+            count=1,
+            filter=f'userName eq "{user_ids[1]}@example.com"',
+        )
+        [user] = response.Resources
+        assert {group["value"] for group in user.groups} == {
+            groups["eng"].id,
+            groups["ops"].id,
+        }
+
+        with count_queries(engine) as statements:
+            await get_users(scim_request(), startIndex=1, count=100, filter=None)
+        # 用户分页、计数，整页用户的所属组和组成员各一次
+        assert len(statements) == 4
+
+
+class TestOAuthGroupSync:
+    def sync(self, user_id, claim, blocked, create=False):
+        config = SimpleNamespace(
+            OAUTH_GROUPS_CLAIM="groups",
+            OAUTH_BLOCKED_GROUPS=json.dumps(blocked),
+            ENABLE_OAUTH_GROUP_CREATION=create,
+        )
+        with patch("open_webui.utils.oauth.auth_manager_config", config):
+            OAuthManager(app=None).update_user_groups(
+                SimpleNamespace(id=user_id),
+                {"groups": claim},
+                default_permissions={"chat": {"delete": False}},
+            )
+
+    def member_of(self, user_id):
+        return {group.name for group in Groups.get_groups_by_member_id(user_id)}
+
+    def test_sync_is_one_diff_and_skips_blocked(self, directory):
+        suffix, user_ids, groups = directory
+        user_id = user_ids[0]
+        Groups.add_users_to_group(groups["blocked"].id, [user_id])
+
+        with count_queries(engine) as statements:
+            self.sync(user_id, [f"ops-{suffix}"], [f"blocked-{suffix}"])
+        # 同 sync_groups_by_group_names：两次查询 + 删除 + 插入 + 更新时间 + 默认权限
+        assert len(statements) == 6
+        names = self.member_of(user_id)
+        assert names == {f"ops-{suffix}", f"blocked-{suffix}"}
+        assert Groups.get_group_by_id(groups["ops"].id).permissions == {
+            "chat": {"delete": False}
+        }
+
+        # 没有组声明时保留原有成员关系
+        self.sync(user_id, [], [f"blocked-{suffix}"])
+        assert self.member_of(user_id) == names
+
+    def test_missing_groups_are_created(self, directory):
+        suffix, user_ids, _ = directory
+        self.sync(user_ids[2], [f"eng-{suffix}", f"new-{suffix}"], [], create=True)
+        assert self.member_of(user_ids[2]) == {f"eng-{suffix}", f"new-{suffix}"}
+        [created] = [
+            group for group in Groups.get_groups() if group.name == f"new-{suffix}"
+        ]
+        assert created.permissions == {"chat": {"delete": False}}
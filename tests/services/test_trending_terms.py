@@ -0,0 +1,188 @@
+"""
+热词统计服务单元测试
+"""
+
+import time
+from collections import defaultdict
+
+import pytest
+
+from open_webui.services.trending_terms import (
+    CountMinSketch,
+    TopK,
+    TrendingTermsEngine,
+    WindowSpec,
+)
+
+
+class FakeRedis:
+    """只实现热词同步用到的命令"""
+
+    def __init__(self):
+        self.hashes = defaultdict(dict)
+        self.zsets = defaultdict(dict)
+        self.strings = {}
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+    def hincrby(self, key, field, amount):
+        self.hashes[key][field] = self.hashes[key].get(field, 0) + amount
+        return self.hashes[key][field]
+
+    def zadd(self, key, mapping, gt=False):
+        for member, score in mapping.items():
+            current = self.zsets[key].get(member)
+            if current is None or not gt or score > current:
+                self.zsets[key][member] = score
+        return len(mapping)
+
+    def zremrangebyrank(self, key, start, stop):
+        ranked = sorted(self.zsets[key].items(), key=lambda x: x[1])
+        stop = len(ranked) + stop if stop < 0 else stop
+        for member, _ in ranked[start : stop + 1]:
+            del self.zsets[key][member]
+
+    def zrange(self, key, start, stop, withscores=False):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda x: x[1])
+
+    def expire(self, key, ttl):
+        return True
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+
+        return _queue
+
+    def execute(self):
+        return [getattr(self.redis, n)(*a, **kw) for n, a, kw in self.calls]
+
+
+WINDOWS = [
+    WindowSpec(name="1h", slot_seconds=300, slots=12),
+    WindowSpec(name="7d", slot_seconds=86400, slots=7),
+]
+
+
+class TestCountMinSketch:
+    def test_estimate_never_undercounts(self):
+        sketch = CountMinSketch(width=64, depth=4)
+        for i in range(200):
+            sketch.add(f"term-{i % 20}")
+        for i in range(20):
+            assert sketch.estimate(f"term-{i}") >= 10
+
+    def test_merge(self):
+        a = CountMinSketch(width=128, depth=4)
+        b = CountMinSketch(width=128, depth=4)
+        a.add("交换机", 3)
+        b.add("交换机", 4)
+        a.merge(b)
+        assert a.estimate("交换机") == 7
+        assert a.total == 7
+
+    def test_merge_rejects_different_dimensions(self):
+        with pytest.raises(ValueError):
+            CountMinSketch(width=64).merge(CountMinSketch(width=128))
+
+
+class TestTopK:
+    def test_keeps_heaviest_items(self):
+        top = TopK(capacity=2)
+        top.offer("a", 1)
+        top.offer("b", 5)
+        top.offer("c", 3)
+        assert [k for k, _ in top.top(2)] == ["b", "c"]
+
+
+class TestTrendingTermsEngine:
+    def test_top_ranks_by_frequency(self):
+        engine = TrendingTermsEngine(windows=WINDOWS)
+        now = 1_700_000_000
+        engine.record(["ospf"] * 5 + ["bgp"] * 2, timestamp=now)
+        ranked = engine.top(window="1h", n=2, now=now)
+        assert [term for term, _, _ in ranked] == ["ospf", "bgp"]
+        assert ranked[0][2] == 5
+
+    def test_old_slots_expire_and_decay(self):
+        engine = TrendingTermsEngine(windows=WINDOWS)
+        now = 1_700_000_000
+        engine.record(["vlan"] * 4, timestamp=now - 2 * 3600)
+        engine.record(["mpls"] * 3, timestamp=now)
+
+        assert [t for t, _, _ in engine.top(window="1h", now=now)] == ["mpls"]
+        # 7天窗口内两者都在，但旧数据已衰减
+        ranked = dict((t, s) for t, s, _ in engine.top(window="7d", now=now))
+        assert set(ranked) == {"vlan", "mpls"}
+
+    def test_unknown_window(self):
+        with pytest.raises(ValueError):
+            TrendingTermsEngine(windows=WINDOWS).top(window="30d")
+
+    def test_workers_merge_through_redis(self):
+        redis = FakeRedis()
+        worker_a = TrendingTermsEngine(windows=WINDOWS, redis_client=redis)
+        worker_b = TrendingTermsEngine(windows=WINDOWS, redis_client=redis)
+
+        worker_a.record(["防火墙"] * 3 + ["路由"])
+        worker_b.record(["防火墙"] * 2 + ["路由"] * 5)
+        assert worker_a.maybe_sync(force=True)
+        assert worker_b.maybe_sync(force=True)
+        assert worker_a.maybe_sync(force=True)
+
+        for worker in (worker_a, worker_b):
+            counts = {t: c for t, _, c in worker.top(window="1h")}
+            assert counts == {"路由": 6, "防火墙": 5}
+
+    def test_seed_claimed_once(self):
+        redis = FakeRedis()
+        assert TrendingTermsEngine(redis_client=redis).try_claim_seed(ttl=60)
+        assert not TrendingTermsEngine(redis_client=redis).try_claim_seed(ttl=60)
+
+    def test_recording_worker_pushes_without_reads(self):
+        redis = FakeRedis()
+        writer = TrendingTermsEngine(
+            windows=WINDOWS, redis_client=redis, sync_interval=0.05
+        )
+        reader = TrendingTermsEngine(windows=WINDOWS, redis_client=redis)
+        try:
+            # 只记录、从不查询热词的 worker 由后台线程推送增量
+            writer.record(["防火墙"] * 2)
+            deadline = time.time() + 5
+            while writer.get_stats()["pending_terms"] and time.time() < deadline:
+                time.sleep(0.01)
+            assert reader.maybe_sync(force=True)
+            assert {t: c for t, _, c in reader.top(window="1h")} == {"防火墙": 2}
+        finally:
+            writer.close()
+
+    def test_pending_increments_are_capped(self):
+        engine = TrendingTermsEngine(
+            windows=WINDOWS, redis_client=FakeRedis(), max_pending=4
+        )
+        # 后台线程已停止，增量只能累积
+        engine._stopped.set()
+        engine.record([f"词{i}" for i in range(5)])
+        assert engine.get_stats()["pending_terms"] == 4
+        # 每个词在两个窗口各占一项，后三个词的增量被丢弃
+        assert engine.pending_dropped == 6
+        # 本地统计不受影响
+        assert len(engine.top(window="1h")) == 5
+
+    def test_seed_attempted_once_without_redis(self):
+        engine = TrendingTermsEngine(windows=WINDOWS)
+        assert engine.try_claim_seed(ttl=60)
+        assert not engine.try_claim_seed(ttl=60)
@@ -0,0 +1,113 @@
+"""
+向量数据库异步接口测试
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from open_webui.retrieval.vector.main import SearchResult, VectorDBBase
+
+
+class SlowVectorDB(VectorDBBase):
+    """同步实现的假后端，search 阻塞一段时间"""
+
+    def __init__(self):
+        self.deleted = []
+
+    def has_collection(self, collection_name):
+        return collection_name == "docs"
+
+    def delete_collection(self, collection_name):
+        pass
+
+    def insert(self, collection_name, items):
+        pass
+
+    def upsert(self, collection_name, items):
+        pass
+
+    def search(self, collection_name, vectors, limit):
+        time.sleep(0.2)
+        return SearchResult(
+            ids=[[collection_name]],
+            documents=[["doc"]],
+            metadatas=[[{}]],
+            distances=[[0.1]],
+        )
+
+    def query(self, collection_name, filter, limit=None):
+        return None
+
+    def get(self, collection_name):
+        return None
+
+    def delete(self, collection_name, ids=None, filter=None):
+        self.deleted.append((collection_name, ids, filter))
+
+    def reset(self):
+        pass
+
+
+class TestAsyncVectorDB:
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_overlap(self):
+        db = SlowVectorDB()
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(db.asearch(f"c{i}", [[0.0, 1.0]], 3) for i in range(4))
+        )
+        elapsed = time.perf_counter() - start
+
+        assert [r.ids[0][0] for r in results] == ["c0", "c1", "c2", "c3"]
+        # 串行需要 0.8 秒
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_default_methods_delegate(self):
+        db = SlowVectorDB()
+        assert await db.ahas_collection("docs")
+        assert not await db.ahas_collection("other")
+
+        await db.adelete("docs", filter={"file_id": "f1"})
+        assert db.deleted == [("docs", None, {"file_id": "f1"})]
+
+
+class TestBatchVectorSearch:
+    @pytest.mark.asyncio
+    async def test_queries_are_embedded_once_and_searched_concurrently(
+        self, monkeypatch
+    ):
+        from open_webui.services import performance_service as module
+
+        db = SlowVectorDB()
+        monkeypatch.setattr(module, "get_retrieval_vector_db", lambda: db)
+        service = module.PerformanceService()
+        embedded = []
+
+        def embed(texts):
+            embedded.append(list(texts))
+            return [[float(i), 1.0] for i in range(len(texts))]
+
+        queries = [f"q{i}" for i in range(4)]
+        start = time.perf_counter()
+        results = await service.batch_vector_search(
+            queries, 3, collection_name="docs", embedding_function=embed
+        )
+        elapsed = time.perf_counter() - start
+
+        assert embedded == [queries]
+        assert set(results) == set(queries)
+        assert all(
+            hits == [{"id": "docs", "document": "doc", "metadata": {}, "distance": 0.1}]
+            for hits in results.values()
+        )
+        # 串行需要 0.8 秒
+        assert elapsed < 0.6
+
+        # 第二次全部命中缓存，不再向量化
+        assert await service.batch_vector_search(
+            queries, 3, collection_name="docs", embedding_function=embed
+        ) == results
+        assert len(embedded) == 1
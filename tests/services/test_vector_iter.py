@@ -0,0 +1,51 @@
+"""
+向量集合分页遍历测试
+"""
+
+import pytest
+
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    VectorDBBase,
+    collect_get_pages,
+)
+
+
+class ListVectorDB(VectorDBBase):
+    """get 返回固定条目的假后端"""
+
+    def __init__(self, count):
+        self.count = count
+
+    has_collection = delete_collection = insert = upsert = None
+    search = query = delete = reset = None
+
+    def get(self, collection_name):
+        ids = [f"id-{i}" for i in range(self.count)]
+        return GetResult(
+            ids=[ids],
+            documents=[[f"doc {i}" for i in range(self.count)]],
+            metadatas=[[{"n": i} for i in range(self.count)]],
+        )
+
+
+class TestIterGet:
+    def test_default_pages_bounded(self):
+        pages = list(ListVectorDB(7).iter_get("docs", batch_size=3))
+        assert [len(page.ids[0]) for page in pages] == [3, 3, 1]
+        assert pages[1].documents[0] == ["doc 3", "doc 4", "doc 5"]
+        assert pages[2].metadatas[0] == [{"n": 6}]
+
+    def test_empty_collection(self):
+        assert list(ListVectorDB(0).iter_get("docs", batch_size=3)) == []
+
+    def test_merge_pages(self):
+        db = ListVectorDB(5)
+        merged = collect_get_pages(db.iter_get("docs", batch_size=2))
+        assert merged.ids == db.get("docs").ids
+        assert collect_get_pages(ListVectorDB(0).iter_get("docs")) is None
+
+    @pytest.mark.asyncio
+    async def test_async_iteration(self):
+        pages = [page async for page in ListVectorDB(5).aiter_get("docs", 2)]
+        assert [page.ids[0][0] for page in pages] == ["id-0", "id-2", "id-4"]
@@ -0,0 +1,165 @@
+"""
+向量检索结果缓存测试
+"""
+
+from open_webui.retrieval.vector.main import GetResult, SearchResult, VectorDBBase
+from open_webui.services.vector_query_cache import VectorQueryCache
+
+
+def make_result(name):
+    return SearchResult(
+        ids=[[name]], documents=[["doc"]], metadatas=[[{}]], distances=[[0.1]]
+    )
+
+
+class CountingSearch:
+    def __init__(self, name="id-0"):
+        self.name = name
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return make_result(self.name)
+
+
+class WritableVectorDB(VectorDBBase):
+    """只实现写入方法的假后端"""
+
+    has_collection = search = query = get = None
+
+    def insert(self, collection_name, items):
+        pass
+
+    def upsert(self, collection_name, items):
+        pass
+
+    def delete(self, collection_name, ids=None, filter=None):
+        pass
+
+    def delete_collection(self, collection_name):
+        pass
+
+    def reset(self):
+        pass
+
+
+class TestVectorQueryCache:
+    def test_repeated_search_hits(self):
+        cache = VectorQueryCache(max_entries=10)
+        search = CountingSearch()
+
+        first = cache.search("docs", [0.1, 0.2], 3, search)
+        second = cache.search("docs", [0.1, 0.2], 3, search)
+        assert search.calls == 1
+        assert first.ids == second.ids
+
+        # 返回的是拷贝，调用方修改不影响缓存
+        second.ids[0].append("other")
+        assert cache.search("docs", [0.1, 0.2], 3, search).ids == [["id-0"]]
+
+        cache.search("docs", [0.1, 0.2], 5, search)
+        cache.search("docs", [0.2, 0.1], 3, search)
+        assert search.calls == 3
+
+    def test_backend_write_invalidates_collection(self):
+        import open_webui.retrieval.vector.main as vector_main
+
+        cache = VectorQueryCache(max_entries=10)
+        vector_main.add_write_listener(cache.invalidate)
+        try:
+            db = WritableVectorDB()
+            search = CountingSearch()
+            cache.search("docs", [0.1], 3, search)
+            cache.search("notes", [0.1], 3, search)
+
+            db.upsert("docs", [])
+            cache.search("docs", [0.1], 3, search)
+            cache.search("notes", [0.1], 3, search)
+            assert search.calls == 3
+
+            db.delete(collection_name="notes", ids=["x"])
+            cache.search("notes", [0.1], 3, search)
+            assert search.calls == 4
+
+            db.reset()
+            cache.search("docs", [0.1], 3, search)
+            assert search.calls == 5
+        finally:
+            vector_main._write_listeners.remove(cache.invalidate)
+
+    def test_collection_fetch_cached_until_changed(self):
+        cache = VectorQueryCache(max_entries=200, max_collection_items=2)
+        calls = []
+
+        def get(count):
+            def fetch():
+                calls.append(count)
+                return GetResult(
+                    ids=[[str(i) for i in range(count)]],
+                    documents=[["doc"] * count],
+                    metadatas=[[{}] * count],
+                )
+
+            return fetch
+
+        cache.get_collection("small", get(2))
+        cache.get_collection("small", get(2))
+        cache.get_collection("large", get(3))
+        cache.get_collection("large", get(3))
+        assert calls == [2, 3, 3]
+
+        cache.invalidate("small")
+        cache.get_collection("small", get(2))
+        assert calls == [2, 3, 3, 2]
+
+    def test_collection_cache_bounded_by_bytes(self):
+        # 每个集合 10 条，约 10 * (200 + 100) = 3000 字节
+        cache = VectorQueryCache(max_entries=200, max_collection_bytes=7000)
+        calls = []
+
+        def get(name):
+            def fetch():
+                calls.append(name)
+                return GetResult(
+                    ids=[[str(i) for i in range(10)]],
+                    documents=[["x" * 100] * 10],
+                    metadatas=[[None] * 10],
+                )
+
+            return fetch
+
+        for name in ["a", "b", "c", "a", "c"]:
+            cache.get_collection(name, get(name))
+        # 第三个集合放入后淘汰最久未用的 a
+        assert calls == ["a", "b", "c", "a"]
+        assert cache.get_stats()["cached_collections"] == 2
+        assert cache.get_stats()["cached_collection_bytes"] <= 7000
+
+        cache.invalidate("c")
+        assert cache.get_stats()["cached_collections"] == 1
+
+        small = VectorQueryCache(max_entries=200, max_collection_bytes=1000)
+        small.get_collection("a", get("a"))
+        small.get_collection("a", get("a"))
+        assert small.get_stats()["cached_collections"] == 0
+
+    def test_stats_per_collection(self):
+        cache = VectorQueryCache(max_entries=10)
+        search = CountingSearch()
+        for _ in range(4):
+            cache.search("docs", [0.1], 3, search)
+        cache.search("notes", [0.1], 3, search)
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 2
+        assert stats["collections"]["docs"]["hit_rate"] == 75.0
+        assert stats["collections"]["notes"]["hit_rate"] == 0.0
+
+    def test_disabled(self):
+        cache = VectorQueryCache(max_entries=0)
+        search = CountingSearch()
+        cache.search("docs", [0.1], 3, search)
+        cache.search("docs", [0.1], 3, search)
+        assert search.calls == 2
+        assert not cache.get_stats()["enabled"]
@@ -0,0 +1,69 @@
+"""
+网页缓存测试
+"""
+
+from unittest.mock import MagicMock
+
+from open_webui.services.web_page_cache import WebPageCache, normalize_url
+
+
+def make_cache(tmp_path, **kwargs):
+    return WebPageCache(path=tmp_path / "web_pages.db", **kwargs)
+
+
+class TestNormalizeUrl:
+    def test_equivalent_urls(self):
+        assert normalize_url("HTTPS://Example.com:443/a?b=2&a=1#top") == (
+            "https://example.com/a?a=1&b=2"
+        )
+        assert normalize_url("http://example.com") == "http://example.com/"
+        assert normalize_url("http://example.com:8080/") == "http://example.com:8080/"
+
+
+class TestWebPageCache:
+    def test_conditional_headers_require_cached_extract(self, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.put_page("https://example.com/", "h1", etag='"v1"', last_modified="Mon")
+        page = cache.get_page("https://EXAMPLE.com")
+
+        # 正文不在缓存中时不能依赖 304
+        assert cache.conditional_headers(page) == {}
+
+        cache.put_extract("h1", "hello", {"title": "Example"})
+        assert cache.conditional_headers(page) == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon",
+        }
+        assert cache.get_extract("h1") == {
+            "text": "hello",
+            "metadata": {"title": "Example"},
+        }
+
+    def test_embeddings_only_computed_for_new_chunks(self, tmp_path):
+        cache = make_cache(tmp_path)
+        embed = MagicMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+
+        assert cache.embed_with_cache(["a", "bb"], embed, "model") == [[1.0], [2.0]]
+        assert cache.embed_with_cache(["bb", "ccc"], embed, "model") == [[2.0], [3.0]]
+        assert embed.call_args_list[1].args == (["ccc"],)
+
+        # 不同模型的向量不混用
+        cache.embed_with_cache(["a"], embed, "other-model")
+        assert embed.call_count == 3
+        assert cache.get_stats()["embedding_hits"] == 1
+
+    def test_prune_keeps_most_recent(self, tmp_path):
+        cache = make_cache(tmp_path, max_entries=2)
+        for i in range(4):
+            cache.put_extract(f"h{i}", str(i), {})
+        cache.prune()
+        assert cache.get_extract("h0") is None
+        assert cache.get_extract("h3")["text"] == "3"
+
+    def test_disabled_cache_passes_through(self, tmp_path):
+        cache = make_cache(tmp_path, enabled=False)
+        embed = MagicMock(return_value=[[1.0]])
+        cache.embed_with_cache(["a"], embed, "model")
+        cache.embed_with_cache(["a"], embed, "model")
+        assert embed.call_count == 2
+        assert cache.get_page("https://example.com/") is None
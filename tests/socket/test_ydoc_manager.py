@@ -0,0 +1,81 @@
+"""
+Yjs 文档存储与压缩测试
+"""
+
+import json
+
+import pycrdt as Y
+import pytest
+
+from open_webui.socket.utils import YdocManager
+
+
+def make_updates(count):
+    doc = Y.Doc()
+    doc["content"] = text = Y.Text()
+    updates = []
+    doc.observe(lambda event: updates.append(event.update))
+    for i in range(count):
+        text += f"line {i}\n"
+    return doc, updates
+
+
+def load(update):
+    doc = Y.Doc()
+    doc["content"] = text = Y.Text()
+    doc.apply_update(update)
+    return doc, text
+
+
+class TestYdocManager:
+    @pytest.mark.asyncio
+    async def test_compaction_keeps_document_intact(self):
+        manager = YdocManager(compaction_threshold=1000, compaction_tail=3)
+        source, updates = make_updates(10)
+        for update in updates:
+            await manager.append_to_updates("note:abc", update)
+
+        assert await manager.compact("note:abc")
+        stored = await manager.get_updates("note:abc")
+        # 一个快照加上尾部的 3 个更新
+        assert len(stored) == 4
+
+        _, text = load(await manager.get_state("note:abc"))
+        assert str(text) == str(source["content"])
+
+    @pytest.mark.asyncio
+    async def test_state_vector_diff(self):
+        manager = YdocManager(compaction_threshold=1000, compaction_tail=0)
+        _, updates = make_updates(6)
+        for update in updates[:4]:
+            await manager.append_to_updates("doc", update)
+        await manager.compact("doc")
+
+        client, client_text = load(await manager.get_state("doc"))
+        for update in updates[4:]:
+            await manager.append_to_updates("doc", update)
+
+        diff = await manager.get_state("doc", client.get_state())
+        assert len(diff) < len(await manager.get_state("doc"))
+        client.apply_update(diff)
+        assert str(client_text).count("line") == 6
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_updates(self):
+        _, updates = make_updates(2)
+        legacy = [json.dumps(list(u)).encode() for u in updates]
+        merged = YdocManager()._merge(None, legacy)
+        _, text = load(merged)
+        assert str(text) == "line 0\nline 1\n"
+
+    @pytest.mark.asyncio
+    async def test_clear_document(self):
+        manager = YdocManager(compaction_threshold=1000, compaction_tail=0)
+        _, updates = make_updates(2)
+        for update in updates:
+            await manager.append_to_updates("doc", update)
+        await manager.compact("doc")
+        assert await manager.document_exists("doc")
+
+        await manager.clear_document("doc")
+        assert not await manager.document_exists("doc")